@@ -16,17 +16,31 @@ from frappe.utils import add_days, cint, cstr, flt, getdate, now_datetime, nowda
 from frappe.utils.data import escape_html, format_datetime, formatdate
 from frappe.utils.pdf import get_pdf
 
+from cold_storage.api.customer_scope import CustomerScope
 from cold_storage.client_portal_views import (
 	CLIENT_PORTAL_VIEW_SOURCE_API,
 	log_client_portal_view,
 )
+from cold_storage.cold_storage.batch_balances import (
+	get_balance_provider,
+	get_batch_ledger_sql,
+	sum_balances_by,
+)
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.cold_storage.prepared_reports import (
+	get_prepared_report_data,
+	is_prepared_report,
+	queue_prepared_report,
+)
 from cold_storage.setup.client_portal_user_permissions import (
 	CLIENT_PORTAL_ROLE,
+	get_all_customer_names,
 	get_customers_for_portal_user,
 )
 
 DEFAULT_LIMIT: Final[int] = 20
 MAX_LIMIT: Final[int] = 1000
+TOP_BATCHES_LIMIT: Final[int] = 10
 ADMIN_ROLE: Final[str] = "Cold Storage Admin"
 SYSTEM_MANAGER_ROLE: Final[str] = "System Manager"
 REPORTS_WITH_CUSTOMER_FILTER: Final[set[str]] = {
@@ -65,20 +79,21 @@ PORTAL_REPORT_DEFINITIONS: Final[tuple[dict[str, str], ...]] = (
 		"label": "Yearly Inward/Outward Trend",
 		"description": "Year-over-year inward vs outward movement trend by item group.",
 	},
-
 )
 
 
-
 @frappe.whitelist()
+@instrumented
 def get_snapshot(limit: int = DEFAULT_LIMIT, customer: str | None = None) -> dict:
 	"""Return customer-filtered stock, movement, invoice and report data for the portal."""
 	row_limit = _sanitize_limit(limit)
 	_ensure_client_portal_access()
+	scope, available_customers, selected_customer = _resolve_customer_scope(customer)
+	# Build any scope temp table before the access log writes to this transaction.
+	scope.materialize()
 	_track_client_portal_access()
-	customers, available_customers, selected_customer = _resolve_customer_scope(customer)
 
-	if not customers:
+	if scope.is_empty():
 		return {
 			"available_customers": available_customers,
 			"selected_customer": selected_customer,
@@ -89,69 +104,50 @@ def get_snapshot(limit: int = DEFAULT_LIMIT, customer: str | None = None) -> dic
 			"reports": [],
 			"announcement": None,
 			"company_name": frappe.db.get_single_value("Cold Storage Settings", "company") or "",
-			"analytics": {
-				"stock_composition": [],
-				"movement_trends": {"labels": [], "datasets": []}
-			},
-			"total_outstanding": 0.0
+			"analytics": {"stock_composition": [], "movement_trends": {"labels": [], "datasets": []}},
+			"total_outstanding": 0.0,
 		}
 
-	stock_rows = _get_stock_rows(customers, max(row_limit, 50))
-	movement_rows = _get_movement_rows(customers, row_limit)
-	invoice_rows = _get_invoice_rows(customers, row_limit)
+	stock_rows = _get_stock_rows(scope, row_limit)
+	movement_rows = _get_movement_rows(scope, row_limit)
+	invoice_rows = _get_invoice_rows(scope, row_limit)
 	report_rows = _get_report_links(selected_customer)
-	total_outstanding = _get_total_outstanding(customers)
+	total_outstanding = _get_total_outstanding(scope)
 
 	available_customers = _dedupe_strings(available_customers)
-	customers = _dedupe_strings(customers)
+	scoped_customers = available_customers if scope.is_all else list(scope.customers)
 	stock_rows = _dedupe_stock_rows(stock_rows)
 	movement_rows = _dedupe_movement_rows(movement_rows)
 	invoice_rows = _dedupe_invoice_rows(invoice_rows)
 	report_rows = _dedupe_report_rows(report_rows)
 
 	# Chart Data: Top Batches by Stock Qty
-	# Aggregate by batch_no
-	batch_qty_map = {}
-	for r in stock_rows:
-		batch = r.get("batch_no")
-		if batch:
-			batch_qty_map[batch] = batch_qty_map.get(batch, 0.0) + flt(r.get("qty"))
-	
-	stock_chart_data = sorted(
-		[{"name": k, "value": v} for k, v in batch_qty_map.items()],
-		key=lambda x: x["value"],
-		reverse=True
-	)[:10]
+	stock_chart_data = _get_top_batches(scope)
 
 	# Chart Data: Movement Trends (Last 30 Days)
-	trend_chart_data = _get_movement_trends(customers)
+	trend_chart_data = _get_movement_trends(scope)
 
 	# Fetch settings
 	announcement = _safe_get_single_value("Cold Storage Settings", "portal_announcement")
 	company_name = frappe.db.get_single_value("Cold Storage Settings", "company") or ""
-	
 
 	return {
 		"available_customers": available_customers,
 		"selected_customer": selected_customer,
-		"customers": customers,
+		"customers": scoped_customers,
 		"stock": stock_rows,
 		"movements": movement_rows,
 		"invoices": invoice_rows,
 		"reports": report_rows,
 		"announcement": announcement,
 		"company_name": company_name,
-		"analytics": {
-			"stock_composition": stock_chart_data,
-			"movement_trends": trend_chart_data
-		},
-		"total_outstanding": total_outstanding
+		"analytics": {"stock_composition": stock_chart_data, "movement_trends": trend_chart_data},
+		"total_outstanding": total_outstanding,
 	}
 
 
-
-
 @frappe.whitelist()
+@instrumented
 def create_service_request(request_type: str, customer: str, items: list[dict], required_date: str) -> dict:
 	"""Create a Draft Inward or Outward document."""
 	_ensure_client_portal_access()
@@ -163,8 +159,8 @@ def create_service_request(request_type: str, customer: str, items: list[dict],
 		frappe.throw(_("At least one item is required"), frappe.ValidationError)
 
 	# Validate customer access
-	allowed_customers, _available_customers, _selected_customer = _resolve_customer_scope(customer)
-	if not allowed_customers:
+	_scope, _available_customers, selected_customer = _resolve_customer_scope(customer)
+	if not selected_customer:
 		frappe.throw(_("Invalid customer"), frappe.PermissionError)
 
 	doctype = "Cold Storage Inward" if request_type == "Inward" else "Cold Storage Outward"
@@ -202,12 +198,11 @@ def create_service_request(request_type: str, customer: str, items: list[dict],
 
 	doc.insert(ignore_permissions=True)
 
-	return {
-		"name": doc.name,
-		"message": _("Request created successfully")
-	}
+	return {"name": doc.name, "message": _("Request created successfully")}
+
 
 @frappe.whitelist()
+@instrumented
 def get_document_details(doctype: str, docname: str) -> dict:
 	"""Fetch details and child items for a specific document."""
 	_ensure_client_portal_access()
@@ -219,7 +214,7 @@ def get_document_details(doctype: str, docname: str) -> dict:
 		frappe.throw(_("Document not found"))
 
 	doc = frappe.get_doc(doctype, docname)
-	
+
 	# Security check: Ensure user has access to this customer
 	user_customers = get_customers_for_portal_user(frappe.session.user)
 	if doc.customer not in user_customers:
@@ -230,72 +225,42 @@ def get_document_details(doctype: str, docname: str) -> dict:
 		"status": "Draft" if doc.docstatus == 0 else ("Submitted" if doc.docstatus == 1 else "Cancelled"),
 		"posting_date": formatdate(doc.posting_date),
 		"customer": doc.customer,
-		"doctype": doctype, 
+		"doctype": doctype,
 		"items": [
 			{
 				"item_code": item.item_code,
 				"item_name": item.item_name,
 				"qty": item.qty,
 				"batch_no": item.batch_no,
-				"uom": item.uom
+				"uom": item.uom,
 			}
 			for item in doc.items
-		]
+		],
 	}
+
+
 @frappe.whitelist()
+@instrumented
 def get_available_items(customer: str | None = None, request_type: str = "Inward") -> list[str]:
 	"""Fetch available item codes for the customer based on request type.
-	
+
 	Inward: Items the customer has batches for (their goods).
 	Outward: Items the customer currently has in stock (qty > 0).
 	"""
 	_ensure_client_portal_access()
-	
+
 	if not customer:
 		return []
-	
+
 	# Validate customer scope
-	_customers, _available, _selected = _resolve_customer_scope(customer)
-	if not _customers:
+	scope, _available, _selected = _resolve_customer_scope(customer)
+	if scope.is_empty():
 		return []
 
 	if request_type == "Outward":
 		# For Outward, only allow items currently in stock for this customer
-		# Uses same UNION ALL pattern as _get_stock_rows to handle both
-		# direct batch_no and Serial and Batch Bundle entries
-		return frappe.db.sql(
-			"""
-			select distinct stock.item_code
-			from `tabBatch` batch
-			join (
-				select item_code, batch_no, sum(qty) as qty
-				from (
-					select sle.item_code, sle.batch_no, sle.actual_qty as qty
-					from `tabStock Ledger Entry` sle
-					where sle.is_cancelled = 0
-						and ifnull(sle.batch_no, '') != ''
-
-					union all
-
-					select sle.item_code, sbe.batch_no, sbe.qty as qty
-					from `tabStock Ledger Entry` sle
-					inner join `tabSerial and Batch Entry` sbe
-						on sbe.parent = sle.serial_and_batch_bundle
-					where sle.is_cancelled = 0
-						and ifnull(sle.batch_no, '') = ''
-						and ifnull(sle.serial_and_batch_bundle, '') != ''
-						and ifnull(sbe.batch_no, '') != ''
-						and ifnull(sbe.is_cancelled, 0) = 0
-				) combined
-				group by item_code, batch_no
-			) stock on stock.batch_no = batch.name
-			where batch.custom_customer = %(customer)s
-				and stock.qty > 0
-			order by stock.item_code
-			""",
-			{"customer": customer},
-			pluck=True
-		)
+		balances = get_balance_provider().get_balances(customer=customer)
+		return sorted(item for item, qty in sum_balances_by(balances, "item_code").items() if qty > 0)
 
 	# For Inward, return items the customer has batches for (their goods)
 	customer_items = frappe.db.sql(
@@ -309,7 +274,7 @@ def get_available_items(customer: str | None = None, request_type: str = "Inward
 		order by batch.item
 		""",
 		{"customer": customer},
-		pluck=True
+		pluck=True,
 	)
 
 	# If customer has historical items, return those
@@ -321,116 +286,66 @@ def get_available_items(customer: str | None = None, request_type: str = "Inward
 		"Item",
 		filters={"disabled": 0, "is_stock_item": 1, "has_batch_no": 1},
 		pluck="name",
-		order_by="name asc"
+		order_by="name asc",
 	)
 
+
 @frappe.whitelist()
+@instrumented
 def get_available_batches(customer: str, item_code: str, request_type: str = "Inward") -> list[dict]:
 	"""Fetch available batches for the customer and item combination.
-	
+
 	Inward: All batches the customer owns for the item.
 	Outward: Only batches with positive stock (qty > 0).
-	
+
 	Returns list of dicts: [{batch_no, qty}]
 	"""
 	_ensure_client_portal_access()
-	
+
 	if not customer or not item_code:
 		return []
-	
+
 	# Validate customer scope
-	_customers, _available, _selected = _resolve_customer_scope(customer)
-	if not _customers:
+	scope, _available, _selected = _resolve_customer_scope(customer)
+	if scope.is_empty():
 		return []
 
+	qty_by_batch = sum_balances_by(
+		get_balance_provider().get_balances(customer=customer, item_code=item_code), "batch_no"
+	)
 	if request_type == "Outward":
 		# Only batches with positive stock
-		return frappe.db.sql(
-			"""
-			select batch.name as batch_no, stock.qty
-			from `tabBatch` batch
-			join (
-				select batch_no, sum(qty) as qty
-				from (
-					select sle.batch_no, sle.actual_qty as qty
-					from `tabStock Ledger Entry` sle
-					where sle.is_cancelled = 0
-						and sle.item_code = %(item_code)s
-						and ifnull(sle.batch_no, '') != ''
-
-					union all
-
-					select sbe.batch_no, sbe.qty as qty
-					from `tabStock Ledger Entry` sle
-					inner join `tabSerial and Batch Entry` sbe
-						on sbe.parent = sle.serial_and_batch_bundle
-					where sle.is_cancelled = 0
-						and sle.item_code = %(item_code)s
-						and ifnull(sle.batch_no, '') = ''
-						and ifnull(sle.serial_and_batch_bundle, '') != ''
-						and ifnull(sbe.batch_no, '') != ''
-						and ifnull(sbe.is_cancelled, 0) = 0
-				) combined
-				group by batch_no
-				having sum(qty) > 0
-			) stock on stock.batch_no = batch.name
-			where batch.custom_customer = %(customer)s
-				and batch.item = %(item_code)s
-			order by batch.name
-			""",
-			{"customer": customer, "item_code": item_code},
-			as_dict=True
-		)
+		return [
+			{"batch_no": batch_no, "qty": qty} for batch_no, qty in sorted(qty_by_batch.items()) if qty > 0
+		]
 
 	# For Inward, all batches the customer owns for this item
-	return frappe.db.sql(
-		"""
-		select batch.name as batch_no, ifnull(stock.qty, 0) as qty
-		from `tabBatch` batch
-		left join (
-			select batch_no, sum(qty) as qty
-			from (
-				select sle.batch_no, sle.actual_qty as qty
-				from `tabStock Ledger Entry` sle
-				where sle.is_cancelled = 0
-					and sle.item_code = %(item_code)s
-					and ifnull(sle.batch_no, '') != ''
-
-				union all
-
-				select sbe.batch_no, sbe.qty as qty
-				from `tabStock Ledger Entry` sle
-				inner join `tabSerial and Batch Entry` sbe
-					on sbe.parent = sle.serial_and_batch_bundle
-				where sle.is_cancelled = 0
-					and sle.item_code = %(item_code)s
-					and ifnull(sle.batch_no, '') = ''
-					and ifnull(sle.serial_and_batch_bundle, '') != ''
-					and ifnull(sbe.batch_no, '') != ''
-					and ifnull(sbe.is_cancelled, 0) = 0
-			) combined
-			group by batch_no
-		) stock on stock.batch_no = batch.name
-		where batch.custom_customer = %(customer)s
-			and batch.item = %(item_code)s
-		order by batch.name
-		""",
-		{"customer": customer, "item_code": item_code},
-		as_dict=True
+	batch_nos = frappe.get_all(
+		"Batch",
+		filters={"custom_customer": customer, "item": item_code},
+		pluck="name",
+		order_by="name asc",
 	)
+	return [{"batch_no": batch_no, "qty": qty_by_batch.get(batch_no, 0.0)} for batch_no in batch_nos]
+
 
 @frappe.whitelist()
+@instrumented
 def get_item_details(item_code: str) -> dict:
 	"""Fetch item name and details."""
 	_ensure_client_portal_access()
-	return frappe.db.get_value("Item", item_code, ["item_name", "stock_uom", "description"], as_dict=True) or {}
+	return (
+		frappe.db.get_value("Item", item_code, ["item_name", "stock_uom", "description"], as_dict=True) or {}
+	)
+
 
 @frappe.whitelist()
+@instrumented
 def download_stock_csv(customer: str | None = None) -> None:
 	"""Download customer-filtered stock snapshot as CSV."""
 	_ensure_client_portal_access()
-	customers, _available_customers, _selected_customer = _resolve_customer_scope(customer)
-	rows = _get_stock_rows(customers, MAX_LIMIT * 2) if customers else []
+	scope, _available_customers, _selected_customer = _resolve_customer_scope(customer)
+	rows = _get_stock_rows(scope, MAX_LIMIT * 2)
 	_download_csv(
 		filename="cold_storage_stock.csv",
 		fieldnames=[
@@ -447,11 +362,12 @@ def download_stock_csv(customer: str | None = None) -> None:
 
 
 @frappe.whitelist()
+@instrumented
 def download_movements_csv(customer: str | None = None) -> None:
 	"""Download customer-filtered movement data as CSV."""
 	_ensure_client_portal_access()
-	customers, _available_customers, _selected_customer = _resolve_customer_scope(customer)
-	rows = _get_movement_rows(customers, MAX_LIMIT * 2) if customers else []
+	scope, _available_customers, _selected_customer = _resolve_customer_scope(customer)
+	rows = _get_movement_rows(scope, MAX_LIMIT * 2)
 	_download_csv(
 		filename="cold_storage_movements.csv",
 		fieldnames=[
@@ -467,11 +383,12 @@ def download_movements_csv(customer: str | None = None) -> None:
 
 
 @frappe.whitelist()
+@instrumented
 def download_invoices_csv(customer: str | None = None) -> None:
 	"""Download customer-filtered invoice data as CSV."""
 	_ensure_client_portal_access()
-	customers, _available_customers, _selected_customer = _resolve_customer_scope(customer)
-	rows = _get_invoice_rows(customers, MAX_LIMIT * 2) if customers else []
+	scope, _available_customers, _selected_customer = _resolve_customer_scope(customer)
+	rows = _get_invoice_rows(scope, MAX_LIMIT * 2)
 	_download_csv(
 		filename="cold_storage_invoices.csv",
 		fieldnames=[
@@ -489,17 +406,18 @@ def download_invoices_csv(customer: str | None = None) -> None:
 
 
 @frappe.whitelist()
+@instrumented
 def download_customer_statement(customer: str | None = None) -> None:
 	"""Download a customer-scoped statement PDF from portal invoices."""
 	_ensure_client_portal_access()
-	customers, _available_customers, selected_customer = _resolve_customer_scope(customer)
-	rows = _get_invoice_rows(customers, MAX_LIMIT * 5) if customers else []
+	scope, available_customers, selected_customer = _resolve_customer_scope(customer)
+	rows = _get_invoice_rows(scope, MAX_LIMIT * 5)
 	total_invoiced = sum(flt(row.get("grand_total")) for row in rows)
 	total_outstanding = sum(flt(row.get("outstanding_amount")) for row in rows)
 
 	html = _render_customer_statement_pdf_html(
 		selected_customer=selected_customer,
-		customers=customers,
+		customers=available_customers if scope.is_all else list(scope.customers),
 		rows=rows,
 		total_invoiced=total_invoiced,
 		total_outstanding=total_outstanding,
@@ -523,6 +441,7 @@ def download_customer_statement(customer: str | None = None) -> None:
 
 
 @frappe.whitelist()
+@instrumented
 def get_invoice_payment_link(invoice_name: str) -> dict[str, str]:
 	"""Return a portal-safe payment link for a Sales Invoice."""
 	_ensure_client_portal_access()
@@ -541,10 +460,8 @@ def get_invoice_payment_link(invoice_name: str) -> dict[str, str]:
 	if not invoice or cint(invoice.get("docstatus")) != 1:
 		frappe.throw(_("Only submitted invoices are eligible for payment links"), frappe.ValidationError)
 
-	allowed_customers, _available_customers, _selected_customer = _resolve_customer_scope(
-		cstr(invoice.get("customer"))
-	)
-	if cstr(invoice.get("customer")) not in allowed_customers:
+	scope, _available_customers, _selected_customer = _resolve_customer_scope(cstr(invoice.get("customer")))
+	if cstr(invoice.get("customer")) not in scope:
 		frappe.throw(_("You are not allowed to access this invoice"), frappe.PermissionError)
 
 	if flt(invoice.get("outstanding_amount")) <= 0:
@@ -552,7 +469,9 @@ def get_invoice_payment_link(invoice_name: str) -> dict[str, str]:
 
 	existing = _get_existing_payment_request(invoice_name)
 	if existing:
-		payment_url = cstr(existing.get("payment_url")).strip() or _to_payment_request_route(existing.get("name"))
+		payment_url = cstr(existing.get("payment_url")).strip() or _to_payment_request_route(
+			existing.get("name")
+		)
 		return {"payment_url": payment_url, "source": "payment_request", "status": "existing"}
 
 	created = _create_portal_payment_request(invoice_name, cstr(invoice.get("customer")))
@@ -563,6 +482,7 @@ def get_invoice_payment_link(invoice_name: str) -> dict[str, str]:
 
 
 @frappe.whitelist()
+@instrumented
 def download_report_pdf(report_name: str, customer: str | None = None) -> None:
 	"""Download a customer-scoped portal report as PDF."""
 	_ensure_client_portal_access()
@@ -579,9 +499,23 @@ def download_report_pdf(report_name: str, customer: str | None = None) -> None:
 	if not _has_report_access(report_name, roles):
 		frappe.throw(_("You are not allowed to export this report"), frappe.PermissionError)
 
-	_customers, _available_customers, selected_customer = _resolve_customer_scope(customer)
+	_scope, _available_customers, selected_customer = _resolve_customer_scope(customer)
 	filters = _get_report_filters(report_name, selected_customer)
-	report_data = run_query_report(report_name=report_name, filters=filters or None)
+	if is_prepared_report(report_name):
+		report_data = get_prepared_report_data(report_name, filters)
+		if report_data is None:
+			queue_prepared_report(report_name, filters)
+			frappe.respond_as_web_page(
+				_("Report Queued"),
+				_(
+					"{0} is being prepared in the background. "
+					"You will get a notification when it is ready; download it again then."
+				).format(_(report_name)),
+				indicator_color="blue",
+			)
+			return
+	else:
+		report_data = run_query_report(report_name=report_name, filters=filters or None)
 	html = _render_portal_report_pdf_html(
 		report_name=report_name,
 		selected_customer=selected_customer,
@@ -643,93 +577,66 @@ def _track_client_portal_access() -> None:
 		frappe.log_error(frappe.get_traceback(), "Client Portal View Logging Failed")
 
 
-def _get_scoped_customers_for_session() -> list[str]:
+def _get_scoped_customers_for_session() -> tuple[list[str], bool]:
+	"""Return the session's selectable customers and whether they mean "every customer"."""
 	customers = get_customers_for_portal_user()
 	if customers:
-		return customers
+		return customers, False
 
 	roles = set(frappe.get_roles())
 	if _has_global_portal_scope(roles):
-		return frappe.get_all("Customer", pluck="name")
+		return get_all_customer_names(), True
+
+	return [], False
 
-	return []
 
+def _get_top_batches(scope: CustomerScope, limit: int = TOP_BATCHES_LIMIT) -> list[dict]:
+	"""Largest batches by current stock, from the ranking maintained on submit/cancel."""
+	if scope.is_empty():
+		return []
 
-def _get_movement_trends(customers: list[str], days: int = 30) -> dict:
-	"""Fetch aggregated Inward/Outward quantities per day for the last N days."""
-	if not customers:
+	rows = frappe.db.sql(
+		f"""
+		select ranking.name, ranking.qty
+		from `tabCold Storage Batch Ranking` ranking
+		where {scope.condition("ranking.customer")}
+		order by ranking.qty desc, ranking.name asc
+		limit %(limit)s
+		""",
+		{**scope.params(), "limit": cint(limit)},
+		as_dict=True,
+	)
+	return [{"name": row.name, "value": flt(row.qty)} for row in rows]
+
+
+def _get_movement_trends(scope: CustomerScope, days: int = 30) -> dict:
+	"""Inward/Outward quantities per day for the last N days, from the per-customer daily totals."""
+	if scope.is_empty():
 		return {"labels": [], "datasets": []}
 
 	start_date = add_days(nowdate(), -days)
-	
-	# Fetch aggregated data via SQL for performance and correctness
+
+	# Ownership transfer legs are already booked as Inward/Outward for the receiving/giving customer.
 	data = frappe.db.sql(
-		"""
-		select posting_date, movement_type, sum(qty) as qty
-		from (
-			-- Inward
-			select posting_date, 'Inward' as movement_type, sum(total_qty) as qty
-			from `tabCold Storage Inward`
-			where docstatus = 1 and customer in %(customers)s and posting_date >= %(start_date)s
-			group by posting_date
-			
-			union all
-			
-			-- Outward
-			select posting_date, 'Outward' as movement_type, sum(total_qty) as qty
-			from `tabCold Storage Outward`
-			where docstatus = 1 and customer in %(customers)s and posting_date >= %(start_date)s
-			group by posting_date
-
-			union all
-
-			-- Transfer In (treated as Inward for this customer)
-			select posting_date, 'Inward' as movement_type, sum(total_qty) as qty
-			from `tabCold Storage Transfer`
-			where docstatus = 1 and to_customer in %(customers)s and posting_date >= %(start_date)s
-			group by posting_date
-
-			union all
-
-			-- Transfer Out (treated as Outward for this customer)
-			select posting_date, 'Outward' as movement_type, sum(total_qty) as qty
-			from `tabCold Storage Transfer`
-			where docstatus = 1 and from_customer in %(customers)s and posting_date >= %(start_date)s
-			group by posting_date
-		) combined
-		group by posting_date, movement_type
-		order by posting_date asc
+		f"""
+		select cdm.posting_date, sum(cdm.inward_qty) as inward_qty, sum(cdm.outward_qty) as outward_qty
+		from `tabCold Storage Customer Daily Movement` cdm
+		where cdm.posting_date >= %(start_date)s
+			and {scope.condition("cdm.customer")}
+		group by cdm.posting_date
+		order by cdm.posting_date asc
 		""",
-		{"customers": customers, "start_date": start_date},
-		as_dict=True
+		{**scope.params(), "start_date": start_date},
+		as_dict=True,
 	)
 
-	# Initialize map for all dates in range to ensure continuity? 
-	# Or just present dates with activity? 
-	# Presenting dates with activity is usually consistent with previous logic.
-	# But let's fill gaps if needed? The previous logic didn't fill gaps.
-	# So we just process the results.
-
-	stats = {}
-	for row in data:
-		d = getdate(row.posting_date)
-		if d not in stats:
-			stats[d] = {"Inward": 0.0, "Outward": 0.0}
-		stats[d][row.movement_type] += flt(row.qty)
-
-	sorted_dates = sorted(stats.keys())
-	# Limit to last N days strictly in case of clock skew, though SQL filter handles it.
-	# formatted dates
-	labels = [d.strftime("%d %b") for d in sorted_dates]
-	inward_vals = [stats[d]["Inward"] for d in sorted_dates]
-	outward_vals = [stats[d]["Outward"] for d in sorted_dates]
+	labels = [getdate(row.posting_date).strftime("%d %b") for row in data]
+	inward_vals = [flt(row.inward_qty) for row in data]
+	outward_vals = [flt(row.outward_qty) for row in data]
 
 	return {
 		"labels": labels,
-		"datasets": [
-			{"name": "Inward", "values": inward_vals},
-			{"name": "Outward", "values": outward_vals}
-		]
+		"datasets": [{"name": "Inward", "values": inward_vals}, {"name": "Outward", "values": outward_vals}],
 	}
 
 
@@ -737,24 +644,34 @@ def _has_global_portal_scope(roles: set[str]) -> bool:
 	return SYSTEM_MANAGER_ROLE in roles or ADMIN_ROLE in roles
 
 
-def _resolve_customer_scope(customer: str | None = None) -> tuple[list[str], list[str], str]:
-	available_customers = _get_scoped_customers_for_session()
+def _resolve_customer_scope(customer: str | None = None) -> tuple[CustomerScope, list[str], str]:
+	"""Return (query scope, selectable customers, selected customer).
+
+	Global admin scope is ``CustomerScope.all()``, so admin queries run without a customer
+	predicate, the same plan as a company-wide report.
+	"""
+	available_customers, is_global_scope = _get_scoped_customers_for_session()
 	selected_customer = cstr(customer).strip()
 	if not selected_customer:
-		return available_customers, available_customers, ""
+		scope = CustomerScope.all() if is_global_scope else CustomerScope(available_customers)
+		return scope, available_customers, ""
 
 	if selected_customer not in set(available_customers):
 		frappe.throw(_("You are not allowed to access this customer's data"), frappe.PermissionError)
 
-	return [selected_customer], available_customers, selected_customer
+	return CustomerScope([selected_customer]), available_customers, selected_customer
+
+
+# Batch-wise stock rows, with the same ledger rules as the fast balance provider.
+_BATCH_STOCK_SOURCE_SQL: Final[str] = get_batch_ledger_sql()
 
 
-def _get_stock_rows(customers: list[str], row_limit: int) -> list[dict]:
-	if not customers:
+def _get_stock_rows(scope: CustomerScope, row_limit: int) -> list[dict]:
+	if scope.is_empty():
 		return []
 
 	rows = frappe.db.sql(
-		"""
+		f"""
 		select
 			batch.custom_customer as customer,
 			stock.item_code,
@@ -763,36 +680,11 @@ def _get_stock_rows(customers: list[str], row_limit: int) -> list[dict]:
 			stock.warehouse,
 			round(sum(stock.qty), 3) as qty,
 			batch.expiry_date
-		from (
-			select
-				sle.item_code,
-				sle.batch_no,
-				sle.warehouse,
-				sle.actual_qty as qty
-			from `tabStock Ledger Entry` sle
-			where sle.is_cancelled = 0
-				and ifnull(sle.batch_no, '') != ''
-
-			union all
-
-			select
-				sle.item_code,
-				sbe.batch_no,
-				sle.warehouse,
-				sbe.qty as qty
-			from `tabStock Ledger Entry` sle
-			inner join `tabSerial and Batch Entry` sbe
-				on sbe.parent = sle.serial_and_batch_bundle
-			where sle.is_cancelled = 0
-				and ifnull(sle.batch_no, '') = ''
-				and ifnull(sle.serial_and_batch_bundle, '') != ''
-				and ifnull(sbe.batch_no, '') != ''
-				and ifnull(sbe.is_cancelled, 0) = 0
-		) stock
+		from ({_BATCH_STOCK_SOURCE_SQL}) stock
 		inner join `tabBatch` batch on batch.name = stock.batch_no
 		left join `tabItem` item on item.name = stock.item_code
-		where 1=1
-			and batch.custom_customer in %(customers)s
+		where ifnull(batch.custom_customer, '') != ''
+			and {scope.condition("batch.custom_customer")}
 		group by
 			batch.custom_customer,
 			stock.item_code,
@@ -804,10 +696,7 @@ def _get_stock_rows(customers: list[str], row_limit: int) -> list[dict]:
 		order by qty desc, stock.item_code asc
 		limit %(row_limit)s
 		""",
-		{
-			"customers": tuple(customers),
-			"row_limit": cint(row_limit),
-		},
+		{**scope.params(), "row_limit": cint(row_limit)},
 		as_dict=True,
 	)
 
@@ -817,6 +706,53 @@ def _get_stock_rows(customers: list[str], row_limit: int) -> list[dict]:
 	return rows
 
 
+def get_item_stock_by_customer(
+	customers: list[str] | None = None, company: str | None = None
+) -> dict[str, list[dict]]:
+	"""Return closing stock per item for many customers in one query.
+
+	``customers=None`` covers every customer that owns a batch; ``company`` limits the ledger
+	to that company's entries.
+	"""
+	scope = CustomerScope(customers)
+	if scope.is_empty():
+		return {}
+
+	stock_source_sql = get_batch_ledger_sql(company=True) if company else _BATCH_STOCK_SOURCE_SQL
+
+	rows = frappe.db.sql(
+		f"""
+		select
+			batch.custom_customer as customer,
+			stock.item_code,
+			item.item_name,
+			item.stock_uom,
+			count(distinct stock.batch_no) as batch_count,
+			round(sum(stock.qty), 3) as qty
+		from ({stock_source_sql}) stock
+		inner join `tabBatch` batch on batch.name = stock.batch_no
+		left join `tabItem` item on item.name = stock.item_code
+		where ifnull(batch.custom_customer, '') != ''
+			and {scope.condition("batch.custom_customer")}
+		group by
+			batch.custom_customer,
+			stock.item_code,
+			item.item_name,
+			item.stock_uom
+		having round(sum(stock.qty), 3) > 0
+		order by batch.custom_customer asc, qty desc, stock.item_code asc
+		""",
+		{**scope.params(), "company": company},
+		as_dict=True,
+	)
+
+	stock_by_customer: dict[str, list[dict]] = {}
+	for row in rows:
+		row["qty"] = flt(row.get("qty"), 3)
+		stock_by_customer.setdefault(row.customer, []).append(row)
+	return stock_by_customer
+
+
 def _dedupe_strings(values: list[str]) -> list[str]:
 	seen: set[str] = set()
 	unique_values: list[str] = []
@@ -854,7 +790,7 @@ def _dedupe_movement_rows(rows: list[dict]) -> list[dict]:
 	# Or enforce uniqueness if needed. SLE IDs are unique.
 	# But we are returning dicts.
 	# Let's assume unique enough for now or dedupe by all fields?
-    # Actually, for portal view duplication is unlikely unless join issues.
+	# Actually, for portal view duplication is unlikely unless join issues.
 	return rows
 
 
@@ -886,14 +822,14 @@ def _dedupe_report_rows(rows: list[dict]) -> list[dict]:
 	return unique_rows
 
 
-def _get_movement_rows(customers: list[str], row_limit: int) -> list[dict]:
-	if not customers:
+def _get_movement_rows(scope: CustomerScope, row_limit: int) -> list[dict]:
+	if scope.is_empty():
 		return []
 
 	# Query Cold Storage Inward/Outward/Transfer child tables directly
 	# (Stock Ledger Entries use voucher_type='Stock Entry' and won't match)
 	return frappe.db.sql(
-		"""
+		f"""
 		(
 			select
 				p.posting_date,
@@ -906,7 +842,7 @@ def _get_movement_rows(customers: list[str], row_limit: int) -> list[dict]:
 				'Inward' as movement_type
 			from `tabCold Storage Inward` p
 			join `tabCold Storage Inward Item` ci on ci.parent = p.name
-			where p.docstatus = 1 and p.customer in %(customers)s
+			where p.docstatus = 1 and {scope.condition("p.customer")}
 		)
 		union all
 		(
@@ -921,7 +857,7 @@ def _get_movement_rows(customers: list[str], row_limit: int) -> list[dict]:
 				'Outward' as movement_type
 			from `tabCold Storage Outward` p
 			join `tabCold Storage Outward Item` ci on ci.parent = p.name
-			where p.docstatus = 1 and p.customer in %(customers)s
+			where p.docstatus = 1 and {scope.condition("p.customer")}
 		)
 		union all
 		(
@@ -937,35 +873,31 @@ def _get_movement_rows(customers: list[str], row_limit: int) -> list[dict]:
 			from `tabCold Storage Transfer` p
 			join `tabCold Storage Transfer Item` ci on ci.parent = p.name
 			where p.docstatus = 1
-				and (p.customer in %(customers)s
-					or p.from_customer in %(customers)s
-					or p.to_customer in %(customers)s)
+				and ({scope.condition("p.customer")}
+					or {scope.condition("p.from_customer")}
+					or {scope.condition("p.to_customer")})
 		)
 		order by posting_date desc
 		limit %(row_limit)s
 		""",
-		{
-			"customers": tuple(customers),
-			"row_limit": cint(row_limit),
-		},
+		{**scope.params(), "row_limit": cint(row_limit)},
 		as_dict=True,
 	)
 
 
-
 def _resolve_transfer_customer(row: frappe._dict) -> str:
 	if row.get("transfer_type") == "Ownership Transfer":
 		return f"{row.get('from_customer') or ''} -> {row.get('to_customer') or ''}".strip(" ->")
 	return cstr(row.get("customer") or "")
 
 
-def _get_invoice_rows(customers: list[str], row_limit: int) -> list[dict]:
-	if not customers:
+def _get_invoice_rows(scope: CustomerScope, row_limit: int) -> list[dict]:
+	if scope.is_empty():
 		return []
 
 	# Fetch all submitted Sales Invoices for these customers
 	rows = frappe.db.sql(
-		"""
+		f"""
 		select
 			name,
 			posting_date,
@@ -977,39 +909,63 @@ def _get_invoice_rows(customers: list[str], row_limit: int) -> list[dict]:
 			status
 		from `tabSales Invoice`
 		where docstatus = 1
-			and customer in %(customers)s
+			and {scope.condition("customer")}
 		order by posting_date desc, modified desc
 		limit %(row_limit)s
 		""",
-		{
-			"customers": tuple(customers),
-			"row_limit": cint(row_limit),
-		},
+		{**scope.params(), "row_limit": cint(row_limit)},
 		as_dict=True,
 	)
-	
+
 	for row in rows:
 		row["route"] = _to_invoice_route(row.get("name"))
 	return rows
 
 
-def _get_total_outstanding(customers: list[str]) -> float:
-	if not customers:
+def _get_total_outstanding(scope: CustomerScope) -> float:
+	if scope.is_empty():
 		return 0.0
-	
+
 	total = frappe.db.sql(
-		"""
+		f"""
 		select sum(outstanding_amount)
 		from `tabSales Invoice`
 		where docstatus = 1
-			and customer in %(customers)s
+			and {scope.condition("customer")}
 		""",
-		{"customers": tuple(customers)}
+		scope.params(),
 	)[0][0]
-	
+
 	return flt(total or 0.0)
 
 
+def get_outstanding_by_customer(
+	customers: list[str] | None = None, company: str | None = None
+) -> dict[str, float]:
+	"""Return submitted Sales Invoice outstanding per customer in one grouped query.
+
+	Pass ``company`` whenever the totals are shown in one company's currency.
+	"""
+	scope = CustomerScope(customers)
+	if scope.is_empty():
+		return {}
+
+	company_condition = "and company = %(company)s" if company else ""
+	rows = frappe.db.sql(
+		f"""
+		select customer, sum(outstanding_amount) as outstanding
+		from `tabSales Invoice`
+		where docstatus = 1
+			and {scope.condition("customer")}
+			{company_condition}
+		group by customer
+		having sum(outstanding_amount) != 0
+		""",
+		{**scope.params(), "company": company},
+	)
+	return {customer: flt(outstanding) for customer, outstanding in rows}
+
+
 def _get_report_links(selected_customer: str = "") -> list[dict]:
 	roles = set(frappe.get_roles())
 	links: list[dict] = []
@@ -1390,8 +1346,8 @@ def _render_customer_statement_pdf_html(
 			</div>
 			<div class="meta">
 				<div class="meta-card"><div class="meta-label">Customer Scope</div><div class="meta-value">{escape_html(scope)}</div></div>
-				<div class="meta-card"><div class="meta-label">Total Invoiced</div><div class="meta-value">{escape_html(f'{total_invoiced:,.2f}')}</div></div>
-				<div class="meta-card"><div class="meta-label">Total Outstanding</div><div class="meta-value">{escape_html(f'{total_outstanding:,.2f}')}</div></div>
+				<div class="meta-card"><div class="meta-label">Total Invoiced</div><div class="meta-value">{escape_html(f"{total_invoiced:,.2f}")}</div></div>
+				<div class="meta-card"><div class="meta-label">Total Outstanding</div><div class="meta-value">{escape_html(f"{total_outstanding:,.2f}")}</div></div>
 			</div>
 			<table>
 				<thead>
@@ -1400,7 +1356,7 @@ def _render_customer_statement_pdf_html(
 					</tr>
 				</thead>
 				<tbody>
-					{''.join(body_rows)}
+					{"".join(body_rows)}
 				</tbody>
 			</table>
 		</div>
@@ -1479,22 +1435,25 @@ def _download_csv(filename: str, fieldnames: list[str], rows: list[dict]) -> Non
 
 
 @frappe.whitelist()
+@instrumented
 def download_dashboard_report(customer: str | None = None) -> None:
 	"""Generate and download a comprehensive dashboard PDF report."""
 	_ensure_client_portal_access()
-	
+
 	# Reuse existing snapshot logic to fetch all data
 	# Fetch basic snapshot first
 	data = get_snapshot(limit=100, customer=customer)
-	
+
 	# Override movements with a larger limit for the report to ensure completeness
-	data["movements"] = _get_movement_rows(data["customers"], row_limit=5000)
+	scope, _available_customers, _selected_customer = _resolve_customer_scope(customer)
+	data["movements"] = _get_movement_rows(scope, row_limit=5000)
 
-	
 	# Add derived metrics for the report
-	data["total_stock_value"] = sum(flt(row.get("qty")) * flt(row.get("valuation_rate", 0)) for row in data["stock"])
+	data["total_stock_value"] = sum(
+		flt(row.get("qty")) * flt(row.get("valuation_rate", 0)) for row in data["stock"]
+	)
 	data["max_stock_value"] = max([d["value"] for d in data["analytics"]["stock_composition"]] or [1])
-	
+
 	# Calculate 30-day inward volume from analytics data
 	total_inward = 0.0
 	trend_data = data["analytics"]["movement_trends"]
@@ -1503,7 +1462,7 @@ def download_dashboard_report(customer: str | None = None) -> None:
 		inward_ds = next((ds for ds in trend_data["datasets"] if ds["name"] == "Inward"), None)
 		if inward_ds:
 			total_inward = sum(flt(v) for v in inward_ds["values"])
-			
+
 	data["total_inward_30_days"] = total_inward
 
 	# Render Template
@@ -1530,6 +1489,7 @@ def download_dashboard_report(customer: str | None = None) -> None:
 
 
 @frappe.whitelist(allow_guest=True)
+@instrumented
 def download_brochure() -> None:
 	"""Generate and download the Cold Storage product brochure as a PDF."""
 	company_name = frappe.db.get_single_value("Cold Storage Settings", "company") or "Cold Storage"
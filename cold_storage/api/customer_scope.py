@@ -0,0 +1,101 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Customer restriction shared by the client portal queries."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, Final
+
+import frappe
+
+# Above this many customers an ``IN (...)`` list is swapped for a join on a session temp table.
+IN_LIST_LIMIT: Final[int] = 500
+TEMP_TABLE_INSERT_CHUNK: Final[int] = 1000
+
+
+class CustomerScope:
+	"""Which customers a portal query may read.
+
+	Three shapes are rendered by :meth:`condition`:
+
+	- every customer (global admin scope): no predicate at all;
+	- a small set: ``column in %(customers)s``;
+	- a large set: ``column in (select customer from <temp table>)``, so the SQL text and
+	  plan stay the same size regardless of how many customers a user is mapped to.
+	"""
+
+	__slots__ = ("_customers", "_temp_table")
+
+	def __init__(self, customers: Iterable[str] | None = None) -> None:
+		if customers is None:
+			self._customers: tuple[str, ...] | None = None
+		else:
+			self._customers = tuple(dict.fromkeys(customer for customer in customers if customer))
+		self._temp_table: str | None = None
+
+	@classmethod
+	def all(cls) -> CustomerScope:
+		return cls(None)
+
+	@property
+	def is_all(self) -> bool:
+		return self._customers is None
+
+	@property
+	def customers(self) -> tuple[str, ...] | None:
+		"""Explicit customers, or ``None`` for every customer."""
+		return self._customers
+
+	def is_empty(self) -> bool:
+		return self._customers is not None and not self._customers
+
+	def __contains__(self, customer: object) -> bool:
+		if self._customers is None:
+			return bool(customer)
+		return customer in self._customers
+
+	def __repr__(self) -> str:
+		if self._customers is None:
+			return "CustomerScope(all)"
+		return f"CustomerScope({len(self._customers)} customers)"
+
+	def condition(self, column: str) -> str:
+		"""SQL predicate restricting ``column`` to this scope."""
+		if self._customers is None:
+			return "1=1"
+		if len(self._customers) > IN_LIST_LIMIT and self.materialize():
+			return f"{column} in (select customer from `{self._temp_table}`)"
+		return f"{column} in %(customers)s"
+
+	def params(self) -> dict[str, Any]:
+		"""Query parameters referenced by :meth:`condition`."""
+		if self._customers is None:
+			return {}
+		return {"customers": self._customers or ("",)}
+
+	def materialize(self) -> bool:
+		"""Load a large scope into a session temp table; returns False when it cannot.
+
+		``CREATE TEMPORARY TABLE`` is refused by Frappe once the transaction has written,
+		so callers that want the join should materialize before logging or inserting.
+		The table lives until the DB connection closes at the end of the request or job.
+		"""
+		if self._temp_table:
+			return True
+		if not self._customers or len(self._customers) <= IN_LIST_LIMIT:
+			return False
+		if frappe.db.transaction_writes:
+			return False
+
+		table = f"tmp_cs_customer_scope_{frappe.generate_hash(length=10)}"
+		frappe.db.sql(f"create temporary table `{table}` (customer varchar(140) not null primary key)")
+		for start in range(0, len(self._customers), TEMP_TABLE_INSERT_CHUNK):
+			chunk = self._customers[start : start + TEMP_TABLE_INSERT_CHUNK]
+			frappe.db.sql(
+				f"insert into `{table}` (customer) values {', '.join(['(%s)'] * len(chunk))}",
+				chunk,
+			)
+		self._temp_table = table
+		return True
@@ -0,0 +1,331 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Hot-path latency benchmark over a seeded synthetic dataset.
+
+Times the portal snapshot, the link-field search queries, every script report's ``execute`` and
+insert/submit of 10/100/500-row Inward, Outward and Transfer documents::
+
+	bench --site <site> execute cold_storage.benchmarks.hot_paths.run \\
+		--kwargs "{'seed': 7, 'batches': 2000, 'output': '/tmp/cs-bench-v0.0.2.json'}"
+
+	bench --site <site> execute cold_storage.benchmarks.hot_paths.compare \\
+		--kwargs "{'baseline': '/tmp/cs-bench-v0.0.1.json', 'current': '/tmp/cs-bench-v0.0.2.json'}"
+
+Reports are timed without the report cache. Submitted benchmark documents are rolled back unless
+``keep_documents`` is set; the synthetic dataset itself is committed and reused.
+"""
+
+from __future__ import annotations
+
+import inspect
+import os
+import time
+from collections.abc import Callable
+from statistics import median
+from typing import Any, Final
+
+import frappe
+from frappe import _
+from frappe.utils import add_years, cint, flt, getdate, now, nowdate
+
+import cold_storage
+from cold_storage.api import client_portal
+from cold_storage.benchmarks import synthetic_data
+from cold_storage.cold_storage import utils
+from cold_storage.cold_storage.batch_balances import get_balance_provider
+
+REPORTS_MODULE: Final[str] = "cold_storage.cold_storage.report"
+DEFAULT_ROW_COUNTS: Final[tuple[int, ...]] = (10, 100, 500)
+SUBMIT_DOCTYPES: Final[tuple[str, ...]] = (
+	"Cold Storage Inward",
+	"Cold Storage Outward",
+	"Cold Storage Transfer",
+)
+SEARCH_FUNCTIONS: Final[tuple[str, ...]] = (
+	"search_batches_for_customer_warehouse",
+	"search_warehouses_for_customer",
+	"search_items_for_customer_stock",
+	"search_items_for_customer_movement",
+	"search_batches_for_customer_item",
+	"search_warehouses_for_batch",
+)
+REGRESSION_THRESHOLD: Final[float] = 0.2
+
+
+def run(
+	seed: int = 42,
+	customers: int = 20,
+	batches: int = 200,
+	warehouses: int = 4,
+	years: int = 2,
+	movements_per_batch: int = 4,
+	iterations: int = 5,
+	row_counts: str | list[int] | None = None,
+	reports: str | list[str] | None = None,
+	keep_documents: int = 0,
+	output: str | None = None,
+) -> dict:
+	"""Generate (or reuse) the dataset for ``seed``, time every hot path and return the results."""
+	iterations = max(cint(iterations), 1)
+	if cint(warehouses) < 2:
+		frappe.throw(_("At least two warehouses are needed to benchmark transfers"))
+	row_counts = _parse_list(row_counts) or list(DEFAULT_ROW_COUNTS)
+	if any(cint(count) < 1 for count in row_counts):
+		frappe.throw(_("Row counts must be positive integers"))
+	row_counts = [cint(count) for count in row_counts]
+	report_names = _parse_list(reports) or get_report_names()
+	unknown_reports = sorted(set(report_names) - set(get_report_names()))
+	if unknown_reports:
+		frappe.throw(_("Unknown reports: {0}").format(", ".join(unknown_reports)))
+
+	dataset = synthetic_data.generate(
+		customers=customers,
+		batches=batches,
+		warehouses=warehouses,
+		years=years,
+		movements_per_batch=movements_per_batch,
+		seed=seed,
+	)
+	context = _get_context(dataset, years)
+
+	result = {
+		"started_at": now(),
+		"versions": _get_versions(),
+		"parameters": {
+			"seed": cint(seed),
+			"customers": len(dataset.customers),
+			"batches": len(dataset.batches),
+			"warehouses": len(dataset.warehouses),
+			"years": cint(years),
+			"movements_per_batch": cint(movements_per_batch),
+			"iterations": iterations,
+			"row_counts": row_counts,
+		},
+		"dataset": dataset.documents,
+		"timings": {},
+	}
+	timings = result["timings"]
+	timings["get_snapshot"] = _time_call(
+		lambda: client_portal.get_snapshot(customer=context.customer), iterations
+	)
+	for function_name in SEARCH_FUNCTIONS:
+		timings[f"search.{function_name}"] = _time_call(
+			lambda function_name=function_name: _call_search(function_name, context), iterations
+		)
+	for report_name in report_names:
+		timings[f"report.{report_name}"] = _time_call(
+			lambda report_name=report_name: _execute_report(report_name, context), iterations
+		)
+
+	try:
+		for row_count in row_counts:
+			for doctype, timing in _time_submits(dataset, context, row_count).items():
+				timings[f"submit.{doctype}.{row_count}"] = timing
+	finally:
+		if cint(keep_documents):
+			frappe.db.commit()
+		else:
+			frappe.db.rollback()
+
+	if output:
+		with open(output, "w") as handle:
+			handle.write(frappe.as_json(result))
+		result["output"] = os.path.abspath(output)
+	return result
+
+
+def compare(baseline: str, current: str, threshold: float = REGRESSION_THRESHOLD) -> dict:
+	"""Compare two ``run`` outputs; a timing regresses when its p50 grows by more than ``threshold``."""
+	baseline_timings = _load_timings(baseline)
+	current_timings = _load_timings(current)
+	threshold = flt(threshold)
+
+	rows = []
+	for key in sorted(set(baseline_timings) & set(current_timings)):
+		before = flt(baseline_timings[key].get("p50"))
+		after = flt(current_timings[key].get("p50"))
+		change = (after - before) / before if before else 0.0
+		rows.append(
+			{
+				"timing": key,
+				"baseline_p50": before,
+				"current_p50": after,
+				"change": round(change, 4),
+				"regressed": change > threshold,
+			}
+		)
+
+	return {
+		"threshold": threshold,
+		"regressions": [row["timing"] for row in rows if row["regressed"]],
+		"timings": rows,
+		"only_in_baseline": sorted(set(baseline_timings) - set(current_timings)),
+		"only_in_current": sorted(set(current_timings) - set(baseline_timings)),
+	}
+
+
+def get_report_names() -> list[str]:
+	"""Module names of the app's script reports."""
+	report_dir = frappe.get_app_path("cold_storage", "cold_storage", "report")
+	return sorted(
+		name
+		for name in os.listdir(report_dir)
+		if os.path.isfile(os.path.join(report_dir, name, f"{name}.py"))
+	)
+
+
+def _get_context(dataset: dict, years: int) -> frappe._dict:
+	"""Filters shared by the timed calls, taken from a batch that still holds stock."""
+	balances = get_balance_provider().get_balances(
+		item_code=dataset.item_code, batch_nos=[batch_no for batch_no, _customer in dataset.batches]
+	)
+	customer_by_batch = dict(dataset.batches)
+	stocked = max(balances, key=lambda row: row.qty) if balances else None
+	if not stocked:
+		frappe.throw(_("The synthetic dataset has no batch with stock left to benchmark"))
+
+	today = getdate(nowdate())
+	return frappe._dict(
+		company=dataset.company,
+		customer=customer_by_batch[stocked.batch_no],
+		item_code=dataset.item_code,
+		batch_no=stocked.batch_no,
+		warehouse=stocked.warehouse,
+		from_date=add_years(today, -max(cint(years), 1)),
+		to_date=today,
+	)
+
+
+def _call_search(function_name: str, context: frappe._dict):
+	filters = {
+		"customer": context.customer,
+		"warehouse": context.warehouse,
+		"company": context.company,
+		"item": context.item_code,
+		"batch_no": context.batch_no,
+	}
+	return getattr(utils, function_name)(
+		doctype="",
+		txt="",
+		searchfield="name",
+		start=0,
+		page_len=20,
+		filters=filters,
+	)
+
+
+def _execute_report(report_name: str, context: frappe._dict):
+	execute = frappe.get_attr(f"{REPORTS_MODULE}.{report_name}.{report_name}.execute")
+	# Time the query, not a report cache hit or the instrumentation wrapper.
+	execute = inspect.unwrap(execute)
+	return execute(
+		{
+			"company": context.company,
+			"customer": context.customer,
+			"batch_no": context.batch_no,
+			"from_date": context.from_date,
+			"to_date": context.to_date,
+			"as_on_date": context.to_date,
+			"from_year": getdate(context.from_date).year,
+			"to_year": getdate(context.to_date).year,
+		}
+	)
+
+
+def _time_submits(dataset: dict, context: frappe._dict, row_count: int) -> dict[str, dict]:
+	"""Insert and submit one ``row_count``-row document of each type on fresh batches."""
+	customer = context.customer
+	source, target = dataset.warehouses[:2]
+	batch_nos = [
+		synthetic_data.ensure_batch(
+			f"{synthetic_data.DATASET_PREFIX}-{dataset.seed}-{row_count}R-{frappe.generate_hash(length=6)}",
+			dataset.item_code,
+			customer,
+		)[0]
+		for _index in range(row_count)
+	]
+	posting_date = nowdate()
+
+	timings = {}
+	for doctype in SUBMIT_DOCTYPES:
+		rows = [{"batch_no": batch_no, "warehouse": source, "qty": 10} for batch_no in batch_nos]
+		if doctype == "Cold Storage Outward":
+			for row in rows:
+				row["qty"] = 2
+		elif doctype == "Cold Storage Transfer":
+			for row in rows:
+				row.update(qty=2, target_warehouse=target)
+
+		doc = synthetic_data.make_document(
+			dataset, doctype, rows, posting_date=posting_date, customer=customer
+		)
+		started = time.perf_counter()
+		doc.insert()
+		inserted = time.perf_counter()
+		doc.submit()
+		submitted = time.perf_counter()
+		timings[doctype] = {
+			"rows": row_count,
+			"insert_ms": round((inserted - started) * 1000, 2),
+			"submit_ms": round((submitted - inserted) * 1000, 2),
+			"p50": round((submitted - started) * 1000, 2),
+		}
+	return timings
+
+
+def _time_call(call: Callable[[], Any], iterations: int) -> dict:
+	latencies: list[float] = []
+	error = None
+	for _iteration in range(iterations):
+		started = time.perf_counter()
+		try:
+			call()
+		except Exception as exc:
+			error = f"{type(exc).__name__}: {exc}"
+			frappe.clear_messages()
+			break
+		latencies.append(time.perf_counter() - started)
+
+	timing = _summarize_latencies(latencies)
+	timing["calls"] = len(latencies)
+	if error:
+		timing["error"] = error
+	return timing
+
+
+def _summarize_latencies(latencies: list[float]) -> dict[str, float]:
+	if not latencies:
+		return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+
+	ordered = sorted(latencies)
+	p95_index = min(int(len(ordered) * 0.95), len(ordered) - 1)
+	return {
+		"p50": round(median(ordered) * 1000, 2),
+		"p95": round(ordered[p95_index] * 1000, 2),
+		"max": round(ordered[-1] * 1000, 2),
+	}
+
+
+def _get_versions() -> dict[str, str]:
+	versions = {"cold_storage": cold_storage.__version__, "frappe": frappe.__version__}
+	try:
+		import erpnext
+
+		versions["erpnext"] = erpnext.__version__
+	except ImportError:
+		pass
+	return versions
+
+
+def _load_timings(path: str) -> dict[str, dict]:
+	with open(path) as handle:
+		return frappe.parse_json(handle.read()).get("timings") or {}
+
+
+def _parse_list(value: str | list | None) -> list:
+	if not value:
+		return []
+	if isinstance(value, str):
+		return [part.strip() for part in value.split(",") if part.strip()]
+	return list(value)
@@ -0,0 +1,266 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Seeded synthetic Cold Storage data for benchmarks.
+
+Needs a configured Cold Storage Settings (company, UOM, accounts, charge configuration)::
+
+	bench --site <site> execute cold_storage.benchmarks.synthetic_data.generate \\
+		--kwargs "{'customers': 50, 'batches': 2000, 'warehouses': 6, 'years': 3, 'seed': 7}"
+
+The same ``seed`` always yields the same customers, batches, quantities and posting dates, and
+documents are named after the seed so a dataset is only generated once per site. Movements are
+submitted in posting-date order so no backdated stock reposting is triggered.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Final
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, getdate, nowdate
+
+from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+	get_default_company,
+)
+
+DATASET_PREFIX: Final[str] = "CS-BENCH"
+COMMIT_EVERY: Final[int] = 100
+MIN_INWARD_QTY: Final[int] = 50
+MAX_INWARD_QTY: Final[int] = 500
+# Relative weights of the movements that follow a batch's inward.
+MOVEMENT_WEIGHTS: Final[dict[str, int]] = {"Outward": 3, "Transfer": 1}
+
+
+def generate(
+	customers: int = 20,
+	batches: int = 200,
+	warehouses: int = 4,
+	years: int = 2,
+	movements_per_batch: int = 4,
+	seed: int = 42,
+) -> dict:
+	"""Create the dataset for ``seed`` (if missing) and return its names and document counts."""
+	customers = max(cint(customers), 1)
+	batches = max(cint(batches), 1)
+	warehouses = max(cint(warehouses), 1)
+	years = max(cint(years), 1)
+	movements_per_batch = max(cint(movements_per_batch), 0)
+	seed = cint(seed)
+
+	settings = frappe.get_single("Cold Storage Settings")
+	company = get_default_company()
+	if not company or not settings.default_uom:
+		frappe.throw(_("Configure Company and Default UOM in Cold Storage Settings before generating data"))
+
+	rng = random.Random(seed)
+	prefix = f"{DATASET_PREFIX}-{seed}"
+	item_code, item_group = _ensure_item(prefix, settings)
+	dataset = frappe._dict(
+		seed=seed,
+		company=company,
+		item_code=item_code,
+		item_group=item_group,
+		uom=settings.default_uom,
+		customers=[_ensure_customer(f"{prefix} Customer {index:04d}") for index in range(1, customers + 1)],
+		warehouses=[
+			_ensure_warehouse(f"{prefix} WH {index:02d}", company) for index in range(1, warehouses + 1)
+		],
+	)
+	dataset.batches = [
+		ensure_batch(f"{prefix}-B{index:06d}", item_code, rng.choice(dataset.customers))
+		for index in range(1, batches + 1)
+	]
+	frappe.db.commit()
+
+	counts = {"Cold Storage Inward": 0, "Cold Storage Outward": 0, "Cold Storage Transfer": 0}
+	if not frappe.db.exists("Cold Storage Inward", {"remarks": prefix, "docstatus": 1}):
+		events = plan_movements(rng, dataset, years=years, movements_per_batch=movements_per_batch)
+		for index, event in enumerate(events, start=1):
+			doc = _make_document(dataset, event, remarks=prefix)
+			doc.insert()
+			doc.submit()
+			counts[doc.doctype] += 1
+			if index % COMMIT_EVERY == 0:
+				frappe.db.commit()
+		frappe.db.commit()
+
+	dataset.documents = counts
+	return dataset
+
+
+def plan_movements(
+	rng: random.Random, dataset: dict, *, years: int, movements_per_batch: int, today=None
+) -> list[dict]:
+	"""Inward/Outward/Transfer events for every batch, sorted by posting date.
+
+	Each batch is received once and then moved ``movements_per_batch`` times on later dates,
+	never taking more than the batch holds in the source warehouse.
+	"""
+	today = getdate(today or nowdate())
+	span_days = years * 365
+	events = []
+	for batch_no, customer in dataset["batches"]:
+		posting_date = add_days(today, -rng.randint(movements_per_batch + 1, span_days))
+		warehouse = rng.choice(dataset["warehouses"])
+		qty = rng.randint(MIN_INWARD_QTY, MAX_INWARD_QTY)
+		balances = {warehouse: qty}
+		events.append(
+			{
+				"doctype": "Cold Storage Inward",
+				"posting_date": posting_date,
+				"customer": customer,
+				"batch_no": batch_no,
+				"warehouse": warehouse,
+				"qty": qty,
+			}
+		)
+
+		remaining_days = (today - getdate(posting_date)).days
+		for step in range(movements_per_batch):
+			stocked = [(name, balance) for name, balance in balances.items() if balance > 1]
+			if not stocked or remaining_days <= movements_per_batch - step:
+				break
+			posting_date = add_days(
+				posting_date, rng.randint(1, max(remaining_days // (movements_per_batch - step), 1))
+			)
+			remaining_days = (today - getdate(posting_date)).days
+			source, balance = rng.choice(stocked)
+			qty = rng.randint(1, balance // 2 or 1)
+			kind = rng.choices(list(MOVEMENT_WEIGHTS), weights=list(MOVEMENT_WEIGHTS.values()))[0]
+			targets = [name for name in dataset["warehouses"] if name != source]
+			if kind == "Transfer" and targets:
+				target = rng.choice(targets)
+				balances[target] = balances.get(target, 0) + qty
+				events.append(
+					{
+						"doctype": "Cold Storage Transfer",
+						"posting_date": posting_date,
+						"customer": customer,
+						"batch_no": batch_no,
+						"warehouse": source,
+						"target_warehouse": target,
+						"qty": qty,
+					}
+				)
+			else:
+				events.append(
+					{
+						"doctype": "Cold Storage Outward",
+						"posting_date": posting_date,
+						"customer": customer,
+						"batch_no": batch_no,
+						"warehouse": source,
+						"qty": qty,
+					}
+				)
+			balances[source] = balance - qty
+
+	# Stable sort keeps a batch's same-day events in the order they were planned.
+	return sorted(events, key=lambda event: getdate(event["posting_date"]))
+
+
+def make_document(dataset: dict, doctype: str, rows: list[dict], **values):
+	"""Unsaved ``doctype`` with one item row per ``{batch_no, warehouse, qty[, target_warehouse]}``."""
+	doc = {
+		"doctype": doctype,
+		"company": dataset["company"],
+		"posting_date": values.pop("posting_date", None) or nowdate(),
+		**values,
+	}
+	items = []
+	for row in rows:
+		item = {
+			"item": dataset["item_code"],
+			"item_group": dataset["item_group"],
+			"batch_no": row["batch_no"],
+			"qty": row["qty"],
+			"uom": dataset["uom"],
+		}
+		if doctype == "Cold Storage Transfer":
+			item["source_warehouse"] = row["warehouse"]
+			item["target_warehouse"] = row.get("target_warehouse")
+		else:
+			item["warehouse"] = row["warehouse"]
+		items.append(item)
+	doc["items"] = items
+	if doctype == "Cold Storage Transfer":
+		doc.setdefault("transfer_type", "Inter-Warehouse Transfer")
+	return frappe.get_doc(doc)
+
+
+def _make_document(dataset: dict, event: dict, remarks: str):
+	return make_document(
+		dataset,
+		event["doctype"],
+		[event],
+		posting_date=event["posting_date"],
+		customer=event["customer"],
+		remarks=remarks,
+	)
+
+
+def _ensure_item(prefix: str, settings) -> tuple[str, str]:
+	item_code = f"{prefix}-ITEM"
+	item_group = next(
+		(row.item_group for row in settings.get("charge_configurations") or [] if row.item_group),
+		"Products",
+	)
+	if not frappe.db.exists("Item", item_code):
+		frappe.get_doc(
+			{
+				"doctype": "Item",
+				"item_code": item_code,
+				"item_name": item_code,
+				"item_group": item_group,
+				"stock_uom": settings.default_uom,
+				"is_stock_item": 1,
+				"has_batch_no": 1,
+			}
+		).insert()
+	return item_code, item_group
+
+
+def _ensure_customer(customer_name: str) -> str:
+	if frappe.db.exists("Customer", customer_name):
+		return customer_name
+
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Customer",
+				"customer_name": customer_name,
+				"customer_type": "Individual",
+				"customer_group": frappe.db.get_value("Customer Group", {"is_group": 0}, "name"),
+				"territory": frappe.db.get_value("Territory", {"is_group": 0}, "name"),
+			}
+		)
+		.insert()
+		.name
+	)
+
+
+def _ensure_warehouse(warehouse_name: str, company: str) -> str:
+	existing = frappe.db.get_value("Warehouse", {"warehouse_name": warehouse_name, "company": company})
+	if existing:
+		return existing
+
+	return (
+		frappe.get_doc({"doctype": "Warehouse", "warehouse_name": warehouse_name, "company": company})
+		.insert()
+		.name
+	)
+
+
+def ensure_batch(batch_id: str, item_code: str, customer: str) -> tuple[str, str]:
+	"""Return ``(batch_no, customer)``; an existing batch keeps the customer it was created with."""
+	existing = frappe.db.get_value("Batch", batch_id, "custom_customer")
+	if existing:
+		return batch_id, existing
+
+	frappe.get_doc(
+		{"doctype": "Batch", "batch_id": batch_id, "item": item_code, "custom_customer": customer}
+	).insert()
+	return batch_id, customer
@@ -0,0 +1,212 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""End-to-end WhatsApp notification throughput benchmark.
+
+Run against a local Meta stand-in (never the live Graph API)::
+
+	bench --site <site> execute cold_storage.benchmarks.whatsapp_throughput.run \\
+		--kwargs "{'count': 500, 'mode': 'enqueue', 'latency_ms': 80, 'rate_limit_ratio': 0.02}"
+
+``mode="send"`` calls the send path inline in this process. ``mode="enqueue"`` goes through
+``enqueue_document_whatsapp_notification`` and measures until background workers have
+delivered every message to the stand-in, read from the stand-in's ``/stats`` counters.
+
+When nothing listens on the configured base URL, an embedded stand-in is started on that
+address for the run (``start_stub`` defaults to this); when the standalone stand-in is
+already running there, it is used as is and the latency/ratio arguments do not apply.
+"""
+
+from __future__ import annotations
+
+import socket
+import time
+from collections.abc import Callable
+from functools import partial
+from itertools import cycle, islice
+from statistics import median
+from urllib.parse import urlsplit
+
+import frappe
+from frappe import _
+from frappe.integrations.utils import make_get_request
+from frappe.utils import cint, flt
+
+from cold_storage.cold_storage.integrations import whatsapp
+from cold_storage.cold_storage.integrations.meta_cloud_api_stub import STATS_PATH, MetaCloudAPIStub
+
+BENCHMARK_MODES = ("send", "enqueue")
+STUB_STAT_KEYS = ("requests", "accepted", "rate_limited", "errors", "rejected")
+
+
+def run(
+	count: int = 100,
+	mode: str = "send",
+	doctype: str = "Cold Storage Inward",
+	latency_ms: float = 0.0,
+	rate_limit_ratio: float = 0.0,
+	error_ratio: float = 0.0,
+	start_stub: int | None = None,
+	timeout: int = 300,
+) -> dict:
+	"""Send ``count`` notifications for submitted documents and report notifications per second."""
+	count = max(cint(count), 1)
+	if mode not in BENCHMARK_MODES:
+		frappe.throw(_("Mode must be one of: {0}").format(", ".join(BENCHMARK_MODES)))
+	if doctype not in whatsapp.SUPPORTED_DOCTYPES:
+		frappe.throw(_("Unsupported doctype for WhatsApp notification: {0}").format(doctype))
+
+	settings = whatsapp._get_enabled_settings(raise_if_disabled=True)
+	base_url = whatsapp._get_api_base_url(settings)
+	if base_url == whatsapp.META_GRAPH_BASE_URL:
+		frappe.throw(_("Point Meta Graph API Base URL in Cold Storage Settings at a local stand-in first"))
+
+	docnames = frappe.get_all(
+		doctype,
+		filters={"docstatus": 1, "company": settings["company"]},
+		pluck="name",
+		order_by="creation desc",
+		limit=count,
+	)
+	if not docnames:
+		frappe.throw(_("No submitted {0} documents found to benchmark").format(doctype))
+	docnames = list(islice(cycle(docnames), count))
+
+	parsed = urlsplit(base_url)
+	host, port = parsed.hostname or "127.0.0.1", parsed.port or 80
+	if start_stub is None:
+		start_stub = 0 if _is_listening(host, port) else 1
+
+	stub = None
+	if cint(start_stub):
+		try:
+			stub = MetaCloudAPIStub(
+				host,
+				port,
+				latency_ms=flt(latency_ms),
+				rate_limit_ratio=flt(rate_limit_ratio),
+				error_ratio=flt(error_ratio),
+			).start()
+		except OSError as exc:
+			frappe.throw(
+				_(
+					"Could not start the embedded stand-in on {0}: {1}. Leave start_stub unset to reuse it"
+				).format(base_url, exc)
+			)
+		read_stats = stub.get_stats
+	else:
+		read_stats = partial(_get_remote_stats, base_url)
+	baseline = read_stats()
+
+	def read_run_stats() -> dict[str, int]:
+		current = read_stats()
+		return {key: cint(current.get(key)) - cint(baseline.get(key)) for key in STUB_STAT_KEYS}
+
+	stub_stats = None
+	try:
+		if mode == "send":
+			result = _run_inline(doctype, docnames)
+		else:
+			result = _run_enqueued(doctype, docnames, read_run_stats, cint(timeout))
+		stub_stats = read_run_stats()
+	finally:
+		if stub:
+			stub.stop()
+
+	result.update(
+		{
+			"mode": mode,
+			"doctype": doctype,
+			"count": count,
+			"distinct_documents": len(set(docnames)),
+			"base_url": base_url,
+			"embedded_stub": bool(stub),
+			"stub": stub_stats,
+		}
+	)
+	return result
+
+
+def _run_inline(doctype: str, docnames: list[str]) -> dict:
+	outcomes = {"sent": 0, "skipped": 0, "rate_limited": 0, "failed": 0}
+	latencies: list[float] = []
+
+	started = time.perf_counter()
+	for docname in docnames:
+		call_started = time.perf_counter()
+		try:
+			response = whatsapp.send_document_whatsapp_notification(
+				doctype=doctype,
+				docname=docname,
+				raise_exceptions=True,
+			)
+			outcomes["sent" if response else "skipped"] += 1
+		except Exception as exc:
+			status_code = getattr(getattr(exc, "response", None), "status_code", None)
+			outcomes["rate_limited" if status_code == 429 else "failed"] += 1
+		latencies.append(time.perf_counter() - call_started)
+	elapsed = time.perf_counter() - started
+
+	return {
+		"elapsed_seconds": round(elapsed, 4),
+		"notifications_per_second": round(outcomes["sent"] / elapsed, 2) if elapsed else 0.0,
+		"outcomes": outcomes,
+		"latency_ms": _summarize_latencies(latencies),
+	}
+
+
+def _run_enqueued(
+	doctype: str, docnames: list[str], read_stats: Callable[[], dict[str, int]], timeout: int
+) -> dict:
+	started = time.perf_counter()
+	for docname in docnames:
+		whatsapp.enqueue_document_whatsapp_notification(doctype, docname)
+	# Jobs are enqueued after commit, mirroring the on_submit path.
+	frappe.db.commit()
+	enqueued = time.perf_counter()
+
+	deadline = started + max(timeout, 1)
+	stats = read_stats()
+	while stats["requests"] < len(docnames) and time.perf_counter() < deadline:
+		time.sleep(0.05)
+		stats = read_stats()
+	elapsed = time.perf_counter() - started
+
+	return {
+		"elapsed_seconds": round(elapsed, 4),
+		"enqueue_seconds": round(enqueued - started, 4),
+		"timed_out": stats["requests"] < len(docnames),
+		"notifications_per_second": round(stats["accepted"] / elapsed, 2) if elapsed else 0.0,
+		"outcomes": {
+			"sent": stats["accepted"],
+			"rate_limited": stats["rate_limited"],
+			"failed": stats["errors"] + stats["rejected"],
+			"pending": max(len(docnames) - stats["requests"], 0),
+		},
+	}
+
+
+def _is_listening(host: str, port: int) -> bool:
+	try:
+		with socket.create_connection((host, port), timeout=1):
+			return True
+	except OSError:
+		return False
+
+
+def _get_remote_stats(base_url: str) -> dict[str, int]:
+	"""Read the request counters of a stand-in running in another process."""
+	return make_get_request(f"{base_url.rstrip('/')}{STATS_PATH}")
+
+
+def _summarize_latencies(latencies: list[float]) -> dict[str, float]:
+	if not latencies:
+		return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+
+	ordered = sorted(latencies)
+	p95_index = min(int(len(ordered) * 0.95), len(ordered) - 1)
+	return {
+		"p50": round(median(ordered) * 1000, 2),
+		"p95": round(ordered[p95_index] * 1000, 2),
+		"max": round(ordered[-1] * 1000, 2),
+	}
@@ -0,0 +1,313 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Batch balances behind one provider interface.
+
+``ERPNextBatchBalanceProvider`` is used wherever a wrong balance would let stock go negative
+(Outward/Transfer validation). Single-batch lookups ask ERPNext's ``get_batch_qty(batch_no=...)``;
+batched lookups for one item and warehouse aggregate the ledger in one query with the same
+per-batch semantics, because ``get_batch_qty(item_code=...)`` drops expired and reserved batches.
+``LedgerBatchBalanceProvider`` runs that aggregation for search and portal lookups. Both count
+``Stock Ledger Entry.batch_no`` rows and Serial and Batch Bundle rows and skip cancelled entries;
+``check_balance_consistency`` diffs ERPNext's per-batch balances against the ledger aggregation.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Final
+
+import frappe
+from frappe.utils import flt
+
+QTY_PRECISION: Final[int] = 3
+CONSISTENCY_CHUNK_SIZE: Final[int] = 500
+
+# Batch-wise stock from both the legacy SLE.batch_no column and Serial and Batch Bundles.
+BATCH_LEDGER_SQL: Final[str] = """
+	select
+		sle.item_code,
+		sle.batch_no,
+		sle.warehouse,
+		sle.actual_qty as qty
+	from `tabStock Ledger Entry` sle
+	where sle.is_cancelled = 0
+		and ifnull(sle.batch_no, '') != ''
+		{sle_conditions}
+
+	union all
+
+	select
+		sle.item_code,
+		sbe.batch_no,
+		sle.warehouse,
+		sbe.qty as qty
+	from `tabStock Ledger Entry` sle
+	inner join `tabSerial and Batch Entry` sbe
+		on sbe.parent = sle.serial_and_batch_bundle
+	where sle.is_cancelled = 0
+		and ifnull(sle.batch_no, '') = ''
+		and ifnull(sle.serial_and_batch_bundle, '') != ''
+		and ifnull(sbe.batch_no, '') != ''
+		and ifnull(sbe.is_cancelled, 0) = 0
+		{bundle_conditions}
+"""
+
+
+def get_batch_ledger_sql(
+	*, item_code: bool = False, warehouse: bool = False, batch_nos: bool = False, company: bool = False
+) -> str:
+	"""``BATCH_LEDGER_SQL`` with optional ``%(item_code)s``/``%(warehouse)s``/``%(batch_nos)s``/
+	``%(company)s`` filters.
+
+	The filters go inside both branches so each can use the ledger's indexes.
+	"""
+	sle_conditions = []
+	bundle_conditions = []
+	if item_code:
+		sle_conditions.append("and sle.item_code = %(item_code)s")
+		bundle_conditions.append("and sle.item_code = %(item_code)s")
+	if warehouse:
+		sle_conditions.append("and sle.warehouse = %(warehouse)s")
+		bundle_conditions.append("and sle.warehouse = %(warehouse)s")
+	if batch_nos:
+		sle_conditions.append("and sle.batch_no in %(batch_nos)s")
+		bundle_conditions.append("and sbe.batch_no in %(batch_nos)s")
+	if company:
+		sle_conditions.append("and sle.company = %(company)s")
+		bundle_conditions.append("and sle.company = %(company)s")
+	return BATCH_LEDGER_SQL.format(
+		sle_conditions="\n\t\t".join(sle_conditions),
+		bundle_conditions="\n\t\t".join(bundle_conditions),
+	)
+
+
+class BatchBalanceProvider(ABC):
+	"""Interface for batch balances per warehouse."""
+
+	name: str = ""
+
+	@abstractmethod
+	def get_balance(self, batch_no: str, warehouse: str) -> float:
+		"""Available quantity of one batch in one warehouse."""
+
+	@abstractmethod
+	def get_balances(
+		self,
+		*,
+		customer: str | None = None,
+		company: str | None = None,
+		warehouse: str | None = None,
+		item_code: str | None = None,
+		batch_nos: list[str] | None = None,
+	) -> list[frappe._dict]:
+		"""Non-zero ``{batch_no, item_code, warehouse, qty}`` rows matching the filters."""
+
+	def get_warehouse_balances(self, item_code: str, warehouse: str) -> dict[str, float]:
+		"""Balance per batch of one item in one warehouse."""
+		return sum_balances_by(self.get_balances(item_code=item_code, warehouse=warehouse), "batch_no")
+
+
+class ERPNextBatchBalanceProvider(BatchBalanceProvider):
+	"""Strict balances with the per-batch semantics of ERPNext's ``get_batch_qty(batch_no=...)``.
+
+	``get_balance`` and ``get_balances`` call ERPNext once per batch; ``get_warehouse_balances``
+	reads every batch of the item from one ledger aggregation.
+	"""
+
+	name = "erpnext"
+
+	def get_balance(self, batch_no: str, warehouse: str) -> float:
+		from erpnext.stock.doctype.batch.batch import get_batch_qty
+
+		return flt(get_batch_qty(batch_no=batch_no, warehouse=warehouse))
+
+	def get_warehouse_balances(self, item_code: str, warehouse: str) -> dict[str, float]:
+		# get_batch_qty(item_code=...) goes through get_auto_batch_nos, which drops expired and
+		# disabled batches and subtracts reservations. Keep the per-batch ledger semantics of
+		# get_batch_qty(batch_no=...) and read every batch of the item in one aggregation.
+		return LedgerBatchBalanceProvider().get_warehouse_balances(item_code, warehouse)
+
+	def get_balances(
+		self,
+		*,
+		customer: str | None = None,
+		company: str | None = None,
+		warehouse: str | None = None,
+		item_code: str | None = None,
+		batch_nos: list[str] | None = None,
+	) -> list[frappe._dict]:
+		from erpnext.stock.doctype.batch.batch import get_batch_qty
+
+		filters = {}
+		if customer:
+			filters["custom_customer"] = customer
+		if item_code:
+			filters["item"] = item_code
+		if batch_nos is not None:
+			filters["name"] = ["in", batch_nos or [""]]
+		batches = frappe.get_all("Batch", filters=filters, fields=["name", "item"], order_by="name asc")
+
+		company_by_warehouse = {}
+		if company:
+			company_by_warehouse = dict(frappe.get_all("Warehouse", fields=["name", "company"], as_list=True))
+
+		rows = []
+		for batch in batches:
+			for balance in get_batch_qty(batch_no=batch.name) or []:
+				qty = flt(balance.get("qty"), QTY_PRECISION)
+				row_warehouse = balance.get("warehouse")
+				if not qty or (warehouse and row_warehouse != warehouse):
+					continue
+				if company and company_by_warehouse.get(row_warehouse) != company:
+					continue
+				rows.append(
+					frappe._dict(batch_no=batch.name, item_code=batch.item, warehouse=row_warehouse, qty=qty)
+				)
+		return rows
+
+
+class LedgerBatchBalanceProvider(BatchBalanceProvider):
+	"""Fast balances from one aggregation over ``BATCH_LEDGER_SQL``."""
+
+	name = "ledger"
+
+	def get_balance(self, batch_no: str, warehouse: str) -> float:
+		rows = self.get_balances(warehouse=warehouse, batch_nos=[batch_no])
+		return flt(sum(row.qty for row in rows), QTY_PRECISION)
+
+	def get_balances(
+		self,
+		*,
+		customer: str | None = None,
+		company: str | None = None,
+		warehouse: str | None = None,
+		item_code: str | None = None,
+		batch_nos: list[str] | None = None,
+	) -> list[frappe._dict]:
+		if batch_nos is not None and not batch_nos:
+			return []
+
+		conditions = []
+		if customer:
+			conditions.append("batch.custom_customer = %(customer)s")
+		if company:
+			conditions.append(
+				"exists (select 1 from `tabWarehouse` w"
+				" where w.name = stock.warehouse and w.company = %(company)s)"
+			)
+		ledger_sql = get_batch_ledger_sql(
+			item_code=bool(item_code), warehouse=bool(warehouse), batch_nos=batch_nos is not None
+		)
+
+		rows = frappe.db.sql(
+			f"""
+			select
+				stock.batch_no,
+				stock.item_code,
+				stock.warehouse,
+				round(sum(stock.qty), {QTY_PRECISION}) as qty
+			from ({ledger_sql}) stock
+			inner join `tabBatch` batch on batch.name = stock.batch_no
+			{"where " + " and ".join(conditions) if conditions else ""}
+			group by stock.batch_no, stock.item_code, stock.warehouse
+			having round(sum(stock.qty), {QTY_PRECISION}) != 0
+			order by stock.batch_no, stock.warehouse
+			""",
+			{
+				"customer": customer,
+				"company": company,
+				"warehouse": warehouse,
+				"item_code": item_code,
+				"batch_nos": tuple(batch_nos or ()),
+			},
+			as_dict=True,
+		)
+		for row in rows:
+			row.qty = flt(row.qty, QTY_PRECISION)
+		return rows
+
+
+BALANCE_PROVIDERS: Final[dict[str, type[BatchBalanceProvider]]] = {
+	ERPNextBatchBalanceProvider.name: ERPNextBatchBalanceProvider,
+	LedgerBatchBalanceProvider.name: LedgerBatchBalanceProvider,
+}
+
+
+def get_balance_provider(strict: bool = False) -> BatchBalanceProvider:
+	"""Return the ERPNext provider for ``strict`` callers, else the site's fast provider.
+
+	The fast provider defaults to ``ledger`` and can be switched with the
+	``cold_storage_balance_provider`` site config key.
+	"""
+	if strict:
+		return ERPNextBatchBalanceProvider()
+	name = frappe.conf.get("cold_storage_balance_provider") or LedgerBatchBalanceProvider.name
+	return BALANCE_PROVIDERS.get(name, LedgerBatchBalanceProvider)()
+
+
+def sum_balances_by(balances: list[dict], key: str) -> dict[str, float]:
+	"""Total balance per ``key`` (e.g. ``item_code``, ``batch_no``, ``warehouse``)."""
+	totals: dict[str, float] = {}
+	for row in balances:
+		totals[row[key]] = flt(totals.get(row[key], 0.0) + flt(row["qty"]), QTY_PRECISION)
+	return totals
+
+
+def check_balance_consistency(
+	batch_nos: list[str] | None = None, chunk_size: int = CONSISTENCY_CHUNK_SIZE
+) -> dict:
+	"""Diff ERPNext's per-batch balances against the ledger aggregation across all batches
+	(or ``batch_nos``).
+
+	The ledger aggregation serves fast lookups and batched strict validation, so it is checked
+	against ``get_batch_qty`` regardless of the site's configured fast provider.
+
+	Run with ``bench --site <site> execute``
+	``cold_storage.cold_storage.batch_balances.check_balance_consistency``.
+	"""
+	strict = ERPNextBatchBalanceProvider()
+	fast = LedgerBatchBalanceProvider()
+	if batch_nos is None:
+		batch_nos = frappe.get_all("Batch", pluck="name", order_by="name asc")
+
+	mismatches = []
+	for start in range(0, len(batch_nos), chunk_size):
+		chunk = batch_nos[start : start + chunk_size]
+		mismatches.extend(
+			diff_balances(strict.get_balances(batch_nos=chunk), fast.get_balances(batch_nos=chunk))
+		)
+
+	return {
+		"strict_provider": strict.name,
+		"fast_provider": fast.name,
+		"batches_checked": len(batch_nos),
+		"mismatches": mismatches,
+	}
+
+
+def diff_balances(strict_rows: list[dict], fast_rows: list[dict]) -> list[dict]:
+	"""``{batch_no, warehouse, strict_qty, fast_qty}`` for every (batch, warehouse) that differs."""
+	strict_qty = _index_qty(strict_rows)
+	fast_qty = _index_qty(fast_rows)
+	return [
+		{
+			"batch_no": batch_no,
+			"warehouse": warehouse,
+			"strict_qty": strict_qty.get((batch_no, warehouse), 0.0),
+			"fast_qty": fast_qty.get((batch_no, warehouse), 0.0),
+		}
+		for batch_no, warehouse in sorted(set(strict_qty) | set(fast_qty))
+		if flt(
+			strict_qty.get((batch_no, warehouse), 0.0) - fast_qty.get((batch_no, warehouse), 0.0),
+			QTY_PRECISION,
+		)
+	]
+
+
+def _index_qty(rows: list[dict]) -> dict[tuple[str, str], float]:
+	qty_by_key: dict[tuple[str, str], float] = {}
+	for row in rows:
+		key = (row["batch_no"], row["warehouse"])
+		qty_by_key[key] = flt(qty_by_key.get(key, 0.0) + flt(row["qty"]), QTY_PRECISION)
+	return qty_by_key
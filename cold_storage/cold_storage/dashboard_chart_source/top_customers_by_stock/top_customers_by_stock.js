@@ -0,0 +1,13 @@
+frappe.provide("frappe.dashboards.chart_sources");
+
+frappe.dashboards.chart_sources["Top Customers By Stock"] = {
+	method: "cold_storage.cold_storage.dashboard_chart_source.top_customers_by_stock.top_customers_by_stock.get",
+	filters: [
+		{
+			fieldname: "company",
+			label: __("Company"),
+			fieldtype: "Link",
+			options: "Company",
+		},
+	],
+};
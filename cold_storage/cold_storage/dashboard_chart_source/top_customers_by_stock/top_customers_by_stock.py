@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt
+
+from cold_storage.cold_storage.report_cache import REPORT_CACHE_TTL, get_movement_epoch
+
+TOP_CUSTOMERS_CACHE_KEY_PREFIX = "cold_storage:top_customers_by_stock"
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 50
+
+
+@frappe.whitelist()
+def get(
+	chart_name=None,
+	chart=None,
+	no_cache=None,
+	filters=None,
+	from_date=None,
+	to_date=None,
+	timespan=None,
+	time_interval=None,
+	heatmap_year=None,
+):
+	del chart_name, chart, no_cache, from_date, to_date, timespan, time_interval, heatmap_year
+
+	filters = frappe.parse_json(filters) or {}
+	if not isinstance(filters, dict):
+		filters = {}
+	rows = get_top_customers(company=filters.get("company"))
+	return {
+		"labels": [row["customer"] for row in rows],
+		"datasets": [{"name": _("Available Stock Qty"), "values": [row["qty"] for row in rows]}],
+	}
+
+
+@frappe.whitelist()
+def get_top_customers(company: str | None = None, limit: int | None = None) -> list[dict]:
+	"""Customers holding the most stock, from the daily movement aggregate.
+
+	Cached per movement epoch, so repeated desk navigation costs one Redis read until a
+	movement is submitted or cancelled.
+	"""
+	frappe.has_permission("Customer", "read", throw=True)
+	company = company or ""
+	limit = min(max(cint(limit) or DEFAULT_LIMIT, 1), MAX_LIMIT)
+
+	cache_key = f"{TOP_CUSTOMERS_CACHE_KEY_PREFIX}:{get_movement_epoch()}:{company}:{limit}"
+	rows = frappe.cache.get_value(cache_key)
+	if rows is None:
+		rows = _get_top_customers(company, limit)
+		frappe.cache.set_value(cache_key, rows, expires_in_sec=REPORT_CACHE_TTL)
+	return rows
+
+
+def _get_top_customers(company: str, limit: int) -> list[dict]:
+	# Intra-customer transfers only move stock between warehouses, so they do not change the total.
+	rows = frappe.db.sql(
+		"""
+		select
+			dm.customer,
+			sum(
+				case
+					when dm.movement_type in ('Inward', 'Transfer In') then dm.qty
+					when dm.movement_type in ('Outward', 'Transfer Out') then -dm.qty
+					else 0
+				end
+			) as qty
+		from `tabCold Storage Daily Movement` dm
+		where ifnull(dm.customer, '') != ''
+			and (%(company)s = '' or dm.company = %(company)s)
+		group by dm.customer
+		having round(qty, 3) > 0
+		order by qty desc, dm.customer asc
+		limit %(limit)s
+		""",
+		{"company": company, "limit": limit},
+		as_dict=True,
+	)
+	return [{"customer": row.customer, "qty": flt(row.qty, 3)} for row in rows]
@@ -5,6 +5,8 @@ from frappe import _
 from frappe.utils import cint, flt, getdate
 from frappe.utils.dashboard import cache_source
 
+from cold_storage.cold_storage.date_ranges import fold_by_month, get_year_bounds
+
 
 def _normalize_filters(filters):
 	"""Support both dict filters and legacy list-based filters."""
@@ -66,52 +68,27 @@ def get(
 	if from_year and to_year and from_year > to_year:
 		from_year, to_year = to_year, from_year
 
+	from_date, to_date = get_year_bounds(from_year, to_year)
 	rows = frappe.db.sql(
 		"""
 		select
-			monthly.year_num as year_num,
-			monthly.month_num as month_num,
-			sum(monthly.inward_qty) as inward_qty,
-			sum(monthly.outward_qty) as outward_qty
-		from (
-			select
-				year(ci.posting_date) as year_num,
-				month(ci.posting_date) as month_num,
-				sum(ci.total_qty) as inward_qty,
-				0 as outward_qty
-			from `tabCold Storage Inward` ci
-			where ci.docstatus = 1
-				and ci.posting_date is not null
-				and (%(company)s = '' or ci.company = %(company)s)
-				and (%(from_year)s = 0 or year(ci.posting_date) >= %(from_year)s)
-				and (%(to_year)s = 0 or year(ci.posting_date) <= %(to_year)s)
-			group by year(ci.posting_date), month(ci.posting_date)
-
-			union all
-
-			select
-				year(co.posting_date) as year_num,
-				month(co.posting_date) as month_num,
-				0 as inward_qty,
-				sum(co.total_qty) as outward_qty
-			from `tabCold Storage Outward` co
-			where co.docstatus = 1
-				and co.posting_date is not null
-				and (%(company)s = '' or co.company = %(company)s)
-				and (%(from_year)s = 0 or year(co.posting_date) >= %(from_year)s)
-				and (%(to_year)s = 0 or year(co.posting_date) <= %(to_year)s)
-			group by year(co.posting_date), month(co.posting_date)
-		) monthly
-		group by monthly.year_num, monthly.month_num
-		order by monthly.year_num, monthly.month_num
+			dm.posting_date,
+			sum(case when dm.movement_type = 'Inward' then dm.qty else 0 end) as inward_qty,
+			sum(case when dm.movement_type = 'Outward' then dm.qty else 0 end) as outward_qty
+		from `tabCold Storage Daily Movement` dm
+		where dm.posting_date between %(from_date)s and %(to_date)s
+			and dm.movement_type in ('Inward', 'Outward')
+			and (%(company)s = '' or dm.company = %(company)s)
+		group by dm.posting_date
 		""",
 		{
 			"company": company,
-			"from_year": from_year,
-			"to_year": to_year,
+			"from_date": from_date,
+			"to_date": to_date,
 		},
 		as_dict=True,
 	)
+	monthly_totals = fold_by_month(rows, ("inward_qty", "outward_qty"))
 
 	if from_year and not to_year:
 		to_year = from_year
@@ -119,7 +96,7 @@ def get(
 		from_year = to_year
 
 	if not from_year and not to_year:
-		years_in_data = [cint(row.year_num) for row in rows if row.year_num is not None]
+		years_in_data = [year for (year, _month) in monthly_totals]
 		if years_in_data:
 			from_year = min(years_in_data)
 			to_year = max(years_in_data)
@@ -128,17 +105,6 @@ def get(
 			from_year = current_year
 			to_year = current_year
 
-	monthly_totals = {}
-	for row in rows:
-		year = cint(row.year_num)
-		month = cint(row.month_num)
-		if not year or not month:
-			continue
-		monthly_totals[(year, month)] = {
-			"inward_qty": flt(row.inward_qty),
-			"outward_qty": flt(row.outward_qty),
-		}
-
 	labels = []
 	inward_values = []
 	outward_values = []
@@ -0,0 +1,54 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Turn year/month report filters into index-friendly ``posting_date`` bounds.
+
+Reports filter with ``posting_date between %(from_date)s and %(to_date)s`` and group by
+``posting_date``; the per-month rollup happens in Python with :func:`fold_by_month`
+instead of ``year()``/``month()`` wrappers that defeat the posting_date indexes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from datetime import date
+from typing import Any, Final
+
+from frappe.utils import cint, flt, getdate
+
+MIN_POSTING_DATE: Final[date] = date(1900, 1, 1)
+MAX_POSTING_DATE: Final[date] = date(2999, 12, 31)
+
+
+def get_year_bounds(
+	from_year: int | str | None = None, to_year: int | str | None = None
+) -> tuple[date, date]:
+	"""Return (first day of ``from_year``, last day of ``to_year``); an unset end stays open."""
+	from_year = cint(from_year)
+	to_year = cint(to_year)
+	return (
+		date(from_year, 1, 1) if from_year else MIN_POSTING_DATE,
+		date(to_year, 12, 31) if to_year else MAX_POSTING_DATE,
+	)
+
+
+def fold_by_month(
+	rows: Iterable[Any],
+	value_fields: Sequence[str],
+	key_fields: Sequence[str] = (),
+	date_field: str = "posting_date",
+) -> dict[tuple, dict[str, float]]:
+	"""Sum per-day rows into ``{(*key_fields, year, month): {value_field: total}}``."""
+	totals: dict[tuple, dict[str, float]] = {}
+	for row in rows:
+		posting_date = row.get(date_field)
+		if not posting_date:
+			continue
+		posting_date = getdate(posting_date)
+		key = (*(row.get(fieldname) for fieldname in key_fields), posting_date.year, posting_date.month)
+		bucket = totals.get(key)
+		if bucket is None:
+			bucket = totals[key] = dict.fromkeys(value_fields, 0.0)
+		for fieldname in value_fields:
+			bucket[fieldname] += flt(row.get(fieldname))
+	return totals
@@ -0,0 +1,150 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Current stock per customer-owned batch, for the portal's "Top Batches" chart.
+
+One row per batch with stock (named after the batch, not linked to it, so ownership-transfer
+target batches can still be deleted on cancel). Inward/Outward/Transfer refresh the rows of the
+batches they move on submit and cancel; ``rebuild_batch_ranking`` recomputes every batch from the
+stock ledger. Batches moved by other stock transactions are picked up by their next Cold Storage
+movement or a rebuild.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now
+
+from cold_storage.cold_storage.batch_balances import (
+	QTY_PRECISION,
+	get_balance_provider,
+	get_batch_ledger_sql,
+	sum_balances_by,
+)
+from cold_storage.cold_storage.utils import get_batch_details
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
+DOCTYPE: Final[str] = "Cold Storage Batch Ranking"
+UPSERT_CHUNK_SIZE: Final[int] = 500
+
+
+class ColdStorageBatchRanking(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		customer: DF.Link | None
+		item: DF.Link | None
+		qty: DF.Float
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype(DOCTYPE)
+
+
+def update_batch_ranking(doc: Document) -> None:
+	"""Refresh the batches moved by one Inward/Outward/Transfer."""
+	refresh_batch_ranking(get_document_batch_nos(doc))
+
+
+def get_document_batch_nos(doc: Document) -> list[str]:
+	"""Batches a document moves, including the target batches an ownership transfer created."""
+	batch_nos = {row.get("batch_no") for row in doc.get("items") or [] if row.get("batch_no")}
+	if doc.doctype == "Cold Storage Transfer" and doc.get("transfer_type") == "Ownership Transfer":
+		batch_nos.update(
+			frappe.get_all(
+				"Batch",
+				filters={"reference_doctype": doc.doctype, "reference_name": doc.name},
+				pluck="name",
+			)
+		)
+	return sorted(batch_nos)
+
+
+def refresh_batch_ranking(batch_nos: list[str]) -> None:
+	"""Set the ranked qty of ``batch_nos`` from their current balances; drop batches without stock."""
+	batch_nos = sorted({batch_no for batch_no in batch_nos if batch_no})
+	if not batch_nos:
+		return
+
+	balances = sum_balances_by(get_balance_provider().get_balances(batch_nos=batch_nos), "batch_no")
+	batches = get_batch_details(batch_nos)
+	ranked = []
+	for batch_no in batch_nos:
+		batch = batches.get(batch_no)
+		qty = balances.get(batch_no, 0.0)
+		if batch and batch.custom_customer and qty > 0:
+			ranked.append(
+				{"name": batch_no, "customer": batch.custom_customer, "item": batch.item, "qty": qty}
+			)
+
+	if ranked:
+		_upsert_rankings(ranked)
+	ranked_names = {row["name"] for row in ranked}
+	stale = [batch_no for batch_no in batch_nos if batch_no not in ranked_names]
+	if stale:
+		frappe.db.sql(f"delete from `tab{DOCTYPE}` where name in %(names)s", {"names": tuple(stale)})
+
+
+def rebuild_batch_ranking() -> int:
+	"""Recompute every batch's ranked qty from the stock ledger.
+
+	bench --site <site> execute cold_storage.cold_storage.doctype.cold_storage_batch_ranking.cold_storage_batch_ranking.rebuild_batch_ranking
+	"""
+	frappe.db.sql(f"delete from `tab{DOCTYPE}`")
+	frappe.db.sql(
+		f"""
+		insert into `tab{DOCTYPE}`
+			(name, creation, modified, modified_by, owner, docstatus, idx, customer, item, qty)
+		select
+			stock.batch_no,
+			%(now)s, %(now)s, 'Administrator', 'Administrator', 0, 0,
+			batch.custom_customer,
+			batch.item,
+			round(sum(stock.qty), {QTY_PRECISION})
+		from ({get_batch_ledger_sql()}) stock
+		inner join `tabBatch` batch on batch.name = stock.batch_no
+		where ifnull(batch.custom_customer, '') != ''
+		group by stock.batch_no, batch.custom_customer, batch.item
+		having round(sum(stock.qty), {QTY_PRECISION}) > 0
+		""",
+		{"now": now()},
+	)
+	return frappe.db.count(DOCTYPE)
+
+
+def _upsert_rankings(rows: list[dict[str, Any]]) -> None:
+	timestamp = now()
+	user = frappe.session.user or "Administrator"
+	for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+		chunk = rows[start : start + UPSERT_CHUNK_SIZE]
+		values: list[Any] = []
+		for row in chunk:
+			values.extend(
+				(row["name"], timestamp, timestamp, user, user, row["customer"], row["item"], row["qty"])
+			)
+		placeholders = ", ".join(["(%s, %s, %s, %s, %s, 0, 0, %s, %s, %s)"] * len(chunk))
+		frappe.db.sql(
+			f"""
+			insert into `tab{DOCTYPE}`
+				(name, creation, modified, modified_by, owner, docstatus, idx, customer, item, qty)
+			values {placeholders}
+			on duplicate key update
+				customer = values(customer),
+				item = values(item),
+				qty = values(qty),
+				modified = values(modified),
+				modified_by = values(modified_by)
+			""",
+			values,
+		)
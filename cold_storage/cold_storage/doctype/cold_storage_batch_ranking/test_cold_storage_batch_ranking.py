@@ -0,0 +1,66 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import frappe
+
+from cold_storage.cold_storage.doctype.cold_storage_batch_ranking import (
+	cold_storage_batch_ranking as ranking,
+)
+
+MODULE = "cold_storage.cold_storage.doctype.cold_storage_batch_ranking.cold_storage_batch_ranking"
+
+
+class TestColdStorageBatchRanking(TestCase):
+	def test_refresh_ranks_batches_with_stock_and_drops_the_rest(self):
+		provider = MagicMock()
+		provider.get_balances.return_value = [
+			frappe._dict(batch_no="BATCH-A", item_code="APL", warehouse="WH-1", qty=6.0),
+			frappe._dict(batch_no="BATCH-A", item_code="APL", warehouse="WH-2", qty=4.0),
+		]
+		batches = {
+			"BATCH-A": frappe._dict(name="BATCH-A", item="APL", custom_customer="CUST-A"),
+			"BATCH-B": frappe._dict(name="BATCH-B", item="APL", custom_customer="CUST-A"),
+		}
+		with (
+			patch(f"{MODULE}.get_balance_provider", return_value=provider),
+			patch(f"{MODULE}.get_batch_details", return_value=batches),
+			patch(f"{MODULE}._upsert_rankings") as upsert,
+			patch(f"{MODULE}.frappe.db.sql") as sql,
+		):
+			ranking.refresh_batch_ranking(["BATCH-B", "BATCH-A", "BATCH-A"])
+
+		provider.get_balances.assert_called_once_with(batch_nos=["BATCH-A", "BATCH-B"])
+		upsert.assert_called_once_with(
+			[{"name": "BATCH-A", "customer": "CUST-A", "item": "APL", "qty": 10.0}]
+		)
+		self.assertEqual(sql.call_args.args[1], {"names": ("BATCH-B",)})
+
+	def test_ownership_transfer_includes_generated_target_batches(self):
+		doc = frappe._dict(
+			doctype="Cold Storage Transfer",
+			name="CS-TR-0001",
+			transfer_type="Ownership Transfer",
+			items=[frappe._dict(batch_no="BATCH-A"), frappe._dict(batch_no="BATCH-A")],
+		)
+		with patch(f"{MODULE}.frappe.get_all", return_value=["BATCH-A-cust_b"]) as get_all:
+			batch_nos = ranking.get_document_batch_nos(doc)
+
+		self.assertEqual(batch_nos, ["BATCH-A", "BATCH-A-cust_b"])
+		self.assertEqual(
+			get_all.call_args.kwargs["filters"],
+			{"reference_doctype": "Cold Storage Transfer", "reference_name": "CS-TR-0001"},
+		)
+
+	def test_location_transfer_only_refreshes_its_rows(self):
+		doc = frappe._dict(
+			doctype="Cold Storage Transfer",
+			transfer_type="Inter-Warehouse Transfer",
+			items=[frappe._dict(batch_no="BATCH-A")],
+		)
+		with patch(f"{MODULE}.frappe.get_all") as get_all:
+			self.assertEqual(ranking.get_document_batch_nos(doc), ["BATCH-A"])
+
+		get_all.assert_not_called()
@@ -0,0 +1,299 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Append-only compliance event log for Cold Storage movement documents.
+
+Inward/Outward/Transfer write one compact row per user action (created, submitted,
+cancelled, amended, field or row changes) as it happens, so compliance reporting reads
+indexed ranges of this table instead of re-parsing ``Version`` JSON diffs.
+``backfill_compliance_events`` seeds the log from existing documents and Versions.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Final
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import cint, now, now_datetime
+
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
+DOCTYPE: Final[str] = "Cold Storage Compliance Event"
+EVENT_CREATED: Final[str] = "Created"
+EVENT_SUBMITTED: Final[str] = "Submitted"
+EVENT_CANCELLED: Final[str] = "Cancelled"
+EVENT_AMENDED: Final[str] = "Amended"
+EVENT_UPDATED: Final[str] = "Updated"
+EVENT_ROW_UPDATE: Final[str] = "Row Update"
+MOVEMENT_DOCTYPES: Final[tuple[str, ...]] = (
+	"Cold Storage Inward",
+	"Cold Storage Outward",
+	"Cold Storage Transfer",
+)
+# Bookkeeping fields Frappe touches on every save; not user changes.
+SYSTEM_FIELDS: Final[frozenset[str]] = frozenset(
+	{"_assign", "_comments", "_liked_by", "_seen", "idx", "modified", "modified_by"}
+)
+EVENT_FIELDS: Final[tuple[str, ...]] = (
+	"event_timestamp",
+	"event_type",
+	"user",
+	"reference_doctype",
+	"reference_name",
+	"company",
+	"customer",
+	"changed_fields",
+	"rows_added",
+	"rows_removed",
+	"rows_changed",
+)
+NO_CHANGES: Final[dict[str, Any]] = {
+	"changed_fields": "",
+	"rows_added": 0,
+	"rows_removed": 0,
+	"rows_changed": 0,
+}
+BACKFILL_CHUNK_SIZE: Final[int] = 1000
+_EVENT_BY_METHOD: Final[dict[str, str]] = {
+	"on_submit": EVENT_SUBMITTED,
+	"on_cancel": EVENT_CANCELLED,
+}
+
+
+class ColdStorageComplianceEvent(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		changed_fields: DF.SmallText | None
+		company: DF.Link | None
+		customer: DF.Link | None
+		event_timestamp: DF.Datetime
+		event_type: DF.Literal["Created", "Submitted", "Cancelled", "Amended", "Updated", "Row Update"]
+		reference_doctype: DF.Link
+		reference_name: DF.DynamicLink
+		rows_added: DF.Int
+		rows_changed: DF.Int
+		rows_removed: DF.Int
+		user: DF.Link | None
+	# end: auto-generated types
+
+	def validate(self):
+		if not self.is_new():
+			frappe.throw(_("Compliance events are append-only and cannot be changed"))
+
+	def on_trash(self):
+		frappe.throw(_("Compliance events are append-only and cannot be deleted"))
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype(DOCTYPE)
+
+
+def record_compliance_event(doc: Document, method: str | None = None) -> None:
+	"""doc_events hook for Inward/Outward/Transfer: append the action that just happened."""
+	event = get_document_event(doc, method)
+	if not event:
+		return
+
+	frappe.get_doc(
+		{
+			"doctype": DOCTYPE,
+			"event_timestamp": now_datetime(),
+			"user": frappe.session.user,
+			"reference_doctype": doc.doctype,
+			"reference_name": doc.name,
+			"company": doc.get("company"),
+			"customer": get_document_customer(doc),
+			**event,
+		}
+	).insert(ignore_permissions=True)
+
+
+def get_document_event(doc: Document, method: str | None) -> dict[str, Any] | None:
+	if method == "after_insert":
+		return {"event_type": EVENT_AMENDED if doc.get("amended_from") else EVENT_CREATED}
+	if method in _EVENT_BY_METHOD:
+		return {"event_type": _EVENT_BY_METHOD[method]}
+
+	# on_update / on_update_after_submit: only record saves that changed something.
+	doc_before_save = doc.get_doc_before_save()
+	if not doc_before_save:
+		return None
+	# Submit runs on_update before on_submit; the docstatus hooks record the transition.
+	if doc_before_save.get("docstatus") != doc.get("docstatus"):
+		return None
+
+	from frappe.core.doctype.version.version import get_diff
+
+	return get_event_from_diff(get_diff(doc_before_save, doc))
+
+
+def get_event_from_diff(diff: dict | None) -> dict[str, Any] | None:
+	"""Classify a Version-style diff (``changed``/``added``/``removed``/``row_changed``)."""
+	diff = diff or {}
+	changed_fields: list[str] = []
+	docstatus_transition = None
+	amended = False
+
+	for entry in diff.get("changed") or []:
+		if not isinstance(entry, (list, tuple)) or len(entry) < 3:
+			continue
+		fieldname, old_value, new_value = entry[0], entry[1], entry[2]
+		if fieldname == "docstatus":
+			docstatus_transition = (_to_int(old_value), _to_int(new_value))
+		elif fieldname == "amended_from" and new_value:
+			amended = True
+		if fieldname not in SYSTEM_FIELDS and fieldname not in changed_fields:
+			changed_fields.append(fieldname)
+
+	rows_added = len(diff.get("added") or [])
+	rows_removed = len(diff.get("removed") or [])
+	rows_changed = len(diff.get("row_changed") or [])
+
+	if docstatus_transition == (0, 1):
+		event_type = EVENT_SUBMITTED
+	elif docstatus_transition == (1, 2):
+		event_type = EVENT_CANCELLED
+	elif docstatus_transition == (2, 0) or amended:
+		event_type = EVENT_AMENDED
+	elif rows_added or rows_removed or rows_changed:
+		event_type = EVENT_ROW_UPDATE
+	elif changed_fields:
+		event_type = EVENT_UPDATED
+	else:
+		return None
+
+	return {
+		"event_type": event_type,
+		"changed_fields": ", ".join(changed_fields),
+		"rows_added": rows_added,
+		"rows_removed": rows_removed,
+		"rows_changed": rows_changed,
+	}
+
+
+def get_document_customer(doc: Any) -> str | None:
+	return doc.get("customer") or doc.get("to_customer") or doc.get("from_customer")
+
+
+def backfill_compliance_events() -> int:
+	"""Seed the log for documents that have no events yet, from the documents and their Versions.
+
+	Returns the number of events written.
+	"""
+	written = 0
+	for doctype in MOVEMENT_DOCTYPES:
+		documents = frappe.db.sql(
+			f"""
+			select doc.name, doc.owner, doc.creation, doc.amended_from, doc.company,
+				coalesce(nullif(doc.customer, ''), {_transfer_customer_sql(doctype)}) as customer
+			from `tab{doctype}` doc
+			where not exists (
+				select 1 from `tab{DOCTYPE}` event
+				where event.reference_doctype = %(doctype)s and event.reference_name = doc.name
+			)
+			order by doc.creation
+			""",
+			{"doctype": doctype},
+			as_dict=True,
+		)
+		for start in range(0, len(documents), BACKFILL_CHUNK_SIZE):
+			chunk = documents[start : start + BACKFILL_CHUNK_SIZE]
+			written += _insert_events(_get_backfill_events(doctype, chunk))
+
+	return written
+
+
+def _get_backfill_events(doctype: str, documents: list[dict]) -> list[dict[str, Any]]:
+	document_by_name = {document.name: document for document in documents}
+	events = [
+		{
+			"event_timestamp": document.creation,
+			"event_type": EVENT_AMENDED if document.amended_from else EVENT_CREATED,
+			"user": document.owner,
+			"reference_doctype": doctype,
+			"reference_name": document.name,
+			"company": document.company,
+			"customer": document.customer,
+		}
+		for document in documents
+	]
+
+	versions = frappe.db.sql(
+		"""
+		select docname, owner, creation, data
+		from `tabVersion`
+		where ref_doctype = %(doctype)s and docname in %(docnames)s
+		order by creation asc, name asc
+		""",
+		{"doctype": doctype, "docnames": tuple(document_by_name)},
+		as_dict=True,
+	)
+	for version in versions:
+		event = get_event_from_diff(_parse_version_data(version.data))
+		if not event:
+			continue
+		document = document_by_name[version.docname]
+		events.append(
+			{
+				"event_timestamp": version.creation,
+				"user": version.owner,
+				"reference_doctype": doctype,
+				"reference_name": version.docname,
+				"company": document.company,
+				"customer": document.customer,
+				**event,
+			}
+		)
+	return events
+
+
+def _insert_events(events: list[dict[str, Any]]) -> int:
+	if not events:
+		return 0
+	timestamp = now()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		DOCTYPE,
+		fields=["name", "creation", "modified", "owner", "modified_by", "docstatus", *EVENT_FIELDS],
+		values=[
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				user,
+				user,
+				0,
+				*({**NO_CHANGES, **event}.get(field) for field in EVENT_FIELDS),
+			)
+			for event in events
+		],
+	)
+	return len(events)
+
+
+def _parse_version_data(data: Any) -> dict | None:
+	if isinstance(data, dict):
+		return data
+	try:
+		return json.loads(data) if data else None
+	except ValueError:
+		return None
+
+
+def _transfer_customer_sql(doctype: str) -> str:
+	if doctype == "Cold Storage Transfer":
+		return "nullif(doc.to_customer, ''), nullif(doc.from_customer, '')"
+	return "null"
+
+
+def _to_int(value: Any) -> int | None:
+	return cint(value) if value not in (None, "") else None
@@ -0,0 +1,80 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import frappe
+
+from cold_storage.cold_storage.doctype.cold_storage_compliance_event import (
+	cold_storage_compliance_event as compliance_events,
+)
+
+MODULE = "cold_storage.cold_storage.doctype.cold_storage_compliance_event.cold_storage_compliance_event"
+
+
+class TestColdStorageComplianceEvent(TestCase):
+	def test_diff_is_classified_into_a_compact_event(self):
+		event = compliance_events.get_event_from_diff(
+			{
+				"changed": [["remarks", "", "Checked"], ["modified", "a", "b"]],
+				"added": [["items", {}], ["items", {}]],
+				"row_changed": [["items", 1, "ROW-1", [["qty", 1, 2]]]],
+			}
+		)
+
+		self.assertEqual(event["event_type"], "Row Update")
+		self.assertEqual(event["changed_fields"], "remarks")
+		self.assertEqual((event["rows_added"], event["rows_removed"], event["rows_changed"]), (2, 0, 1))
+
+	def test_docstatus_transitions_and_empty_saves(self):
+		submitted = compliance_events.get_event_from_diff({"changed": [["docstatus", 0, 1]]})
+		cancelled = compliance_events.get_event_from_diff({"changed": [["docstatus", 1, 2]]})
+
+		self.assertEqual(submitted["event_type"], "Submitted")
+		self.assertEqual(cancelled["event_type"], "Cancelled")
+		self.assertIsNone(compliance_events.get_event_from_diff({"changed": [["modified", "a", "b"]]}))
+
+	def test_insert_of_an_amendment_is_recorded_as_amended(self):
+		doc = frappe._dict(doctype="Cold Storage Inward", name="INW-1-1", amended_from="INW-1")
+
+		self.assertEqual(compliance_events.get_document_event(doc, "after_insert"), {"event_type": "Amended"})
+
+	def test_first_on_update_after_insert_is_not_recorded(self):
+		doc = frappe._dict(doctype="Cold Storage Inward", name="INW-1")
+		doc.get_doc_before_save = Mock(return_value=None)
+
+		with patch(f"{MODULE}.frappe.get_doc") as get_doc:
+			compliance_events.record_compliance_event(doc, "on_update")
+
+		get_doc.assert_not_called()
+
+	def test_submit_hook_sequence_records_one_submitted_event(self):
+		doc = frappe._dict(
+			doctype="Cold Storage Inward", name="INW-1", company="Cold Co", customer="CUST-A", docstatus=1
+		)
+		doc.get_doc_before_save = Mock(return_value=frappe._dict(doc, docstatus=0))
+
+		with (
+			patch(
+				"frappe.core.doctype.version.version.get_diff",
+				return_value={"changed": [["docstatus", 0, 1]]},
+			),
+			patch(f"{MODULE}.frappe.session", frappe._dict(user="ops@example.com")),
+			patch(f"{MODULE}.frappe.get_doc") as get_doc,
+		):
+			# Document.submit runs on_update and then on_submit on the same doc.
+			compliance_events.record_compliance_event(doc, "on_update")
+			compliance_events.record_compliance_event(doc, "on_submit")
+
+		events = [call.args[0]["event_type"] for call in get_doc.call_args_list]
+		self.assertEqual(events, ["Submitted"])
+
+	def test_events_cannot_be_changed_or_deleted(self):
+		event = frappe.new_doc(compliance_events.DOCTYPE)
+		event.is_new = Mock(return_value=False)
+
+		with self.assertRaises(frappe.ValidationError):
+			event.validate()
+		with self.assertRaises(frappe.ValidationError):
+			event.on_trash()
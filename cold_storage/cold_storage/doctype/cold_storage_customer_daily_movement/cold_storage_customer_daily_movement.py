@@ -0,0 +1,189 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Per-customer daily Inward/Outward totals behind the portal's 30-day trend chart.
+
+A rollup of ``Cold Storage Daily Movement`` with one row per (posting_date, customer), so the
+chart reads one row per day for a customer. ``update_daily_movements`` keeps it in step on
+submit/cancel; ``rebuild_customer_daily_movements`` recomputes a date range from the fact table.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Final
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cstr, flt, getdate, now
+
+from cold_storage.cold_storage.date_ranges import MAX_POSTING_DATE, MIN_POSTING_DATE
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
+DOCTYPE: Final[str] = "Cold Storage Customer Daily Movement"
+# Ownership transfer legs count as Inward/Outward for the receiving/giving customer;
+# location transfers do not change what a customer holds.
+QTY_FIELD_BY_MOVEMENT_TYPE: Final[dict[str, str]] = {
+	"Inward": "inward_qty",
+	"Transfer In": "inward_qty",
+	"Outward": "outward_qty",
+	"Transfer Out": "outward_qty",
+}
+UPSERT_CHUNK_SIZE: Final[int] = 500
+
+
+class ColdStorageCustomerDailyMovement(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		customer: DF.Link | None
+		inward_qty: DF.Float
+		outward_qty: DF.Float
+		posting_date: DF.Date
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype(DOCTYPE)
+
+
+def update_customer_daily_movements(movements: list[dict[str, Any]]) -> None:
+	"""Add signed ``Cold Storage Daily Movement`` rows to their customer's daily totals."""
+	totals = get_customer_daily_totals(movements)
+	if totals:
+		_upsert_totals(totals)
+
+
+def get_customer_daily_totals(movements: list[dict[str, Any]]) -> list[dict[str, Any]]:
+	"""Roll daily movement rows up to one ``{name, posting_date, customer, inward_qty, outward_qty}``
+	row per customer and day."""
+	totals: dict[str, dict[str, Any]] = {}
+	for row in movements:
+		qty_field = QTY_FIELD_BY_MOVEMENT_TYPE.get(row.get("movement_type"))
+		customer = cstr(row.get("customer"))
+		if not qty_field or not customer or not row.get("posting_date"):
+			continue
+
+		posting_date = getdate(row["posting_date"])
+		key = get_customer_day_key(posting_date, customer)
+		total = totals.setdefault(
+			key,
+			{
+				"name": key,
+				"posting_date": posting_date,
+				"customer": customer,
+				"inward_qty": 0.0,
+				"outward_qty": 0.0,
+			},
+		)
+		total[qty_field] += flt(row.get("qty"))
+	return list(totals.values())
+
+
+def get_customer_day_key(posting_date, customer: str) -> str:
+	"""Deterministic row name; must match the ``md5(concat_ws(...))`` used by the rebuild."""
+	raw = f"{cstr(getdate(posting_date))}|{cstr(customer)}"
+	return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def rebuild_customer_daily_movements(from_date: str | None = None, to_date: str | None = None) -> int:
+	"""Recompute totals for a posting-date range (default: everything) from the daily movement table.
+
+	bench --site <site> execute cold_storage.cold_storage.doctype.cold_storage_customer_daily_movement.cold_storage_customer_daily_movement.rebuild_customer_daily_movements
+	"""
+	params = {
+		"from_date": getdate(from_date) if from_date else MIN_POSTING_DATE,
+		"to_date": getdate(to_date) if to_date else MAX_POSTING_DATE,
+	}
+	frappe.db.sql(
+		f"delete from `tab{DOCTYPE}` where posting_date between %(from_date)s and %(to_date)s",
+		params,
+	)
+
+	inward_types = ", ".join(
+		frappe.db.escape(movement_type)
+		for movement_type, qty_field in QTY_FIELD_BY_MOVEMENT_TYPE.items()
+		if qty_field == "inward_qty"
+	)
+	outward_types = ", ".join(
+		frappe.db.escape(movement_type)
+		for movement_type, qty_field in QTY_FIELD_BY_MOVEMENT_TYPE.items()
+		if qty_field == "outward_qty"
+	)
+	frappe.db.sql(
+		f"""
+		insert into `tab{DOCTYPE}`
+			(name, creation, modified, modified_by, owner, docstatus, idx,
+			posting_date, customer, inward_qty, outward_qty)
+		select
+			md5(concat_ws('|', dm.posting_date, dm.customer)),
+			%(now)s, %(now)s, 'Administrator', 'Administrator', 0, 0,
+			dm.posting_date,
+			dm.customer,
+			sum(case when dm.movement_type in ({inward_types}) then dm.qty else 0 end),
+			sum(case when dm.movement_type in ({outward_types}) then dm.qty else 0 end)
+		from `tabCold Storage Daily Movement` dm
+		where dm.posting_date between %(from_date)s and %(to_date)s
+			and ifnull(dm.customer, '') != ''
+			and dm.movement_type in ({inward_types}, {outward_types})
+		group by dm.posting_date, dm.customer
+		""",
+		{**params, "now": now()},
+	)
+
+	return frappe.db.sql(
+		f"select count(*) from `tab{DOCTYPE}` where posting_date between %(from_date)s and %(to_date)s",
+		params,
+	)[0][0]
+
+
+def _upsert_totals(totals: list[dict[str, Any]]) -> None:
+	timestamp = now()
+	user = frappe.session.user or "Administrator"
+	for start in range(0, len(totals), UPSERT_CHUNK_SIZE):
+		chunk = totals[start : start + UPSERT_CHUNK_SIZE]
+		values: list[Any] = []
+		for row in chunk:
+			values.extend(
+				(
+					row["name"],
+					timestamp,
+					timestamp,
+					user,
+					user,
+					row["posting_date"],
+					row["customer"],
+					row["inward_qty"],
+					row["outward_qty"],
+				)
+			)
+		placeholders = ", ".join(["(%s, %s, %s, %s, %s, 0, 0, %s, %s, %s, %s)"] * len(chunk))
+		frappe.db.sql(
+			f"""
+			insert into `tab{DOCTYPE}`
+				(name, creation, modified, modified_by, owner, docstatus, idx,
+				posting_date, customer, inward_qty, outward_qty)
+			values {placeholders}
+			on duplicate key update
+				inward_qty = inward_qty + values(inward_qty),
+				outward_qty = outward_qty + values(outward_qty),
+				modified = values(modified),
+				modified_by = values(modified_by)
+			""",
+			values,
+		)
+
+	frappe.db.sql(
+		f"""
+		delete from `tab{DOCTYPE}`
+		where name in %(names)s and abs(inward_qty) < 0.0000001 and abs(outward_qty) < 0.0000001
+		""",
+		{"names": tuple(row["name"] for row in totals)},
+	)
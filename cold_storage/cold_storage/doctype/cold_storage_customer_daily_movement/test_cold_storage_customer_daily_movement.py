@@ -0,0 +1,67 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+from cold_storage.cold_storage.doctype.cold_storage_customer_daily_movement import (
+	cold_storage_customer_daily_movement as customer_movements,
+)
+
+MODULE = (
+	"cold_storage.cold_storage.doctype.cold_storage_customer_daily_movement"
+	".cold_storage_customer_daily_movement"
+)
+
+
+def movement(movement_type: str, customer: str, qty: float, posting_date: str = "2026-10-18") -> dict:
+	return {
+		"posting_date": datetime.date.fromisoformat(posting_date),
+		"customer": customer,
+		"movement_type": movement_type,
+		"qty": qty,
+	}
+
+
+class TestColdStorageCustomerDailyMovement(TestCase):
+	def test_movements_roll_up_per_customer_and_day(self):
+		totals = customer_movements.get_customer_daily_totals(
+			[
+				movement("Inward", "CUST-A", 10),
+				movement("Inward", "CUST-A", 5),
+				movement("Outward", "CUST-A", 3),
+				movement("Inward", "CUST-A", 7, posting_date="2026-10-17"),
+				movement("Transfer", "CUST-A", 4),
+			]
+		)
+
+		by_date = {row["posting_date"].isoformat(): row for row in totals}
+		self.assertEqual(set(by_date), {"2026-10-17", "2026-10-18"})
+		self.assertEqual(by_date["2026-10-18"]["inward_qty"], 15.0)
+		self.assertEqual(by_date["2026-10-18"]["outward_qty"], 3.0)
+		self.assertEqual(by_date["2026-10-17"]["inward_qty"], 7.0)
+
+	def test_ownership_transfer_legs_count_for_each_customer(self):
+		totals = customer_movements.get_customer_daily_totals(
+			[movement("Transfer Out", "CUST-A", 4), movement("Transfer In", "CUST-B", 4)]
+		)
+
+		by_customer = {row["customer"]: row for row in totals}
+		self.assertEqual(by_customer["CUST-A"]["outward_qty"], 4.0)
+		self.assertEqual(by_customer["CUST-B"]["inward_qty"], 4.0)
+
+	def test_day_key_matches_rebuild_hash_input(self):
+		# Same text as md5(concat_ws('|', posting_date, customer)) in the rebuild.
+		self.assertEqual(
+			customer_movements.get_customer_day_key(datetime.date(2026, 10, 18), "CUST-A"),
+			customer_movements.hashlib.md5(b"2026-10-18|CUST-A").hexdigest(),
+		)
+
+	def test_cancelled_movements_subtract_from_the_day(self):
+		with patch(f"{MODULE}._upsert_totals") as upsert:
+			customer_movements.update_customer_daily_movements([movement("Outward", "CUST-A", -3)])
+
+		(totals,) = upsert.call_args.args
+		self.assertEqual(totals[0]["outward_qty"], -3.0)
+		self.assertEqual(totals[0]["name"], customer_movements.get_customer_day_key("2026-10-18", "CUST-A"))
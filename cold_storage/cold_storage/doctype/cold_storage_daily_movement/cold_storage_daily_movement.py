@@ -0,0 +1,283 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Daily movement fact table shared by the movement reports and portal charts.
+
+One row holds the submitted quantity for a (posting_date, company, customer, item,
+item_group, warehouse, movement_type) combination. Inward/Outward/Transfer add their
+rows on submit and subtract them on cancel; ``rebuild_daily_movements`` recomputes a
+date range from the source documents. Both keep the per-customer rollup in
+``Cold Storage Customer Daily Movement`` in step.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Final
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cstr, flt, getdate, now
+
+from cold_storage.cold_storage.date_ranges import MAX_POSTING_DATE, MIN_POSTING_DATE
+from cold_storage.cold_storage.doctype.cold_storage_customer_daily_movement.cold_storage_customer_daily_movement import (
+	rebuild_customer_daily_movements,
+	update_customer_daily_movements,
+)
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
+DOCTYPE: Final[str] = "Cold Storage Daily Movement"
+MOVEMENT_INWARD: Final[str] = "Inward"
+MOVEMENT_OUTWARD: Final[str] = "Outward"
+# Inter/intra-warehouse transfer, booked once against the source warehouse.
+MOVEMENT_TRANSFER: Final[str] = "Transfer"
+# Ownership transfer legs for the receiving and the giving customer.
+MOVEMENT_TRANSFER_IN: Final[str] = "Transfer In"
+MOVEMENT_TRANSFER_OUT: Final[str] = "Transfer Out"
+DIMENSIONS: Final[tuple[str, ...]] = (
+	"posting_date",
+	"company",
+	"customer",
+	"item",
+	"item_group",
+	"warehouse",
+	"movement_type",
+)
+UPSERT_CHUNK_SIZE: Final[int] = 500
+
+# Source rows with the fact-table columns; the rebuild aggregates these per day.
+_SOURCE_MOVEMENTS_SQL: Final[str] = """
+	select
+		p.posting_date, p.company, p.customer, ci.item, ci.item_group, ci.warehouse,
+		'Inward' as movement_type, ci.qty
+	from `tabCold Storage Inward` p
+	inner join `tabCold Storage Inward Item` ci
+		on ci.parent = p.name and ci.parenttype = 'Cold Storage Inward'
+	where p.docstatus = 1 and p.posting_date between %(from_date)s and %(to_date)s
+
+	union all
+
+	select
+		p.posting_date, p.company, p.customer, co.item, co.item_group, co.warehouse,
+		'Outward' as movement_type, co.qty
+	from `tabCold Storage Outward` p
+	inner join `tabCold Storage Outward Item` co
+		on co.parent = p.name and co.parenttype = 'Cold Storage Outward'
+	where p.docstatus = 1 and p.posting_date between %(from_date)s and %(to_date)s
+
+	union all
+
+	select
+		p.posting_date, p.company, p.customer, ct.item, ct.item_group, ct.source_warehouse,
+		'Transfer' as movement_type, ct.qty
+	from `tabCold Storage Transfer` p
+	inner join `tabCold Storage Transfer Item` ct
+		on ct.parent = p.name and ct.parenttype = 'Cold Storage Transfer'
+	where p.docstatus = 1 and p.posting_date between %(from_date)s and %(to_date)s
+		and ifnull(p.transfer_type, '') != 'Ownership Transfer'
+
+	union all
+
+	select
+		p.posting_date, p.company, p.from_customer, ct.item, ct.item_group, ct.source_warehouse,
+		'Transfer Out' as movement_type, ct.qty
+	from `tabCold Storage Transfer` p
+	inner join `tabCold Storage Transfer Item` ct
+		on ct.parent = p.name and ct.parenttype = 'Cold Storage Transfer'
+	where p.docstatus = 1 and p.posting_date between %(from_date)s and %(to_date)s
+		and p.transfer_type = 'Ownership Transfer'
+
+	union all
+
+	select
+		p.posting_date, p.company, p.to_customer, ct.item, ct.item_group,
+		coalesce(nullif(ct.target_warehouse, ''), ct.source_warehouse),
+		'Transfer In' as movement_type, ct.qty
+	from `tabCold Storage Transfer` p
+	inner join `tabCold Storage Transfer Item` ct
+		on ct.parent = p.name and ct.parenttype = 'Cold Storage Transfer'
+	where p.docstatus = 1 and p.posting_date between %(from_date)s and %(to_date)s
+		and p.transfer_type = 'Ownership Transfer'
+"""
+
+
+class ColdStorageDailyMovement(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		customer: DF.Link | None
+		item: DF.Link | None
+		item_group: DF.Link | None
+		movement_type: DF.Literal["Inward", "Outward", "Transfer", "Transfer In", "Transfer Out"]
+		posting_date: DF.Date
+		qty: DF.Float
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype(DOCTYPE)
+
+
+def update_daily_movements(doc: Document, *, cancel: bool = False) -> None:
+	"""Add (submit) or subtract (cancel) a movement document's rows."""
+	movements = get_document_movements(doc)
+	if not movements:
+		return
+	if cancel:
+		for row in movements:
+			row["qty"] = -flt(row["qty"])
+	_upsert_movements(movements)
+	update_customer_daily_movements(movements)
+
+
+def get_document_movements(doc: Document) -> list[dict[str, Any]]:
+	"""Return fact rows for one Inward/Outward/Transfer, aggregated by dimension."""
+	posting_date = getdate(doc.get("posting_date")) if doc.get("posting_date") else None
+	if not posting_date:
+		return []
+
+	base = {"posting_date": posting_date, "company": cstr(doc.get("company"))}
+	legs: list[tuple[dict[str, Any], str, str]] = []
+	if doc.doctype == "Cold Storage Inward":
+		legs = [(row, cstr(doc.get("customer")), MOVEMENT_INWARD) for row in doc.get("items") or []]
+	elif doc.doctype == "Cold Storage Outward":
+		legs = [(row, cstr(doc.get("customer")), MOVEMENT_OUTWARD) for row in doc.get("items") or []]
+	elif doc.doctype == "Cold Storage Transfer":
+		for row in doc.get("items") or []:
+			if doc.get("transfer_type") == "Ownership Transfer":
+				legs.append((row, cstr(doc.get("from_customer")), MOVEMENT_TRANSFER_OUT))
+				legs.append((row, cstr(doc.get("to_customer")), MOVEMENT_TRANSFER_IN))
+			else:
+				legs.append((row, cstr(doc.get("customer")), MOVEMENT_TRANSFER))
+
+	aggregated: dict[str, dict[str, Any]] = {}
+	for row, customer, movement_type in legs:
+		if movement_type == MOVEMENT_TRANSFER_IN:
+			warehouse = cstr(row.get("target_warehouse")) or cstr(row.get("source_warehouse"))
+		elif doc.doctype == "Cold Storage Transfer":
+			warehouse = cstr(row.get("source_warehouse"))
+		else:
+			warehouse = cstr(row.get("warehouse"))
+
+		movement = {
+			**base,
+			"customer": customer,
+			"item": cstr(row.get("item")),
+			"item_group": cstr(row.get("item_group")),
+			"warehouse": warehouse,
+			"movement_type": movement_type,
+		}
+		key = get_movement_key(movement)
+		if key in aggregated:
+			aggregated[key]["qty"] += flt(row.get("qty"))
+		else:
+			aggregated[key] = {**movement, "name": key, "qty": flt(row.get("qty"))}
+
+	return list(aggregated.values())
+
+
+def get_movement_key(movement: dict[str, Any]) -> str:
+	"""Deterministic row name; must match the ``md5(concat_ws(...))`` used by the rebuild."""
+	raw = "|".join(cstr(movement.get(fieldname)) for fieldname in DIMENSIONS)
+	return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def rebuild_daily_movements(from_date: str | None = None, to_date: str | None = None) -> int:
+	"""Recompute facts for a posting-date range (default: everything) from submitted documents.
+
+	bench --site <site> execute cold_storage.cold_storage.doctype.cold_storage_daily_movement.cold_storage_daily_movement.rebuild_daily_movements
+	"""
+	params = {
+		"from_date": getdate(from_date) if from_date else MIN_POSTING_DATE,
+		"to_date": getdate(to_date) if to_date else MAX_POSTING_DATE,
+	}
+	frappe.db.sql(
+		f"delete from `tab{DOCTYPE}` where posting_date between %(from_date)s and %(to_date)s",
+		params,
+	)
+
+	columns = ", ".join(f"m.{fieldname}" for fieldname in DIMENSIONS)
+	normalized = ", ".join(
+		f"ifnull(source.{fieldname}, '') as {fieldname}"
+		for fieldname in DIMENSIONS
+		if fieldname != "posting_date"
+	)
+	frappe.db.sql(
+		f"""
+		insert into `tab{DOCTYPE}`
+			(name, creation, modified, modified_by, owner, docstatus, idx,
+			posting_date, company, customer, item, item_group, warehouse, movement_type, qty)
+		select
+			md5(concat_ws('|', {columns})),
+			%(now)s, %(now)s, 'Administrator', 'Administrator', 0, 0,
+			{columns},
+			sum(m.qty)
+		from (
+			select source.posting_date, {normalized}, source.qty
+			from ({_SOURCE_MOVEMENTS_SQL}) source
+		) m
+		group by {columns}
+		having abs(sum(m.qty)) > 0.0000001
+		""",
+		{**params, "now": now()},
+	)
+	rebuild_customer_daily_movements(from_date, to_date)
+
+	return frappe.db.sql(
+		f"select count(*) from `tab{DOCTYPE}` where posting_date between %(from_date)s and %(to_date)s",
+		params,
+	)[0][0]
+
+
+def _upsert_movements(movements: list[dict[str, Any]]) -> None:
+	timestamp = now()
+	user = frappe.session.user or "Administrator"
+	for start in range(0, len(movements), UPSERT_CHUNK_SIZE):
+		chunk = movements[start : start + UPSERT_CHUNK_SIZE]
+		values: list[Any] = []
+		for row in chunk:
+			values.extend(
+				(
+					row["name"],
+					timestamp,
+					timestamp,
+					user,
+					user,
+					row["posting_date"],
+					row["company"],
+					row["customer"],
+					row["item"],
+					row["item_group"],
+					row["warehouse"],
+					row["movement_type"],
+					row["qty"],
+				)
+			)
+		placeholders = ", ".join(["(%s, %s, %s, %s, %s, 0, 0, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+		frappe.db.sql(
+			f"""
+			insert into `tab{DOCTYPE}`
+				(name, creation, modified, modified_by, owner, docstatus, idx,
+				posting_date, company, customer, item, item_group, warehouse, movement_type, qty)
+			values {placeholders}
+			on duplicate key update
+				qty = qty + values(qty),
+				modified = values(modified),
+				modified_by = values(modified_by)
+			""",
+			values,
+		)
+
+	frappe.db.sql(
+		f"delete from `tab{DOCTYPE}` where name in %(names)s and abs(qty) < 0.0000001",
+		{"names": tuple(row["name"] for row in movements)},
+	)
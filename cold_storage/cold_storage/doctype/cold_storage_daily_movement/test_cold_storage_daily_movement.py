@@ -0,0 +1,89 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage.doctype.cold_storage_daily_movement import (
+	cold_storage_daily_movement as movements,
+)
+
+MODULE = "cold_storage.cold_storage.doctype.cold_storage_daily_movement.cold_storage_daily_movement"
+
+
+class TestColdStorageDailyMovement(TestCase):
+	def test_inward_rows_are_aggregated_per_dimension(self):
+		doc = frappe._dict(
+			doctype="Cold Storage Inward",
+			posting_date="2026-10-18",
+			company="Default Co",
+			customer="CUST-A",
+			items=[
+				frappe._dict(item="APL", item_group="Fruits", warehouse="WH-1", qty=10),
+				frappe._dict(item="APL", item_group="Fruits", warehouse="WH-1", qty=5),
+				frappe._dict(item="APL", item_group="Fruits", warehouse="WH-2", qty=2),
+			],
+		)
+
+		rows = movements.get_document_movements(doc)
+
+		self.assertEqual(sorted(row["qty"] for row in rows), [2.0, 15.0])
+		self.assertEqual({row["movement_type"] for row in rows}, {"Inward"})
+		self.assertEqual(rows[0]["posting_date"], datetime.date(2026, 10, 18))
+
+	def test_ownership_transfer_books_both_customer_legs(self):
+		doc = frappe._dict(
+			doctype="Cold Storage Transfer",
+			transfer_type="Ownership Transfer",
+			posting_date="2026-10-18",
+			company="Default Co",
+			from_customer="CUST-A",
+			to_customer="CUST-B",
+			items=[frappe._dict(item="APL", item_group="Fruits", source_warehouse="WH-1", qty=4)],
+		)
+
+		rows = {row["movement_type"]: row for row in movements.get_document_movements(doc)}
+
+		self.assertEqual(rows["Transfer Out"]["customer"], "CUST-A")
+		self.assertEqual(rows["Transfer In"]["customer"], "CUST-B")
+		self.assertEqual(rows["Transfer In"]["warehouse"], "WH-1")
+
+	def test_movement_key_matches_rebuild_hash_input(self):
+		row = {
+			"posting_date": datetime.date(2026, 10, 18),
+			"company": "Default Co",
+			"customer": "CUST-A",
+			"item": "APL",
+			"item_group": "",
+			"warehouse": "WH-1",
+			"movement_type": "Inward",
+		}
+
+		# Same text as md5(concat_ws('|', ...)) over the normalized rebuild columns.
+		self.assertEqual(
+			movements.get_movement_key(row),
+			movements.hashlib.md5(b"2026-10-18|Default Co|CUST-A|APL||WH-1|Inward").hexdigest(),
+		)
+
+	def test_cancel_subtracts_the_same_rows(self):
+		doc = frappe._dict(
+			doctype="Cold Storage Outward",
+			posting_date="2026-10-18",
+			company="Default Co",
+			customer="CUST-A",
+			items=[frappe._dict(item="APL", item_group="Fruits", warehouse="WH-1", qty=3)],
+		)
+
+		with (
+			patch(f"{MODULE}._upsert_movements") as upsert,
+			patch(f"{MODULE}.update_customer_daily_movements") as update_customer_totals,
+		):
+			movements.update_daily_movements(doc, cancel=True)
+
+		(rows,) = upsert.call_args.args
+		self.assertEqual(rows[0]["qty"], -3.0)
+		self.assertEqual(rows[0]["name"], movements.get_movement_key(rows[0]))
+		update_customer_totals.assert_called_once_with(rows)
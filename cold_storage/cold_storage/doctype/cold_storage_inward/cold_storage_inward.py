@@ -6,6 +6,15 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import flt, nowdate
 
+from cold_storage.cold_storage.doctype.cold_storage_batch_ranking.cold_storage_batch_ranking import (
+	update_batch_ranking,
+)
+from cold_storage.cold_storage.doctype.cold_storage_daily_movement.cold_storage_daily_movement import (
+	update_daily_movements,
+)
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
 
 class ColdStorageInward(Document):
 	# begin: auto-generated types
@@ -40,6 +49,7 @@ class ColdStorageInward(Document):
 		self.company = self.company or get_default_company()
 		self.naming_series = get_series_for_company("inward", self.company)
 
+	@instrumented
 	def validate(self) -> None:
 		self._set_company()
 		self._validate_items()
@@ -59,37 +69,53 @@ class ColdStorageInward(Document):
 			)
 		self.company = default_company
 
+	@instrumented
 	def on_submit(self) -> None:
 		self._store_submitted_qr_code_data_uri()
 		self._create_stock_entry()
 		self._create_sales_invoice()
 		self._create_labour_journal_entry()
+		update_daily_movements(self)
+		update_batch_ranking(self)
 		self._enqueue_whatsapp_notification()
 
 	def on_cancel(self) -> None:
 		self._cancel_linked_docs()
+		update_daily_movements(self, cancel=True)
+		update_batch_ranking(self)
 
 	# ── Validations ──────────────────────────────────────────────
 
 	def _validate_items(self) -> None:
 		"""Validate each item row: batch belongs to customer."""
 		from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+			get_warehouse_companies,
 			validate_warehouse_company,
 		)
+		from cold_storage.cold_storage.utils import get_batch_details
+
+		warehouse_companies = get_warehouse_companies(getattr(row, "warehouse", None) for row in self.items)
+		batches = get_batch_details(row.batch_no for row in self.items)
 
 		for row in self.items:
-			validate_warehouse_company(getattr(row, "warehouse", None), self.company, row_idx=row.idx)
+			validate_warehouse_company(
+				getattr(row, "warehouse", None),
+				self.company,
+				row_idx=row.idx,
+				warehouse_companies=warehouse_companies,
+			)
 
 			if not row.batch_no:
 				continue
-			batch_item = frappe.db.get_value("Batch", row.batch_no, "item")
+			batch = batches.get(row.batch_no) or {}
+			batch_item = batch.get("item")
 			if batch_item and row.item and batch_item != row.item:
 				frappe.throw(
 					_("Row {0}: Batch {1} belongs to Item {2}, not {3}").format(
 						row.idx, row.batch_no, batch_item, row.item
 					)
 				)
-			batch_customer = frappe.db.get_value("Batch", row.batch_no, "custom_customer")
+			batch_customer = batch.get("custom_customer")
 			if batch_customer and batch_customer != self.customer:
 				frappe.throw(
 					_("Row {0}: Batch {1} belongs to Customer {2}, not {3}").format(
@@ -102,12 +128,14 @@ class ColdStorageInward(Document):
 	def _fetch_rates(self) -> None:
 		"""Fetch unloading rate from Settings for rows where rate is not set."""
 		from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+			get_charge_configurations,
 			get_charge_rate,
 		)
 
+		charge_configurations = get_charge_configurations()
 		for row in self.items:
 			if row.item_group:
-				row.unloading_rate = get_charge_rate(row.item_group, "unloading_rate")
+				row.unloading_rate = get_charge_rate(row.item_group, "unloading_rate", charge_configurations)
 			row.amount = flt(row.qty) * flt(row.unloading_rate)
 
 	def _compute_totals(self) -> None:
@@ -380,3 +408,7 @@ class ColdStorageInward(Document):
 				title=_("Cold Storage Inward QR Cache Failed"),
 				message=frappe.get_traceback(),
 			)
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype("Cold Storage Inward")
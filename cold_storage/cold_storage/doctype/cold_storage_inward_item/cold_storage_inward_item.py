@@ -3,6 +3,8 @@
 
 from frappe.model.document import Document
 
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
 
 class ColdStorageInwardItem(Document):
 	from typing import TYPE_CHECKING
@@ -25,3 +27,7 @@ class ColdStorageInwardItem(Document):
 		warehouse: DF.Link | None
 
 	pass
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype("Cold Storage Inward Item")
@@ -8,6 +8,15 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import flt, nowdate
 
+from cold_storage.cold_storage.doctype.cold_storage_batch_ranking.cold_storage_batch_ranking import (
+	update_batch_ranking,
+)
+from cold_storage.cold_storage.doctype.cold_storage_daily_movement.cold_storage_daily_movement import (
+	update_daily_movements,
+)
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
 
 class ColdStorageOutward(Document):
 	# begin: auto-generated types
@@ -41,6 +50,7 @@ class ColdStorageOutward(Document):
 		self.company = self.company or get_default_company()
 		self.naming_series = get_series_for_company("outward", self.company)
 
+	@instrumented
 	def validate(self) -> None:
 		self._set_company()
 		self._validate_items()
@@ -60,40 +70,54 @@ class ColdStorageOutward(Document):
 			)
 		self.company = default_company
 
+	@instrumented
 	def on_submit(self) -> None:
 		self._store_submitted_qr_code_data_uri()
 		self._create_stock_entry()
 		self._create_sales_invoice()
+		update_daily_movements(self)
+		update_batch_ranking(self)
 		self._enqueue_whatsapp_notification()
 
 	def on_cancel(self) -> None:
 		self._cancel_linked_docs()
+		update_daily_movements(self, cancel=True)
+		update_batch_ranking(self)
 
 	# ── Validations ──────────────────────────────────────────────
 
 	def _validate_items(self) -> None:
 		from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+			get_warehouse_companies,
 			validate_warehouse_company,
 		)
-		from cold_storage.cold_storage.utils import get_batch_balance
+		from cold_storage.cold_storage.utils import get_batch_balances, get_batch_details
 
 		requested_qty_map: dict[tuple[str, str, str | None], dict[str, object]] = defaultdict(
 			lambda: {"qty": 0.0, "rows": []}
 		)
+		warehouse_companies = get_warehouse_companies(getattr(row, "warehouse", None) for row in self.items)
+		batches = get_batch_details(row.batch_no for row in self.items)
 
 		for row in self.items:
-			validate_warehouse_company(getattr(row, "warehouse", None), self.company, row_idx=row.idx)
+			validate_warehouse_company(
+				getattr(row, "warehouse", None),
+				self.company,
+				row_idx=row.idx,
+				warehouse_companies=warehouse_companies,
+			)
 
 			if not row.batch_no:
 				continue
-			batch_item = frappe.db.get_value("Batch", row.batch_no, "item")
+			batch = batches.get(row.batch_no) or {}
+			batch_item = batch.get("item")
 			if batch_item and row.item and batch_item != row.item:
 				frappe.throw(
 					_("Row {0}: Batch {1} belongs to Item {2}, not {3}").format(
 						row.idx, row.batch_no, batch_item, row.item
 					)
 				)
-			batch_customer = frappe.db.get_value("Batch", row.batch_no, "custom_customer")
+			batch_customer = batch.get("custom_customer")
 			if not batch_customer:
 				frappe.throw(
 					_("Row {0}: Batch {1} must have Customer set in Batch master").format(
@@ -111,10 +135,9 @@ class ColdStorageOutward(Document):
 			requested_qty_map[key]["qty"] = flt(requested_qty_map[key]["qty"]) + flt(getattr(row, "qty", 0))
 			requested_qty_map[key]["rows"].append(row.idx)
 
+		available_qty_map = get_batch_balances(requested_qty_map)
 		for (batch_no, warehouse, item_code), data in requested_qty_map.items():
-			available_qty = flt(
-				get_batch_balance(batch_no=batch_no, warehouse=warehouse, item_code=item_code)
-			)
+			available_qty = flt(available_qty_map.get((batch_no, warehouse, item_code)))
 			requested_qty = flt(data["qty"])
 			if requested_qty > available_qty:
 				rows = ", ".join(str(idx) for idx in data["rows"])
@@ -128,13 +151,15 @@ class ColdStorageOutward(Document):
 
 	def _fetch_rates(self) -> None:
 		from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+			get_charge_configurations,
 			get_charge_rate,
 		)
 
+		charge_configurations = get_charge_configurations()
 		for row in self.items:
 			if row.item_group:
-				row.handling_rate = get_charge_rate(row.item_group, "handling_rate")
-				row.loading_rate = get_charge_rate(row.item_group, "loading_rate")
+				row.handling_rate = get_charge_rate(row.item_group, "handling_rate", charge_configurations)
+				row.loading_rate = get_charge_rate(row.item_group, "loading_rate", charge_configurations)
 			row.amount = flt(row.qty) * (flt(row.handling_rate) + flt(row.loading_rate))
 
 	def _compute_totals(self) -> None:
@@ -300,3 +325,7 @@ class ColdStorageOutward(Document):
 				title=_("Cold Storage Outward QR Cache Failed"),
 				message=frappe.get_traceback(),
 			)
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype("Cold Storage Outward")
@@ -96,17 +96,10 @@ class TestColdStorageOutward(TestCase):
 			items=[SimpleNamespace(idx=1, batch_no="BATCH-0001", item="ITEM-WRONG")],
 		)
 
-		def get_value(_doctype, _name, fieldname):
-			if fieldname == "item":
-				return "ITEM-ACTUAL"
-			if fieldname == "custom_customer":
-				return "CUST-0001"
-			return None
-
 		with (
 			patch(
-				"cold_storage.cold_storage.doctype.cold_storage_outward.cold_storage_outward.frappe.db.get_value",
-				side_effect=get_value,
+				"cold_storage.cold_storage.utils.get_batch_details",
+				return_value={"BATCH-0001": frappe._dict(item="ITEM-ACTUAL", custom_customer="CUST-0001")},
 			),
 			patch(
 				"cold_storage.cold_storage.doctype.cold_storage_outward.cold_storage_outward.frappe.throw",
@@ -3,6 +3,8 @@
 
 from frappe.model.document import Document
 
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
 
 class ColdStorageOutwardItem(Document):
 	from typing import TYPE_CHECKING
@@ -26,3 +28,7 @@ class ColdStorageOutwardItem(Document):
 		warehouse: DF.Link | None
 
 	pass
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype("Cold Storage Outward Item")
@@ -7,9 +7,10 @@ import re
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import cint
+from frappe.utils import cint, cstr
 from frappe.utils.jinja import validate_template
 
+DEFAULT_WHATSAPP_API_BASE_URL = "https://graph.facebook.com"
 DEFAULT_INWARD_TEMPLATE_BODY_PARAMS: tuple[str, ...] = (
 	"{{ voucher_no }}",
 	"{{ customer }}",
@@ -22,6 +23,15 @@ DEFAULT_OUTWARD_TEMPLATE_BODY_PARAMS: tuple[str, ...] = (
 	"{{ posting_date }}",
 	"{{ total_qty }}",
 )
+# Meta rejects newlines in template parameters, so the item list is a single "; "-joined line.
+DEFAULT_STOCK_STATEMENT_TEMPLATE_BODY_PARAMS: tuple[str, ...] = (
+	"{{ customer_name }}",
+	"{{ as_on }}",
+	"{{ item_summary }}",
+	"{{ total_qty }}",
+	"{{ outstanding }}",
+)
+STOCK_STATEMENT_TEMPLATE_KEY = "Stock Statement"
 
 
 class ColdStorageSettings(Document):
@@ -31,7 +41,9 @@ class ColdStorageSettings(Document):
 	from typing import TYPE_CHECKING
 
 	if TYPE_CHECKING:
-		from cold_storage.cold_storage.doctype.charge_configuration.charge_configuration import ChargeConfiguration
+		from cold_storage.cold_storage.doctype.charge_configuration.charge_configuration import (
+			ChargeConfiguration,
+		)
 		from frappe.types import DF
 
 		charge_configurations: DF.Table[ChargeConfiguration]
@@ -43,9 +55,12 @@ class ColdStorageSettings(Document):
 		labour_account: DF.Link
 		labour_manager_account: DF.Link
 		portal_announcement: DF.SmallText | None
+		send_daily_stock_statements: DF.Check
+		stock_statement_channels: DF.Literal["WhatsApp and Email", "WhatsApp", "Email"]
 		storage_terms_and_conditions: DF.SmallText | None
 		transfer_expense_account: DF.Link
 		whatsapp_access_token: DF.Password | None
+		whatsapp_api_base_url: DF.Data | None
 		whatsapp_api_version: DF.Data | None
 		whatsapp_default_country_code: DF.Data | None
 		whatsapp_enabled: DF.Check
@@ -58,6 +73,8 @@ class ColdStorageSettings(Document):
 		whatsapp_phone_number_id: DF.Data | None
 		whatsapp_send_inward_on_submit: DF.Check
 		whatsapp_send_outward_on_submit: DF.Check
+		whatsapp_stock_statement_template_body_params: DF.Code | None
+		whatsapp_stock_statement_template_name: DF.Data | None
 		whatsapp_template_language: DF.Data | None
 	# end: auto-generated types
 
@@ -69,6 +86,15 @@ class ColdStorageSettings(Document):
 		self._set_default_whatsapp_template_body_params()
 		self._validate_whatsapp_configuration()
 
+	def on_update(self) -> None:
+		self._clear_whatsapp_template_cache()
+
+	def _clear_whatsapp_template_cache(self) -> None:
+		"""Drop compiled WhatsApp templates so the next message renders the saved revision."""
+		from cold_storage.cold_storage.integrations.whatsapp import clear_compiled_template_cache
+
+		clear_compiled_template_cache()
+
 	def _set_default_whatsapp_template_body_params(self) -> None:
 		"""Auto-fill template body params with Meta-compatible defaults when blank."""
 		if not (self.whatsapp_inward_template_body_params or "").strip():
@@ -79,6 +105,10 @@ class ColdStorageSettings(Document):
 			self.whatsapp_outward_template_body_params = get_default_whatsapp_template_body_params_json(
 				"Cold Storage Outward"
 			)
+		if not (self.whatsapp_stock_statement_template_body_params or "").strip():
+			self.whatsapp_stock_statement_template_body_params = (
+				get_default_whatsapp_template_body_params_json(STOCK_STATEMENT_TEMPLATE_KEY)
+			)
 
 	def _ensure_default_uom(self) -> None:
 		"""Keep default_uom linked to an existing UOM record."""
@@ -151,9 +181,7 @@ class ColdStorageSettings(Document):
 
 		if missing:
 			frappe.throw(
-				_("Please configure {0} before enabling WhatsApp integration").format(
-					", ".join(missing)
-				)
+				_("Please configure {0} before enabling WhatsApp integration").format(", ".join(missing))
 			)
 
 		api_version = (self.whatsapp_api_version or "").strip()
@@ -161,6 +189,11 @@ class ColdStorageSettings(Document):
 			frappe.throw(_("Meta Graph API Version must be in format v<major>.<minor> (example: v22.0)"))
 		self.whatsapp_api_version = api_version
 
+		api_base_url = (self.whatsapp_api_base_url or "").strip().rstrip("/")
+		if api_base_url and not re.match(r"https?://", api_base_url):
+			frappe.throw(_("Meta Graph API Base URL must start with http:// or https://"))
+		self.whatsapp_api_base_url = api_base_url or DEFAULT_WHATSAPP_API_BASE_URL
+
 		phone_number_id = (self.whatsapp_phone_number_id or "").strip()
 		if phone_number_id and not phone_number_id.isdigit():
 			frappe.throw(_("Phone Number ID must contain digits only"))
@@ -193,6 +226,10 @@ class ColdStorageSettings(Document):
 			fieldname="whatsapp_outward_template_body_params",
 			label=_("Outward Template Body Params (JSON)"),
 		)
+		self._validate_template_body_params(
+			fieldname="whatsapp_stock_statement_template_body_params",
+			label=_("Stock Statement Template Body Params (JSON)"),
+		)
 
 	def _validate_template_body_params(self, *, fieldname: str, label: str) -> None:
 		value = (self.get(fieldname) or "").strip()
@@ -259,6 +296,7 @@ def get_default_whatsapp_template_body_params_json(doctype: str) -> str:
 	default_map = {
 		"Cold Storage Inward": DEFAULT_INWARD_TEMPLATE_BODY_PARAMS,
 		"Cold Storage Outward": DEFAULT_OUTWARD_TEMPLATE_BODY_PARAMS,
+		STOCK_STATEMENT_TEMPLATE_KEY: DEFAULT_STOCK_STATEMENT_TEMPLATE_BODY_PARAMS,
 	}
 	params = default_map.get(doctype, DEFAULT_INWARD_TEMPLATE_BODY_PARAMS)
 	return json.dumps(list(params), ensure_ascii=True)
@@ -270,6 +308,7 @@ def get_whatsapp_settings() -> dict[str, str | int | None]:
 	return {
 		"enabled": cint(settings.whatsapp_enabled),
 		"company": settings.company,
+		"api_base_url": getattr(settings, "whatsapp_api_base_url", None) or DEFAULT_WHATSAPP_API_BASE_URL,
 		"api_version": settings.whatsapp_api_version or "v22.0",
 		"phone_number_id": settings.whatsapp_phone_number_id or "",
 		"access_token": settings.get_password("whatsapp_access_token", raise_exception=False) or "",
@@ -283,8 +322,12 @@ def get_whatsapp_settings() -> dict[str, str | int | None]:
 		"outward_template_body_params": settings.whatsapp_outward_template_body_params
 		or get_default_whatsapp_template_body_params_json("Cold Storage Outward"),
 		"outward_text_template": settings.whatsapp_outward_text_template or "",
+		"stock_statement_template_name": settings.whatsapp_stock_statement_template_name or "",
+		"stock_statement_template_body_params": settings.whatsapp_stock_statement_template_body_params
+		or get_default_whatsapp_template_body_params_json(STOCK_STATEMENT_TEMPLATE_KEY),
 		"send_inward_on_submit": cint(settings.whatsapp_send_inward_on_submit),
 		"send_outward_on_submit": cint(settings.whatsapp_send_outward_on_submit),
+		"revision": cstr(getattr(settings, "modified", None) or ""),
 	}
 
 
@@ -294,33 +337,61 @@ def validate_warehouse_company(
 	*,
 	row_idx: int | None = None,
 	label: str = "Warehouse",
+	warehouse_companies: dict[str, str] | None = None,
 ) -> None:
-	"""Validate that a warehouse belongs to the selected company."""
+	"""Validate that a warehouse belongs to the selected company.
+
+	Pass ``warehouse_companies`` from ``get_warehouse_companies`` when validating many rows.
+	"""
 	if not warehouse:
 		return
 
-	warehouse_company = frappe.db.get_value("Warehouse", warehouse, "company")
+	if warehouse_companies is None:
+		warehouse_company = frappe.db.get_value("Warehouse", warehouse, "company")
+	else:
+		warehouse_company = warehouse_companies.get(warehouse)
 	if warehouse_company and warehouse_company != company:
 		prefix = _("Row {0}: ").format(row_idx) if row_idx else ""
 		frappe.throw(_("{0}{1} {2} does not belong to Company {3}").format(prefix, label, warehouse, company))
 
 
-def get_charge_rate(item_group: str, rate_field: str) -> float:
+def get_warehouse_companies(warehouses) -> dict[str, str]:
+	"""Return ``{warehouse: company}`` for the given warehouses in one query."""
+	warehouses = sorted({warehouse for warehouse in warehouses if warehouse})
+	if not warehouses:
+		return {}
+	return dict(
+		frappe.get_all(
+			"Warehouse", filters={"name": ["in", warehouses]}, fields=["name", "company"], as_list=True
+		)
+	)
+
+
+def get_charge_rate(item_group: str, rate_field: str, charge_configurations: dict | None = None) -> float:
 	"""Fetch a specific rate from the charge configuration table for the given Item Group.
 
 	Args:
 		item_group: The Item Group to look up.
 		rate_field: One of 'unloading_rate', 'handling_rate', 'loading_rate',
 		            'inter_warehouse_transfer_rate', 'intra_warehouse_transfer_rate'.
+		charge_configurations: Result of ``get_charge_configurations``, to avoid re-reading
+		            Settings for every row.
 
 	Returns:
 		The rate value, or 0.0 if no matching row is found.
 	"""
-	settings = get_settings()
-	for row in settings.charge_configurations:
-		if row.item_group == item_group:
-			return float(row.get(rate_field) or 0)
-	return 0.0
+	if charge_configurations is None:
+		charge_configurations = get_charge_configurations()
+	row = charge_configurations.get(item_group)
+	return float(row.get(rate_field) or 0) if row else 0.0
+
+
+def get_charge_configurations() -> dict:
+	"""Return charge configuration rows by Item Group (the first row wins)."""
+	configurations = {}
+	for row in get_settings().charge_configurations:
+		configurations.setdefault(row.item_group, row)
+	return configurations
 
 
 @frappe.whitelist()
@@ -8,6 +8,17 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import flt, nowdate
 
+from cold_storage.cold_storage.doctype.cold_storage_batch_ranking.cold_storage_batch_ranking import (
+	get_document_batch_nos,
+	refresh_batch_ranking,
+	update_batch_ranking,
+)
+from cold_storage.cold_storage.doctype.cold_storage_daily_movement.cold_storage_daily_movement import (
+	update_daily_movements,
+)
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
 
 class ColdStorageTransfer(Document):
 	# begin: auto-generated types
@@ -45,6 +56,7 @@ class ColdStorageTransfer(Document):
 		self.company = self.company or get_default_company()
 		self.naming_series = get_series_for_company("transfer", self.company)
 
+	@instrumented
 	def validate(self) -> None:
 		self._set_company()
 		self._validate_transfer_type_fields()
@@ -65,6 +77,7 @@ class ColdStorageTransfer(Document):
 			)
 		self.company = default_company
 
+	@instrumented
 	def on_submit(self) -> None:
 		if self.transfer_type == "Ownership Transfer":
 			self._create_stock_entry()
@@ -72,9 +85,15 @@ class ColdStorageTransfer(Document):
 		else:
 			self._create_stock_entry()
 			self._process_location_transfer()
+		update_daily_movements(self)
+		update_batch_ranking(self)
 
 	def on_cancel(self) -> None:
+		# Read the generated target batches before cancelling deletes them.
+		batch_nos = get_document_batch_nos(self)
 		self._cancel_linked_docs()
+		update_daily_movements(self, cancel=True)
+		refresh_batch_ranking(batch_nos)
 
 	# ── Validations ──────────────────────────────────────────────
 
@@ -86,13 +105,20 @@ class ColdStorageTransfer(Document):
 	def _validate_items(self) -> None:
 		"""Validate batch ownership and warehouse per item row."""
 		from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+			get_warehouse_companies,
 			validate_warehouse_company,
 		)
-		from cold_storage.cold_storage.utils import get_batch_balance
+		from cold_storage.cold_storage.utils import get_batch_balances, get_batch_details
 
 		requested_qty_map: dict[tuple[str, str, str | None], dict[str, object]] = defaultdict(
 			lambda: {"qty": 0.0, "rows": []}
 		)
+		warehouse_companies = get_warehouse_companies(
+			warehouse
+			for row in self.items
+			for warehouse in (getattr(row, "source_warehouse", None), getattr(row, "target_warehouse", None))
+		)
+		batches = get_batch_details(row.batch_no for row in self.items)
 
 		for row in self.items:
 			if self.transfer_type == "Ownership Transfer":
@@ -101,7 +127,11 @@ class ColdStorageTransfer(Document):
 						_("Row {0}: Source Warehouse is required for Ownership Transfer").format(row.idx)
 					)
 				validate_warehouse_company(
-					row.source_warehouse, self.company, row_idx=row.idx, label=_("Source Warehouse")
+					row.source_warehouse,
+					self.company,
+					row_idx=row.idx,
+					label=_("Source Warehouse"),
+					warehouse_companies=warehouse_companies,
 				)
 
 			# Warehouse validation for location transfers
@@ -111,7 +141,11 @@ class ColdStorageTransfer(Document):
 						_("Row {0}: Source Warehouse is required for {1}").format(row.idx, self.transfer_type)
 					)
 				validate_warehouse_company(
-					row.source_warehouse, self.company, row_idx=row.idx, label=_("Source Warehouse")
+					row.source_warehouse,
+					self.company,
+					row_idx=row.idx,
+					label=_("Source Warehouse"),
+					warehouse_companies=warehouse_companies,
 				)
 
 			if self.transfer_type == "Inter-Warehouse Transfer":
@@ -122,7 +156,11 @@ class ColdStorageTransfer(Document):
 						)
 					)
 				validate_warehouse_company(
-					row.target_warehouse, self.company, row_idx=row.idx, label=_("Target Warehouse")
+					row.target_warehouse,
+					self.company,
+					row_idx=row.idx,
+					label=_("Target Warehouse"),
+					warehouse_companies=warehouse_companies,
 				)
 				if row.source_warehouse == row.target_warehouse:
 					frappe.throw(_("Row {0}: Source and Target Warehouse must be different").format(row.idx))
@@ -134,7 +172,8 @@ class ColdStorageTransfer(Document):
 			if not row.batch_no:
 				continue
 
-			batch_item = frappe.db.get_value("Batch", row.batch_no, "item")
+			batch = batches.get(row.batch_no) or {}
+			batch_item = batch.get("item")
 			if batch_item and row.item and batch_item != row.item:
 				frappe.throw(
 					_("Row {0}: Batch {1} belongs to Item {2}, not {3}").format(
@@ -142,7 +181,7 @@ class ColdStorageTransfer(Document):
 					)
 				)
 
-			batch_customer = frappe.db.get_value("Batch", row.batch_no, "custom_customer")
+			batch_customer = batch.get("custom_customer")
 			if not batch_customer:
 				frappe.throw(
 					_("Row {0}: Batch {1} must have Customer set in Batch master").format(
@@ -169,10 +208,9 @@ class ColdStorageTransfer(Document):
 			requested_qty_map[key]["qty"] = flt(requested_qty_map[key]["qty"]) + flt(getattr(row, "qty", 0))
 			requested_qty_map[key]["rows"].append(row.idx)
 
+		available_qty_map = get_batch_balances(requested_qty_map)
 		for (batch_no, source_warehouse, item_code), data in requested_qty_map.items():
-			available_qty = flt(
-				get_batch_balance(batch_no=batch_no, warehouse=source_warehouse, item_code=item_code)
-			)
+			available_qty = flt(available_qty_map.get((batch_no, source_warehouse, item_code)))
 			requested_qty = flt(data["qty"])
 			if requested_qty > available_qty:
 				rows = ", ".join(str(idx) for idx in data["rows"])
@@ -192,9 +230,11 @@ class ColdStorageTransfer(Document):
 			return
 
 		from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+			get_charge_configurations,
 			get_charge_rate,
 		)
 
+		charge_configurations = get_charge_configurations()
 		rate_field = (
 			"inter_warehouse_transfer_rate"
 			if self.transfer_type == "Inter-Warehouse Transfer"
@@ -202,7 +242,7 @@ class ColdStorageTransfer(Document):
 		)
 		for row in self.items:
 			if row.item_group:
-				row.transfer_rate = get_charge_rate(row.item_group, rate_field)
+				row.transfer_rate = get_charge_rate(row.item_group, rate_field, charge_configurations)
 			row.amount = flt(row.qty) * flt(row.transfer_rate)
 
 	def _compute_totals(self) -> None:
@@ -441,3 +481,7 @@ class ColdStorageTransfer(Document):
 			_("Generated target Batch records deleted: {0}").format(", ".join(generated_batches)),
 			alert=True,
 		)
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype("Cold Storage Transfer")
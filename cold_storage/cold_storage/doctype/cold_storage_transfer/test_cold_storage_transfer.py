@@ -281,17 +281,14 @@ class TestColdStorageTransfer(TestCase):
 			],
 		)
 
-		def get_value(_doctype, _name, fieldname):
-			if fieldname == "item":
-				return "ITEM-ACTUAL"
-			if fieldname == "custom_customer":
-				return "CUST-0001"
-			return None
-
 		with (
 			patch(
-				"cold_storage.cold_storage.doctype.cold_storage_transfer.cold_storage_transfer.frappe.db.get_value",
-				side_effect=get_value,
+				"cold_storage.cold_storage.utils.get_batch_details",
+				return_value={"BATCH-0001": frappe._dict(item="ITEM-ACTUAL", custom_customer="CUST-0001")},
+			),
+			patch(
+				"cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings.get_warehouse_companies",
+				return_value={},
 			),
 			patch(
 				"cold_storage.cold_storage.doctype.cold_storage_transfer.cold_storage_transfer.frappe.throw",
@@ -317,21 +314,18 @@ class TestColdStorageTransfer(TestCase):
 			],
 		)
 
-		def get_value(_doctype, _name, fieldname):
-			if fieldname == "item":
-				return "ITEM-001"
-			if fieldname == "custom_customer":
-				return "CUST-0001"
-			return None
-
 		with (
 			patch(
-				"cold_storage.cold_storage.doctype.cold_storage_transfer.cold_storage_transfer.frappe.db.get_value",
-				side_effect=get_value,
+				"cold_storage.cold_storage.utils.get_batch_details",
+				return_value={"BATCH-0001": frappe._dict(item="ITEM-001", custom_customer="CUST-0001")},
+			),
+			patch(
+				"cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings.get_warehouse_companies",
+				return_value={},
 			),
 			patch(
-				"cold_storage.cold_storage.utils.get_batch_balance",
-				return_value=10,
+				"cold_storage.cold_storage.utils.get_batch_balances",
+				return_value={("BATCH-0001", "WH-A", "ITEM-001"): 10},
 			),
 			patch(
 				"cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings.validate_warehouse_company"
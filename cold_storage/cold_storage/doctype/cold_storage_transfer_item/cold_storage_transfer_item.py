@@ -3,6 +3,8 @@
 
 from frappe.model.document import Document
 
+from cold_storage.setup.database_indexes import add_indexes_for_doctype
+
 
 class ColdStorageTransferItem(Document):
 	from typing import TYPE_CHECKING
@@ -26,3 +28,7 @@ class ColdStorageTransferItem(Document):
 		uom: DF.Link | None
 
 	pass
+
+
+def on_doctype_update() -> None:
+	add_indexes_for_doctype("Cold Storage Transfer Item")
@@ -0,0 +1,241 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Opt-in query-count and latency instrumentation.
+
+Enable per site with ``bench --site <site> set-config cold_storage_instrumentation 1``. Portal API
+methods, report ``execute`` functions and movement document ``validate``/``on_submit`` are wrapped
+with ``instrumented``; each call records its SQL statement count, DB time, Python time and Redis
+cache hits into a ring buffer in Redis. Nested calls are counted in every enclosing call too.
+System Managers read the buffer with ``get_instrumentation_records``; in developer mode each
+response also carries an ``X-CS-Timing`` header for its top-level calls. ``count_queries`` uses
+the same probes, always on, to let tests assert statement counts.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, Final
+
+import frappe
+from frappe.utils import cint, flt, now
+
+INSTRUMENTATION_CONF_KEY: Final[str] = "cold_storage_instrumentation"
+INSTRUMENTATION_CACHE_KEY: Final[str] = "cold_storage:instrumentation"
+INSTRUMENTATION_BUFFER_SIZE: Final[int] = 1000
+TIMING_HEADER: Final[str] = "X-CS-Timing"
+DEFAULT_RECORD_LIMIT: Final[int] = 100
+
+
+def is_enabled() -> bool:
+	return bool(cint(frappe.conf.get(INSTRUMENTATION_CONF_KEY)))
+
+
+def instrumented(fn: Callable[..., Any]) -> Callable[..., Any]:
+	"""Decorate a function or method to record its calls while instrumentation is enabled."""
+	name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+	@functools.wraps(fn)
+	def wrapper(*args, **kwargs):
+		if not is_enabled():
+			return fn(*args, **kwargs)
+		with instrument(name):
+			return fn(*args, **kwargs)
+
+	return wrapper
+
+
+@contextmanager
+def instrument(name: str) -> Iterator[dict | None]:
+	"""Record the block as one call named ``name``; yields the live counters (``None`` when off)."""
+	if not is_enabled():
+		yield None
+		return
+
+	stack = _get_stack()
+	frame = _push_frame(stack, name)
+	started = time.perf_counter()
+	try:
+		yield frame
+	finally:
+		elapsed = time.perf_counter() - started
+		stack.remove(frame)
+		record = make_record(frame, elapsed, depth=len(stack))
+		pending = frappe.flags.cold_storage_instrumentation_pending
+		if pending is None:
+			pending = frappe.flags.cold_storage_instrumentation_pending = []
+		pending.append(record)
+		if not stack:
+			_flush(pending)
+			frappe.flags.cold_storage_instrumentation_pending = None
+
+
+@contextmanager
+def count_queries() -> Iterator[dict]:
+	"""Count SQL statements run in the block, whether or not instrumentation is enabled.
+
+	Yields the live counters; ``statements`` lists the SQL text in execution order.
+	"""
+	stack = _get_stack()
+	frame = _push_frame(stack, "count_queries")
+	frame["statements"] = []
+	try:
+		yield frame
+	finally:
+		stack.remove(frame)
+
+
+def make_record(frame: dict, elapsed: float, depth: int = 0) -> dict:
+	total_ms = elapsed * 1000
+	db_ms = frame["db_time"] * 1000
+	return {
+		"name": frame["name"],
+		"timestamp": now(),
+		"user": frappe.session.user if getattr(frappe.local, "session", None) else None,
+		"depth": depth,
+		"queries": frame["queries"],
+		"db_ms": round(db_ms, 2),
+		"python_ms": round(max(total_ms - db_ms, 0.0), 2),
+		"total_ms": round(total_ms, 2),
+		"cache_hits": frame["cache_hits"],
+		"cache_misses": frame["cache_misses"],
+	}
+
+
+@frappe.whitelist()
+def get_instrumentation_records(limit: int = DEFAULT_RECORD_LIMIT, name: str | None = None) -> dict:
+	"""Latest recorded calls (newest first) and a per-name summary. System Manager only."""
+	frappe.only_for("System Manager")
+	limit = min(max(cint(limit), 1), INSTRUMENTATION_BUFFER_SIZE)
+	records = [json.loads(value) for value in frappe.cache.lrange(INSTRUMENTATION_CACHE_KEY, 0, -1) or []]
+	if name:
+		records = [record for record in records if record["name"] == name]
+	records = records[:limit]
+	return {"enabled": is_enabled(), "records": records, "summary": summarize_records(records)}
+
+
+@frappe.whitelist(methods=["POST"])
+def clear_instrumentation_records() -> None:
+	frappe.only_for("System Manager")
+	frappe.cache.delete_value(INSTRUMENTATION_CACHE_KEY)
+
+
+def summarize_records(records: list[dict]) -> list[dict]:
+	"""Calls, mean queries/DB/Python time and worst total time per instrumented name."""
+	groups: dict[str, list[dict]] = {}
+	for record in records:
+		groups.setdefault(record["name"], []).append(record)
+
+	summary = []
+	for name, rows in groups.items():
+		calls = len(rows)
+		summary.append(
+			{
+				"name": name,
+				"calls": calls,
+				"avg_queries": flt(sum(row["queries"] for row in rows) / calls, 1),
+				"max_queries": max(row["queries"] for row in rows),
+				"avg_db_ms": flt(sum(row["db_ms"] for row in rows) / calls, 2),
+				"avg_python_ms": flt(sum(row["python_ms"] for row in rows) / calls, 2),
+				"max_total_ms": max(row["total_ms"] for row in rows),
+				"cache_hits": sum(row["cache_hits"] for row in rows),
+				"cache_misses": sum(row["cache_misses"] for row in rows),
+			}
+		)
+	return sorted(summary, key=lambda row: row["avg_db_ms"] + row["avg_python_ms"], reverse=True)
+
+
+def add_timing_header(response=None, request=None) -> None:
+	"""after_request hook: ``X-CS-Timing`` with this request's top-level calls, in developer mode."""
+	timings = frappe.flags.cold_storage_request_timings
+	if response is None or not timings or not frappe.conf.developer_mode:
+		return
+	response.headers[TIMING_HEADER] = format_timing_header(timings)
+
+
+def format_timing_header(records: list[dict]) -> str:
+	return ", ".join(
+		f"{record['name']};q={record['queries']};db={record['db_ms']};py={record['python_ms']}"
+		f";cache={record['cache_hits']}/{record['cache_hits'] + record['cache_misses']}"
+		for record in records
+	)
+
+
+def _flush(records: list[dict]) -> None:
+	if frappe.conf.developer_mode:
+		timings = frappe.flags.cold_storage_request_timings
+		if timings is None:
+			timings = frappe.flags.cold_storage_request_timings = []
+		timings.extend(record for record in records if not record["depth"])
+
+	try:
+		for record in records:
+			frappe.cache.lpush(INSTRUMENTATION_CACHE_KEY, json.dumps(record, default=str))
+		frappe.cache.ltrim(INSTRUMENTATION_CACHE_KEY, 0, INSTRUMENTATION_BUFFER_SIZE - 1)
+	except Exception:
+		frappe.log_error(frappe.get_traceback(), "Cold Storage Instrumentation Flush Failed")
+
+
+def _get_stack() -> list[dict]:
+	_install_probes()
+	stack = frappe.flags.cold_storage_instrumentation_stack
+	if stack is None:
+		stack = frappe.flags.cold_storage_instrumentation_stack = []
+	return stack
+
+
+def _push_frame(stack: list[dict], name: str) -> dict:
+	frame = {"name": name, "queries": 0, "db_time": 0.0, "cache_hits": 0, "cache_misses": 0}
+	stack.append(frame)
+	return frame
+
+
+def _install_probes() -> None:
+	"""Count statements and cache lookups made while a call is being recorded.
+
+	Like ``frappe.recorder``, this swaps ``frappe.db.sql`` on the connection; the Redis wrapper is
+	shared by the process, so its probes only count when this thread has a call in progress.
+	"""
+	db = frappe.db
+	if not getattr(db, "_cold_storage_probed", False):
+		db.sql = functools.partial(_probed_sql, db.sql)
+		db._cold_storage_probed = True
+
+	cache = frappe.cache
+	if not getattr(cache, "_cold_storage_probed", False):
+		cache.get_value = functools.partial(_probed_cache_lookup, cache.get_value)
+		cache.hget = functools.partial(_probed_cache_lookup, cache.hget)
+		cache._cold_storage_probed = True
+
+
+def _probed_sql(sql: Callable[..., Any], *args, **kwargs):
+	stack = _get_active_stack()
+	if not stack:
+		return sql(*args, **kwargs)
+
+	started = time.perf_counter()
+	try:
+		return sql(*args, **kwargs)
+	finally:
+		elapsed = time.perf_counter() - started
+		for frame in stack:
+			frame["queries"] += 1
+			frame["db_time"] += elapsed
+			if "statements" in frame:
+				frame["statements"].append(args[0] if args else kwargs.get("query"))
+
+
+def _probed_cache_lookup(lookup: Callable[..., Any], *args, **kwargs):
+	value = lookup(*args, **kwargs)
+	for frame in _get_active_stack():
+		frame["cache_hits" if value is not None else "cache_misses"] += 1
+	return value
+
+
+def _get_active_stack() -> list[dict]:
+	flags = getattr(frappe.local, "flags", None)
+	return (flags.get("cold_storage_instrumentation_stack") if flags else None) or []
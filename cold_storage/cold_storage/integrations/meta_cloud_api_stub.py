@@ -0,0 +1,238 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Local stand-in for the Meta WhatsApp Cloud API messages endpoint.
+
+Point ``Meta Graph API Base URL`` in Cold Storage Settings at this server to run the
+WhatsApp integration offline or to load-test notification throughput:
+
+	python -m cold_storage.cold_storage.integrations.meta_cloud_api_stub --port 8787 --latency-ms 80
+
+``GET /stats`` returns the request counters, so a benchmark in another process can tell
+when queued messages have been delivered. The module only uses the standard library so it
+can run outside a bench environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+MESSAGES_PATH_PATTERN = re.compile(r"^/v\d+\.\d+/(?P<phone_number_id>\d+)/messages/?$")
+STATS_PATH = "/stats"
+RATE_LIMIT_ERROR_CODE = 130429
+GENERIC_ERROR_CODE = 131000
+
+
+class MetaCloudAPIStub:
+	"""Threaded HTTP server that mimics ``POST /<version>/<phone_number_id>/messages``.
+
+	Latency, throttling (HTTP 429) and server errors (HTTP 500) are injected per request
+	using the configured ratios. Counters are exposed through :meth:`get_stats`.
+	"""
+
+	def __init__(
+		self,
+		host: str = "127.0.0.1",
+		port: int = 0,
+		*,
+		latency_ms: float = 0.0,
+		latency_jitter_ms: float = 0.0,
+		rate_limit_ratio: float = 0.0,
+		error_ratio: float = 0.0,
+		access_token: str | None = None,
+		seed: int | None = None,
+	) -> None:
+		self.latency_ms = max(float(latency_ms), 0.0)
+		self.latency_jitter_ms = max(float(latency_jitter_ms), 0.0)
+		self.rate_limit_ratio = min(max(float(rate_limit_ratio), 0.0), 1.0)
+		self.error_ratio = min(max(float(error_ratio), 0.0), 1.0)
+		self.access_token = access_token or None
+		self._random = random.Random(seed)
+		self._lock = threading.Lock()
+		self._stats = {"requests": 0, "accepted": 0, "rate_limited": 0, "errors": 0, "rejected": 0}
+		self._thread: threading.Thread | None = None
+		self._server = ThreadingHTTPServer((host, int(port)), _build_handler(self))
+		self._server.daemon_threads = True
+
+	@property
+	def base_url(self) -> str:
+		host, port = self._server.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def start(self) -> MetaCloudAPIStub:
+		"""Serve requests on a background thread and return self."""
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+			self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		self._server.shutdown()
+		self._server.server_close()
+		if self._thread is not None:
+			self._thread.join(timeout=5)
+			self._thread = None
+
+	def serve_forever(self) -> None:
+		self._server.serve_forever()
+
+	def get_stats(self) -> dict[str, int]:
+		with self._lock:
+			return dict(self._stats)
+
+	def reset_stats(self) -> None:
+		with self._lock:
+			for key in self._stats:
+				self._stats[key] = 0
+
+	def __enter__(self) -> MetaCloudAPIStub:
+		return self.start()
+
+	def __exit__(self, *exc_info) -> None:
+		self.stop()
+
+	def _count(self, key: str) -> None:
+		with self._lock:
+			self._stats[key] += 1
+
+	def _pick_outcome(self) -> str:
+		with self._lock:
+			roll = self._random.random()
+			delay = self.latency_ms + self._random.uniform(0, self.latency_jitter_ms)
+		time.sleep(delay / 1000.0)
+
+		if roll < self.rate_limit_ratio:
+			return "rate_limited"
+		if roll < self.rate_limit_ratio + self.error_ratio:
+			return "errors"
+		return "accepted"
+
+
+def _build_handler(stub: MetaCloudAPIStub) -> type[BaseHTTPRequestHandler]:
+	class _MessagesHandler(BaseHTTPRequestHandler):
+		server_version = "ColdStorageMetaStub/1.0"
+
+		def do_GET(self) -> None:
+			if self.path.split("?", 1)[0].rstrip("/") != STATS_PATH:
+				self._send_error(HTTPStatus.NOT_FOUND, "Unsupported path", 100)
+				return
+			self._send_json(HTTPStatus.OK, stub.get_stats())
+
+		def do_POST(self) -> None:
+			stub._count("requests")
+			match = MESSAGES_PATH_PATTERN.match(self.path.split("?", 1)[0])
+			if not match:
+				stub._count("rejected")
+				self._send_error(HTTPStatus.NOT_FOUND, "Unsupported path", 100)
+				return
+
+			if stub.access_token and self.headers.get("Authorization") != f"Bearer {stub.access_token}":
+				stub._count("rejected")
+				self._send_error(HTTPStatus.UNAUTHORIZED, "Invalid OAuth access token", 190)
+				return
+
+			payload = self._read_json()
+			if not isinstance(payload, dict) or payload.get("messaging_product") != "whatsapp":
+				stub._count("rejected")
+				self._send_error(HTTPStatus.BAD_REQUEST, "Invalid parameter", 100)
+				return
+
+			outcome = stub._pick_outcome()
+			stub._count(outcome)
+			if outcome == "rate_limited":
+				self._send_error(HTTPStatus.TOO_MANY_REQUESTS, "Rate limit hit", RATE_LIMIT_ERROR_CODE)
+				return
+			if outcome == "errors":
+				self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Service unavailable", GENERIC_ERROR_CODE)
+				return
+
+			recipient = str(payload.get("to") or "")
+			self._send_json(
+				HTTPStatus.OK,
+				{
+					"messaging_product": "whatsapp",
+					"contacts": [{"input": recipient, "wa_id": recipient}],
+					"messages": [{"id": f"wamid.stub.{uuid.uuid4().hex}"}],
+				},
+			)
+
+		def log_message(self, format: str, *args: Any) -> None:
+			# Keep benchmark output clean; request counters are available via get_stats().
+			return
+
+		def _read_json(self) -> Any:
+			length = int(self.headers.get("Content-Length") or 0)
+			body = self.rfile.read(length) if length else b""
+			try:
+				return json.loads(body or b"null")
+			except ValueError:
+				return None
+
+		def _send_error(self, status: HTTPStatus, message: str, code: int) -> None:
+			self._send_json(
+				status,
+				{
+					"error": {
+						"message": message,
+						"type": "OAuthException",
+						"code": code,
+						"fbtrace_id": uuid.uuid4().hex[:12],
+					}
+				},
+			)
+
+		def _send_json(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+			body = json.dumps(payload).encode()
+			self.send_response(status)
+			self.send_header("Content-Type", "application/json")
+			self.send_header("Content-Length", str(len(body)))
+			self.end_headers()
+			self.wfile.write(body)
+
+	return _MessagesHandler
+
+
+def main(argv: list[str] | None = None) -> None:
+	parser = argparse.ArgumentParser(description="Local Meta WhatsApp Cloud API stand-in")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8787)
+	parser.add_argument("--latency-ms", type=float, default=0.0)
+	parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+	parser.add_argument(
+		"--rate-limit-ratio", type=float, default=0.0, help="Share of requests answered with 429"
+	)
+	parser.add_argument("--error-ratio", type=float, default=0.0, help="Share of requests answered with 500")
+	parser.add_argument("--access-token", default=None, help="Reject requests without this bearer token")
+	parser.add_argument("--seed", type=int, default=None)
+	args = parser.parse_args(argv)
+
+	stub = MetaCloudAPIStub(
+		args.host,
+		args.port,
+		latency_ms=args.latency_ms,
+		latency_jitter_ms=args.latency_jitter_ms,
+		rate_limit_ratio=args.rate_limit_ratio,
+		error_ratio=args.error_ratio,
+		access_token=args.access_token,
+		seed=args.seed,
+	)
+	print(f"Meta Cloud API stand-in listening on {stub.base_url}")
+	try:
+		stub.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		print(json.dumps(stub.get_stats()))
+
+
+if __name__ == "__main__":
+	main()
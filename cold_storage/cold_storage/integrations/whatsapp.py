@@ -4,25 +4,38 @@
 from __future__ import annotations
 
 import json
+from types import CodeType
 from typing import Any, TypedDict, cast
 
 import frappe
 from frappe import _
 from frappe.integrations.utils import make_post_request
 from frappe.utils import cint, cstr, flt, formatdate
+from frappe.utils.jinja import get_jenv
 
 from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+	DEFAULT_WHATSAPP_API_BASE_URL,
+	STOCK_STATEMENT_TEMPLATE_KEY,
 	get_whatsapp_settings,
 )
 
-META_GRAPH_BASE_URL = "https://graph.facebook.com"
+META_GRAPH_BASE_URL = DEFAULT_WHATSAPP_API_BASE_URL
 DEFAULT_API_VERSION = "v22.0"
 SUPPORTED_DOCTYPES = frozenset(("Cold Storage Inward", "Cold Storage Outward"))
+CUSTOMER_MOBILE_FIELDS: tuple[str, ...] = ("whatsapp_no", "mobile_no", "mobile_number", "phone")
+CONTACT_MOBILE_FIELDS: tuple[str, ...] = ("mobile_no", "phone")
+
+# Process-local cache of compiled Jinja code, keyed by site and Cold Storage Settings revision
+# (a worker serves every site of a bench, and revisions are only timestamps). Compiled code
+# objects are not picklable, so this cannot live in Redis; a settings save changes the
+# revision and every worker rebuilds on its next message for that site.
+_compiled_template_cache: dict[str, dict[str, Any]] = {}
 
 
 class WhatsAppSettings(TypedDict):
 	enabled: int
 	company: str | None
+	api_base_url: str
 	api_version: str
 	phone_number_id: str
 	access_token: str
@@ -34,8 +47,16 @@ class WhatsAppSettings(TypedDict):
 	outward_template_name: str
 	outward_template_body_params: str
 	outward_text_template: str
+	stock_statement_template_name: str
+	stock_statement_template_body_params: str
 	send_inward_on_submit: int
 	send_outward_on_submit: int
+	revision: str
+
+
+class CompiledDocumentTemplates(TypedDict):
+	body_params: list[CodeType] | None
+	text_template: CodeType | None
 
 
 @frappe.whitelist()
@@ -113,11 +134,14 @@ def get_whatsapp_setup_status() -> dict[str, Any]:
 				)
 			)
 
-	api_version = cstr(settings.get("api_version")).strip() or DEFAULT_API_VERSION
+	base_url = _get_api_base_url(settings)
+	if base_url != META_GRAPH_BASE_URL:
+		warnings.append(
+			_("Meta Graph API Base URL points to {0}. Messages will not reach WhatsApp").format(base_url)
+		)
+
 	phone_number_id = cstr(settings.get("phone_number_id")).strip()
-	endpoint = (
-		f"{META_GRAPH_BASE_URL}/{api_version}/{phone_number_id}/messages" if phone_number_id else ""
-	)
+	endpoint = _get_messages_endpoint(settings) if phone_number_id else ""
 	enabled = bool(cint(settings.get("enabled")))
 
 	return {
@@ -217,6 +241,58 @@ def send_document_whatsapp_notification(
 		return None
 
 
+def send_customer_template_messages(template_key: str, contexts: dict[str, dict[str, Any]]) -> dict[str, str]:
+	"""Send the approved template configured for ``template_key`` to each customer in ``contexts``.
+
+	Body parameters are rendered from the configured JSON entries with the customer's context.
+	Mobile numbers for all customers are resolved together, so a batch costs a fixed number
+	of queries regardless of its size. Returns message id or "" per customer; failures are
+	logged and do not stop the batch.
+	"""
+	settings = _get_enabled_settings()
+	if not settings or not contexts:
+		return {}
+
+	template_name = _get_template_name(template_key, settings)
+	if not template_name:
+		frappe.log_error(
+			title=_("Cold Storage WhatsApp Notification Failed"),
+			message=_("No WhatsApp template is configured for {0} in Cold Storage Settings").format(
+				template_key
+			),
+		)
+		return {}
+
+	compiled_params = _get_compiled_document_templates(template_key, settings)["body_params"] or []
+	mobiles = _get_customer_mobiles(list(contexts))
+	results: dict[str, str] = {}
+	for customer, context in contexts.items():
+		normalized_number = _normalize_phone_number(
+			mobiles.get(customer, ""), settings["default_country_code"]
+		)
+		if not normalized_number:
+			results[customer] = ""
+			continue
+
+		try:
+			response = _send_template_message(
+				settings=settings,
+				to_number=normalized_number,
+				template_name=template_name,
+				language_code=settings["template_language"],
+				body_parameters=[_render_compiled_template(code, context) for code in compiled_params],
+			)
+			results[customer] = _extract_message_id(response)
+		except Exception:
+			results[customer] = ""
+			frappe.log_error(
+				title=_("Cold Storage WhatsApp Notification Failed"),
+				message=frappe.get_traceback(),
+			)
+
+	return results
+
+
 def _get_enabled_settings(*, raise_if_disabled: bool = False) -> WhatsAppSettings | None:
 	settings = cast(WhatsAppSettings, get_whatsapp_settings())
 
@@ -271,6 +347,8 @@ def _get_template_name(doctype: str, settings: WhatsAppSettings) -> str:
 		return cstr(settings["inward_template_name"]).strip()
 	if doctype == "Cold Storage Outward":
 		return cstr(settings["outward_template_name"]).strip()
+	if doctype == STOCK_STATEMENT_TEMPLATE_KEY:
+		return cstr(settings.get("stock_statement_template_name", "")).strip()
 	return ""
 
 
@@ -279,8 +357,11 @@ def _get_template_body_params_config(doctype: str, settings: WhatsAppSettings) -
 		return cstr(settings.get("inward_template_body_params", "")).strip()
 	if doctype == "Cold Storage Outward":
 		return cstr(settings.get("outward_template_body_params", "")).strip()
+	if doctype == STOCK_STATEMENT_TEMPLATE_KEY:
+		return cstr(settings.get("stock_statement_template_body_params", "")).strip()
 	return ""
 
+
 def _get_text_template(doctype: str, settings: WhatsAppSettings) -> str:
 	if doctype == "Cold Storage Inward":
 		return cstr(settings.get("inward_text_template", "")).strip()
@@ -290,10 +371,10 @@ def _get_text_template(doctype: str, settings: WhatsAppSettings) -> str:
 
 
 def _build_template_parameters(doc: Any, doctype: str, settings: WhatsAppSettings) -> list[str]:
-	configured_params = _get_template_body_params_config(doctype, settings)
-	if configured_params:
-		entries = _parse_template_param_entries(configured_params)
-		return [_render_jinja_template(entry, doc) for entry in entries]
+	compiled_params = _get_compiled_document_templates(doctype, settings)["body_params"]
+	if compiled_params is not None:
+		context = _get_template_context(doc)
+		return [_render_compiled_template(code, context) for code in compiled_params]
 
 	return [
 		cstr(doc.name),
@@ -304,9 +385,9 @@ def _build_template_parameters(doc: Any, doctype: str, settings: WhatsAppSetting
 
 
 def _build_document_message(doc: Any, doctype: str, settings: WhatsAppSettings) -> str:
-	custom_template = _get_text_template(doctype, settings)
-	if custom_template:
-		rendered = _render_jinja_template(custom_template, doc).strip()
+	compiled_text = _get_compiled_document_templates(doctype, settings)["text_template"]
+	if compiled_text is not None:
+		rendered = _render_compiled_template(compiled_text, _get_template_context(doc)).strip()
 		if rendered:
 			return rendered
 
@@ -328,6 +409,49 @@ def _build_document_message(doc: Any, doctype: str, settings: WhatsAppSettings)
 	)
 
 
+def clear_compiled_template_cache() -> None:
+	"""Drop the current site's compiled WhatsApp templates held by this process."""
+	_compiled_template_cache.pop(cstr(getattr(frappe.local, "site", None)), None)
+
+
+def _get_compiled_document_templates(doctype: str, settings: WhatsAppSettings) -> CompiledDocumentTemplates:
+	"""Return parsed-and-compiled body params/text template for a doctype.
+
+	Results are reused while the settings revision is unchanged. Settings dicts built
+	without a revision (ad-hoc callers, tests) are compiled on every call.
+	"""
+	revision = cstr(settings.get("revision")).strip()
+	if not revision:
+		return _compile_document_templates(doctype, settings)
+
+	site = cstr(getattr(frappe.local, "site", None))
+	site_cache = _compiled_template_cache.get(site)
+	if site_cache is None or site_cache["revision"] != revision:
+		site_cache = _compiled_template_cache[site] = {"revision": revision, "doctypes": {}}
+
+	compiled_by_doctype: dict[str, CompiledDocumentTemplates] = site_cache["doctypes"]
+	compiled = compiled_by_doctype.get(doctype)
+	if compiled is None:
+		compiled = _compile_document_templates(doctype, settings)
+		compiled_by_doctype[doctype] = compiled
+	return compiled
+
+
+def _compile_document_templates(doctype: str, settings: WhatsAppSettings) -> CompiledDocumentTemplates:
+	body_params: list[CodeType] | None = None
+	configured_params = _get_template_body_params_config(doctype, settings)
+	if configured_params:
+		entries = _parse_template_param_entries(configured_params)
+		body_params = [_compile_jinja_template(entry) for entry in entries]
+
+	text_template: CodeType | None = None
+	custom_template = _get_text_template(doctype, settings)
+	if custom_template:
+		text_template = _compile_jinja_template(custom_template)
+
+	return {"body_params": body_params, "text_template": text_template}
+
+
 def _parse_template_param_entries(value: str) -> list[str]:
 	try:
 		payload = json.loads(value)
@@ -346,8 +470,8 @@ def _parse_template_param_entries(value: str) -> list[str]:
 	return entries
 
 
-def _render_jinja_template(template_text: str, doc: Any) -> str:
-	context = {
+def _get_template_context(doc: Any) -> dict[str, Any]:
+	return {
 		"doc": doc,
 		"voucher_no": cstr(doc.name),
 		"customer": cstr(doc.get("customer")),
@@ -355,12 +479,25 @@ def _render_jinja_template(template_text: str, doc: Any) -> str:
 		"posting_date": formatdate(doc.get("posting_date")),
 		"total_qty": flt(doc.get("total_qty")),
 	}
-	return cstr(frappe.render_template(template_text, context))
+
+
+def _compile_jinja_template(template_text: str) -> CodeType:
+	"""Parse and compile a template string with the same guard as ``frappe.render_template``."""
+	if ".__" in template_text:
+		frappe.throw(_("Illegal template"))
+	return get_jenv().compile(template_text)
+
+
+def _render_compiled_template(code: CodeType, context: dict[str, Any]) -> str:
+	# Bind compiled code to the current request's environment so Jinja globals are fresh.
+	jenv = get_jenv()
+	template = jenv.template_class.from_code(jenv, code, jenv.make_globals(None))
+	return cstr(template.render(context))
 
 
 def _get_customer_mobile(customer: str) -> str:
 	customer_doc = frappe.get_doc("Customer", customer)
-	for fieldname in ("whatsapp_no", "mobile_no", "mobile_number", "phone"):
+	for fieldname in CUSTOMER_MOBILE_FIELDS:
 		value = cstr(customer_doc.get(fieldname)).strip()
 		if value:
 			return value
@@ -380,7 +517,7 @@ def _get_customer_mobile(customer: str) -> str:
 		as_dict=True,
 	)
 	for row in rows:
-		for fieldname in ("mobile_no", "phone"):
+		for fieldname in CONTACT_MOBILE_FIELDS:
 			value = cstr(row.get(fieldname)).strip()
 			if value:
 				return value
@@ -388,6 +525,60 @@ def _get_customer_mobile(customer: str) -> str:
 	return ""
 
 
+def _get_customer_mobiles(customers: list[str]) -> dict[str, str]:
+	"""Resolve mobiles like ``_get_customer_mobile`` for many customers in two queries."""
+	if not customers:
+		return {}
+
+	customer_meta = frappe.get_meta("Customer")
+	fieldnames = [fieldname for fieldname in CUSTOMER_MOBILE_FIELDS if customer_meta.has_field(fieldname)]
+	mobiles: dict[str, str] = {}
+	if fieldnames:
+		for row in frappe.get_all(
+			"Customer",
+			filters={"name": ("in", customers)},
+			fields=["name", *fieldnames],
+		):
+			value = _first_filled_value(row, fieldnames)
+			if value:
+				mobiles[row.name] = value
+
+	pending = [customer for customer in customers if customer not in mobiles]
+	if not pending:
+		return mobiles
+
+	rows = frappe.db.sql(
+		"""
+		select dl.link_name as customer, c.mobile_no, c.phone
+		from `tabContact` c
+		inner join `tabDynamic Link` dl
+			on dl.parent = c.name
+			and dl.parenttype = 'Contact'
+		where dl.link_doctype = 'Customer'
+			and dl.link_name in %(customers)s
+		order by dl.link_name, c.is_primary_contact desc, c.modified desc
+		""",
+		{"customers": tuple(pending)},
+		as_dict=True,
+	)
+	for row in rows:
+		if row.customer in mobiles:
+			continue
+		value = _first_filled_value(row, CONTACT_MOBILE_FIELDS)
+		if value:
+			mobiles[row.customer] = value
+
+	return mobiles
+
+
+def _first_filled_value(row: dict[str, Any], fieldnames: list[str] | tuple[str, ...]) -> str:
+	for fieldname in fieldnames:
+		value = cstr(row.get(fieldname)).strip()
+		if value:
+			return value
+	return ""
+
+
 def _normalize_phone_number(number: str, default_country_code: str = "") -> str:
 	value = cstr(number).strip()
 	if not value:
@@ -454,14 +645,21 @@ def _send_template_message(
 	return _send_meta_message(settings, payload)
 
 
+def _get_api_base_url(settings: WhatsAppSettings) -> str:
+	return cstr(settings.get("api_base_url")).strip().rstrip("/") or META_GRAPH_BASE_URL
+
+
+def _get_messages_endpoint(settings: WhatsAppSettings) -> str:
+	api_version = cstr(settings.get("api_version")).strip() or DEFAULT_API_VERSION
+	phone_number_id = cstr(settings.get("phone_number_id")).strip()
+	return f"{_get_api_base_url(settings)}/{api_version}/{phone_number_id}/messages"
+
+
 def _send_meta_message(settings: WhatsAppSettings, payload: dict[str, Any]) -> dict[str, Any]:
-	api_version = cstr(settings["api_version"]).strip() or DEFAULT_API_VERSION
-	phone_number_id = cstr(settings["phone_number_id"]).strip()
 	access_token = cstr(settings["access_token"]).strip()
 
-	url = f"{META_GRAPH_BASE_URL}/{api_version}/{phone_number_id}/messages"
 	response = make_post_request(
-		url=url,
+		url=_get_messages_endpoint(settings),
 		headers={
 			"Authorization": f"Bearer {access_token}",
 			"Content-Type": "application/json",
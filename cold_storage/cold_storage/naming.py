@@ -8,7 +8,7 @@ from typing import Final
 
 import frappe
 from frappe import _
-from frappe.utils import cstr
+from frappe.utils import cint, cstr
 
 SERIES_KEY_TO_TOKEN: Final[dict[str, str]] = {
 	"inward": "CS-IN",
@@ -19,16 +19,28 @@ SERIES_KEY_TO_TOKEN: Final[dict[str, str]] = {
 	"journal_entry": "CS-JV",
 	"gl_entry": "CS-GLE",
 }
+_UNSAFE_ABBR_CHARS: Final[re.Pattern[str]] = re.compile(r"[^A-Za-z0-9]")
 
 
 def get_company_abbreviation(company: str) -> str:
-	"""Return a safe uppercase company abbreviation used in naming series."""
+	"""Return a safe uppercase company abbreviation used in naming series.
+
+	Memoized for the current request in ``frappe.flags``: GL posting asks for the same company
+	once per GL row.
+	"""
+	memo = frappe.flags.cold_storage_company_abbr
+	if memo is None:
+		memo = frappe.flags.cold_storage_company_abbr = {}
+	if company in memo:
+		return memo[company]
+
 	abbr = cstr(frappe.get_cached_value("Company", company, "abbr") or "").strip()
 	if not abbr:
 		abbr = cstr(company).strip()
 
-	safe_abbr = re.sub(r"[^A-Za-z0-9]", "", abbr).upper()
-	return safe_abbr or "CO"
+	safe_abbr = _UNSAFE_ABBR_CHARS.sub("", abbr).upper() or "CO"
+	memo[company] = safe_abbr
+	return safe_abbr
 
 
 def get_series_for_company(series_key: str, company: str) -> str:
@@ -44,3 +56,43 @@ def is_cold_storage_prefixed_voucher(voucher_no: str, company: str) -> bool:
 	"""Return True when voucher belongs to the cold-storage naming namespace."""
 	abbr = get_company_abbreviation(company)
 	return cstr(voucher_no).strip().startswith(f"{abbr}-CS-")
+
+
+def reserve_series_numbers(key: str, count: int, after: int = 0) -> int:
+	"""Reserve ``count`` consecutive numbers of a naming series with one update; return the first.
+
+	Numbers start past ``after`` even if the series is behind it. Same locking as
+	``frappe.model.naming.getseries``, which reserves one number per call.
+	"""
+	current = frappe.db.sql("select `current` from `tabSeries` where `name` = %s for update", (key,))
+	if current and current[0][0] is not None:
+		start = max(cint(current[0][0]), cint(after))
+		frappe.db.sql("update `tabSeries` set `current` = %s where `name` = %s", (start + count, key))
+		return start + 1
+
+	start = max(cint(after), 0)
+	frappe.db.sql("insert into `tabSeries` (`name`, `current`) values (%s, %s)", (key, start + count))
+	return start + 1
+
+
+def release_series_numbers(key: str, reserved_until: int, used_until: int) -> None:
+	"""Hand back the unused tail of a reservation if nothing was reserved after it."""
+	if used_until >= reserved_until:
+		return
+	frappe.db.sql(
+		"update `tabSeries` set `current` = %s where `name` = %s and `current` = %s",
+		(used_until, key, reserved_until),
+	)
+
+
+def settle_series_numbers(key: str, reserved_until: int, used_until: int) -> None:
+	"""Release the unused tail like ``release_series_numbers`` and make sure the series is at
+	least ``used_until``, in case a savepoint rollback moved it back below numbers in use."""
+	frappe.db.sql(
+		"""
+		update `tabSeries`
+		set `current` = if(`current` = %s, %s, greatest(`current`, %s))
+		where `name` = %s
+		""",
+		(reserved_until, used_until, used_until, key),
+	)
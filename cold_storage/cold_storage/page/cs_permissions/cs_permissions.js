@@ -182,7 +182,7 @@ function renderMatrix($container, data, page) {
                     const attrs = isAdmin && !isNA
                         ? `data-doctype="${dt}" data-role="${role}" data-perm="${pt}" data-val="${rp[pt] ? 1 : 0}"`
                         : '';
-                    html += `<td class="${tdCls}"><span class="${dotCls}" ${attrs} title="${permTitles[pt]}: ${isNA ? 'N/A' : (rp[pt] ? 'Yes' : 'No')}"></span></td>`;
+                    html += `<td class="${tdCls}"><span class="${dotCls}" ${attrs} title="${permTitles[pt]}: ${isNA ? 'N/A' : (rp[pt] ? (rp.if_owner ? 'Yes (only if owner)' : 'Yes') : 'No')}"></span></td>`;
                 });
             }
             html += `</tr>`;
@@ -227,33 +227,63 @@ function renderMatrix($container, data, page) {
 
     $container.html(html);
 
-    // Click handler
+    // Click handler — toggles are collected locally and saved in one batch.
+    const pending = new Map();
+    const updateSaveIndicator = () => {
+        if (pending.size) page.set_indicator(`${pending.size} unsaved change(s)`, "orange");
+        else page.set_indicator("");
+    };
+
     if (isAdmin) {
-        $container.on("click", ".cs-dot.editable", function () {
+        $container.off("click.csPermissions").on("click.csPermissions", ".cs-dot.editable", function () {
             const $dot = $(this);
             const dt = $dot.data("doctype");
             const role = $dot.data("role");
             const perm = $dot.data("perm");
-            const cur = $dot.data("val");
-            const next = cur ? 0 : 1;
+            const next = $dot.data("val") ? 0 : 1;
+            const key = `${dt}|${role}|${perm}`;
+
+            if ($dot.data("saved-val") === undefined) $dot.data("saved-val", $dot.data("val"));
+            if (next === $dot.data("saved-val")) pending.delete(key);
+            else pending.set(key, { doctype: dt, role: role, perm_type: perm, value: next });
+
+            $dot.data("val", next);
+            if (next) { $dot.removeClass("denied").addClass("granted").attr("title", `${permTitles[perm]}: Yes`); }
+            else { $dot.removeClass("granted").addClass("denied").attr("title", `${permTitles[perm]}: No`); }
+            updateSaveIndicator();
+        });
+
+        page.set_primary_action("Save Changes", () => {
+            if (!pending.size) {
+                frappe.show_alert({ message: "No changes to save", indicator: "blue" });
+                return;
+            }
+            page.set_indicator("Saving…", "orange");
             frappe.call({
-                method: "cold_storage.cold_storage.page.cs_permissions.cs_permissions.update_permission",
-                args: { doctype: dt, role: role, perm_type: perm, value: next },
+                method: "cold_storage.cold_storage.page.cs_permissions.cs_permissions.update_permissions",
+                args: { changes: Array.from(pending.values()) },
                 callback() {
-                    $dot.data("val", next);
-                    if (next) { $dot.removeClass("denied").addClass("granted").attr("title", `${permTitles[perm]}: Yes`); }
-                    else { $dot.removeClass("granted").addClass("denied").attr("title", `${permTitles[perm]}: No`); }
+                    pending.clear();
+                    $container.find(".cs-dot.editable").each(function () {
+                        $(this).removeData("saved-val");
+                    });
+                    updateSaveIndicator();
+                },
+                error() {
+                    updateSaveIndicator();
                 },
             });
-        });
+        }, "save");
     }
 
     // Refresh button
-    page.set_primary_action("Refresh", () => {
+    const refresh = () => {
         page.set_indicator("Refreshing…", "orange");
         frappe.call({
             method: "cold_storage.cold_storage.page.cs_permissions.cs_permissions.get_permissions_matrix",
             callback(r) { page.set_indicator(""); if (r.message) renderMatrix($container, r.message, page); },
         });
-    }, "refresh");
+    };
+    if (isAdmin) page.set_secondary_action("Refresh", refresh, "refresh");
+    else page.set_primary_action("Refresh", refresh, "refresh");
 }
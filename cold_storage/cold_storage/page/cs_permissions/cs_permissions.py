@@ -1,71 +1,187 @@
 # Copyright (c) 2026, Umaish Solutions and contributors
 # For license information, please see license.txt
 
+import hashlib
+
 import frappe
 from frappe import _
+from frappe.utils import cint
+
+MATRIX_CACHE_KEY_PREFIX = "cold_storage:cs_permissions_matrix"
+MATRIX_CACHE_TTL = 24 * 60 * 60
+
+# All CS-relevant roles
+CS_ROLES = [
+	"System Manager",
+	"Stock Manager",
+	"Cold Storage Admin",
+	"Cold Storage Warehouse Manager",
+	"Cold Storage Inbound Operator",
+	"Cold Storage Dispatch Operator",
+	"Cold Storage Inventory Controller",
+	"Cold Storage Billing Executive",
+	"Cold Storage Quality Inspector",
+	"Cold Storage Maintenance Technician",
+	"Cold Storage Client Portal User",
+]
+
+# All CS doctypes grouped by category
+DOCTYPE_GROUPS = {
+	"Configuration": [
+		"Cold Storage Settings",
+		"Charge Configuration",
+	],
+	"Inward / Storage": [
+		"Cold Storage Inward",
+	],
+	"Outward / Dispatch": [
+		"Cold Storage Outward",
+	],
+	"Transfer": [
+		"Cold Storage Transfer",
+	],
+}
+
+PERM_TYPES = [
+	"read",
+	"write",
+	"create",
+	"delete",
+	"submit",
+	"cancel",
+	"amend",
+	"report",
+	"export",
+	"print",
+	"share",
+	"email",
+]
+
+# --- Portal access summary ---
+# The CS Client Portal is an API-driven portal (cs-portal) where
+# Cold Storage Client Portal User gets customer-scoped access.
+PORTAL_ACCESS = [
+	{
+		"feature": "Dashboard",
+		"description": "View current stock, recent movements, and outstanding invoices",
+		"api": "get_portal_dashboard",
+		"access": "Read (customer-scoped)",
+	},
+	{
+		"feature": "Batch Details",
+		"description": "View batch-wise stock details with quantities and locations",
+		"api": "get_batch_stock_details",
+		"access": "Read (customer-scoped)",
+	},
+	{
+		"feature": "Movement History",
+		"description": "View inward, outward, and transfer history",
+		"api": "get_movement_history",
+		"access": "Read (customer-scoped)",
+	},
+	{
+		"feature": "Outstanding Invoices",
+		"description": "View unpaid invoices and payment history",
+		"api": "get_invoices",
+		"access": "Read (customer-scoped)",
+	},
+	{
+		"feature": "Reports (PDF)",
+		"description": "Download customer-scoped reports as PDF",
+		"api": "download_portal_report_pdf",
+		"access": "Read + Export (customer-scoped)",
+	},
+	{
+		"feature": "Product Brochure",
+		"description": "Download the Cold Storage brochure PDF",
+		"api": "get_brochure_pdf",
+		"access": "Read",
+	},
+	{
+		"feature": "Settings (Announcement)",
+		"description": "View portal announcements set by admin",
+		"api": "get_portal_dashboard",
+		"access": "Read (filtered)",
+	},
+]
 
 
 @frappe.whitelist()
 def get_permissions_matrix() -> dict:
-	"""Return the complete role-permission matrix for all Cold Storage doctypes."""
-
-	# All CS-relevant roles
-	cs_roles = [
-		"System Manager",
-		"Stock Manager",
-		"Cold Storage Admin",
-		"Cold Storage Warehouse Manager",
-		"Cold Storage Inbound Operator",
-		"Cold Storage Dispatch Operator",
-		"Cold Storage Inventory Controller",
-		"Cold Storage Billing Executive",
-		"Cold Storage Quality Inspector",
-		"Cold Storage Maintenance Technician",
-		"Cold Storage Client Portal User",
-	]
-
-	# All CS doctypes grouped by category
-	doctype_groups = {
-		"Configuration": [
-			"Cold Storage Settings",
-			"Charge Configuration",
-		],
-		"Inward / Storage": [
-			"Cold Storage Inward",
-		],
-		"Outward / Dispatch": [
-			"Cold Storage Outward",
-		],
-		"Transfer": [
-			"Cold Storage Transfer",
-		],
+	"""Return the complete role-permission matrix for all Cold Storage doctypes.
+
+	The matrix is cached per version of the doctypes' permissions, so page loads only rebuild
+	it after a DocType or its Custom DocPerm rows change.
+	"""
+	cache_key = f"{MATRIX_CACHE_KEY_PREFIX}:{get_permissions_version()}"
+	matrix = frappe.cache.get_value(cache_key)
+	if matrix is None:
+		matrix = build_permissions_matrix()
+		frappe.cache.set_value(cache_key, matrix, expires_in_sec=MATRIX_CACHE_TTL)
+
+	return {
+		"roles": CS_ROLES,
+		"perm_types": PERM_TYPES,
+		"doctype_groups": DOCTYPE_GROUPS,
+		"matrix": matrix,
+		"portal_access": PORTAL_ACCESS,
 	}
 
-	perm_types = [
-		"read", "write", "create", "delete",
-		"submit", "cancel", "amend",
-		"report", "export", "print", "share", "email",
-	]
 
-	# Fetch permissions from DocType meta
+def get_permissions_version() -> str:
+	"""Fingerprint of the DocType and Custom DocPerm modified timestamps for the matrix doctypes."""
+	doctypes = _get_matrix_doctypes()
+	doctype_rows = frappe.get_all(
+		"DocType", filters={"name": ["in", doctypes]}, fields=["name", "modified"], order_by="name asc"
+	)
+	custom_rows = frappe.db.sql(
+		"""
+		select parent, count(*) as row_count, max(modified) as modified
+		from `tabCustom DocPerm`
+		where parent in %(doctypes)s
+		group by parent
+		order by parent
+		""",
+		{"doctypes": doctypes},
+		as_dict=True,
+	)
+	digest = hashlib.sha1(usedforsecurity=False)
+	for row in doctype_rows:
+		digest.update(f"{row.name}|{row.modified}\n".encode())
+	for row in custom_rows:
+		digest.update(f"{row.parent}|{row.row_count}|{row.modified}\n".encode())
+	return digest.hexdigest()
+
+
+def build_permissions_matrix() -> dict:
+	role_set = set(CS_ROLES)
 	matrix = {}
-	for group, doctypes in doctype_groups.items():
+	for group, doctypes in DOCTYPE_GROUPS.items():
 		for dt in doctypes:
 			try:
 				meta = frappe.get_meta(dt)
 			except Exception:
 				continue
 
-			dt_perms = {}
-			for role in cs_roles:
-				role_perm = {"has_access": False}
-				for perm in meta.permissions:
-					if perm.role == role:
-						role_perm["has_access"] = True
-						for pt in perm_types:
-							if perm.get(pt):
-								role_perm[pt] = 1
-				dt_perms[role] = role_perm
+			# One pass over the permission rows, indexed by role.
+			dt_perms = {role: {"has_access": False} for role in CS_ROLES}
+			owner_roles, unrestricted_roles = set(), set()
+			for perm in meta.permissions:
+				if perm.role not in role_set:
+					continue
+				role_perm = dt_perms[perm.role]
+				role_perm["has_access"] = True
+				if not cint(perm.get("permlevel")):
+					if cint(perm.get("if_owner")):
+						owner_roles.add(perm.role)
+					else:
+						unrestricted_roles.add(perm.role)
+				for pt in PERM_TYPES:
+					if perm.get(pt):
+						role_perm[pt] = 1
+			# Rights that only apply to documents the user created are shown as such.
+			for role in owner_roles - unrestricted_roles:
+				dt_perms[role]["if_owner"] = 1
 
 			matrix[dt] = {
 				"group": group,
@@ -73,85 +189,98 @@ def get_permissions_matrix() -> dict:
 				"permissions": dt_perms,
 			}
 
-	# --- Portal access summary ---
-	# The CS Client Portal is an API-driven portal (cs-portal) where
-	# Cold Storage Client Portal User gets customer-scoped access.
-	portal_access = [
-		{
-			"feature": "Dashboard",
-			"description": "View current stock, recent movements, and outstanding invoices",
-			"api": "get_portal_dashboard",
-			"access": "Read (customer-scoped)",
-		},
-		{
-			"feature": "Batch Details",
-			"description": "View batch-wise stock details with quantities and locations",
-			"api": "get_batch_stock_details",
-			"access": "Read (customer-scoped)",
-		},
-		{
-			"feature": "Movement History",
-			"description": "View inward, outward, and transfer history",
-			"api": "get_movement_history",
-			"access": "Read (customer-scoped)",
-		},
-		{
-			"feature": "Outstanding Invoices",
-			"description": "View unpaid invoices and payment history",
-			"api": "get_invoices",
-			"access": "Read (customer-scoped)",
-		},
-		{
-			"feature": "Reports (PDF)",
-			"description": "Download customer-scoped reports as PDF",
-			"api": "download_portal_report_pdf",
-			"access": "Read + Export (customer-scoped)",
-		},
-		{
-			"feature": "Product Brochure",
-			"description": "Download the Cold Storage brochure PDF",
-			"api": "get_brochure_pdf",
-			"access": "Read",
-		},
-		{
-			"feature": "Settings (Announcement)",
-			"description": "View portal announcements set by admin",
-			"api": "get_portal_dashboard",
-			"access": "Read (filtered)",
-		},
-	]
+	return matrix
 
-	return {
-		"roles": cs_roles,
-		"perm_types": perm_types,
-		"doctype_groups": doctype_groups,
-		"matrix": matrix,
-		"portal_access": portal_access,
-	}
+
+@frappe.whitelist()
+def update_permissions(changes: str | list) -> dict:
+	"""Apply a batch of ``{doctype, role, perm_type, value}`` changes.
+
+	Each doctype is validated and its cache cleared once, however many checkboxes changed.
+	"""
+	frappe.only_for("System Manager")
+	from frappe.core.doctype.doctype.doctype import validate_permissions_for_doctype
+	from frappe.permissions import setup_custom_perms
+
+	changes_by_doctype = _group_permission_changes(frappe.parse_json(changes) or [])
+	for doctype, role_changes in changes_by_doctype.items():
+		setup_custom_perms(doctype)
+		rows_by_role = {}
+		for row in frappe.get_all(
+			"Custom DocPerm",
+			filters={"parent": doctype},
+			fields=["name", "role", "permlevel", "if_owner"],
+			order_by="permlevel asc, if_owner asc, idx asc",
+		):
+			rows_by_role.setdefault(row.role, []).append(row)
+
+		for role, values in role_changes.items():
+			_apply_role_changes(doctype, role, values, rows_by_role.get(role, []))
+
+		validate_permissions_for_doctype(doctype)
+		frappe.clear_cache(doctype=doctype)
+
+	updated = sum(
+		len(values) for role_changes in changes_by_doctype.values() for values in role_changes.values()
+	)
+	frappe.msgprint(_("Updated {0} permission(s)").format(updated), alert=True)
+	return {"updated": updated, "doctypes": sorted(changes_by_doctype)}
 
 
 @frappe.whitelist()
 def update_permission(doctype: str, role: str, perm_type: str, value: int) -> None:
 	"""Update a single permission for a role on a Cold Storage doctype."""
-	frappe.only_for("System Manager")
+	update_permissions([{"doctype": doctype, "role": role, "perm_type": perm_type, "value": value}])
 
-	meta = frappe.get_meta(doctype)
-	perm_row = None
-	for perm in meta.permissions:
-		if perm.role == role:
-			perm_row = perm
-			break
-
-	if value and not perm_row:
-		doc = frappe.get_doc("DocType", doctype)
-		doc.append("permissions", {
-			"role": role,
-			perm_type: 1,
-			"read": 1,
-		})
-		doc.save()
-		frappe.msgprint(_(f"Added {role} to {doctype} with {perm_type} permission"), alert=True)
-	elif perm_row:
-		frappe.db.set_value("DocPerm", perm_row.name, perm_type, value)
-		frappe.clear_cache(doctype=doctype)
-		frappe.msgprint(_(f"Updated {perm_type} for {role} on {doctype}"), alert=True)
+
+def _apply_role_changes(doctype: str, role: str, values: dict[str, int], rows: list) -> None:
+	"""Write one role's changes to the Custom DocPerm rows the matrix merged for it.
+
+	A revoke is cleared on every row of the role, including owner-only and higher-level rows,
+	so the cell really turns off. A grant goes to the role's level-0 row, preferring the
+	unrestricted one; an owner-only row keeps its restriction. A role without a level-0 row
+	gets a new one, which needs read for any other right to apply.
+	"""
+	grants = {perm_type: 1 for perm_type, value in values.items() if value}
+	revokes = {perm_type: 0 for perm_type, value in values.items() if not value}
+	level_zero = [row for row in rows if not cint(row.get("permlevel"))]
+	target = level_zero[0] if level_zero else None
+
+	for row in rows:
+		row_values = dict(revokes)
+		if row is target:
+			row_values.update(grants)
+		if row_values:
+			frappe.db.set_value("Custom DocPerm", row.name, row_values)
+
+	if grants and target is None:
+		frappe.get_doc(
+			{
+				"doctype": "Custom DocPerm",
+				"parent": doctype,
+				"parenttype": "DocType",
+				"parentfield": "permissions",
+				"role": role,
+				"permlevel": 0,
+				"read": 1,
+				**grants,
+			}
+		).insert(ignore_permissions=True)
+
+
+def _group_permission_changes(changes: list) -> dict[str, dict[str, dict[str, int]]]:
+	"""Validate changes and group them as ``{doctype: {role: {perm_type: value}}}``."""
+	allowed_doctypes = set(_get_matrix_doctypes())
+	grouped = {}
+	for change in changes:
+		doctype, role, perm_type = change.get("doctype"), change.get("role"), change.get("perm_type")
+		if doctype not in allowed_doctypes or role not in CS_ROLES or perm_type not in PERM_TYPES:
+			frappe.throw(_("Invalid permission change: {0} / {1} / {2}").format(doctype, role, perm_type))
+		grouped.setdefault(doctype, {}).setdefault(role, {})[perm_type] = (
+			1 if cint(change.get("value")) else 0
+		)
+	return grouped
+
+
+def _get_matrix_doctypes() -> list[str]:
+	return [dt for doctypes in DOCTYPE_GROUPS.values() for dt in doctypes]
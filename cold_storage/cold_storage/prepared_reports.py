@@ -0,0 +1,135 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Background (prepared) execution for the heaviest Cold Storage reports.
+
+Frappe runs these reports in a worker and stores each result as a gzipped JSON attachment
+on a Prepared Report. This module adds what the app needs on top:
+
+- the owner gets a notification when the result is ready (or failed);
+- the client portal PDF export reuses a completed result while it is still current, i.e.
+  no movement has been committed since it was queued (see ``report_cache`` epoch).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Final
+
+import frappe
+from frappe import _
+
+from cold_storage.cold_storage.report_cache import get_movement_epoch
+
+PREPARED_REPORTS: Final[tuple[str, ...]] = (
+	"Cold Storage Audit Trail Compliance Pack",
+	"Cold Storage Warehouse Occupancy Timeline",
+	"Cold Storage Customer Register",
+	"Cold Storage Live Batch Stock",
+)
+PREPARED_REPORT_EPOCH_CACHE_KEY: Final[str] = "cold_storage:prepared_report_epoch"
+# One key per run so each expires on its own; an expired epoch only means the result is re-run.
+PREPARED_REPORT_EPOCH_TTL: Final[int] = 7 * 24 * 60 * 60
+STATUS_COMPLETED: Final[str] = "Completed"
+STATUS_ERROR: Final[str] = "Error"
+PENDING_STATUSES: Final[tuple[str, ...]] = ("Queued", "Started")
+
+
+def is_prepared_report(report_name: str) -> bool:
+	return report_name in PREPARED_REPORTS
+
+
+def get_prepared_report_data(report_name: str, filters: dict | None = None) -> dict[str, Any] | None:
+	"""Return the session user's current completed result for these filters, if any."""
+	name = frappe.db.get_value(
+		"Prepared Report",
+		{
+			"report_name": report_name,
+			"owner": frappe.session.user,
+			"status": STATUS_COMPLETED,
+			"filters": _serialize_filters(filters),
+		},
+		"name",
+		order_by="creation desc",
+	)
+	if not name or not _is_current(name):
+		return None
+
+	data = frappe.get_doc("Prepared Report", name).get_prepared_data()
+	return json.loads(data) if data else None
+
+
+def queue_prepared_report(report_name: str, filters: dict | None = None) -> str:
+	"""Queue a background run for the session user unless one is already pending."""
+	serialized = _serialize_filters(filters)
+	pending = frappe.db.get_value(
+		"Prepared Report",
+		{
+			"report_name": report_name,
+			"owner": frappe.session.user,
+			"status": ("in", PENDING_STATUSES),
+			"filters": serialized,
+		},
+		"name",
+	)
+	if pending:
+		return pending
+
+	prepared_report = frappe.get_doc(
+		{"doctype": "Prepared Report", "report_name": report_name, "filters": serialized}
+	).insert(ignore_permissions=True)
+	return prepared_report.name
+
+
+def record_prepared_report_epoch(doc, method: str | None = None) -> None:
+	"""after_insert hook: remember the movement epoch a prepared run started from."""
+	if is_prepared_report(doc.report_name):
+		frappe.cache.set_value(
+			_get_epoch_cache_key(doc.name), get_movement_epoch(), expires_in_sec=PREPARED_REPORT_EPOCH_TTL
+		)
+
+
+def clear_prepared_report_epoch(doc, method: str | None = None) -> None:
+	"""on_trash hook: drop the epoch of a deleted run."""
+	if is_prepared_report(doc.report_name):
+		frappe.cache.delete_value(_get_epoch_cache_key(doc.name))
+
+
+def notify_prepared_report_ready(doc, method: str | None = None) -> None:
+	"""on_update hook: tell the owner their report finished instead of leaving them on a spinner."""
+	if not is_prepared_report(doc.report_name):
+		return
+	if doc.status not in (STATUS_COMPLETED, STATUS_ERROR) or not doc.has_value_changed("status"):
+		return
+
+	from frappe.desk.doctype.notification_log.notification_log import enqueue_create_notification
+
+	if doc.status == STATUS_COMPLETED:
+		subject = _("{0} is ready").format(_(doc.report_name))
+	else:
+		subject = _("{0} failed to generate").format(_(doc.report_name))
+
+	enqueue_create_notification(
+		doc.owner,
+		{
+			"type": "Alert",
+			"document_type": doc.doctype,
+			"document_name": doc.name,
+			"subject": subject,
+			"from_user": doc.owner,
+		},
+	)
+
+
+def _is_current(prepared_report_name: str) -> bool:
+	epoch = frappe.cache.get_value(_get_epoch_cache_key(prepared_report_name))
+	return epoch is not None and epoch == get_movement_epoch()
+
+
+def _get_epoch_cache_key(prepared_report_name: str) -> str:
+	return f"{PREPARED_REPORT_EPOCH_CACHE_KEY}:{prepared_report_name}"
+
+
+def _serialize_filters(filters: dict | None) -> str:
+	# Same text Frappe stores on Prepared Report (sorted keys, indent 4), so lookups match.
+	return frappe.as_json(filters or {}, indent=4)
@@ -0,0 +1,125 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Customer receivable balances from ERPNext's Payment Ledger Entry.
+
+The Payment Ledger covers every settlement (Payment Entry, Journal Entry, credit notes,
+reconciliation), so balances here need no per-voucher-type logic. Balances as on a date are
+``month-end snapshot + entries after it``: the snapshot (per customer and due date) is cached
+in Redis, and only the days since the previous month end are read from the ledger.
+Snapshots on or after a new ledger entry's posting date are dropped when it is submitted.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final
+
+import frappe
+from frappe.utils import add_days, add_months, cstr, flt, get_last_day, getdate, nowdate
+
+from cold_storage.cold_storage.date_ranges import MIN_POSTING_DATE
+
+AR_SNAPSHOT_CACHE_KEY: Final[str] = "cold_storage:ar_month_end_snapshot"
+AMOUNT_PRECISION: Final[int] = 2
+
+# Receivable ledger rows for customers, with the due date of the invoice they settle.
+RECEIVABLE_LEDGER_SQL: Final[str] = """
+	select
+		ple.party as customer,
+		coalesce(si.due_date, ple.due_date, ple.posting_date) as due_date,
+		ple.posting_date,
+		ple.voucher_no,
+		ple.against_voucher_no,
+		ple.amount
+	from `tabPayment Ledger Entry` ple
+	left join `tabSales Invoice` si
+		on si.name = ple.against_voucher_no
+		and ple.against_voucher_type = 'Sales Invoice'
+	where ple.docstatus = 1
+		and ple.delinked = 0
+		and ple.account_type = 'Receivable'
+		and ple.party_type = 'Customer'
+		and (%(company)s = '' or ple.company = %(company)s)
+		and (%(customer)s = '' or ple.party = %(customer)s)
+		and ple.posting_date between %(from_date)s and %(to_date)s
+"""
+
+
+def get_receivable_balances(
+	company: str | None, customer: str | None, as_on_date: Any
+) -> dict[tuple[str, Any], float]:
+	"""Return ``{(customer, due_date): balance}`` as on ``as_on_date``."""
+	as_on_date = getdate(as_on_date)
+	snapshot_date = get_snapshot_date(as_on_date)
+
+	balances: dict[tuple[str, Any], float] = {}
+	for row_customer, due_date, balance in get_ar_snapshot(company, snapshot_date):
+		if customer and row_customer != customer:
+			continue
+		key = (row_customer, getdate(due_date))
+		balances[key] = balances.get(key, 0.0) + flt(balance)
+
+	for row in _get_balance_rows(company, customer, add_days(snapshot_date, 1), as_on_date):
+		key = (row.customer, getdate(row.due_date))
+		balances[key] = balances.get(key, 0.0) + flt(row.balance)
+
+	return balances
+
+
+def get_snapshot_date(as_on_date: Any):
+	"""Month end strictly before ``as_on_date`` (the last day of the previous month)."""
+	return getdate(get_last_day(add_months(getdate(as_on_date), -1)))
+
+
+def get_ar_snapshot(company: str | None, snapshot_date: Any) -> list[list]:
+	"""Non-zero ``[customer, due_date, balance]`` rows as on a month end, cached per company."""
+	field = _get_snapshot_field(company, snapshot_date)
+	snapshot = frappe.cache.hget(AR_SNAPSHOT_CACHE_KEY, field)
+	if snapshot is None:
+		snapshot = [
+			[row.customer, cstr(row.due_date), flt(row.balance, AMOUNT_PRECISION)]
+			for row in _get_balance_rows(company, None, MIN_POSTING_DATE, snapshot_date)
+		]
+		frappe.cache.hset(AR_SNAPSHOT_CACHE_KEY, field, snapshot)
+	return snapshot
+
+
+def invalidate_ar_snapshots(doc, method: str | None = None) -> None:
+	"""Payment Ledger Entry on_submit hook: drop snapshots the new entry falls into."""
+	posting_date = getdate(doc.get("posting_date") or nowdate())
+	for field in frappe.cache.hkeys(AR_SNAPSHOT_CACHE_KEY):
+		field = frappe.safe_decode(field)
+		company, _separator, snapshot_date = field.rpartition("|")
+		if company not in ("", cstr(doc.get("company"))):
+			continue
+		if getdate(snapshot_date) >= posting_date:
+			frappe.cache.hdel(AR_SNAPSHOT_CACHE_KEY, field)
+
+
+def warm_ar_snapshots() -> None:
+	"""Monthly scheduler: build last month's snapshot for every company before reports ask for it."""
+	snapshot_date = get_snapshot_date(nowdate())
+	for company in frappe.get_all("Company", pluck="name"):
+		get_ar_snapshot(company, snapshot_date)
+
+
+def _get_balance_rows(company: str | None, customer: str | None, from_date: Any, to_date: Any):
+	return frappe.db.sql(
+		f"""
+		select ledger.customer, ledger.due_date, sum(ledger.amount) as balance
+		from ({RECEIVABLE_LEDGER_SQL}) ledger
+		group by ledger.customer, ledger.due_date
+		having round(sum(ledger.amount), {AMOUNT_PRECISION}) != 0
+		""",
+		{
+			"company": company or "",
+			"customer": customer or "",
+			"from_date": from_date,
+			"to_date": to_date,
+		},
+		as_dict=True,
+	)
+
+
+def _get_snapshot_field(company: str | None, snapshot_date: Any) -> str:
+	return f"{company or ''}|{getdate(snapshot_date)}"
@@ -25,6 +25,25 @@ const update_customer_item_cache = async (query_report) => {
 frappe.query_reports[AUDIT_TRAIL_REPORT] = {
 	customer_item_codes: [],
 	onload: async (query_report) => {
+		query_report.page.add_inner_button(__("Export Compressed"), () => {
+			frappe.prompt(
+				{
+					fieldname: "file_format",
+					label: __("Format"),
+					fieldtype: "Select",
+					options: "CSV\nXLSX",
+					default: "CSV",
+				},
+				({ file_format }) =>
+					frappe.call({
+						method: "cold_storage.cold_storage.report.cold_storage_audit_trail_compliance_pack.cold_storage_audit_trail_compliance_pack.export_compliance_pack",
+						args: { filters: query_report.get_values(), file_format },
+						callback: (r) => r.message && frappe.show_alert({ message: r.message, indicator: "blue" }),
+					}),
+				__("Export Compliance Pack")
+			);
+		});
+
 		const company_filter = query_report.get_filter("company", false);
 		if (!company_filter) return;
 
@@ -1,19 +1,29 @@
 from __future__ import annotations
 
-import json
+import csv
+import gzip
+import heapq
 
 import frappe
+from frappe import _
+from frappe.utils import cint, cstr, flt, nowdate, scrub
+
 from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
 	get_default_company,
 )
-from frappe import _
-from frappe.utils import cint, flt, nowdate
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.cold_storage.report_cache import cached_report
 
 DOCSTATUS_LABELS = {0: "Draft", 1: "Submitted", 2: "Cancelled"}
-SYSTEM_VERSION_FIELDS = {"_assign", "_comments", "_liked_by", "_seen", "idx", "modified", "modified_by"}
 MOVEMENT_DOCTYPES = ("Cold Storage Inward", "Cold Storage Outward", "Cold Storage Transfer")
+REPORT_NAME = "Cold Storage Audit Trail Compliance Pack"
+EVENT_FETCH_CHUNK_SIZE = 1000
+EXPORT_FORMATS = ("CSV", "XLSX")
+EXPORT_TIMEOUT = 1800
 
 
+@instrumented
+@cached_report
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	set_default_filters(filters)
@@ -21,18 +31,8 @@ def execute(filters=None):
 	filters.company = get_report_company(filters)
 
 	movement_rows, document_meta = get_movement_rows(filters)
-	action_rows = (
-		get_user_action_rows(filters, document_meta) if cint(filters.get("include_user_actions")) else []
-	)
-	data = sorted(
-		movement_rows + action_rows,
-		key=lambda row: (
-			row.get("event_timestamp") or "",
-			0 if row.get("record_type") == "Movement" else 1,
-			row.get("reference_doctype") or "",
-			row.get("reference_name") or "",
-		),
-	)
+	data = list(iter_pack_rows(filters, movement_rows, document_meta))
+	action_rows = [row for row in data if row.get("record_type") == "User Action"]
 
 	return get_columns(), data, None, get_chart_data(movement_rows), get_report_summary(movement_rows, action_rows)
 
@@ -232,8 +232,6 @@ def append_movement_row(rows: list[dict], document_meta: dict, movement_row: dic
 			"reference_name": reference_name,
 			"status": status_label,
 			"customer": movement_row.get("customer"),
-			"owner": movement_row.get("user"),
-			"creation": movement_row.get("event_timestamp"),
 			"batches": set(),
 		},
 	)
@@ -410,147 +408,122 @@ def get_common_parent_conditions(filters, doctype_key: str):
 	return conditions
 
 
-def get_user_action_rows(filters, document_meta):
-	if not document_meta:
-		return []
-
-	action_rows = []
-	for key, meta in document_meta.items():
-		action_rows.append(
-			{
-				"event_timestamp": meta.get("creation"),
-				"posting_date": None,
-				"record_type": "User Action",
-				"event_type": "Created",
-				"reference_doctype": key[0],
-				"reference_name": key[1],
-				"batch_no": ", ".join(sorted(meta.get("batches") or [])),
-				"item": "",
-				"customer": meta.get("customer"),
-				"from_warehouse": "",
-				"to_warehouse": "",
-				"qty": None,
-				"status": meta.get("status"),
-				"user": meta.get("owner"),
-				"remarks": _("Document created"),
-			}
-		)
-
+def iter_user_action_rows(document_meta):
+	"""Yield compliance events for the documents in scope in report order, one page at a time."""
 	docname_map = {}
 	for doctype, docname in document_meta:
 		docname_map.setdefault(doctype, set()).add(docname)
 
-	for doctype in MOVEMENT_DOCTYPES:
-		docnames = sorted(docname_map.get(doctype) or [])
-		if not docnames:
-			continue
-
-		version_rows = frappe.get_all(
-			"Version",
-			filters={
-				"ref_doctype": doctype,
-				"docname": ["in", docnames],
-			},
-			fields=["docname", "owner", "creation", "data"],
-			order_by="creation asc",
-			limit_page_length=0,
+	event_streams = [
+		iter_event_action_rows(doctype, sorted(docname_map[doctype]), document_meta)
+		for doctype in MOVEMENT_DOCTYPES
+		if docname_map.get(doctype)
+	]
+	return heapq.merge(*event_streams, key=get_row_sort_key)
+
+
+def iter_event_action_rows(doctype, docnames, document_meta):
+	for event in iter_compliance_events(doctype, docnames):
+		meta = document_meta.get((doctype, event.reference_name), {})
+		yield {
+			"event_timestamp": event.event_timestamp,
+			"posting_date": None,
+			"record_type": "User Action",
+			"event_type": event.event_type,
+			"reference_doctype": doctype,
+			"reference_name": event.reference_name,
+			"batch_no": ", ".join(sorted(meta.get("batches") or [])),
+			"item": "",
+			"customer": meta.get("customer"),
+			"from_warehouse": "",
+			"to_warehouse": "",
+			"qty": None,
+			"status": meta.get("status"),
+			"user": event.user,
+			"remarks": build_action_remarks(
+				event.event_type,
+				event.changed_fields,
+				event.rows_added,
+				event.rows_removed,
+				event.rows_changed,
+			),
+		}
+
+
+def iter_compliance_events(doctype, docnames, chunk_size=EVENT_FETCH_CHUNK_SIZE):
+	"""Yield compliance events ordered by (event_timestamp, reference_name, name) using keyset pages.
+
+	Each page is an indexed range scan on (reference_doctype, reference_name, event_timestamp)
+	that resumes after the last key seen, so late pages cost the same as the first.
+	"""
+	params = {"reference_doctype": doctype, "docnames": tuple(docnames), "chunk_size": chunk_size}
+	keyset_condition = ""
+	while True:
+		rows = frappe.db.sql(
+			f"""
+			select name, reference_name, event_timestamp, event_type, user,
+				changed_fields, rows_added, rows_removed, rows_changed
+			from `tabCold Storage Compliance Event`
+			where reference_doctype = %(reference_doctype)s
+				and reference_name in %(docnames)s
+				{keyset_condition}
+			order by event_timestamp asc, reference_name asc, name asc
+			limit %(chunk_size)s
+			""",
+			params,
+			as_dict=True,
 		)
+		yield from rows
+		if len(rows) < chunk_size:
+			return
+
+		last_row = rows[-1]
+		params.update(
+			last_timestamp=last_row.event_timestamp,
+			last_reference=last_row.reference_name,
+			last_name=last_row.name,
+		)
+		keyset_condition = """and (
+					event_timestamp > %(last_timestamp)s
+					or (event_timestamp = %(last_timestamp)s and reference_name > %(last_reference)s)
+					or (
+						event_timestamp = %(last_timestamp)s
+						and reference_name = %(last_reference)s
+						and name > %(last_name)s
+					)
+				)"""
 
-		for version_row in version_rows:
-			meta = document_meta.get((doctype, version_row.docname), {})
-			action_type, action_remarks = parse_version_payload(version_row.data)
-			action_rows.append(
-				{
-					"event_timestamp": version_row.creation,
-					"posting_date": None,
-					"record_type": "User Action",
-					"event_type": action_type,
-					"reference_doctype": doctype,
-					"reference_name": version_row.docname,
-					"batch_no": ", ".join(sorted(meta.get("batches") or [])),
-					"item": "",
-					"customer": meta.get("customer"),
-					"from_warehouse": "",
-					"to_warehouse": "",
-					"qty": None,
-					"status": meta.get("status"),
-					"user": version_row.owner,
-					"remarks": action_remarks,
-				}
-			)
-
-	return action_rows
-
-
-def parse_version_payload(payload_text: str | None) -> tuple[str, str]:
-	if not payload_text:
-		return "Updated", _("Change captured in Version")
-
-	try:
-		payload = payload_text if isinstance(payload_text, dict) else json.loads(payload_text)
-	except (TypeError, ValueError, json.JSONDecodeError):
-		return "Updated", _("Version payload could not be parsed")
-
-	changed_entries = payload.get("changed") or []
-	added_entries = payload.get("added") or []
-	removed_entries = payload.get("removed") or []
-	row_changed_entries = payload.get("row_changed") or []
-
-	docstatus_transition = None
-	amend_detected = False
-	changed_fields = []
-
-	for entry in changed_entries:
-		if not isinstance(entry, (list, tuple)) or len(entry) < 3:
-			continue
-		fieldname, old_value, new_value = entry[0], entry[1], entry[2]
-		if fieldname == "docstatus":
-			docstatus_transition = normalize_status(old_value), normalize_status(new_value)
-		elif fieldname == "amended_from" and new_value:
-			amend_detected = True
-
-		if fieldname not in SYSTEM_VERSION_FIELDS:
-			changed_fields.append(fieldname)
-
-	action_type = classify_action(docstatus_transition, amend_detected, added_entries, removed_entries, row_changed_entries)
-	action_remarks = build_action_remarks(changed_fields, added_entries, removed_entries, row_changed_entries)
-	return action_type, action_remarks
 
+def iter_pack_rows(filters, movement_rows, document_meta):
+	"""Merge movement rows with the (lazily fetched) user action rows in report order."""
+	action_rows = iter_user_action_rows(document_meta) if cint(filters.get("include_user_actions")) else ()
+	return heapq.merge(sorted(movement_rows, key=get_row_sort_key), action_rows, key=get_row_sort_key)
 
-def normalize_status(value) -> int | None:
-	try:
-		return int(value)
-	except Exception:
-		return None
 
+def get_row_sort_key(row):
+	return (
+		row.get("event_timestamp") or "",
+		0 if row.get("record_type") == "Movement" else 1,
+		row.get("reference_doctype") or "",
+		row.get("reference_name") or "",
+	)
 
-def classify_action(docstatus_transition, amend_detected, added_entries, removed_entries, row_changed_entries) -> str:
-	if docstatus_transition == (0, 1):
-		return "Submitted"
-	if docstatus_transition == (1, 2):
-		return "Cancelled"
-	if docstatus_transition == (2, 0) or amend_detected:
-		return "Amended"
-	if added_entries or removed_entries or row_changed_entries:
-		return "Row Update"
-	return "Updated"
 
+def build_action_remarks(event_type, changed_fields, rows_added, rows_removed, rows_changed) -> str:
+	if event_type in ("Created", "Amended") and not changed_fields:
+		return _("Document created") if event_type == "Created" else _("Amended document created")
 
-def build_action_remarks(changed_fields, added_entries, removed_entries, row_changed_entries) -> str:
 	parts = []
-	unique_fields = []
-	for fieldname in changed_fields:
-		if fieldname not in unique_fields:
-			unique_fields.append(fieldname)
-	if unique_fields:
-		parts.append(_("Changed fields: {0}").format(", ".join(unique_fields[:8])))
-	if added_entries:
-		parts.append(_("Rows added: {0}").format(len(added_entries)))
-	if removed_entries:
-		parts.append(_("Rows removed: {0}").format(len(removed_entries)))
-	if row_changed_entries:
-		parts.append(_("Rows changed: {0}").format(len(row_changed_entries)))
-	return " | ".join(parts) if parts else _("Change captured in Version")
+	fieldnames = [fieldname for fieldname in (changed_fields or "").split(", ") if fieldname]
+	if fieldnames:
+		parts.append(_("Changed fields: {0}").format(", ".join(fieldnames[:8])))
+	if cint(rows_added):
+		parts.append(_("Rows added: {0}").format(cint(rows_added)))
+	if cint(rows_removed):
+		parts.append(_("Rows removed: {0}").format(cint(rows_removed)))
+	if cint(rows_changed):
+		parts.append(_("Rows changed: {0}").format(cint(rows_changed)))
+	return " | ".join(parts) if parts else _("Change captured in compliance log")
 
 
 def get_chart_data(movement_rows):
@@ -635,3 +608,100 @@ def get_report_summary(movement_rows, action_rows):
 			"indicator": "Teal",
 		},
 	]
+
+
+@frappe.whitelist()
+def export_compliance_pack(filters: str | dict | None = None, file_format: str = "CSV") -> str:
+	"""Queue a compressed export of the full pack; the requester is notified with the file."""
+	if not frappe.get_doc("Report", REPORT_NAME).is_permitted():
+		frappe.throw(_("Not permitted to export {0}").format(_(REPORT_NAME)), frappe.PermissionError)
+	if file_format not in EXPORT_FORMATS:
+		frappe.throw(_("Export format must be one of: {0}").format(", ".join(EXPORT_FORMATS)))
+
+	filters = frappe._dict(frappe.parse_json(filters) or {})
+	set_default_filters(filters)
+	ensure_mandatory_filters(filters)
+
+	frappe.enqueue(
+		"cold_storage.cold_storage.report.cold_storage_audit_trail_compliance_pack."
+		"cold_storage_audit_trail_compliance_pack.write_compliance_pack_file",
+		queue="long",
+		timeout=EXPORT_TIMEOUT,
+		filters=filters,
+		file_format=file_format,
+		user=frappe.session.user,
+	)
+	return _("The compliance pack export has been queued. You will be notified when the file is ready.")
+
+
+def write_compliance_pack_file(filters, file_format: str, user: str) -> str:
+	"""Write the pack straight to a private file, row by row, and notify ``user``.
+
+	CSV is written gzip-compressed; XLSX is already a zip container and is written with
+	openpyxl's write-only workbook so neither format holds the full pack in memory.
+	"""
+	filters = frappe._dict(filters)
+	filters.company = get_report_company(filters)
+	movement_rows, document_meta = get_movement_rows(filters)
+	rows = iter_pack_rows(filters, movement_rows, document_meta)
+	columns = get_columns()
+
+	extension = "csv.gz" if file_format == "CSV" else "xlsx"
+	file_name = "audit-trail-{}-{}-{}-{}.{}".format(
+		scrub(cstr(filters.batch_no)),
+		filters.from_date,
+		filters.to_date,
+		frappe.generate_hash(length=8),
+		extension,
+	)
+	file_path = frappe.get_site_path("private", "files", file_name)
+	if file_format == "CSV":
+		write_csv_gz(file_path, columns, rows)
+	else:
+		write_xlsx(file_path, columns, rows)
+
+	file_doc = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
+			"is_private": 1,
+			"attached_to_doctype": "Report",
+			"attached_to_name": REPORT_NAME,
+		}
+	)
+	file_doc.owner = user
+	file_doc.insert(ignore_permissions=True)
+
+	from frappe.desk.doctype.notification_log.notification_log import enqueue_create_notification
+
+	enqueue_create_notification(
+		user,
+		{
+			"type": "Alert",
+			"document_type": "File",
+			"document_name": file_doc.name,
+			"subject": _("{0} export is ready").format(_(REPORT_NAME)),
+			"from_user": user,
+		},
+	)
+	return file_doc.file_url
+
+
+def write_csv_gz(file_path: str, columns: list[dict], rows) -> None:
+	with gzip.open(file_path, "wt", encoding="utf-8", newline="") as handle:
+		writer = csv.writer(handle)
+		writer.writerow([column["label"] for column in columns])
+		for row in rows:
+			writer.writerow([cstr(row.get(column["fieldname"])) for column in columns])
+
+
+def write_xlsx(file_path: str, columns: list[dict], rows) -> None:
+	from openpyxl import Workbook
+
+	workbook = Workbook(write_only=True)
+	sheet = workbook.create_sheet(title="Audit Trail")
+	sheet.append([column["label"] for column in columns])
+	for row in rows:
+		sheet.append([row.get(column["fieldname"]) for column in columns])
+	workbook.save(file_path)
@@ -5,10 +5,12 @@ from frappe import _
 from frappe.utils import add_days, nowdate
 
 from cold_storage.client_portal_views import CLIENT_PORTAL_VIEW_PATH_FILTER
+from cold_storage.cold_storage.instrumentation import instrumented
 
 ROW_LIMIT = 1000
 
 
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	if not filters.get("from_date"):
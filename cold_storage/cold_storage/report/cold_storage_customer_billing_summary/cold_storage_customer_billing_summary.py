@@ -2,7 +2,10 @@ import frappe
 from frappe import _
 from frappe.utils import cint, flt, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
 
+
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	filters.from_date = filters.get("from_date") or nowdate()
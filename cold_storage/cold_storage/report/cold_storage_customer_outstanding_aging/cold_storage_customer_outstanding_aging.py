@@ -2,7 +2,10 @@ import frappe
 from frappe import _
 from frappe.utils import cint, flt, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
 
+
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	filters.as_on_date = filters.get("as_on_date") or nowdate()
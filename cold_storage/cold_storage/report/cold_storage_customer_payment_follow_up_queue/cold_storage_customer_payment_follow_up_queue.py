@@ -2,10 +2,12 @@ import frappe
 from frappe import _
 from frappe.utils import cint, flt, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
 
 PRIORITY_ORDER = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
 
 
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	filters.as_on_date = filters.get("as_on_date") or nowdate()
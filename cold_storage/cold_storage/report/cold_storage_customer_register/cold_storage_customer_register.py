@@ -2,7 +2,12 @@ import frappe
 from frappe import _
 from frappe.utils import flt, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.cold_storage.report_cache import cached_report
 
+
+@instrumented
+@cached_report
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	if not filters.get("as_on_date"):
@@ -0,0 +1,2 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+
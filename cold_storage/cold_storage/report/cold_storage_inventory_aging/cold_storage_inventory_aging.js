@@ -0,0 +1,60 @@
+frappe.query_reports["Cold Storage Inventory Aging"] = {
+	onload: async (query_report) => {
+		const company_filter = query_report.get_filter("company", false);
+		if (!company_filter) return;
+
+		try {
+			const configured_company = await frappe.db.get_single_value("Cold Storage Settings", "company");
+			if (configured_company) {
+				company_filter.df.default = configured_company;
+				company_filter.df.read_only = 1;
+				await company_filter.set_value(configured_company);
+			} else {
+				company_filter.df.read_only = 0;
+			}
+			company_filter.refresh();
+		} catch (error) {
+			console.warn("Unable to load Cold Storage Settings company for inventory aging filter", error);
+			company_filter.df.read_only = 0;
+			company_filter.refresh();
+		}
+	},
+	filters: [
+		{
+			fieldname: "company",
+			label: __("Company"),
+			fieldtype: "Link",
+			options: "Company",
+			description: __("Filter by company."),
+		},
+		{
+			fieldname: "as_on_date",
+			label: __("As On Date"),
+			fieldtype: "Date",
+			default: frappe.datetime.get_today(),
+			reqd: 1,
+			description: __("Stock and ages are computed as on this date."),
+		},
+		{
+			fieldname: "customer",
+			label: __("Customer"),
+			fieldtype: "Link",
+			options: "Customer",
+			description: __("Filter by customer."),
+		},
+		{
+			fieldname: "warehouse",
+			label: __("Warehouse"),
+			fieldtype: "Link",
+			options: "Warehouse",
+			description: __("Filter by warehouse."),
+		},
+		{
+			fieldname: "item_group",
+			label: __("Item Group"),
+			fieldtype: "Link",
+			options: "Item Group",
+			description: __("Filter by item group."),
+		},
+	],
+};
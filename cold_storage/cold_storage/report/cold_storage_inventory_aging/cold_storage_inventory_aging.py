@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+from collections import deque
+
+import frappe
+from frappe import _
+from frappe.utils import date_diff, flt, getdate, nowdate
+
+from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+	get_default_company,
+)
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.cold_storage.report_cache import cached_report
+
+# (label, upper bound in days inclusive); the last bucket is open-ended.
+AGE_BUCKETS = (
+	("0-30", 30),
+	("31-90", 90),
+	("91-180", 180),
+	("181-365", 365),
+	("365+", None),
+)
+QTY_PRECISION = 3
+
+
+@instrumented
+@cached_report
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	if not filters.get("as_on_date"):
+		filters.as_on_date = nowdate()
+	filters.company = get_report_company(filters)
+
+	data = get_data(filters)
+	return get_columns(), data, None, get_chart_data(data), get_report_summary(data)
+
+
+def get_report_company(filters):
+	try:
+		return get_default_company() or filters.get("company")
+	except Exception:
+		return filters.get("company")
+
+
+def get_columns():
+	columns = [
+		{
+			"label": _("Customer"),
+			"fieldname": "customer",
+			"fieldtype": "Link",
+			"options": "Customer",
+			"width": 190,
+		},
+		{
+			"label": _("Warehouse"),
+			"fieldname": "warehouse",
+			"fieldtype": "Link",
+			"options": "Warehouse",
+			"width": 180,
+		},
+		{
+			"label": _("Item Group"),
+			"fieldname": "item_group",
+			"fieldtype": "Link",
+			"options": "Item Group",
+			"width": 150,
+		},
+	]
+	columns.extend(
+		{
+			"label": _("{0} Days").format(label),
+			"fieldname": get_bucket_fieldname(label),
+			"fieldtype": "Float",
+			"width": 110,
+		}
+		for label, _upper in AGE_BUCKETS
+	)
+	columns.extend(
+		[
+			{"label": _("Total Qty"), "fieldname": "total_qty", "fieldtype": "Float", "width": 110},
+			{"label": _("Avg Age (Days)"), "fieldname": "average_age", "fieldtype": "Float", "width": 120},
+		]
+	)
+	return columns
+
+
+def get_bucket_fieldname(label: str) -> str:
+	return "age_" + label.replace("-", "_").replace("+", "_plus")
+
+
+def get_age_bucket(age_days: int) -> str:
+	for label, upper in AGE_BUCKETS:
+		if upper is None or age_days <= upper:
+			return label
+	return AGE_BUCKETS[-1][0]
+
+
+def get_data(filters):
+	as_on_date = getdate(filters.as_on_date)
+	warehouse = filters.get("warehouse")
+	groups = {}
+	for layer in iter_open_layers(get_ledger_events(filters)):
+		if warehouse and layer["warehouse"] != warehouse:
+			continue
+		age_days = max(date_diff(as_on_date, layer["posting_date"]), 0)
+		key = (layer["customer"], layer["warehouse"], layer["item_group"])
+		group = groups.get(key)
+		if group is None:
+			group = groups[key] = {
+				"customer": key[0],
+				"warehouse": key[1],
+				"item_group": key[2],
+				**{get_bucket_fieldname(label): 0.0 for label, _upper in AGE_BUCKETS},
+				"total_qty": 0.0,
+				"qty_days": 0.0,
+			}
+		group[get_bucket_fieldname(get_age_bucket(age_days))] += layer["qty"]
+		group["total_qty"] += layer["qty"]
+		group["qty_days"] += layer["qty"] * age_days
+
+	data = []
+	for group in groups.values():
+		if flt(group["total_qty"], QTY_PRECISION) <= 0:
+			continue
+		for label, _upper in AGE_BUCKETS:
+			fieldname = get_bucket_fieldname(label)
+			group[fieldname] = flt(group[fieldname], QTY_PRECISION)
+		group["average_age"] = flt(group.pop("qty_days") / group["total_qty"], 1)
+		group["total_qty"] = flt(group["total_qty"], QTY_PRECISION)
+		data.append(group)
+
+	return sorted(
+		data, key=lambda row: (row["customer"] or "", row["warehouse"] or "", row["item_group"] or "")
+	)
+
+
+def get_ledger_events(filters):
+	"""Batch ledger events up to the as-on date, sorted for a single FIFO sweep.
+
+	Rows are ordered by batch, then posting time, and negatives first within one voucher
+	so a transfer's outgoing leg is consumed before its incoming leg is booked. The warehouse
+	filter selects batches that touched the warehouse but keeps their full ledger, so stock
+	transferred in keeps the date it was received elsewhere; ``get_data`` drops the layers
+	held in other warehouses.
+	"""
+	conditions = ["sle.is_cancelled = 0", "sle.posting_date <= %(as_on_date)s"]
+	if filters.get("company"):
+		conditions.append("sle.company = %(company)s")
+	ledger_conditions = " and ".join(conditions)
+
+	batch_conditions = ["ifnull(batch.custom_customer, '') != ''"]
+	if filters.get("customer"):
+		batch_conditions.append("batch.custom_customer = %(customer)s")
+	if filters.get("item_group"):
+		batch_conditions.append("item.item_group = %(item_group)s")
+	if filters.get("warehouse"):
+		batch_conditions.append(
+			f"""batch.name in (
+				select sle.batch_no
+				from `tabStock Ledger Entry` sle
+				where {ledger_conditions}
+					and sle.warehouse = %(warehouse)s
+					and ifnull(sle.batch_no, '') != ''
+				union
+				select sbe.batch_no
+				from `tabStock Ledger Entry` sle
+				inner join `tabSerial and Batch Entry` sbe
+					on sbe.parent = sle.serial_and_batch_bundle
+				where {ledger_conditions}
+					and sle.warehouse = %(warehouse)s
+					and ifnull(sle.batch_no, '') = ''
+					and ifnull(sbe.is_cancelled, 0) = 0
+			)"""
+		)
+
+	with frappe.db.unbuffered_cursor():
+		yield from frappe.db.sql(
+			f"""
+			select
+				event.batch_no,
+				event.warehouse,
+				event.voucher_no,
+				event.posting_date,
+				event.qty,
+				batch.custom_customer as customer,
+				ifnull(item.item_group, '') as item_group
+			from (
+				select
+					sle.batch_no, sle.item_code, sle.warehouse, sle.voucher_no, sle.posting_date,
+					sle.posting_time, sle.creation, sle.actual_qty as qty
+				from `tabStock Ledger Entry` sle
+				where {ledger_conditions}
+					and ifnull(sle.batch_no, '') != ''
+
+				union all
+
+				select
+					sbe.batch_no, sle.item_code, sle.warehouse, sle.voucher_no, sle.posting_date,
+					sle.posting_time, sle.creation, sbe.qty as qty
+				from `tabStock Ledger Entry` sle
+				inner join `tabSerial and Batch Entry` sbe
+					on sbe.parent = sle.serial_and_batch_bundle
+				where {ledger_conditions}
+					and ifnull(sle.batch_no, '') = ''
+					and ifnull(sle.serial_and_batch_bundle, '') != ''
+					and ifnull(sbe.batch_no, '') != ''
+					and ifnull(sbe.is_cancelled, 0) = 0
+			) event
+			inner join `tabBatch` batch on batch.name = event.batch_no
+			left join `tabItem` item on item.name = event.item_code
+			where {" and ".join(batch_conditions)}
+			order by
+				event.batch_no,
+				event.posting_date,
+				event.posting_time,
+				event.creation,
+				event.voucher_no,
+				event.qty
+			""",
+			{
+				"as_on_date": filters.as_on_date,
+				"company": filters.get("company"),
+				"customer": filters.get("customer"),
+				"warehouse": filters.get("warehouse"),
+				"item_group": filters.get("item_group"),
+			},
+			as_dict=True,
+			as_iterator=True,
+		)
+
+
+def iter_open_layers(events):
+	"""Yield the inward layers still in stock after FIFO consumption, one batch at a time.
+
+	``events`` must be sorted by batch and posting time. Receipts open a layer dated on their
+	posting date; issues consume the oldest layers of that warehouse first. Stock moved between
+	warehouses by one voucher keeps the dates of the layers it was taken from, so a transfer
+	does not reset its age.
+	"""
+	current_batch = None
+	layers = {}
+	in_transit = {}
+
+	for event in events:
+		if event.batch_no != current_batch:
+			yield from _flush_layers(layers)
+			current_batch = event.batch_no
+			layers = {}
+			in_transit = {}
+
+		qty = flt(event.qty)
+		warehouse_layers = layers.setdefault(event.warehouse, deque())
+		if qty < 0:
+			consumed = _consume_fifo(warehouse_layers, -qty)
+			in_transit.setdefault(event.voucher_no, deque()).extend(consumed)
+		elif qty > 0:
+			moved = _consume_fifo(in_transit.get(event.voucher_no) or deque(), qty)
+			moved_qty = sum(layer["qty"] for layer in moved)
+			for layer in moved:
+				warehouse_layers.append({**layer, "warehouse": event.warehouse})
+			if qty - moved_qty > 0:
+				warehouse_layers.append(
+					{
+						"qty": qty - moved_qty,
+						"posting_date": event.posting_date,
+						"customer": event.customer,
+						"warehouse": event.warehouse,
+						"item_group": event.item_group,
+					}
+				)
+
+	yield from _flush_layers(layers)
+
+
+def _consume_fifo(layers, qty):
+	"""Take ``qty`` from the front of ``layers``; return the slices taken (with their dates)."""
+	consumed = []
+	while qty > 0 and layers:
+		layer = layers[0]
+		if layer["qty"] <= qty:
+			qty -= layer["qty"]
+			consumed.append(layers.popleft())
+		else:
+			layer["qty"] -= qty
+			consumed.append({**layer, "qty": qty})
+			qty = 0
+	return consumed
+
+
+def _flush_layers(layers):
+	for warehouse_layers in layers.values():
+		yield from warehouse_layers
+
+
+def get_chart_data(data):
+	if not data:
+		return None
+
+	return {
+		"data": {
+			"labels": [label for label, _upper in AGE_BUCKETS],
+			"datasets": [
+				{
+					"name": _("Qty"),
+					"values": [
+						flt(sum(row[get_bucket_fieldname(label)] for row in data), QTY_PRECISION)
+						for label, _upper in AGE_BUCKETS
+					],
+				}
+			],
+		},
+		"type": "bar",
+		"colors": ["#f59e0b"],
+	}
+
+
+def get_report_summary(data):
+	total_qty = sum(row["total_qty"] for row in data)
+	oldest_bucket = AGE_BUCKETS[-1][0]
+	aged_qty = sum(row[get_bucket_fieldname(oldest_bucket)] for row in data)
+	average_age = (sum(row["total_qty"] * row["average_age"] for row in data) / total_qty) if total_qty else 0
+
+	return [
+		{"value": total_qty, "label": _("Total Qty"), "datatype": "Float", "indicator": "Blue"},
+		{
+			"value": flt(average_age, 1),
+			"label": _("Avg Age (Days)"),
+			"datatype": "Float",
+			"indicator": "Orange",
+		},
+		{
+			"value": aged_qty,
+			"label": _("Qty Older Than {0} Days").format(AGE_BUCKETS[-2][1]),
+			"datatype": "Float",
+			"indicator": "Red",
+		},
+		{
+			"value": len({row["customer"] for row in data}),
+			"label": _("Customers"),
+			"datatype": "Int",
+			"indicator": "Green",
+		},
+	]
@@ -2,7 +2,10 @@ import frappe
 from frappe import _
 from frappe.utils import flt, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
 
+
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	filters.from_date = filters.get("from_date") or nowdate()
@@ -39,44 +42,25 @@ def get_data(filters):
 		select
 			t.item_code,
 			ifnull(i.item_name, t.item_code) as item_name,
-			sum(t.inward_qty) as inward_qty,
-			sum(t.outward_qty) as outward_qty,
-			sum(t.transfer_qty) as transfer_qty
+			t.inward_qty,
+			t.outward_qty,
+			t.transfer_qty
 		from (
-			select ci.item as item_code, sum(ci.qty) as inward_qty, 0 as outward_qty, 0 as transfer_qty
-			from `tabCold Storage Inward` p
-			inner join `tabCold Storage Inward Item` ci on ci.parent = p.name
-			where p.docstatus = 1
-				and p.posting_date between %(from_date)s and %(to_date)s
-				and (%(company)s = '' or p.company = %(company)s)
-				and (%(item)s = '' or ci.item = %(item)s)
-			group by ci.item
-
-			union all
-
-			select co.item as item_code, 0 as inward_qty, sum(co.qty) as outward_qty, 0 as transfer_qty
-			from `tabCold Storage Outward` p
-			inner join `tabCold Storage Outward Item` co on co.parent = p.name
-			where p.docstatus = 1
-				and p.posting_date between %(from_date)s and %(to_date)s
-				and (%(company)s = '' or p.company = %(company)s)
-				and (%(item)s = '' or co.item = %(item)s)
-			group by co.item
-
-			union all
-
-			select ct.item as item_code, 0 as inward_qty, 0 as outward_qty, sum(ct.qty) as transfer_qty
-			from `tabCold Storage Transfer` p
-			inner join `tabCold Storage Transfer Item` ct on ct.parent = p.name
-			where p.docstatus = 1
-				and p.posting_date between %(from_date)s and %(to_date)s
-				and (%(company)s = '' or p.company = %(company)s)
-				and (%(item)s = '' or ct.item = %(item)s)
-			group by ct.item
+			select
+				dm.item as item_code,
+				sum(case when dm.movement_type = 'Inward' then dm.qty else 0 end) as inward_qty,
+				sum(case when dm.movement_type = 'Outward' then dm.qty else 0 end) as outward_qty,
+				sum(case when dm.movement_type in ('Transfer', 'Transfer Out') then dm.qty else 0 end)
+					as transfer_qty
+			from `tabCold Storage Daily Movement` dm
+			where dm.posting_date between %(from_date)s and %(to_date)s
+				and dm.movement_type in ('Inward', 'Outward', 'Transfer', 'Transfer Out')
+				and (%(company)s = '' or dm.company = %(company)s)
+				and (%(item)s = '' or dm.item = %(item)s)
+			group by dm.item
 		) t
 		left join `tabItem` i on i.name = t.item_code
-		group by t.item_code, i.item_name
-		order by sum(t.inward_qty - t.outward_qty) desc, t.item_code asc
+		order by t.inward_qty - t.outward_qty desc, t.item_code asc
 		""",
 		params,
 		as_dict=True,
@@ -70,5 +70,20 @@ frappe.query_reports["Cold Storage Live Batch Stock"] = {
 			default: 0,
 		description: __("Enable to filter by include zero/negative balance."),
 		},
+		{
+			fieldname: "page_length",
+			label: __("Rows per Page"),
+			fieldtype: "Select",
+			options: "100\n500\n1000\n5000",
+			default: "500",
+			description: __("Number of batch-location rows loaded per page."),
+		},
+		{
+			fieldname: "page",
+			label: __("Page"),
+			fieldtype: "Int",
+			default: 1,
+			description: __("Page of batch-location rows to show; totals cover all pages."),
+		},
 	],
 };
@@ -1,21 +1,27 @@
 import frappe
+from frappe import _
+from frappe.utils import cint, flt, nowdate
+
 from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
 	get_default_company,
 )
-from erpnext.stock.doctype.batch.batch import get_batch_qty
-from frappe import _
-from frappe.utils import cint, date_diff, flt, nowdate
+from cold_storage.cold_storage.instrumentation import instrumented
 
+DEFAULT_PAGE_LENGTH = 500
 
+
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	if not filters.get("as_on_date"):
 		filters.as_on_date = nowdate()
 
+	balance_sql, params = get_balance_query(filters)
 	columns = get_columns()
-	data = get_data(filters)
-	chart = get_chart_data(data)
-	report_summary = get_report_summary(data)
+	data = get_data(filters, balance_sql, params)
+	totals = get_balance_totals(balance_sql, params)
+	chart = get_chart_data(totals)
+	report_summary = get_report_summary(totals)
 	return columns, data, None, chart, report_summary
 
 
@@ -75,15 +81,14 @@ def get_columns():
 	]
 
 
-def get_data(filters):
-	report_company = get_report_company(filters)
-
-	conditions = [
-		"se.docstatus = 1",
-		"ifnull(sed.batch_no, '') != ''",
-		"se.posting_date <= %(as_on_date)s",
-	]
+def get_balance_query(filters):
+	"""Return SQL yielding one row per batch/item/warehouse balance as on the filter date.
 
+	The stock ledger (direct ``batch_no`` plus Serial and Batch Bundle entries) is aggregated once,
+	giving balance, first/last movement and age together; zero balances are dropped in SQL. The
+	customer filter narrows the ledger rows before aggregation.
+	"""
+	report_company = get_report_company(filters)
 	params = {
 		"as_on_date": filters.as_on_date,
 		"company": report_company,
@@ -93,70 +98,105 @@ def get_data(filters):
 		"batch_no": filters.get("batch_no"),
 	}
 
+	ledger_conditions = ["sle.is_cancelled = 0", "sle.posting_date <= %(as_on_date)s"]
 	if report_company:
-		conditions.append("w.company = %(company)s")
-	if filters.get("customer"):
-		conditions.append("b.custom_customer = %(customer)s")
+		ledger_conditions.append("sle.company = %(company)s")
 	if filters.get("item"):
-		conditions.append("sed.item_code = %(item)s")
+		ledger_conditions.append("sle.item_code = %(item)s")
 	if filters.get("warehouse"):
-		conditions.append("ifnull(sed.t_warehouse, sed.s_warehouse) = %(warehouse)s")
-	if filters.get("batch_no"):
-		conditions.append("sed.batch_no = %(batch_no)s")
+		ledger_conditions.append("sle.warehouse = %(warehouse)s")
+	ledger_conditions = " and ".join(ledger_conditions)
 
-	rows = frappe.db.sql(
-		f"""
+	batch_condition = "= %(batch_no)s" if filters.get("batch_no") else "!= ''"
+	sle_customer_condition = sbe_customer_condition = ""
+	if filters.get("customer"):
+		customer_batches = "(select cb.name from `tabBatch` cb where cb.custom_customer = %(customer)s)"
+		sle_customer_condition = f"and sle.batch_no in {customer_batches}"
+		sbe_customer_condition = f"and sbe.batch_no in {customer_batches}"
+	having = "" if cint(filters.get("include_zero_balance")) else "having round(sum(movement.qty), 3) > 0"
+
+	balance_sql = f"""
 		select
-			sed.batch_no as batch_no,
-			b.custom_customer as customer,
-			sed.item_code as item,
+			ledger.batch_no as batch_no,
+			batch.custom_customer as customer,
+			ledger.item_code as item,
 			i.item_name as item_name,
-			ifnull(sed.t_warehouse, sed.s_warehouse) as warehouse,
+			ledger.warehouse as warehouse,
 			w.company as company,
 			i.stock_uom as uom,
-			min(se.posting_date) as first_movement_date,
-			max(se.posting_date) as last_movement_date
-		from `tabStock Entry Detail` sed
-		inner join `tabStock Entry` se on se.name = sed.parent
-		left join `tabBatch` b on b.name = sed.batch_no
-		left join `tabItem` i on i.name = sed.item_code
-		left join `tabWarehouse` w on w.name = ifnull(sed.t_warehouse, sed.s_warehouse)
-		where {" and ".join(conditions)}
-		group by
-			sed.batch_no,
-			b.custom_customer,
-			sed.item_code,
-			i.item_name,
-			ifnull(sed.t_warehouse, sed.s_warehouse),
-			w.company,
-			i.stock_uom
-		order by max(se.posting_date) desc, sed.batch_no asc
+			ledger.balance_qty as balance_qty,
+			ledger.first_movement_date as first_movement_date,
+			ledger.last_movement_date as last_movement_date,
+			greatest(datediff(%(as_on_date)s, ledger.first_movement_date), 0) as age_days
+		from (
+			select
+				movement.batch_no,
+				movement.item_code,
+				movement.warehouse,
+				round(sum(movement.qty), 3) as balance_qty,
+				min(movement.posting_date) as first_movement_date,
+				max(movement.posting_date) as last_movement_date
+			from (
+				select sle.batch_no, sle.item_code, sle.warehouse, sle.posting_date, sle.actual_qty as qty
+				from `tabStock Ledger Entry` sle
+				where {ledger_conditions}
+					and ifnull(sle.batch_no, '') {batch_condition}
+					{sle_customer_condition}
+
+				union all
+
+				select sbe.batch_no, sle.item_code, sle.warehouse, sle.posting_date, sbe.qty as qty
+				from `tabStock Ledger Entry` sle
+				inner join `tabSerial and Batch Entry` sbe
+					on sbe.parent = sle.serial_and_batch_bundle
+				where {ledger_conditions}
+					and ifnull(sle.batch_no, '') = ''
+					and ifnull(sle.serial_and_batch_bundle, '') != ''
+					and ifnull(sbe.batch_no, '') {batch_condition}
+					and ifnull(sbe.is_cancelled, 0) = 0
+					{sbe_customer_condition}
+			) movement
+			group by movement.batch_no, movement.item_code, movement.warehouse
+			{having}
+		) ledger
+		left join `tabBatch` batch on batch.name = ledger.batch_no
+		left join `tabItem` i on i.name = ledger.item_code
+		left join `tabWarehouse` w on w.name = ledger.warehouse
+	"""
+	return balance_sql, params
+
+
+def get_data(filters, balance_sql, params):
+	"""One page of balances, newest movement first."""
+	page_length = max(cint(filters.get("page_length")) or DEFAULT_PAGE_LENGTH, 1)
+	page = max(cint(filters.get("page")), 1)
+	return frappe.db.sql(
+		f"""
+		select balance.*
+		from ({balance_sql}) balance
+		order by balance.last_movement_date desc, balance.batch_no asc, balance.warehouse asc
+		limit %(page_length)s offset %(offset)s
 		""",
-		params,
+		{**params, "page_length": page_length, "offset": (page - 1) * page_length},
 		as_dict=True,
 	)
 
-	data = []
-	include_zero_balance = cint(filters.get("include_zero_balance"))
 
-	for row in rows:
-		balance_qty = (
-			flt(get_batch_qty(batch_no=row.batch_no, warehouse=row.warehouse))
-			if row.batch_no and row.warehouse
-			else 0.0
-		)
-		if not include_zero_balance and balance_qty <= 0:
-			continue
-
-		row.balance_qty = balance_qty
-		row.age_days = (
-			max(cint(date_diff(filters.as_on_date, row.first_movement_date)), 0)
-			if row.first_movement_date
-			else 0
-		)
-		data.append(row)
-
-	return data
+def get_balance_totals(balance_sql, params):
+	"""Row count and quantity per customer/warehouse across all pages, for the chart and summary."""
+	return frappe.db.sql(
+		f"""
+		select
+			balance.customer,
+			balance.warehouse,
+			count(*) as row_count,
+			sum(balance.balance_qty) as balance_qty
+		from ({balance_sql}) balance
+		group by balance.customer, balance.warehouse
+		""",
+		params,
+		as_dict=True,
+	)
 
 
 def get_report_company(filters):
@@ -169,12 +209,12 @@ def get_report_company(filters):
 	return company or filters.get("company")
 
 
-def get_chart_data(data):
-	if not data:
+def get_chart_data(totals):
+	if not totals:
 		return None
 
 	by_customer = {}
-	for row in data:
+	for row in totals:
 		customer = row.get("customer") or _("Unassigned")
 		by_customer[customer] = flt(by_customer.get(customer)) + flt(row.get("balance_qty"))
 
@@ -192,13 +232,14 @@ def get_chart_data(data):
 	}
 
 
-def get_report_summary(data):
-	total_qty = sum(flt(row.get("balance_qty")) for row in data)
-	unique_customers = len({row.get("customer") for row in data if row.get("customer")})
-	unique_warehouses = len({row.get("warehouse") for row in data if row.get("warehouse")})
+def get_report_summary(totals):
+	total_qty = sum(flt(row.get("balance_qty")) for row in totals)
+	unique_customers = len({row.get("customer") for row in totals if row.get("customer")})
+	unique_warehouses = len({row.get("warehouse") for row in totals if row.get("warehouse")})
+	row_count = sum(cint(row.get("row_count")) for row in totals)
 
 	return [
-		{"value": len(data), "label": _("Batch-Location Rows"), "datatype": "Int", "indicator": "Blue"},
+		{"value": row_count, "label": _("Batch-Location Rows"), "datatype": "Int", "indicator": "Blue"},
 		{"value": total_qty, "label": _("Total Available Qty"), "datatype": "Float", "indicator": "Green"},
 		{"value": unique_customers, "label": _("Customers"), "datatype": "Int", "indicator": "Orange"},
 		{"value": unique_warehouses, "label": _("Warehouses"), "datatype": "Int", "indicator": "Purple"},
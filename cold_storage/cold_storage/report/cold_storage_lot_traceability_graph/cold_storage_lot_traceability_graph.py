@@ -2,9 +2,12 @@ import frappe
 from frappe import _
 from frappe.utils import flt, getdate, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
+
 MOVEMENT_ORDER = {"Inward": 1, "Transfer": 2, "Outward": 3}
 
 
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	if not filters.get("batch_no"):
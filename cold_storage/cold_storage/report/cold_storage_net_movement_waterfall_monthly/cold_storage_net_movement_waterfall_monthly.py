@@ -1,13 +1,17 @@
 from datetime import date
 
 import frappe
+from frappe import _
+from frappe.utils import flt, getdate, nowdate
+
+from cold_storage.cold_storage.date_ranges import fold_by_month
 from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
 	get_default_company,
 )
-from frappe import _
-from frappe.utils import flt, getdate, nowdate
+from cold_storage.cold_storage.instrumentation import instrumented
 
 
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	set_default_filters(filters)
@@ -105,108 +109,44 @@ def get_months(from_date, to_date):
 
 
 def get_opening_net_movement(filters, first_month_start):
-	params = {
-		"first_month_start": first_month_start,
-		"company": filters.get("company") or "",
-		"customer": filters.get("customer") or "",
-		"item": filters.get("item") or "",
-		"warehouse": filters.get("warehouse") or "",
-	}
-
-	inward_qty = flt(
+	return flt(
 		frappe.db.sql(
 			"""
-			select sum(cii.qty)
-			from `tabCold Storage Inward` ci
-			inner join `tabCold Storage Inward Item` cii
-				on cii.parent = ci.name
-				and cii.parenttype = 'Cold Storage Inward'
-			where ci.docstatus = 1
-				and ci.posting_date is not null
-				and ci.posting_date < %(first_month_start)s
-				and (%(company)s = '' or ci.company = %(company)s)
-				and (%(customer)s = '' or ci.customer = %(customer)s)
-				and (%(item)s = '' or cii.item = %(item)s)
-				and (%(warehouse)s = '' or cii.warehouse = %(warehouse)s)
+			select sum(case when dm.movement_type = 'Inward' then dm.qty else -dm.qty end)
+			from `tabCold Storage Daily Movement` dm
+			where dm.posting_date < %(first_month_start)s
+				and dm.movement_type in ('Inward', 'Outward')
+				and (%(company)s = '' or dm.company = %(company)s)
+				and (%(customer)s = '' or dm.customer = %(customer)s)
+				and (%(item)s = '' or dm.item = %(item)s)
+				and (%(warehouse)s = '' or dm.warehouse = %(warehouse)s)
 			""",
-			params,
-		)[0][0]
-	)
-
-	outward_qty = flt(
-		frappe.db.sql(
-			"""
-			select sum(coi.qty)
-			from `tabCold Storage Outward` co
-			inner join `tabCold Storage Outward Item` coi
-				on coi.parent = co.name
-				and coi.parenttype = 'Cold Storage Outward'
-			where co.docstatus = 1
-				and co.posting_date is not null
-				and co.posting_date < %(first_month_start)s
-				and (%(company)s = '' or co.company = %(company)s)
-				and (%(customer)s = '' or co.customer = %(customer)s)
-				and (%(item)s = '' or coi.item = %(item)s)
-				and (%(warehouse)s = '' or coi.warehouse = %(warehouse)s)
-			""",
-			params,
+			{
+				"first_month_start": first_month_start,
+				"company": filters.get("company") or "",
+				"customer": filters.get("customer") or "",
+				"item": filters.get("item") or "",
+				"warehouse": filters.get("warehouse") or "",
+			},
 		)[0][0]
 	)
 
-	return inward_qty - outward_qty
-
 
 def get_monthly_movement_map(filters):
 	rows = frappe.db.sql(
 		"""
 		select
-			movement.year_num,
-			movement.month_num,
-			sum(movement.inward_qty) as inward_qty,
-			sum(movement.outward_qty) as outward_qty
-		from (
-			select
-				year(ci.posting_date) as year_num,
-				month(ci.posting_date) as month_num,
-				sum(cii.qty) as inward_qty,
-				0 as outward_qty
-			from `tabCold Storage Inward` ci
-			inner join `tabCold Storage Inward Item` cii
-				on cii.parent = ci.name
-				and cii.parenttype = 'Cold Storage Inward'
-			where ci.docstatus = 1
-				and ci.posting_date is not null
-				and ci.posting_date >= %(from_date)s
-				and ci.posting_date <= %(to_date)s
-				and (%(company)s = '' or ci.company = %(company)s)
-				and (%(customer)s = '' or ci.customer = %(customer)s)
-				and (%(item)s = '' or cii.item = %(item)s)
-				and (%(warehouse)s = '' or cii.warehouse = %(warehouse)s)
-			group by year(ci.posting_date), month(ci.posting_date)
-
-			union all
-
-			select
-				year(co.posting_date) as year_num,
-				month(co.posting_date) as month_num,
-				0 as inward_qty,
-				sum(coi.qty) as outward_qty
-			from `tabCold Storage Outward` co
-			inner join `tabCold Storage Outward Item` coi
-				on coi.parent = co.name
-				and coi.parenttype = 'Cold Storage Outward'
-			where co.docstatus = 1
-				and co.posting_date is not null
-				and co.posting_date >= %(from_date)s
-				and co.posting_date <= %(to_date)s
-				and (%(company)s = '' or co.company = %(company)s)
-				and (%(customer)s = '' or co.customer = %(customer)s)
-				and (%(item)s = '' or coi.item = %(item)s)
-				and (%(warehouse)s = '' or coi.warehouse = %(warehouse)s)
-			group by year(co.posting_date), month(co.posting_date)
-		) movement
-		group by movement.year_num, movement.month_num
-		order by movement.year_num, movement.month_num
+			dm.posting_date,
+			sum(case when dm.movement_type = 'Inward' then dm.qty else 0 end) as inward_qty,
+			sum(case when dm.movement_type = 'Outward' then dm.qty else 0 end) as outward_qty
+		from `tabCold Storage Daily Movement` dm
+		where dm.posting_date between %(from_date)s and %(to_date)s
+			and dm.movement_type in ('Inward', 'Outward')
+			and (%(company)s = '' or dm.company = %(company)s)
+			and (%(customer)s = '' or dm.customer = %(customer)s)
+			and (%(item)s = '' or dm.item = %(item)s)
+			and (%(warehouse)s = '' or dm.warehouse = %(warehouse)s)
+		group by dm.posting_date
 		""",
 		{
 			"from_date": filters.from_date,
@@ -219,20 +159,7 @@ def get_monthly_movement_map(filters):
 		as_dict=True,
 	)
 
-	return {
-		(cint_or_zero(row.year_num), cint_or_zero(row.month_num)): {
-			"inward_qty": flt(row.inward_qty),
-			"outward_qty": flt(row.outward_qty),
-		}
-		for row in rows
-	}
-
-
-def cint_or_zero(value):
-	try:
-		return int(value or 0)
-	except Exception:
-		return 0
+	return fold_by_month(rows, ("inward_qty", "outward_qty"))
 
 
 def build_data(months, monthly_movement_map, opening_net_movement):
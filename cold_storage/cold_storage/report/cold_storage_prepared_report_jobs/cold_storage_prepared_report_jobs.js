@@ -0,0 +1,38 @@
+frappe.query_reports["Cold Storage Prepared Report Jobs"] = {
+	filters: [
+		{
+			fieldname: "from_date",
+			label: __("From Date"),
+			fieldtype: "Date",
+			default: frappe.datetime.add_days(frappe.datetime.get_today(), -30),
+			description: __("Filter by queued date."),
+		},
+		{
+			fieldname: "to_date",
+			label: __("To Date"),
+			fieldtype: "Date",
+			default: frappe.datetime.get_today(),
+			description: __("Filter by queued date."),
+		},
+		{
+			fieldname: "report_name",
+			label: __("Report"),
+			fieldtype: "Select",
+			options: [
+				"",
+				"Cold Storage Audit Trail Compliance Pack",
+				"Cold Storage Warehouse Occupancy Timeline",
+				"Cold Storage Customer Register",
+				"Cold Storage Live Batch Stock",
+			],
+			description: __("Filter by prepared report."),
+		},
+		{
+			fieldname: "status",
+			label: __("Status"),
+			fieldtype: "Select",
+			options: "\nQueued\nStarted\nCompleted\nError",
+			description: __("Filter by job status."),
+		},
+	],
+};
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, flt, nowdate
+
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.cold_storage.prepared_reports import PREPARED_REPORTS
+
+ROW_LIMIT = 1000
+
+
+@instrumented
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	if not filters.get("from_date"):
+		filters.from_date = add_days(nowdate(), -30)
+	if not filters.get("to_date"):
+		filters.to_date = nowdate()
+
+	columns = get_columns()
+	data = get_data(filters)
+	return columns, data, None, None, get_report_summary(data)
+
+
+def get_columns():
+	return [
+		{
+			"label": _("Prepared Report"),
+			"fieldname": "name",
+			"fieldtype": "Link",
+			"options": "Prepared Report",
+			"width": 120,
+		},
+		{
+			"label": _("Report"),
+			"fieldname": "report_name",
+			"fieldtype": "Link",
+			"options": "Report",
+			"width": 260,
+		},
+		{
+			"label": _("Status"),
+			"fieldname": "status",
+			"fieldtype": "Data",
+			"width": 100,
+		},
+		{
+			"label": _("Requested By"),
+			"fieldname": "owner",
+			"fieldtype": "Link",
+			"options": "User",
+			"width": 190,
+		},
+		{
+			"label": _("Queued At"),
+			"fieldname": "queued_at",
+			"fieldtype": "Datetime",
+			"width": 170,
+		},
+		{
+			"label": _("Finished At"),
+			"fieldname": "report_end_time",
+			"fieldtype": "Datetime",
+			"width": 170,
+		},
+		{
+			"label": _("Turnaround (s)"),
+			"fieldname": "turnaround",
+			"fieldtype": "Int",
+			"width": 110,
+		},
+		{
+			"label": _("Filters"),
+			"fieldname": "filters",
+			"fieldtype": "Code",
+			"width": 260,
+		},
+		{
+			"label": _("Error"),
+			"fieldname": "error_message",
+			"fieldtype": "Data",
+			"width": 260,
+		},
+	]
+
+
+def get_data(filters):
+	conditions = ["report_name in %(report_names)s"]
+	params = {"report_names": PREPARED_REPORTS, "row_limit": ROW_LIMIT}
+
+	if filters.get("from_date"):
+		conditions.append("coalesce(queued_at, creation) >= %(from_datetime)s")
+		params["from_datetime"] = f"{filters.from_date} 00:00:00"
+
+	if filters.get("to_date"):
+		conditions.append("coalesce(queued_at, creation) <= %(to_datetime)s")
+		params["to_datetime"] = f"{filters.to_date} 23:59:59"
+
+	if filters.get("report_name"):
+		conditions.append("report_name = %(report_name)s")
+		params["report_name"] = filters.report_name
+
+	if filters.get("status"):
+		conditions.append("status = %(status)s")
+		params["status"] = filters.status
+
+	return frappe.db.sql(
+		f"""
+		select
+			name,
+			report_name,
+			status,
+			owner,
+			coalesce(queued_at, creation) as queued_at,
+			report_end_time,
+			-- Prepared Report records no start time, so this includes time waiting in the queue.
+			case
+				when report_end_time is null then null
+				else timestampdiff(second, coalesce(queued_at, creation), report_end_time)
+			end as turnaround,
+			filters,
+			error_message
+		from `tabPrepared Report`
+		where {" and ".join(conditions)}
+		order by queued_at desc, creation desc
+		limit %(row_limit)s
+		""",
+		params,
+		as_dict=True,
+	)
+
+
+def get_report_summary(data):
+	turnarounds = [flt(row.turnaround) for row in data if row.turnaround is not None]
+	failed = sum(1 for row in data if row.status == "Error")
+	return [
+		{"value": len(data), "label": _("Jobs"), "datatype": "Int", "indicator": "Blue"},
+		{
+			"value": (sum(turnarounds) / len(turnarounds)) if turnarounds else 0,
+			"label": _("Average Turnaround (s)"),
+			"datatype": "Float",
+			"indicator": "Green",
+		},
+		{
+			"value": max(turnarounds) if turnarounds else 0,
+			"label": _("Longest Turnaround (s)"),
+			"datatype": "Float",
+			"indicator": "Orange",
+		},
+		{"value": failed, "label": _("Failed"), "datatype": "Int", "indicator": "Red" if failed else "Green"},
+	]
@@ -1,6 +1,9 @@
 import frappe
 from frappe import _
-from frappe.utils import cint, flt, getdate, nowdate
+from frappe.utils import add_days, cint, flt, getdate, nowdate
+
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.cold_storage.receivable_snapshots import RECEIVABLE_LEDGER_SQL, get_receivable_balances
 
 BUCKETS = [
 	("Current", "Current"),
@@ -12,8 +15,20 @@ BUCKETS = [
 	("150-180", "150-180 Days"),
 	("180+", "180+ Days"),
 ]
+# Days past due covered by each bucket (inclusive); the last bucket is open-ended.
+BUCKET_MAX_AGE_DAYS = [
+	("Current", 0),
+	("1-30", 30),
+	("31-60", 60),
+	("61-90", 90),
+	("90-120", 120),
+	("120-150", 150),
+	("150-180", 180),
+	("180+", None),
+]
 
 
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	filters.from_date = getdate(filters.get("from_date") or nowdate())
@@ -27,7 +42,8 @@ def execute(filters=None):
 	chart = get_chart(data)
 	message = _(
 		"Formula applied per bucket: Opening AR + New Bills - Collections = Closing AR. "
-		"Collections are payments allocated in selected period."
+		"Collections are all Payment Ledger settlements in the selected period (payments, journal "
+		"entries and credit notes). Closing Actual is the ledger balance on To Date."
 	)
 	summary = get_summary(data)
 	return columns, data, message, chart, summary
@@ -47,65 +63,26 @@ def get_columns():
 
 def get_bucket_key(as_on_date, due_date):
 	age_days = cint(frappe.utils.date_diff(as_on_date, due_date))
-	if age_days <= 0:
-		return "Current"
-	if age_days <= 30:
-		return "1-30"
-	if age_days <= 60:
-		return "31-60"
-	if age_days <= 90:
-		return "61-90"
-	if age_days <= 120:
-		return "90-120"
-	if age_days <= 150:
-		return "120-150"
-	if age_days <= 180:
-		return "150-180"
-	return "180+"
+	for key, max_age_days in BUCKET_MAX_AGE_DAYS:
+		if max_age_days is None or age_days <= max_age_days:
+			return key
+	return BUCKETS[-1][0]
+
+
+def get_bucket_sql(as_on_date_param, due_date_column):
+	"""SQL ``case`` expression matching ``get_bucket_key``."""
+	age = f"datediff({as_on_date_param}, {due_date_column})"
+	conditions = " ".join(
+		f"when {age} <= {max_age_days} then '{key}'"
+		for key, max_age_days in BUCKET_MAX_AGE_DAYS
+		if max_age_days is not None
+	)
+	return f"case {conditions} else '{BUCKETS[-1][0]}' end"
 
 
 def get_data(filters):
-	invoice_rows = frappe.db.sql(
-		"""
-		select
-			si.name,
-			si.customer,
-			si.posting_date,
-			ifnull(si.due_date, si.posting_date) as due_date,
-			si.grand_total,
-			si.outstanding_amount
-		from `tabSales Invoice` si
-		where si.docstatus = 1
-			and si.posting_date <= %(to_date)s
-			and (%(company)s = '' or si.company = %(company)s)
-			and (%(customer)s = '' or si.customer = %(customer)s)
-		""",
-		{
-			"to_date": filters.to_date,
-			"company": filters.get("company") or "",
-			"customer": filters.get("customer") or "",
-		},
-		as_dict=True,
-	)
-
-	collections_map = {
-		row.reference_name: flt(row.collected_amount)
-		for row in frappe.db.sql(
-			"""
-			select
-				per.reference_name,
-				sum(per.allocated_amount) as collected_amount
-			from `tabPayment Entry Reference` per
-			inner join `tabPayment Entry` pe on pe.name = per.parent
-			where pe.docstatus = 1
-				and per.reference_doctype = 'Sales Invoice'
-				and pe.posting_date between %(from_date)s and %(to_date)s
-			group by per.reference_name
-			""",
-			{"from_date": filters.from_date, "to_date": filters.to_date},
-			as_dict=True,
-		)
-	}
+	company = filters.get("company") or ""
+	customer = filters.get("customer") or ""
 
 	bucket_map = {
 		key: {
@@ -120,20 +97,38 @@ def get_data(filters):
 		for key, label in BUCKETS
 	}
 
-	for row in invoice_rows:
-		bucket = get_bucket_key(filters.to_date, row.get("due_date"))
-		rec = bucket_map[bucket]
-		collected_in_period = flt(collections_map.get(row.get("name"), 0.0))
-		outstanding_now = flt(row.get("outstanding_amount"))
-		grand_total = flt(row.get("grand_total"))
+	# Opening and closing balances: cached month-end snapshot plus the days after it.
+	opening = get_receivable_balances(company, customer, add_days(filters.from_date, -1))
+	for (_customer, due_date), balance in opening.items():
+		bucket_map[get_bucket_key(filters.to_date, due_date)]["opening_ar"] += balance
 
-		rec["collections"] += collected_in_period
-		rec["closing_actual"] += outstanding_now
+	closing = get_receivable_balances(company, customer, filters.to_date)
+	for (_customer, due_date), balance in closing.items():
+		bucket_map[get_bucket_key(filters.to_date, due_date)]["closing_actual"] += balance
 
-		if row.get("posting_date") < filters.from_date:
-			rec["opening_ar"] += outstanding_now + collected_in_period
-		elif row.get("posting_date") <= filters.to_date:
-			rec["new_bills"] += grand_total
+	# Period activity: one bounded ledger scan, bucketed in SQL.
+	for row in frappe.db.sql(
+		f"""
+		select
+			{get_bucket_sql("%(to_date)s", "ledger.due_date")} as bucket,
+			sum(if(ledger.voucher_no = ledger.against_voucher_no and ledger.amount > 0, ledger.amount, 0))
+				as new_bills,
+			sum(if(ledger.voucher_no = ledger.against_voucher_no and ledger.amount > 0, 0, -ledger.amount))
+				as collections
+		from ({RECEIVABLE_LEDGER_SQL}) ledger
+		group by bucket
+		""",
+		{
+			"company": company,
+			"customer": customer,
+			"from_date": filters.from_date,
+			"to_date": filters.to_date,
+		},
+		as_dict=True,
+	):
+		rec = bucket_map[row.bucket]
+		rec["new_bills"] += flt(row.new_bills)
+		rec["collections"] += flt(row.collections)
 
 	for key, _bucket_label in BUCKETS:
 		rec = bucket_map[key]
@@ -2,7 +2,10 @@ import frappe
 from frappe import _
 from frappe.utils import cint, flt, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
 
+
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	filters.from_date = filters.get("from_date") or nowdate()
@@ -38,62 +41,22 @@ def get_data(filters):
 		"item_group": filters.get("item_group") or "",
 	}
 
+	# Ownership transfers carry both legs in the fact table; count each line once via "Transfer Out".
 	rows = frappe.db.sql(
 		"""
 		select
-			t.item_group,
-			sum(t.inward_qty) as inward_qty,
-			sum(t.transfer_qty) as transfer_qty,
-			sum(t.outward_qty) as outward_qty
-		from (
-			select
-				ifnull(i.item_group, 'Uncategorized') as item_group,
-				sum(ci.qty) as inward_qty,
-				0 as transfer_qty,
-				0 as outward_qty
-			from `tabCold Storage Inward` p
-			inner join `tabCold Storage Inward Item` ci on ci.parent = p.name
-			left join `tabItem` i on i.name = ci.item
-			where p.docstatus = 1
-				and p.posting_date between %(from_date)s and %(to_date)s
-				and (%(company)s = '' or p.company = %(company)s)
-				and (%(item_group)s = '' or ifnull(i.item_group, 'Uncategorized') = %(item_group)s)
-			group by ifnull(i.item_group, 'Uncategorized')
-
-			union all
-
-			select
-				ifnull(i.item_group, 'Uncategorized') as item_group,
-				0 as inward_qty,
-				sum(ct.qty) as transfer_qty,
-				0 as outward_qty
-			from `tabCold Storage Transfer` p
-			inner join `tabCold Storage Transfer Item` ct on ct.parent = p.name
-			left join `tabItem` i on i.name = ct.item
-			where p.docstatus = 1
-				and p.posting_date between %(from_date)s and %(to_date)s
-				and (%(company)s = '' or p.company = %(company)s)
-				and (%(item_group)s = '' or ifnull(i.item_group, 'Uncategorized') = %(item_group)s)
-			group by ifnull(i.item_group, 'Uncategorized')
-
-			union all
-
-			select
-				ifnull(i.item_group, 'Uncategorized') as item_group,
-				0 as inward_qty,
-				0 as transfer_qty,
-				sum(co.qty) as outward_qty
-			from `tabCold Storage Outward` p
-			inner join `tabCold Storage Outward Item` co on co.parent = p.name
-			left join `tabItem` i on i.name = co.item
-			where p.docstatus = 1
-				and p.posting_date between %(from_date)s and %(to_date)s
-				and (%(company)s = '' or p.company = %(company)s)
-				and (%(item_group)s = '' or ifnull(i.item_group, 'Uncategorized') = %(item_group)s)
-			group by ifnull(i.item_group, 'Uncategorized')
-		) t
-		group by t.item_group
-		order by sum(t.inward_qty) desc, t.item_group asc
+			ifnull(nullif(dm.item_group, ''), 'Uncategorized') as item_group,
+			sum(case when dm.movement_type = 'Inward' then dm.qty else 0 end) as inward_qty,
+			sum(case when dm.movement_type in ('Transfer', 'Transfer Out') then dm.qty else 0 end)
+				as transfer_qty,
+			sum(case when dm.movement_type = 'Outward' then dm.qty else 0 end) as outward_qty
+		from `tabCold Storage Daily Movement` dm
+		where dm.posting_date between %(from_date)s and %(to_date)s
+			and dm.movement_type in ('Inward', 'Transfer', 'Transfer Out', 'Outward')
+			and (%(company)s = '' or dm.company = %(company)s)
+			and (%(item_group)s = '' or ifnull(nullif(dm.item_group, ''), 'Uncategorized') = %(item_group)s)
+		group by ifnull(nullif(dm.item_group, ''), 'Uncategorized')
+		order by inward_qty desc, item_group asc
 		""",
 		params,
 		as_dict=True,
@@ -2,9 +2,12 @@ import frappe
 from frappe import _
 from frappe.utils import flt
 
+from cold_storage.cold_storage.instrumentation import instrumented
+
 DOCSTATUS_LABELS = {0: "Draft", 1: "Submitted", 2: "Cancelled"}
 
 
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	columns = get_columns()
@@ -2,7 +2,11 @@ from datetime import date
 
 import frappe
 from frappe import _
-from frappe.utils import cint, flt, getdate, nowdate
+from frappe.utils import flt, getdate, nowdate
+
+from cold_storage.cold_storage.date_ranges import fold_by_month
+from cold_storage.cold_storage.instrumentation import instrumented
+from cold_storage.cold_storage.report_cache import cached_report
 
 STATUS_CAPACITY_NOT_SET = "Capacity Not Set"
 STATUS_EMPTY = "Empty"
@@ -12,6 +16,8 @@ STATUS_OVER_CAPACITY = "Over Capacity"
 PERCENT_PRECISION = 2
 
 
+@instrumented
+@cached_report
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	set_default_filters(filters)
@@ -197,8 +203,7 @@ def get_monthly_change_map(warehouses, from_month_start, to_date):
 		"""
 		select
 			sle.warehouse,
-			year(sle.posting_date) as year_num,
-			month(sle.posting_date) as month_num,
+			sle.posting_date,
 			sum(
 				case
 					when (
@@ -216,7 +221,7 @@ def get_monthly_change_map(warehouses, from_month_start, to_date):
 			and sle.posting_date >= %(from_month_start)s
 			and sle.posting_date <= %(to_date)s
 			and sle.warehouse in %(warehouses)s
-		group by sle.warehouse, year(sle.posting_date), month(sle.posting_date)
+		group by sle.warehouse, sle.posting_date
 		""",
 		{
 			"from_month_start": from_month_start,
@@ -226,7 +231,10 @@ def get_monthly_change_map(warehouses, from_month_start, to_date):
 		as_dict=True,
 	)
 
-	return {(row.warehouse, cint(row.year_num), cint(row.month_num)): flt(row.qty_change) for row in rows}
+	return {
+		key: values["qty_change"]
+		for key, values in fold_by_month(rows, ("qty_change",), key_fields=("warehouse",)).items()
+	}
 
 
 def build_rows(warehouses, months, opening_qty_map, monthly_change_map):
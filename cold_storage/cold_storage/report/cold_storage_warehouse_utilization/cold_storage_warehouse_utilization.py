@@ -2,6 +2,8 @@ import frappe
 from frappe import _
 from frappe.utils import flt, nowdate
 
+from cold_storage.cold_storage.instrumentation import instrumented
+
 STATUS_CAPACITY_NOT_SET = "Capacity Not Set"
 STATUS_EMPTY = "Empty"
 STATUS_AVAILABLE = "Available"
@@ -10,6 +12,7 @@ STATUS_OVER_CAPACITY = "Over Capacity"
 PERCENT_PRECISION = 2
 
 
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	if not filters.get("as_on_date"):
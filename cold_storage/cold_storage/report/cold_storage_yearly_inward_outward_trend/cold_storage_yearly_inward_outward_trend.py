@@ -4,7 +4,11 @@ import frappe
 from frappe import _
 from frappe.utils import cint, flt, getdate
 
+from cold_storage.cold_storage.date_ranges import fold_by_month, get_year_bounds
+from cold_storage.cold_storage.instrumentation import instrumented
 
+
+@instrumented
 def execute(filters=None):
 	filters = frappe._dict(filters or {})
 	validate_filters(filters)
@@ -60,78 +64,38 @@ def get_columns():
 
 
 def get_data(filters):
-	raw_rows = frappe.db.sql(
+	from_date, to_date = get_year_bounds(filters.get("from_year"), filters.get("to_year"))
+	daily_rows = frappe.db.sql(
 		"""
 		select
-			monthly.year_num as year_num,
-			monthly.month_num as month_num,
-			monthly.item_group as item_group,
-			sum(monthly.inward_qty) as inward_qty,
-			sum(monthly.outward_qty) as outward_qty
-		from (
-			select
-				year(ci.posting_date) as year_num,
-				month(ci.posting_date) as month_num,
-				cii.item_group as item_group,
-				sum(cii.qty) as inward_qty,
-				0 as outward_qty
-			from `tabCold Storage Inward` ci
-			inner join `tabCold Storage Inward Item` cii
-				on cii.parent = ci.name
-				and cii.parenttype = 'Cold Storage Inward'
-			where ci.docstatus = 1
-				and ci.posting_date is not null
-				and ifnull(cii.item_group, '') != ''
-				and (%(company)s = '' or ci.company = %(company)s)
-				and (%(from_year)s = 0 or year(ci.posting_date) >= %(from_year)s)
-				and (%(to_year)s = 0 or year(ci.posting_date) <= %(to_year)s)
-				and (%(item_group)s = '' or cii.item_group = %(item_group)s)
-			group by year(ci.posting_date), month(ci.posting_date), cii.item_group
-
-			union all
-
-			select
-				year(co.posting_date) as year_num,
-				month(co.posting_date) as month_num,
-				coi.item_group as item_group,
-				0 as inward_qty,
-				sum(coi.qty) as outward_qty
-			from `tabCold Storage Outward` co
-			inner join `tabCold Storage Outward Item` coi
-				on coi.parent = co.name
-				and coi.parenttype = 'Cold Storage Outward'
-			where co.docstatus = 1
-				and co.posting_date is not null
-				and ifnull(coi.item_group, '') != ''
-				and (%(company)s = '' or co.company = %(company)s)
-				and (%(from_year)s = 0 or year(co.posting_date) >= %(from_year)s)
-				and (%(to_year)s = 0 or year(co.posting_date) <= %(to_year)s)
-				and (%(item_group)s = '' or coi.item_group = %(item_group)s)
-			group by year(co.posting_date), month(co.posting_date), coi.item_group
-		) monthly
-		group by monthly.year_num, monthly.month_num, monthly.item_group
-		order by monthly.year_num, monthly.month_num, monthly.item_group
+			dm.posting_date,
+			dm.item_group,
+			sum(case when dm.movement_type = 'Inward' then dm.qty else 0 end) as inward_qty,
+			sum(case when dm.movement_type = 'Outward' then dm.qty else 0 end) as outward_qty
+		from `tabCold Storage Daily Movement` dm
+		where dm.posting_date between %(from_date)s and %(to_date)s
+			and dm.movement_type in ('Inward', 'Outward')
+			and dm.item_group != ''
+			and (%(company)s = '' or dm.company = %(company)s)
+			and (%(item_group)s = '' or dm.item_group = %(item_group)s)
+		group by dm.posting_date, dm.item_group
 		""",
 		{
 			"company": filters.get("company") or "",
-			"from_year": cint(filters.get("from_year")),
-			"to_year": cint(filters.get("to_year")),
+			"from_date": from_date,
+			"to_date": to_date,
 			"item_group": filters.get("item_group") or "",
 		},
 		as_dict=True,
 	)
 
-	monthly_totals = {}
-	for row in raw_rows:
-		year = cint(row.year_num)
-		month = cint(row.month_num)
-		item_group = (row.item_group or "").strip()
-		if not year or not month or not item_group:
-			continue
-		monthly_totals[(year, month, item_group)] = {
-			"inward_qty": flt(row.inward_qty),
-			"outward_qty": flt(row.outward_qty),
-		}
+	monthly_totals = {
+		(year, month, item_group.strip()): values
+		for (item_group, year, month), values in fold_by_month(
+			daily_rows, ("inward_qty", "outward_qty"), key_fields=("item_group",)
+		).items()
+		if (item_group or "").strip()
+	}
 
 	months = get_months(filters, monthly_totals)
 	item_group_filter = (filters.get("item_group") or "").strip()
@@ -0,0 +1,101 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Result cache for heavy script reports.
+
+Results are keyed by (report, movement epoch, normalized filters, user scope). The movement
+epoch is a Redis counter bumped after any Cold Storage movement change commits, so a cached
+result is only served while nothing it could depend on has been submitted or cancelled.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+from collections.abc import Callable
+from typing import Any, Final
+
+import frappe
+from frappe.utils import cint
+
+MOVEMENT_EPOCH_CACHE_KEY: Final[str] = "cold_storage:movement_epoch"
+REPORT_CACHE_KEY_PREFIX: Final[str] = "cold_storage:report_result"
+# Upper bound for master-data edits (warehouse capacity, customer names) that do not bump the epoch.
+REPORT_CACHE_TTL: Final[int] = 60 * 60
+
+
+def cached_report(execute: Callable[..., Any]) -> Callable[..., Any]:
+	"""Decorate a script report ``execute(filters=None)`` to serve repeated runs from cache."""
+	report_name = execute.__module__.rsplit(".", 1)[-1]
+
+	@functools.wraps(execute)
+	def wrapper(filters: Any = None) -> Any:
+		cache_key = get_report_cache_key(report_name, filters)
+		cached = frappe.cache.get_value(cache_key)
+		if cached is not None:
+			return cached
+
+		result = execute(filters)
+		frappe.cache.set_value(cache_key, result, expires_in_sec=REPORT_CACHE_TTL)
+		return result
+
+	return wrapper
+
+
+def get_report_cache_key(report_name: str, filters: Any = None, user: str | None = None) -> str:
+	fingerprint = hashlib.sha1(
+		f"{normalize_filters(filters)}|{get_user_scope_key(user)}".encode(),
+		usedforsecurity=False,
+	).hexdigest()
+	return f"{REPORT_CACHE_KEY_PREFIX}:{report_name}:{get_movement_epoch()}:{fingerprint}"
+
+
+def normalize_filters(filters: Any = None) -> str:
+	"""Stable text for a filter dict: empty values dropped, keys sorted."""
+	if isinstance(filters, str):
+		filters = frappe.parse_json(filters)
+	filters = filters or {}
+	return json.dumps(
+		{key: value for key, value in filters.items() if value not in (None, "", [], ())},
+		sort_keys=True,
+		default=str,
+	)
+
+
+def get_user_scope_key(user: str | None = None) -> str:
+	"""Roles plus user permissions: users with the same access share cached results."""
+	from frappe.permissions import get_user_permissions
+
+	user = user or frappe.session.user
+	return json.dumps(
+		{"roles": sorted(frappe.get_roles(user)), "user_permissions": get_user_permissions(user)},
+		sort_keys=True,
+		default=str,
+	)
+
+
+def get_movement_epoch() -> int:
+	return cint(frappe.cache.get(frappe.cache.make_key(MOVEMENT_EPOCH_CACHE_KEY)))
+
+
+def bump_movement_epoch(doc=None, method: str | None = None) -> None:
+	"""doc_events hook: invalidate cached report results once the current transaction commits.
+
+	Bumping after commit (not inside the transaction) keeps a concurrent report run from
+	caching pre-commit data under the new epoch.
+	"""
+	if frappe.flags.cold_storage_movement_epoch_queued:
+		return
+	frappe.flags.cold_storage_movement_epoch_queued = True
+	frappe.db.after_commit.add(_increment_movement_epoch)
+	frappe.db.after_rollback.add(_reset_movement_epoch_flag)
+
+
+def _increment_movement_epoch() -> None:
+	_reset_movement_epoch_flag()
+	frappe.cache.incr(frappe.cache.make_key(MOVEMENT_EPOCH_CACHE_KEY))
+
+
+def _reset_movement_epoch_flag() -> None:
+	frappe.flags.cold_storage_movement_epoch_queued = False
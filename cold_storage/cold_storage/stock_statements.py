@@ -0,0 +1,189 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Daily closing stock and outstanding statements for every customer."""
+
+from __future__ import annotations
+
+from typing import Any, Final
+
+import frappe
+from frappe import _
+from frappe.utils import cint, cstr, flt, fmt_money, formatdate, get_url, nowdate
+
+from cold_storage.api.client_portal import get_item_stock_by_customer, get_outstanding_by_customer
+from cold_storage.cold_storage.doctype.cold_storage_settings.cold_storage_settings import (
+	STOCK_STATEMENT_TEMPLATE_KEY,
+)
+from cold_storage.cold_storage.integrations.whatsapp import send_customer_template_messages
+
+STATEMENT_BATCH_SIZE: Final[int] = 50
+STATEMENT_EMAIL_TEMPLATE: Final[str] = "daily_stock_statement"
+CHANNEL_WHATSAPP: Final[str] = "WhatsApp"
+CHANNEL_EMAIL: Final[str] = "Email"
+MAX_WHATSAPP_ITEM_LINES: Final[int] = 10
+
+
+def send_daily_stock_statements() -> int:
+	"""Scheduler entry point: build all statements in one pass and fan out delivery batches.
+
+	Returns the number of statements queued.
+	"""
+	settings = frappe.get_cached_doc("Cold Storage Settings")
+	if not cint(settings.get("send_daily_stock_statements")):
+		return 0
+
+	channels = get_statement_channels(settings.get("stock_statement_channels"))
+	if not channels:
+		return 0
+
+	statements = build_stock_statements(company=cstr(settings.get("company")))
+	for start in range(0, len(statements), STATEMENT_BATCH_SIZE):
+		frappe.enqueue(
+			"cold_storage.cold_storage.stock_statements.send_stock_statement_batch",
+			queue="long",
+			statements=statements[start : start + STATEMENT_BATCH_SIZE],
+			channels=channels,
+		)
+
+	return len(statements)
+
+
+def get_statement_channels(value: str | None) -> list[str]:
+	value = cstr(value).strip() or "WhatsApp and Email"
+	return [channel for channel in (CHANNEL_WHATSAPP, CHANNEL_EMAIL) if channel in value]
+
+
+def build_stock_statements(company: str = "", as_on: str | None = None) -> list[dict[str, Any]]:
+	"""Return one statement per customer holding stock or dues, using a fixed number of queries."""
+	stock_by_customer = get_item_stock_by_customer(company=company or None)
+	outstanding_by_customer = get_outstanding_by_customer(company=company or None)
+	customers = sorted(set(stock_by_customer) | set(outstanding_by_customer))
+	if not customers:
+		return []
+
+	customer_details = _get_customer_details(customers)
+	currency = frappe.get_cached_value("Company", company, "default_currency") if company else None
+	as_on_label = formatdate(as_on or nowdate())
+
+	statements: list[dict[str, Any]] = []
+	for customer in customers:
+		details = customer_details.get(customer)
+		if not details:
+			continue
+
+		items = [
+			{
+				"item_code": row.get("item_code"),
+				"item_name": row.get("item_name") or row.get("item_code"),
+				"stock_uom": row.get("stock_uom") or "",
+				"batch_count": cint(row.get("batch_count")),
+				"qty": flt(row.get("qty"), 3),
+			}
+			for row in stock_by_customer.get(customer, [])
+		]
+		statements.append(
+			{
+				"customer": customer,
+				"customer_name": details.get("customer_name") or customer,
+				"email": details.get("email") or "",
+				"company": company,
+				"as_on": as_on_label,
+				"items": items,
+				"total_qty": flt(sum(row["qty"] for row in items), 3),
+				"outstanding": fmt_money(outstanding_by_customer.get(customer, 0.0), currency=currency),
+			}
+		)
+
+	return statements
+
+
+def send_stock_statement_batch(statements: list[dict[str, Any]], channels: list[str]) -> None:
+	"""Deliver a batch of prepared statements; runs in a background worker."""
+	if CHANNEL_WHATSAPP in channels:
+		send_customer_template_messages(
+			STOCK_STATEMENT_TEMPLATE_KEY,
+			{statement["customer"]: get_statement_template_context(statement) for statement in statements},
+		)
+
+	if CHANNEL_EMAIL in channels:
+		portal_url = get_url("/cs-portal")
+		subject = _("Daily Stock Statement")
+		for statement in statements:
+			if not statement.get("email"):
+				continue
+			try:
+				frappe.sendmail(
+					recipients=[statement["email"]],
+					subject=f"{subject} - {statement['as_on']}",
+					template=STATEMENT_EMAIL_TEMPLATE,
+					args={**statement, "portal_url": portal_url},
+					reference_doctype="Customer",
+					reference_name=statement["customer"],
+				)
+			except Exception:
+				frappe.log_error(
+					title=_("Cold Storage Stock Statement Email Failed"),
+					message=frappe.get_traceback(),
+				)
+
+
+def get_statement_template_context(statement: dict[str, Any]) -> dict[str, Any]:
+	"""Jinja context for the WhatsApp statement template's body parameters.
+
+	Meta rejects newlines in template parameters, so items are summarised on one line.
+	"""
+	items = statement.get("items") or []
+	parts = [
+		f"{row['item_name']}: {row['qty']} {row['stock_uom']}".rstrip()
+		for row in items[:MAX_WHATSAPP_ITEM_LINES]
+	]
+	if len(items) > MAX_WHATSAPP_ITEM_LINES:
+		parts.append(_("{0} more items").format(len(items) - MAX_WHATSAPP_ITEM_LINES))
+
+	return {
+		"statement": statement,
+		"customer": statement["customer"],
+		"customer_name": statement["customer_name"],
+		"as_on": statement["as_on"],
+		"item_summary": "; ".join(parts) or _("No stock in storage"),
+		"item_count": len(items),
+		"total_qty": statement["total_qty"],
+		"outstanding": statement["outstanding"],
+	}
+
+
+def _get_customer_details(customers: list[str]) -> dict[str, dict[str, str]]:
+	"""Return name and statement email for enabled customers in two queries."""
+	rows = frappe.get_all(
+		"Customer",
+		filters={"name": ("in", customers), "disabled": 0},
+		fields=["name", "customer_name", "email_id"],
+	)
+	details = {
+		row.name: {"customer_name": cstr(row.customer_name), "email": cstr(row.email_id).strip()}
+		for row in rows
+	}
+
+	pending = [customer for customer, row in details.items() if not row["email"]]
+	if pending:
+		contact_rows = frappe.db.sql(
+			"""
+			select dl.link_name as customer, c.email_id
+			from `tabContact` c
+			inner join `tabDynamic Link` dl
+				on dl.parent = c.name
+				and dl.parenttype = 'Contact'
+			where dl.link_doctype = 'Customer'
+				and dl.link_name in %(customers)s
+				and ifnull(c.email_id, '') != ''
+			order by dl.link_name, c.is_primary_contact desc, c.modified desc
+			""",
+			{"customers": tuple(pending)},
+			as_dict=True,
+		)
+		for row in contact_rows:
+			if not details[row.customer]["email"]:
+				details[row.customer]["email"] = cstr(row.email_id).strip()
+
+	return details
@@ -0,0 +1,94 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+import csv
+import gzip
+import os
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage.report.cold_storage_audit_trail_compliance_pack import (
+	cold_storage_audit_trail_compliance_pack as audit_pack,
+)
+
+MODULE = (
+	"cold_storage.cold_storage.report.cold_storage_audit_trail_compliance_pack."
+	"cold_storage_audit_trail_compliance_pack"
+)
+INWARD = "Cold Storage Inward"
+
+
+def _event(name: str, docname: str, timestamp: datetime, event_type: str = "Updated", **changes):
+	return frappe._dict(
+		name=name,
+		reference_name=docname,
+		event_timestamp=timestamp,
+		event_type=event_type,
+		user="a@example.com",
+		changed_fields=changes.get("changed_fields", ""),
+		rows_added=changes.get("rows_added", 0),
+		rows_removed=0,
+		rows_changed=0,
+	)
+
+
+class TestAuditTrailCompliancePack(TestCase):
+	def test_compliance_events_are_paged_by_keyset_not_offset(self):
+		pages = [
+			[_event("E1", "INW-1", datetime(2026, 1, 1)), _event("E2", "INW-2", datetime(2026, 1, 2))],
+			[_event("E3", "INW-1", datetime(2026, 1, 3))],
+		]
+		with patch(f"{MODULE}.frappe.db.sql", side_effect=pages) as sql:
+			rows = list(audit_pack.iter_compliance_events(INWARD, ["INW-1", "INW-2"], chunk_size=2))
+
+		self.assertEqual([row.name for row in rows], ["E1", "E2", "E3"])
+		first_query, second_query = (call.args[0] for call in sql.call_args_list)
+		self.assertNotIn("last_timestamp", first_query)
+		self.assertIn("event_timestamp > %(last_timestamp)s", second_query)
+		self.assertEqual(sql.call_args_list[1].args[1]["last_name"], "E2")
+		self.assertNotIn("offset", second_query.lower())
+
+	def test_action_rows_come_from_the_compliance_log(self):
+		document_meta = {(INWARD, "INW-1"): {"batches": {"B-1"}, "status": "Submitted"}}
+		events = [
+			_event("E1", "INW-1", datetime(2026, 1, 1), "Created"),
+			_event("E2", "INW-1", datetime(2026, 1, 2), "Row Update", changed_fields="remarks", rows_added=2),
+		]
+		with patch(f"{MODULE}.iter_compliance_events", return_value=iter(events)):
+			rows = list(audit_pack.iter_user_action_rows(document_meta))
+
+		self.assertEqual([row["event_type"] for row in rows], ["Created", "Row Update"])
+		self.assertEqual(rows[1]["remarks"], "Changed fields: remarks | Rows added: 2")
+		self.assertEqual(rows[1]["batch_no"], "B-1")
+
+	def test_csv_export_is_gzip_compressed(self):
+		columns = [{"label": "Event", "fieldname": "event_type"}, {"label": "Qty", "fieldname": "qty"}]
+		rows = iter([{"event_type": "Inward", "qty": 5.0}, {"event_type": "Created", "qty": None}])
+		with tempfile.TemporaryDirectory() as directory:
+			file_path = os.path.join(directory, "pack.csv.gz")
+			audit_pack.write_csv_gz(file_path, columns, rows)
+			with gzip.open(file_path, "rt", encoding="utf-8", newline="") as handle:
+				written = list(csv.reader(handle))
+
+		self.assertEqual(written, [["Event", "Qty"], ["Inward", "5.0"], ["Created", ""]])
+
+	def test_export_accepts_json_string_and_dict_filters(self):
+		for filters in (
+			'{"batch_no": "B-1", "company": "Default Co"}',
+			{"batch_no": "B-1", "company": "Default Co"},
+		):
+			with (
+				patch(f"{MODULE}.frappe.get_doc"),
+				patch(f"{MODULE}.set_default_filters"),
+				patch(f"{MODULE}.ensure_mandatory_filters"),
+				patch(f"{MODULE}.frappe.session", frappe._dict(user="a@example.com")),
+				patch(f"{MODULE}.frappe.enqueue") as enqueue,
+			):
+				audit_pack.export_compliance_pack(filters, "CSV")
+
+			queued_filters = enqueue.call_args.kwargs["filters"]
+			self.assertEqual((queued_filters.batch_no, queued_filters.company), ("B-1", "Default Co"))
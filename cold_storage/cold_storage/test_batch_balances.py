@@ -0,0 +1,101 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import frappe
+
+from cold_storage.cold_storage import batch_balances
+
+MODULE = "cold_storage.cold_storage.batch_balances"
+
+
+def _balance(batch_no: str, warehouse: str, qty: float):
+	return frappe._dict(batch_no=batch_no, item_code="ITEM-001", warehouse=warehouse, qty=qty)
+
+
+class TestBatchBalances(TestCase):
+	def test_ledger_filters_apply_to_both_ledger_branches(self):
+		sql = batch_balances.get_batch_ledger_sql(item_code=True, warehouse=True, batch_nos=True)
+
+		self.assertEqual(sql.count("sle.warehouse = %(warehouse)s"), 2)
+		self.assertEqual(sql.count("sle.item_code = %(item_code)s"), 2)
+		self.assertIn("sle.batch_no in %(batch_nos)s", sql)
+		self.assertIn("sbe.batch_no in %(batch_nos)s", sql)
+		self.assertIn("ifnull(sbe.is_cancelled, 0) = 0", sql)
+
+	def test_ledger_provider_aggregates_in_one_query(self):
+		with patch(f"{MODULE}.frappe.db.sql", return_value=[_balance("B-1", "Main - CO", 2.00049)]) as sql:
+			rows = batch_balances.LedgerBatchBalanceProvider().get_balances(
+				customer="CUST-1", company="Co", batch_nos=["B-1"]
+			)
+
+		self.assertEqual(rows[0].qty, 2.0)
+		query, params = sql.call_args.args
+		self.assertIn("batch.custom_customer = %(customer)s", query)
+		self.assertIn("w.company = %(company)s", query)
+		self.assertEqual(params["batch_nos"], ("B-1",))
+		sql.assert_called_once()
+
+	def test_strict_callers_always_get_erpnext(self):
+		with patch.dict(frappe.conf, {"cold_storage_balance_provider": "ledger"}):
+			self.assertIsInstance(
+				batch_balances.get_balance_provider(strict=True), batch_balances.ERPNextBatchBalanceProvider
+			)
+			self.assertIsInstance(
+				batch_balances.get_balance_provider(), batch_balances.LedgerBatchBalanceProvider
+			)
+
+	def test_provider_interface_cannot_be_used_without_its_queries(self):
+		class PartialProvider(batch_balances.BatchBalanceProvider):
+			def get_balance(self, batch_no: str, warehouse: str) -> float:
+				return 0.0
+
+		with self.assertRaises(TypeError):
+			batch_balances.BatchBalanceProvider()
+		with self.assertRaises(TypeError):
+			PartialProvider()
+
+	def test_strict_warehouse_balances_keep_expired_and_reserved_batches(self):
+		rows = [_balance("B-EXPIRED", "Main - CO", 4), _balance("B-1", "Main - CO", 2)]
+		with (
+			patch(f"{MODULE}.frappe.db.sql", return_value=rows) as sql,
+			patch("erpnext.stock.doctype.batch.batch.get_batch_qty") as get_batch_qty,
+		):
+			balances = batch_balances.ERPNextBatchBalanceProvider().get_warehouse_balances(
+				"ITEM-001", "Main - CO"
+			)
+
+		self.assertEqual(balances, {"B-EXPIRED": 4.0, "B-1": 2.0})
+		# No expiry, disabled or reservation filter: the per-batch ledger balance.
+		query = sql.call_args.args[0]
+		self.assertNotIn("expiry_date", query)
+		self.assertNotIn("disabled", query)
+		get_batch_qty.assert_not_called()
+
+	def test_consistency_check_reports_differing_balances(self):
+		strict = Mock(name="strict", get_balances=Mock(return_value=[_balance("B-1", "Main - CO", 5)]))
+		strict.name = "erpnext"
+		fast = Mock(
+			get_balances=Mock(return_value=[_balance("B-1", "Main - CO", 3), _balance("B-2", "Cold - CO", 1)])
+		)
+		fast.name = "ledger"
+		with (
+			patch(f"{MODULE}.ERPNextBatchBalanceProvider", return_value=strict),
+			patch(f"{MODULE}.LedgerBatchBalanceProvider", return_value=fast),
+			patch.dict(frappe.conf, {"cold_storage_balance_provider": "erpnext"}),
+		):
+			result = batch_balances.check_balance_consistency(batch_nos=["B-1", "B-2"])
+
+		strict.get_balances.assert_called_once_with(batch_nos=["B-1", "B-2"])
+		self.assertEqual(result["strict_provider"], "erpnext")
+		self.assertEqual(result["fast_provider"], "ledger")
+		self.assertEqual(result["batches_checked"], 2)
+		self.assertEqual(
+			result["mismatches"],
+			[
+				{"batch_no": "B-1", "warehouse": "Main - CO", "strict_qty": 5.0, "fast_qty": 3.0},
+				{"batch_no": "B-2", "warehouse": "Cold - CO", "strict_qty": 0.0, "fast_qty": 1.0},
+			],
+		)
@@ -0,0 +1,60 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+import json
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+from cold_storage.benchmarks import hot_paths, synthetic_data
+
+DATASET = {
+	"warehouses": ["WH-1", "WH-2", "WH-3"],
+	"batches": [(f"B-{index}", f"CUST-{index % 3}") for index in range(40)],
+}
+
+
+def _plan(seed: int) -> list[dict]:
+	return synthetic_data.plan_movements(
+		random.Random(seed), DATASET, years=2, movements_per_batch=5, today="2026-10-18"
+	)
+
+
+class TestBenchmarks(TestCase):
+	def test_same_seed_plans_the_same_movements(self):
+		self.assertEqual(_plan(7), _plan(7))
+		self.assertNotEqual(_plan(7), _plan(8))
+
+	def test_planned_movements_never_overdraw_a_warehouse(self):
+		events = _plan(7)
+		balances = {}
+		for event in events:
+			key = (event["batch_no"], event["warehouse"])
+			if event["doctype"] == "Cold Storage Inward":
+				balances[key] = balances.get(key, 0) + event["qty"]
+				continue
+			balances[key] = balances.get(key, 0) - event["qty"]
+			self.assertGreaterEqual(balances[key], 0)
+			if event["doctype"] == "Cold Storage Transfer":
+				target = (event["batch_no"], event["target_warehouse"])
+				balances[target] = balances.get(target, 0) + event["qty"]
+
+		self.assertEqual(
+			[event["posting_date"] for event in events], sorted(e["posting_date"] for e in events)
+		)
+		self.assertTrue(all(str(event["posting_date"]) <= "2026-10-18" for event in events))
+
+	def test_compare_flags_p50_regressions_above_the_threshold(self):
+		baseline = {"timings": {"get_snapshot": {"p50": 100.0}, "report.a": {"p50": 50.0}}}
+		current = {"timings": {"get_snapshot": {"p50": 130.0}, "report.a": {"p50": 55.0}, "new": {"p50": 1}}}
+		with tempfile.TemporaryDirectory() as directory:
+			paths = []
+			for name, payload in (("baseline", baseline), ("current", current)):
+				paths.append(os.path.join(directory, f"{name}.json"))
+				with open(paths[-1], "w") as handle:
+					json.dump(payload, handle)
+			result = hot_paths.compare(*paths, threshold=0.2)
+
+		self.assertEqual(result["regressions"], ["get_snapshot"])
+		self.assertEqual(result["only_in_current"], ["new"])
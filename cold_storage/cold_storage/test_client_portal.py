@@ -0,0 +1,172 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.api import client_portal, customer_scope
+from cold_storage.api.customer_scope import CustomerScope
+from cold_storage.setup import client_portal_user_permissions as portal_permissions
+
+PORTAL = "cold_storage.api.client_portal"
+PERMISSIONS = "cold_storage.setup.client_portal_user_permissions"
+
+
+class TestClientPortalCustomerScope(TestCase):
+	def test_admin_scope_is_symbolic_instead_of_customer_list(self):
+		with (
+			patch(f"{PORTAL}.get_customers_for_portal_user", return_value=[]),
+			patch(f"{PORTAL}.get_all_customer_names", return_value=["CUST-A", "CUST-B"]),
+			patch(f"{PORTAL}.frappe.get_roles", return_value=["Cold Storage Admin"]),
+		):
+			scope, available, selected = client_portal._resolve_customer_scope()
+
+		self.assertTrue(scope.is_all)
+		self.assertEqual(scope.condition("p.customer"), "1=1")
+		self.assertEqual(scope.params(), {})
+		self.assertEqual(available, ["CUST-A", "CUST-B"])
+		self.assertEqual(selected, "")
+
+	def test_portal_user_scope_stays_explicit(self):
+		with (
+			patch(f"{PORTAL}.get_customers_for_portal_user", return_value=["CUST-A"]),
+			patch(f"{PORTAL}.frappe.get_roles", return_value=["Cold Storage Client Portal User"]),
+		):
+			scope, available, _selected = client_portal._resolve_customer_scope()
+			selected_scope, _available, selected = client_portal._resolve_customer_scope("CUST-A")
+
+		self.assertEqual(scope.customers, ("CUST-A",))
+		self.assertEqual(available, ["CUST-A"])
+		self.assertEqual(selected_scope.customers, ("CUST-A",))
+		self.assertEqual(selected, "CUST-A")
+
+	def test_small_scope_uses_in_list(self):
+		scope = CustomerScope(["CUST-A", "CUST-B", "CUST-A"])
+
+		self.assertEqual(scope.condition("p.customer"), "p.customer in %(customers)s")
+		self.assertEqual(scope.params(), {"customers": ("CUST-A", "CUST-B")})
+		self.assertIn("CUST-B", scope)
+		self.assertNotIn("CUST-C", scope)
+
+	def test_large_scope_joins_a_temp_table(self):
+		customers = [f"CUST-{index:05d}" for index in range(customer_scope.IN_LIST_LIMIT + 1)]
+		scope = CustomerScope(customers)
+
+		with (
+			patch("cold_storage.api.customer_scope.frappe.db") as db,
+			patch("cold_storage.api.customer_scope.frappe.generate_hash", return_value="abc123"),
+		):
+			db.transaction_writes = 0
+			condition = scope.condition("p.customer")
+			scope.condition("p.to_customer")
+
+		self.assertEqual(condition, "p.customer in (select customer from `tmp_cs_customer_scope_abc123`)")
+		executed = [call.args[0] for call in db.sql.call_args_list]
+		self.assertTrue(executed[0].startswith("create temporary table"))
+		self.assertEqual(len(executed), 2)
+
+	def test_large_scope_falls_back_to_in_list_after_writes(self):
+		scope = CustomerScope([f"CUST-{index:05d}" for index in range(customer_scope.IN_LIST_LIMIT + 1)])
+
+		with patch("cold_storage.api.customer_scope.frappe.db") as db:
+			db.transaction_writes = 1
+			condition = scope.condition("p.customer")
+
+		self.assertEqual(condition, "p.customer in %(customers)s")
+		db.sql.assert_not_called()
+
+	def test_customers_for_portal_user_are_served_from_cache(self):
+		with (
+			patch(f"{PERMISSIONS}.frappe.cache.hget", return_value=["CUST-B", "CUST-A"]) as hget,
+			patch(f"{PERMISSIONS}._get_customers_for_user") as resolve,
+		):
+			customers = portal_permissions.get_customers_for_portal_user("portal@example.com")
+
+		self.assertEqual(customers, ["CUST-B", "CUST-A"])
+		self.assertEqual(
+			hget.call_args.args, (portal_permissions.PORTAL_CUSTOMERS_CACHE_KEY, "portal@example.com")
+		)
+		resolve.assert_not_called()
+
+	def test_contact_change_clears_cache_for_old_and_new_emails(self):
+		previous = frappe._dict(email_ids=[SimpleNamespace(email_id="old@example.com")])
+		contact = frappe._dict(
+			email_id="new@example.com",
+			email_ids=[SimpleNamespace(email_id="new@example.com")],
+			get_doc_before_save=lambda: previous,
+		)
+
+		with patch(f"{PERMISSIONS}.frappe.cache.hdel") as hdel:
+			portal_permissions.clear_portal_customer_cache_for_contact(contact)
+
+		cleared = {call.args[1] for call in hdel.call_args_list}
+		self.assertEqual(cleared, {"old@example.com", "new@example.com"})
+
+	def test_customer_change_clears_every_cached_scope(self):
+		with (
+			patch(f"{PERMISSIONS}.frappe.cache.delete_key") as delete_key,
+			patch(f"{PERMISSIONS}.frappe.cache.delete_value") as delete_value,
+		):
+			portal_permissions.clear_portal_customer_cache_for_customer(SimpleNamespace(name="CUST-A"))
+
+		delete_key.assert_called_once_with(portal_permissions.PORTAL_CUSTOMERS_CACHE_KEY)
+		delete_value.assert_called_once_with(portal_permissions.ALL_CUSTOMERS_CACHE_KEY)
+
+
+class TestClientPortalAnalytics(TestCase):
+	def test_top_batches_read_the_ranking_table(self):
+		rows = [frappe._dict(name="BATCH-B", qty=40.0), frappe._dict(name="BATCH-A", qty=12.5)]
+		with patch(f"{PORTAL}.frappe.db.sql", return_value=rows) as sql:
+			chart = client_portal._get_top_batches(CustomerScope(["CUST-A"]))
+
+		self.assertEqual(chart, [{"name": "BATCH-B", "value": 40.0}, {"name": "BATCH-A", "value": 12.5}])
+		query, params = sql.call_args.args
+		self.assertIn("`tabCold Storage Batch Ranking`", query)
+		self.assertIn("ranking.customer in %(customers)s", query)
+		self.assertEqual(params["limit"], client_portal.TOP_BATCHES_LIMIT)
+
+	def test_movement_trends_read_one_row_per_day(self):
+		rows = [
+			frappe._dict(posting_date="2026-10-17", inward_qty=10.0, outward_qty=0.0),
+			frappe._dict(posting_date="2026-10-18", inward_qty=2.0, outward_qty=5.0),
+		]
+		with patch(f"{PORTAL}.frappe.db.sql", return_value=rows) as sql:
+			trends = client_portal._get_movement_trends(CustomerScope.all())
+
+		self.assertIn("`tabCold Storage Customer Daily Movement`", sql.call_args.args[0])
+		self.assertEqual(trends["labels"], ["17 Oct", "18 Oct"])
+		self.assertEqual(trends["datasets"][0], {"name": "Inward", "values": [10.0, 2.0]})
+		self.assertEqual(trends["datasets"][1], {"name": "Outward", "values": [0.0, 5.0]})
+
+	def test_statement_queries_filter_by_company(self):
+		with patch(f"{PORTAL}.frappe.db.sql", return_value=[]) as sql:
+			client_portal.get_item_stock_by_customer(company="Alpha Co")
+			client_portal.get_outstanding_by_customer(company="Alpha Co")
+
+		(stock_query, stock_params), (outstanding_query, outstanding_params) = (
+			call.args for call in sql.call_args_list
+		)
+		self.assertEqual(stock_query.count("sle.company = %(company)s"), 2)
+		self.assertEqual(stock_params["company"], "Alpha Co")
+		self.assertIn("and company = %(company)s", outstanding_query)
+		self.assertEqual(outstanding_params["company"], "Alpha Co")
+
+	def test_statement_queries_span_companies_without_company(self):
+		with patch(f"{PORTAL}.frappe.db.sql", return_value=[]) as sql:
+			client_portal.get_item_stock_by_customer()
+			client_portal.get_outstanding_by_customer()
+
+		for call in sql.call_args_list:
+			self.assertNotIn("company = %(company)s", call.args[0])
+
+	def test_empty_scope_skips_the_analytics_queries(self):
+		with patch(f"{PORTAL}.frappe.db.sql") as sql:
+			self.assertEqual(client_portal._get_top_batches(CustomerScope([])), [])
+			self.assertEqual(
+				client_portal._get_movement_trends(CustomerScope([])), {"labels": [], "datasets": []}
+			)
+
+		sql.assert_not_called()
@@ -0,0 +1,171 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from contextlib import contextmanager
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage.page.cs_permissions import cs_permissions
+
+MODULE = "cold_storage.cold_storage.page.cs_permissions.cs_permissions"
+
+
+class TestCSPermissions(TestCase):
+	def test_cached_matrix_is_served_without_reading_meta(self):
+		with (
+			patch(f"{MODULE}.get_permissions_version", return_value="v1"),
+			patch(f"{MODULE}.frappe.cache.get_value", return_value={"Cold Storage Inward": {}}) as get_value,
+			patch(f"{MODULE}.frappe.get_meta") as get_meta,
+		):
+			result = cs_permissions.get_permissions_matrix()
+
+		self.assertEqual(result["matrix"], {"Cold Storage Inward": {}})
+		self.assertEqual(get_value.call_args.args[0], f"{cs_permissions.MATRIX_CACHE_KEY_PREFIX}:v1")
+		get_meta.assert_not_called()
+
+	def test_matrix_indexes_permission_rows_by_role(self):
+		meta = frappe._dict(
+			is_submittable=1,
+			permissions=[
+				frappe._dict(role="Cold Storage Admin", read=1, write=1),
+				frappe._dict(role="Cold Storage Admin", permlevel=1, submit=1),
+				frappe._dict(role="Guest", read=1),
+			],
+		)
+		with patch(f"{MODULE}.frappe.get_meta", return_value=meta):
+			matrix = cs_permissions.build_permissions_matrix()
+
+		admin = matrix["Cold Storage Inward"]["permissions"]["Cold Storage Admin"]
+		self.assertEqual(admin, {"has_access": True, "read": 1, "write": 1, "submit": 1})
+		self.assertEqual(matrix["Cold Storage Inward"]["permissions"]["Stock Manager"], {"has_access": False})
+		self.assertNotIn("Guest", matrix["Cold Storage Inward"]["permissions"])
+
+	def test_batch_update_clears_each_doctype_cache_once(self):
+		changes = [
+			{"doctype": "Cold Storage Inward", "role": "Stock Manager", "perm_type": "read", "value": 1},
+			{"doctype": "Cold Storage Inward", "role": "Stock Manager", "perm_type": "write", "value": 1},
+			{
+				"doctype": "Cold Storage Inward",
+				"role": "Cold Storage Admin",
+				"perm_type": "delete",
+				"value": 0,
+			},
+		]
+		with (
+			patch(f"{MODULE}.frappe.only_for"),
+			patch("frappe.permissions.setup_custom_perms"),
+			patch("frappe.core.doctype.doctype.doctype.validate_permissions_for_doctype") as validate,
+			patch(
+				f"{MODULE}.frappe.get_all",
+				return_value=[
+					frappe._dict(name="P1", role="Stock Manager"),
+					frappe._dict(name="P2", role="Cold Storage Admin"),
+				],
+			),
+			patch(f"{MODULE}.frappe.db.set_value") as set_value,
+			patch(f"{MODULE}.frappe.clear_cache") as clear_cache,
+			patch(f"{MODULE}.frappe.msgprint"),
+		):
+			result = cs_permissions.update_permissions(changes)
+
+		self.assertEqual(result, {"updated": 3, "doctypes": ["Cold Storage Inward"]})
+		set_value.assert_any_call("Custom DocPerm", "P1", {"read": 1, "write": 1})
+		self.assertEqual(set_value.call_count, 2)
+		validate.assert_called_once_with("Cold Storage Inward")
+		clear_cache.assert_called_once_with(doctype="Cold Storage Inward")
+
+	def test_matrix_marks_roles_with_owner_only_access(self):
+		meta = frappe._dict(
+			is_submittable=1,
+			permissions=[
+				frappe._dict(role="Cold Storage Inbound Operator", read=1, write=1, if_owner=1),
+				frappe._dict(role="Stock Manager", read=1, if_owner=1),
+				frappe._dict(role="Stock Manager", read=1),
+			],
+		)
+		with patch(f"{MODULE}.frappe.get_meta", return_value=meta):
+			permissions = cs_permissions.build_permissions_matrix()["Cold Storage Inward"]["permissions"]
+
+		self.assertEqual(permissions["Cold Storage Inbound Operator"]["if_owner"], 1)
+		self.assertNotIn("if_owner", permissions["Stock Manager"])
+
+	def test_unchecking_clears_the_owner_only_row_that_granted_it(self):
+		rows = [frappe._dict(name="OWN", role="Cold Storage Inbound Operator", permlevel=0, if_owner=1)]
+		change = {
+			"doctype": "Cold Storage Inward",
+			"role": "Cold Storage Inbound Operator",
+			"perm_type": "write",
+			"value": 0,
+		}
+
+		with self._patch_update(rows) as (set_value, get_doc):
+			cs_permissions.update_permissions([change])
+
+		set_value.assert_called_once_with("Custom DocPerm", "OWN", {"write": 0})
+		get_doc.assert_not_called()
+
+	def test_checking_extends_the_owner_only_row_without_widening_read(self):
+		rows = [frappe._dict(name="OWN", role="Cold Storage Inbound Operator", permlevel=0, if_owner=1)]
+		change = {
+			"doctype": "Cold Storage Inward",
+			"role": "Cold Storage Inbound Operator",
+			"perm_type": "print",
+			"value": 1,
+		}
+
+		with self._patch_update(rows) as (set_value, get_doc):
+			cs_permissions.update_permissions([change])
+
+		set_value.assert_called_once_with("Custom DocPerm", "OWN", {"print": 1})
+		get_doc.assert_not_called()
+
+	def test_checking_prefers_the_unrestricted_row_and_revokes_on_every_row(self):
+		rows = [
+			frappe._dict(name="ALL", role="Stock Manager", permlevel=0, if_owner=0),
+			frappe._dict(name="OWN", role="Stock Manager", permlevel=0, if_owner=1),
+		]
+		changes = [
+			{"doctype": "Cold Storage Inward", "role": "Stock Manager", "perm_type": "write", "value": 1},
+			{"doctype": "Cold Storage Inward", "role": "Stock Manager", "perm_type": "delete", "value": 0},
+		]
+
+		with self._patch_update(rows) as (set_value, get_doc):
+			cs_permissions.update_permissions(changes)
+
+		set_value.assert_any_call("Custom DocPerm", "ALL", {"delete": 0, "write": 1})
+		set_value.assert_any_call("Custom DocPerm", "OWN", {"delete": 0})
+		self.assertEqual(set_value.call_count, 2)
+		get_doc.assert_not_called()
+
+	def test_checking_for_a_role_without_rows_inserts_a_readable_row(self):
+		change = {"doctype": "Cold Storage Inward", "role": "Stock Manager", "perm_type": "print", "value": 1}
+
+		with self._patch_update([]) as (set_value, get_doc):
+			cs_permissions.update_permissions([change])
+
+		set_value.assert_not_called()
+		inserted = get_doc.call_args.args[0]
+		self.assertEqual((inserted["read"], inserted["print"], inserted["permlevel"]), (1, 1, 0))
+		self.assertNotIn("if_owner", inserted)
+
+	@contextmanager
+	def _patch_update(self, rows):
+		with (
+			patch(f"{MODULE}.frappe.only_for"),
+			patch("frappe.permissions.setup_custom_perms"),
+			patch("frappe.core.doctype.doctype.doctype.validate_permissions_for_doctype"),
+			patch(f"{MODULE}.frappe.get_all", return_value=rows),
+			patch(f"{MODULE}.frappe.db.set_value") as set_value,
+			patch(f"{MODULE}.frappe.get_doc") as get_doc,
+			patch(f"{MODULE}.frappe.clear_cache"),
+			patch(f"{MODULE}.frappe.msgprint"),
+		):
+			yield set_value, get_doc
+
+	def test_changes_outside_the_matrix_are_rejected(self):
+		with patch(f"{MODULE}.frappe.only_for"), self.assertRaises(frappe.ValidationError):
+			cs_permissions.update_permissions(
+				[{"doctype": "User", "role": "Stock Manager", "perm_type": "read"}]
+			)
@@ -0,0 +1,148 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import call, patch
+
+import frappe
+
+from cold_storage.setup import database_indexes
+from cold_storage.setup.database_indexes import get_index_name
+
+# Shapes of the hot child-table lookups: lot traceability / audit pack (batch, item)
+# and the customer movement item search (parent join pinned to parenttype).
+BATCH_LOOKUP_SQL = """
+	select child.name
+	from `tab{child}` child
+	inner join `tab{parent}` parent on parent.name = child.parent
+	where child.parenttype = %(parenttype)s
+		and child.batch_no = %(batch_no)s
+"""
+ITEM_LOOKUP_SQL = """
+	select child.name
+	from `tab{child}` child
+	where child.item = %(item)s
+"""
+PARENT_JOIN_SQL = """
+	select child.item
+	from `tab{parent}` parent
+	inner join `tab{child}` child
+		on child.parent = parent.name
+		and child.parenttype = %(parenttype)s
+	where parent.customer = %(customer)s
+"""
+SEED_PREFIX = "CS-EXPLAIN-"
+SEED_PARENTS = 20
+SEED_CHILD_ROWS = 200
+MOVEMENT_TABLES = (
+	("Cold Storage Inward", "Cold Storage Inward Item"),
+	("Cold Storage Outward", "Cold Storage Outward Item"),
+	("Cold Storage Transfer", "Cold Storage Transfer Item"),
+)
+
+
+class TestDatabaseIndexPlan(TestCase):
+	def test_child_tables_cover_batch_item_warehouse_and_parent_lookups(self):
+		for _parent, child in MOVEMENT_TABLES:
+			planned = set(database_indexes.INDEX_PLAN[child])
+			self.assertTrue({("batch_no",), ("item",), ("parent", "parenttype")} <= planned, child)
+
+		self.assertIn(("source_warehouse",), database_indexes.INDEX_PLAN["Cold Storage Transfer Item"])
+		self.assertIn(("target_warehouse",), database_indexes.INDEX_PLAN["Cold Storage Transfer Item"])
+
+	def test_add_indexes_uses_stable_names(self):
+		with patch("cold_storage.setup.database_indexes.frappe.db") as db:
+			database_indexes.add_indexes_for_doctype("Cold Storage Transfer Item")
+
+		self.assertIn(
+			call(
+				"Cold Storage Transfer Item", ["parent", "parenttype"], index_name="parent_parenttype_index"
+			),
+			db.add_index.call_args_list,
+		)
+
+
+class TestHotQueriesUseIndexes(TestCase):
+	"""EXPLAIN the hot lookups against the site database and check the planned index is chosen.
+
+	Each movement table is seeded with selective rows and analyzed first, so the optimizer
+	picks an index on its merits rather than scanning a near-empty table.
+	"""
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		database_indexes.sync_database_indexes()
+		_seed_movement_rows()
+
+	@classmethod
+	def tearDownClass(cls):
+		_delete_seeded_rows()
+		super().tearDownClass()
+
+	def test_batch_lookup_uses_batch_index(self):
+		for parent, child in MOVEMENT_TABLES:
+			key = _explain_key(
+				BATCH_LOOKUP_SQL.format(parent=parent, child=child),
+				{"parenttype": parent, "batch_no": f"{SEED_PREFIX}BATCH-7"},
+				"child",
+			)
+			self.assertEqual(key, get_index_name(("batch_no",)), child)
+
+	def test_item_lookup_uses_item_index(self):
+		for _parent, child in MOVEMENT_TABLES:
+			key = _explain_key(ITEM_LOOKUP_SQL.format(child=child), {"item": f"{SEED_PREFIX}ITEM-7"}, "child")
+			self.assertEqual(key, get_index_name(("item",)), child)
+
+	def test_parent_join_uses_parent_parenttype_index(self):
+		for parent, child in MOVEMENT_TABLES:
+			key = _explain_key(
+				PARENT_JOIN_SQL.format(parent=parent, child=child),
+				{"parenttype": parent, "customer": f"{SEED_PREFIX}CUST-7"},
+				"child",
+			)
+			self.assertEqual(key, get_index_name(("parent", "parenttype")), child)
+
+
+def _explain_key(query: str, params: dict, table_alias: str) -> str | None:
+	"""Index EXPLAIN reports as chosen for ``table_alias`` (``None`` for a full scan)."""
+	for row in frappe.db.sql(f"explain {query}", params, as_dict=True):
+		if row.get("table") == table_alias:
+			return row.get("key")
+	return None
+
+
+def _seed_movement_rows() -> None:
+	for parent, child in MOVEMENT_TABLES:
+		parent_names = [f"{SEED_PREFIX}{parent}-{index}" for index in range(SEED_PARENTS)]
+		frappe.db.bulk_insert(
+			parent,
+			["name", "customer", "docstatus"],
+			[(name, f"{SEED_PREFIX}CUST-{index}", 1) for index, name in enumerate(parent_names)],
+		)
+		frappe.db.bulk_insert(
+			child,
+			["name", "parent", "parenttype", "parentfield", "batch_no", "item"],
+			[
+				(
+					f"{SEED_PREFIX}{child}-{index}",
+					parent_names[index % SEED_PARENTS],
+					parent,
+					"items",
+					f"{SEED_PREFIX}BATCH-{index}",
+					f"{SEED_PREFIX}ITEM-{index}",
+				)
+				for index in range(SEED_CHILD_ROWS)
+			],
+		)
+		# Refresh index statistics; ANALYZE TABLE commits, so the rows are deleted on teardown.
+		frappe.db.sql(f"analyze table `tab{parent}`, `tab{child}`")
+
+
+def _delete_seeded_rows() -> None:
+	for parent, child in MOVEMENT_TABLES:
+		for doctype in (child, parent):
+			frappe.db.sql(
+				f"delete from `tab{doctype}` where name like %(prefix)s", {"prefix": f"{SEED_PREFIX}%"}
+			)
+	frappe.db.commit()
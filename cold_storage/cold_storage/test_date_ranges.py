@@ -0,0 +1,40 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from datetime import date
+from unittest import TestCase
+
+import frappe
+
+from cold_storage.cold_storage import date_ranges
+
+
+class TestDateRanges(TestCase):
+	def test_year_filters_become_posting_date_bounds(self):
+		self.assertEqual(date_ranges.get_year_bounds(2024, 2025), (date(2024, 1, 1), date(2025, 12, 31)))
+		self.assertEqual(
+			date_ranges.get_year_bounds("2026", None), (date(2026, 1, 1), date_ranges.MAX_POSTING_DATE)
+		)
+		self.assertEqual(
+			date_ranges.get_year_bounds(), (date_ranges.MIN_POSTING_DATE, date_ranges.MAX_POSTING_DATE)
+		)
+
+	def test_fold_by_month_sums_daily_rows(self):
+		rows = [
+			frappe._dict(posting_date="2026-01-03", warehouse="WH-1", qty=5),
+			frappe._dict(posting_date=date(2026, 1, 28), warehouse="WH-1", qty=-2),
+			frappe._dict(posting_date="2026-02-01", warehouse="WH-1", qty=1),
+			frappe._dict(posting_date="2026-01-15", warehouse="WH-2", qty=7),
+			frappe._dict(posting_date=None, warehouse="WH-2", qty=100),
+		]
+
+		totals = date_ranges.fold_by_month(rows, ("qty",), key_fields=("warehouse",))
+
+		self.assertEqual(
+			totals,
+			{
+				("WH-1", 2026, 1): {"qty": 3.0},
+				("WH-1", 2026, 2): {"qty": 1.0},
+				("WH-2", 2026, 1): {"qty": 7.0},
+			},
+		)
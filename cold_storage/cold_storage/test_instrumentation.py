@@ -0,0 +1,87 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import frappe
+
+from cold_storage.cold_storage import instrumentation
+
+MODULE = "cold_storage.cold_storage.instrumentation"
+ENABLED = {instrumentation.INSTRUMENTATION_CONF_KEY: 1}
+
+
+@instrumentation.instrumented
+def _inner():
+	instrumentation._probed_sql(Mock(return_value=[]), "select 1")
+	instrumentation._probed_cache_lookup(Mock(return_value=None), "missing-key")
+
+
+@instrumentation.instrumented
+def _outer():
+	instrumentation._probed_sql(Mock(return_value=[]), "select 1")
+	instrumentation._probed_cache_lookup(Mock(return_value="cached"), "key")
+	_inner()
+	instrumentation._probed_sql(Mock(return_value=[]), "select 2")
+	return "done"
+
+
+class TestInstrumentation(TestCase):
+	def setUp(self):
+		frappe.flags.cold_storage_instrumentation_stack = None
+		frappe.flags.cold_storage_instrumentation_pending = None
+		frappe.flags.cold_storage_request_timings = None
+
+	def test_disabled_calls_pass_straight_through(self):
+		with (
+			patch.dict(frappe.conf, {instrumentation.INSTRUMENTATION_CONF_KEY: 0}),
+			patch(f"{MODULE}._install_probes") as install_probes,
+			patch(f"{MODULE}._flush") as flush,
+		):
+			self.assertEqual(_outer(), "done")
+
+		install_probes.assert_not_called()
+		flush.assert_not_called()
+
+	def test_nested_calls_are_counted_in_every_enclosing_call(self):
+		with (
+			patch.dict(frappe.conf, ENABLED),
+			patch(f"{MODULE}._install_probes"),
+			patch(f"{MODULE}._flush") as flush,
+		):
+			_outer()
+
+		flush.assert_called_once()
+		inner, outer = flush.call_args.args[0]
+		self.assertEqual(
+			(inner["name"], inner["depth"], inner["queries"]), ("test_instrumentation._inner", 1, 1)
+		)
+		self.assertEqual((outer["depth"], outer["queries"]), (0, 3))
+		self.assertEqual((outer["cache_hits"], outer["cache_misses"]), (1, 1))
+		self.assertEqual((inner["cache_hits"], inner["cache_misses"]), (0, 1))
+		self.assertEqual(frappe.flags.cold_storage_instrumentation_stack, [])
+
+	def test_timing_header_is_only_added_in_developer_mode(self):
+		frappe.flags.cold_storage_request_timings = [
+			{
+				"name": "client_portal.get_snapshot",
+				"queries": 12,
+				"db_ms": 8.5,
+				"python_ms": 3.1,
+				"cache_hits": 2,
+				"cache_misses": 1,
+			}
+		]
+		response = Mock(headers={})
+
+		with patch.dict(frappe.conf, {"developer_mode": 0}):
+			instrumentation.add_timing_header(response)
+		self.assertNotIn(instrumentation.TIMING_HEADER, response.headers)
+
+		with patch.dict(frappe.conf, {"developer_mode": 1}):
+			instrumentation.add_timing_header(response)
+		self.assertEqual(
+			response.headers[instrumentation.TIMING_HEADER],
+			"client_portal.get_snapshot;q=12;db=8.5;py=3.1;cache=2/3",
+		)
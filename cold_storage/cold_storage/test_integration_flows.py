@@ -5,12 +5,15 @@ import frappe
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
 from frappe.tests import IntegrationTestCase
-from frappe.utils import flt, nowdate
+from frappe.utils import add_days, flt, nowdate
 
+from cold_storage.cold_storage.utils import get_batch_balance, get_batch_balances
 
-class TestColdStorageIntegration(IntegrationTestCase):
-	def setUp(self):
-		super().setUp()
+
+class ColdStorageIntegrationMixin:
+	"""Company, warehouses, customers, settings and document builders for integration tests."""
+
+	def _set_up_cold_storage(self) -> None:
 		self._ensure_batch_custom_customer_field()
 		self._setup_test_context()
 		self._setup_cold_storage_settings()
@@ -203,6 +206,12 @@ class TestColdStorageIntegration(IntegrationTestCase):
 			}
 		)
 
+
+class TestColdStorageIntegration(ColdStorageIntegrationMixin, IntegrationTestCase):
+	def setUp(self):
+		super().setUp()
+		self._set_up_cold_storage()
+
 	def test_outward_rejects_batch_without_customer(self):
 		item_code, batch_no, warehouse = self._make_batch_with_stock(customer=None, qty=10)
 		doc = self._make_outward_doc(
@@ -229,6 +238,26 @@ class TestColdStorageIntegration(IntegrationTestCase):
 		with self.assertRaises(frappe.ValidationError):
 			doc.insert()
 
+	def test_outward_accepts_available_qty_of_an_expired_batch(self):
+		item_code, batch_no, warehouse = self._make_batch_with_stock(customer=self.customer_a, qty=7)
+		frappe.db.set_value("Batch", batch_no, "expiry_date", add_days(nowdate(), -1))
+
+		# Expired stock is still on hand and can be dispatched; the balance must not drop it.
+		balances = get_batch_balances([(batch_no, warehouse, item_code)])
+		self.assertEqual(flt(balances[(batch_no, warehouse, item_code)]), 7)
+		self.assertEqual(
+			flt(balances[(batch_no, warehouse, item_code)]), get_batch_balance(batch_no, warehouse)
+		)
+
+		doc = self._make_outward_doc(
+			customer=self.customer_a,
+			item_code=item_code,
+			batch_no=batch_no,
+			warehouse=warehouse,
+			row_qtys=[3, 4],
+		)
+		doc.insert()
+
 	def test_transfer_rejects_batch_without_customer(self):
 		item_code, batch_no, source_warehouse = self._make_batch_with_stock(customer=None, qty=5)
 		doc = self._make_transfer_doc(
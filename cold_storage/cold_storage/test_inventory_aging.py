@@ -0,0 +1,92 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage.report.cold_storage_inventory_aging import (
+	cold_storage_inventory_aging as aging,
+)
+
+MODULE = "cold_storage.cold_storage.report.cold_storage_inventory_aging.cold_storage_inventory_aging"
+
+
+def _event(batch_no, warehouse, voucher_no, posting_date, qty):
+	return frappe._dict(
+		batch_no=batch_no,
+		warehouse=warehouse,
+		voucher_no=voucher_no,
+		posting_date=datetime.date.fromisoformat(posting_date),
+		qty=qty,
+		customer="CUST-A",
+		item_group="Fruits",
+	)
+
+
+class TestInventoryAging(TestCase):
+	def test_issues_consume_the_oldest_layers_first(self):
+		events = [
+			_event("B-1", "WH-1", "IN-1", "2026-01-01", 10),
+			_event("B-1", "WH-1", "IN-2", "2026-03-01", 5),
+			_event("B-1", "WH-1", "OUT-1", "2026-04-01", -12),
+		]
+
+		layers = list(aging.iter_open_layers(events))
+
+		self.assertEqual(
+			[(layer["qty"], str(layer["posting_date"])) for layer in layers], [(3, "2026-03-01")]
+		)
+
+	def test_transfer_keeps_the_age_of_the_moved_layers(self):
+		events = [
+			_event("B-1", "WH-1", "IN-1", "2026-01-01", 10),
+			_event("B-1", "WH-1", "TR-1", "2026-05-01", -4),
+			_event("B-1", "WH-2", "TR-1", "2026-05-01", 4),
+			_event("B-2", "WH-1", "IN-3", "2026-06-01", 2),
+		]
+
+		layers = list(aging.iter_open_layers(events))
+
+		self.assertEqual(
+			sorted((layer["warehouse"], layer["qty"], str(layer["posting_date"])) for layer in layers),
+			[("WH-1", 2, "2026-06-01"), ("WH-1", 6, "2026-01-01"), ("WH-2", 4, "2026-01-01")],
+		)
+
+	def test_open_stock_is_bucketed_per_customer_warehouse_and_item_group(self):
+		events = [
+			_event("B-1", "WH-1", "IN-1", "2026-10-01", 10),
+			_event("B-2", "WH-1", "IN-2", "2026-06-01", 5),
+		]
+		with patch(f"{MODULE}.get_ledger_events", return_value=iter(events)):
+			data = aging.get_data(frappe._dict(as_on_date="2026-10-18"))
+
+		self.assertEqual(len(data), 1)
+		self.assertEqual(data[0]["age_0_30"], 10)
+		self.assertEqual(data[0]["age_91_180"], 5)
+		self.assertEqual(data[0]["total_qty"], 15)
+
+	def test_warehouse_filter_keeps_the_original_date_of_stock_transferred_in(self):
+		events = [
+			_event("B-1", "WH-1", "IN-1", "2026-01-01", 10),
+			_event("B-1", "WH-1", "TR-1", "2026-10-01", -4),
+			_event("B-1", "WH-2", "TR-1", "2026-10-01", 4),
+		]
+		with patch(f"{MODULE}.get_ledger_events", return_value=iter(events)):
+			data = aging.get_data(frappe._dict(as_on_date="2026-10-18", warehouse="WH-2"))
+
+		self.assertEqual([row["warehouse"] for row in data], ["WH-2"])
+		self.assertEqual(data[0]["age_0_30"], 0)
+		self.assertEqual(data[0]["age_181_365"], 4)
+
+	def test_warehouse_filter_selects_batches_without_trimming_their_ledger(self):
+		with patch(f"{MODULE}.frappe.db") as db:
+			list(aging.get_ledger_events(frappe._dict(as_on_date="2026-10-18", warehouse="WH-2")))
+
+		query = db.sql.call_args.args[0]
+		ledger = query[: query.index("inner join `tabBatch` batch")]
+		self.assertNotIn("%(warehouse)s", ledger)
+		self.assertIn("batch.name in (", query)
+		self.assertIn("sle.warehouse = %(warehouse)s", query[query.index("batch.name in (") :])
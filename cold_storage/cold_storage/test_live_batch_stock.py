@@ -0,0 +1,64 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage.report.cold_storage_live_batch_stock import (
+	cold_storage_live_batch_stock as report,
+)
+
+MODULE = "cold_storage.cold_storage.report.cold_storage_live_batch_stock.cold_storage_live_batch_stock"
+
+
+class TestLiveBatchStock(TestCase):
+	def _balance_query(self, **filters):
+		with patch(f"{MODULE}.get_report_company", return_value="Default Co"):
+			return report.get_balance_query(frappe._dict(as_on_date="2026-10-18", **filters))
+
+	def test_zero_balances_are_dropped_in_sql(self):
+		balance_sql, _params = self._balance_query()
+		self.assertIn("having round(sum(movement.qty), 3) > 0", balance_sql)
+
+		balance_sql, _params = self._balance_query(include_zero_balance=1)
+		self.assertNotIn("having", balance_sql)
+
+	def test_ledger_is_aggregated_once_for_direct_and_bundle_batches(self):
+		balance_sql, params = self._balance_query(batch_no="B-1")
+
+		self.assertEqual(balance_sql.count("group by"), 1)
+		self.assertIn("`tabSerial and Batch Entry`", balance_sql)
+		self.assertIn("ifnull(sbe.batch_no, '') = %(batch_no)s", balance_sql)
+		self.assertEqual(params["company"], "Default Co")
+
+	def test_customer_filter_narrows_the_ledger_before_aggregation(self):
+		balance_sql, params = self._balance_query(customer="CUST-A")
+
+		aggregation = balance_sql[: balance_sql.index("group by")]
+		self.assertIn("sle.batch_no in (select cb.name from `tabBatch` cb", aggregation)
+		self.assertIn("sbe.batch_no in (select cb.name from `tabBatch` cb", aggregation)
+		self.assertNotIn("custom_customer", balance_sql[balance_sql.index("group by") :])
+		self.assertEqual(params["customer"], "CUST-A")
+
+	def test_execute_pages_in_sql_and_aggregates_totals_in_sql(self):
+		totals = [
+			frappe._dict(customer="CUST-A", warehouse="WH-1", row_count=600, balance_qty=1200),
+			frappe._dict(customer="CUST-B", warehouse="WH-1", row_count=400, balance_qty=800),
+		]
+		with (
+			patch(f"{MODULE}.get_report_company", return_value=None),
+			patch(f"{MODULE}.frappe.db.sql", side_effect=[[], totals]) as sql,
+		):
+			_columns, data, _message, chart, summary = report.execute({"page": 3, "page_length": "100"})
+
+		(page_sql, page_params), (totals_sql, _totals_params) = (call.args for call in sql.call_args_list)
+		self.assertIn("limit %(page_length)s offset %(offset)s", page_sql)
+		self.assertEqual((page_params["page_length"], page_params["offset"]), (100, 200))
+		self.assertIn("group by balance.customer, balance.warehouse", totals_sql)
+		self.assertNotIn("limit", totals_sql[totals_sql.rindex("group by balance.customer") :])
+		self.assertEqual(data, [])
+		self.assertEqual(summary[0]["value"], 1000)
+		self.assertEqual(summary[1]["value"], 2000)
+		self.assertEqual(chart["data"]["labels"], ["CUST-A", "CUST-B"])
@@ -5,12 +5,19 @@ from types import SimpleNamespace
 from unittest import TestCase
 from unittest.mock import patch
 
+import frappe
+
 from cold_storage.cold_storage.naming import (
 	get_company_abbreviation,
 	get_series_for_company,
 	is_cold_storage_prefixed_voucher,
 )
-from cold_storage.events.naming import autoname_cold_storage_gl_entry
+from cold_storage.events.naming import (
+	GL_ENTRY_SERIES_BLOCK,
+	autoname_cold_storage_child_doctype,
+	autoname_cold_storage_gl_entry,
+	release_gl_entry_series,
+)
 
 
 class DummyDoc(SimpleNamespace):
@@ -18,7 +25,54 @@ class DummyDoc(SimpleNamespace):
 		return getattr(self, key, default)
 
 
+class FakeCallbacks(list):
+	def add(self, callback) -> None:
+		self.append(callback)
+
+	def run(self) -> None:
+		for callback in list(self):
+			callback()
+		self.clear()
+
+
+class FakeSeries:
+	"""One ``tabSeries`` row with transactional state."""
+
+	def __init__(self) -> None:
+		self.current = self.committed = 0
+
+	def reserve(self, key: str, count: int, after: int = 0) -> int:
+		start = max(self.current, after)
+		self.current = start + count
+		return start + 1
+
+	def settle(self, key: str, reserved_until: int, used_until: int) -> None:
+		self.current = used_until if self.current == reserved_until else max(self.current, used_until)
+
+
+class FakeTransaction(SimpleNamespace):
+	"""``frappe.db`` callbacks as Frappe runs and resets them on commit/rollback."""
+
+	def __init__(self, series: FakeSeries) -> None:
+		super().__init__(series=series, before_commit=FakeCallbacks(), after_rollback=FakeCallbacks())
+
+	def commit(self) -> None:
+		self.before_commit.run()
+		self.after_rollback.clear()
+		self.series.committed = self.series.current
+
+	def rollback(self) -> None:
+		self.series.current = self.series.committed
+		self.before_commit.clear()
+		self.after_rollback.run()
+
+
 class TestColdStorageNaming(TestCase):
+	def setUp(self):
+		frappe.flags.cold_storage_company_abbr = None
+		frappe.flags.cold_storage_gl_entry_series = None
+		frappe.flags.cold_storage_child_parent_company = None
+
 	def test_get_company_abbreviation_prefers_company_abbr(self):
 		with patch(
 			"cold_storage.cold_storage.naming.frappe.get_cached_value",
@@ -33,6 +87,16 @@ class TestColdStorageNaming(TestCase):
 		):
 			self.assertEqual(get_company_abbreviation("Siddique Cold Storage"), "SCS01")
 
+	def test_get_company_abbreviation_is_memoized_per_request(self):
+		with patch(
+			"cold_storage.cold_storage.naming.frappe.get_cached_value",
+			return_value="SCS",
+		) as get_cached_value:
+			get_company_abbreviation("Siddique Cold Storage")
+			get_company_abbreviation("Siddique Cold Storage")
+
+		get_cached_value.assert_called_once()
+
 	def test_get_series_for_company_builds_prefix(self):
 		with patch(
 			"cold_storage.cold_storage.naming.frappe.get_cached_value",
@@ -51,12 +115,15 @@ class TestColdStorageNaming(TestCase):
 			self.assertFalse(is_cold_storage_prefixed_voucher("SCS-SINV-2026-00001", "Siddique Cold Storage"))
 
 	def test_autoname_cold_storage_gl_entry_assigns_prefixed_name(self):
-		doc = DummyDoc(
-			name=None,
-			voucher_type="Sales Invoice",
-			voucher_no="SCS-CS-SINV-2026-00001",
-			company="Siddique Cold Storage",
-		)
+		docs = [
+			DummyDoc(
+				name=None,
+				voucher_type="Sales Invoice",
+				voucher_no="SCS-CS-SINV-2026-00001",
+				company="Siddique Cold Storage",
+			)
+			for _row in range(3)
+		]
 		with (
 			patch(
 				"cold_storage.events.naming.is_cold_storage_prefixed_voucher",
@@ -67,14 +134,73 @@ class TestColdStorageNaming(TestCase):
 				return_value="SCS-CS-GLE-.YYYY.-",
 			),
 			patch(
-				"cold_storage.events.naming.make_autoname",
-				return_value="SCS-CS-GLE-2026-00001",
-			) as make_name,
+				"cold_storage.events.naming.parse_naming_series",
+				return_value="SCS-CS-GLE-2026-",
+			),
+			patch("cold_storage.events.naming.reserve_series_numbers", return_value=41) as reserve,
 		):
+			for doc in docs:
+				autoname_cold_storage_gl_entry(doc)
+
+		self.assertEqual(
+			[doc.name for doc in docs],
+			["SCS-CS-GLE-2026-00041", "SCS-CS-GLE-2026-00042", "SCS-CS-GLE-2026-00043"],
+		)
+		reserve.assert_called_once_with("SCS-CS-GLE-2026-", GL_ENTRY_SERIES_BLOCK, after=0)
+
+	def test_gl_entry_reservations_do_not_survive_commit_or_rollback(self):
+		series = FakeSeries()
+		db = FakeTransaction(series)
+		voucher = {
+			"voucher_type": "Sales Invoice",
+			"voucher_no": "SCS-CS-SINV-2026-00001",
+			"company": "Siddique Cold Storage",
+		}
+
+		def next_name() -> str:
+			doc = DummyDoc(name=None, **voucher)
 			autoname_cold_storage_gl_entry(doc)
+			return doc.name
+
+		with (
+			patch("cold_storage.events.naming.frappe.db", db),
+			patch("cold_storage.events.naming.is_cold_storage_prefixed_voucher", return_value=True),
+			patch("cold_storage.events.naming.get_series_for_company", return_value="SCS-CS-GLE-.YYYY.-"),
+			patch("cold_storage.events.naming.parse_naming_series", return_value="SCS-CS-GLE-2026-"),
+			patch("cold_storage.events.naming.reserve_series_numbers", side_effect=series.reserve),
+			patch("cold_storage.events.naming.settle_series_numbers", side_effect=series.settle),
+		):
+			# Posted outside the voucher hooks: the commit settles the unused tail.
+			self.assertEqual(next_name(), "SCS-CS-GLE-2026-00001")
+			db.commit()
+			self.assertEqual(series.current, 1)
+
+			self.assertEqual(next_name(), "SCS-CS-GLE-2026-00002")
+			db.rollback()
+			self.assertEqual(series.current, 1)
+
+			# The rolled-back block is forgotten, not reused past the series.
+			self.assertEqual(next_name(), "SCS-CS-GLE-2026-00002")
+			self.assertEqual(series.current, 1 + GL_ENTRY_SERIES_BLOCK)
+
+	def test_release_gl_entry_series_returns_unused_numbers(self):
+		frappe.flags.cold_storage_gl_entry_series = {
+			("Siddique Cold Storage", "Sales Invoice", "SCS-CS-SINV-2026-00001"): {
+				"key": "SCS-CS-GLE-2026-",
+				"next": 44,
+				"end": 56,
+			}
+		}
+		voucher = DummyDoc(
+			doctype="Sales Invoice",
+			name="SCS-CS-SINV-2026-00001",
+			company="Siddique Cold Storage",
+		)
+		with patch("cold_storage.events.naming.release_series_numbers") as release:
+			release_gl_entry_series(voucher, "on_submit")
 
-		self.assertEqual(doc.name, "SCS-CS-GLE-2026-00001")
-		make_name.assert_called_once_with("SCS-CS-GLE-.YYYY.-.#####", doc=doc)
+		release.assert_called_once_with("SCS-CS-GLE-2026-", 56, 43)
+		self.assertEqual(frappe.flags.cold_storage_gl_entry_series, {})
 
 	def test_autoname_cold_storage_gl_entry_skips_non_cold_storage_voucher(self):
 		doc = DummyDoc(
@@ -88,9 +214,56 @@ class TestColdStorageNaming(TestCase):
 				"cold_storage.events.naming.is_cold_storage_prefixed_voucher",
 				return_value=False,
 			),
-			patch("cold_storage.events.naming.make_autoname") as make_name,
+			patch("cold_storage.events.naming.reserve_series_numbers") as reserve,
 		):
 			autoname_cold_storage_gl_entry(doc)
 
 		self.assertIsNone(doc.name)
-		make_name.assert_not_called()
+		reserve.assert_not_called()
+
+	def test_child_autoname_uses_parent_doc_without_queries(self):
+		parent = DummyDoc(
+			doctype="Cold Storage Inward", name="SCS-CS-IN-2026-00001", company="Siddique Cold Storage"
+		)
+		rows = [
+			DummyDoc(
+				name=None,
+				doctype="Cold Storage Inward Item",
+				parenttype="Cold Storage Inward",
+				parent=parent.name,
+				parent_doc=parent,
+			)
+			for _row in range(3)
+		]
+		with (
+			patch("cold_storage.events.naming.get_company_abbreviation", return_value="SCS"),
+			patch("cold_storage.events.naming.frappe.db.get_value") as get_value,
+		):
+			for row in rows:
+				autoname_cold_storage_child_doctype(row)
+
+		get_value.assert_not_called()
+		self.assertTrue(all(row.name.startswith("SCS-CS-INI-") for row in rows))
+
+	def test_child_autoname_reads_parent_company_once_per_request(self):
+		rows = [
+			DummyDoc(
+				name=None,
+				doctype="Cold Storage Outward Item",
+				parenttype="Cold Storage Outward",
+				parent="SCS-CS-OUT-2026-00001",
+			)
+			for _row in range(3)
+		]
+		with (
+			patch("cold_storage.events.naming.get_company_abbreviation", return_value="SCS"),
+			patch(
+				"cold_storage.events.naming.frappe.db.get_value",
+				return_value="Siddique Cold Storage",
+			) as get_value,
+		):
+			for row in rows:
+				autoname_cold_storage_child_doctype(row)
+
+		get_value.assert_called_once_with("Cold Storage Outward", "SCS-CS-OUT-2026-00001", "company")
+		self.assertTrue(all(row.name.startswith("SCS-CS-OUTI-") for row in rows))
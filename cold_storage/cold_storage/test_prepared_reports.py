@@ -0,0 +1,81 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import frappe
+
+from cold_storage.cold_storage import prepared_reports
+
+MODULE = "cold_storage.cold_storage.prepared_reports"
+NOTIFY = "frappe.desk.doctype.notification_log.notification_log.enqueue_create_notification"
+REPORT = "Cold Storage Customer Register"
+
+
+def _prepared_report(status: str, status_changed: bool = True, report_name: str = REPORT):
+	doc = frappe._dict(
+		doctype="Prepared Report",
+		name="PR-0001",
+		report_name=report_name,
+		status=status,
+		owner="a@example.com",
+	)
+	doc.has_value_changed = Mock(return_value=status_changed)
+	return doc
+
+
+class TestPreparedReports(TestCase):
+	def test_owner_is_notified_once_the_run_finishes(self):
+		with patch(NOTIFY) as notify:
+			prepared_reports.notify_prepared_report_ready(_prepared_report("Completed"))
+
+		notify.assert_called_once()
+		self.assertEqual(notify.call_args.args[0], "a@example.com")
+		self.assertEqual(notify.call_args.args[1]["document_name"], "PR-0001")
+
+	def test_no_notification_for_pending_unchanged_or_other_reports(self):
+		with patch(NOTIFY) as notify:
+			prepared_reports.notify_prepared_report_ready(_prepared_report("Started"))
+			prepared_reports.notify_prepared_report_ready(_prepared_report("Completed", status_changed=False))
+			prepared_reports.notify_prepared_report_ready(
+				_prepared_report("Completed", report_name="General Ledger")
+			)
+
+		notify.assert_not_called()
+
+	def test_completed_result_is_reused_only_within_the_same_movement_epoch(self):
+		with (
+			patch(f"{MODULE}.frappe.cache.get_value", return_value=3) as get_value,
+			patch(f"{MODULE}.get_movement_epoch", side_effect=[3, 4]),
+		):
+			self.assertTrue(prepared_reports._is_current("PR-0001"))
+			self.assertFalse(prepared_reports._is_current("PR-0001"))
+
+		self.assertEqual(
+			get_value.call_args.args[0], f"{prepared_reports.PREPARED_REPORT_EPOCH_CACHE_KEY}:PR-0001"
+		)
+
+	def test_epoch_is_stored_with_an_expiry_and_dropped_with_the_run(self):
+		doc = _prepared_report("Queued")
+		with (
+			patch(f"{MODULE}.get_movement_epoch", return_value=5),
+			patch(f"{MODULE}.frappe.cache.set_value") as set_value,
+			patch(f"{MODULE}.frappe.cache.delete_value") as delete_value,
+		):
+			prepared_reports.record_prepared_report_epoch(doc)
+			prepared_reports.clear_prepared_report_epoch(doc)
+
+		key = f"{prepared_reports.PREPARED_REPORT_EPOCH_CACHE_KEY}:PR-0001"
+		set_value.assert_called_once_with(key, 5, expires_in_sec=prepared_reports.PREPARED_REPORT_EPOCH_TTL)
+		delete_value.assert_called_once_with(key)
+
+	def test_pending_run_is_reused_instead_of_queueing_another(self):
+		with (
+			patch(f"{MODULE}.frappe.db.get_value", return_value="PR-0002"),
+			patch(f"{MODULE}.frappe.get_doc") as get_doc,
+		):
+			name = prepared_reports.queue_prepared_report(REPORT, {"company": "Default Co"})
+
+		self.assertEqual(name, "PR-0002")
+		get_doc.assert_not_called()
@@ -0,0 +1,177 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""N+1 guards: statement counts of hot paths must not grow with rows or customers in scope."""
+
+from unittest.mock import MagicMock, patch
+
+import frappe
+from erpnext.stock.doctype.item.test_item import make_item
+from frappe.tests import IntegrationTestCase
+from frappe.utils import nowdate
+
+from cold_storage.api import client_portal
+from cold_storage.benchmarks.synthetic_data import make_document
+from cold_storage.cold_storage.doctype.cold_storage_batch_ranking.cold_storage_batch_ranking import (
+	refresh_batch_ranking,
+)
+from cold_storage.cold_storage.doctype.cold_storage_customer_daily_movement.cold_storage_customer_daily_movement import (
+	update_customer_daily_movements,
+)
+from cold_storage.cold_storage.instrumentation import count_queries
+from cold_storage.cold_storage.test_integration_flows import ColdStorageIntegrationMixin
+from cold_storage.cold_storage.utils import create_stock_entry_for_cold_storage
+
+ROW_COUNTS = (1, 50, 200)
+CUSTOMER_COUNTS = (1, 100)
+# Room for one-off lookups (e.g. a cold document cache) that do not scale with input size.
+QUERY_COUNT_TOLERANCE = 2
+
+
+class TestQueryCounts(ColdStorageIntegrationMixin, IntegrationTestCase):
+	def setUp(self):
+		super().setUp()
+		self._set_up_cold_storage()
+
+	def test_inward_queries_do_not_grow_with_rows(self):
+		batch_nos = self._make_batches(max(ROW_COUNTS), with_stock=False)
+		self._assert_controller_queries_are_bounded("Cold Storage Inward", batch_nos)
+
+	def test_outward_queries_do_not_grow_with_rows(self):
+		batch_nos = self._make_batches(max(ROW_COUNTS), with_stock=True)
+		self._assert_controller_queries_are_bounded("Cold Storage Outward", batch_nos)
+
+	def test_transfer_queries_do_not_grow_with_rows(self):
+		batch_nos = self._make_batches(max(ROW_COUNTS), with_stock=True)
+		self._assert_controller_queries_are_bounded(
+			"Cold Storage Transfer",
+			batch_nos,
+			transfer_type="Inter-Warehouse Transfer",
+			target_warehouse=self.finished_warehouse,
+		)
+
+	def test_get_snapshot_queries_do_not_grow_with_customers_in_scope(self):
+		customers = [self.customer_a] + [
+			self._ensure_customer(f"CS Query Count Customer {index:03d}")
+			for index in range(1, max(CUSTOMER_COUNTS))
+		]
+		# Every customer owns stock, a ranked batch and a trend row, so each query returns data.
+		batch_nos = self._make_batches(len(customers), with_stock=True, customers=customers)
+		refresh_batch_ranking(batch_nos)
+		update_customer_daily_movements(
+			[
+				{"posting_date": nowdate(), "customer": customer, "movement_type": "Inward", "qty": 10}
+				for customer in customers
+			]
+		)
+
+		counts = {}
+		for customer_count in CUSTOMER_COUNTS:
+			scoped_customers = customers[:customer_count]
+			with (
+				patch.object(client_portal, "get_customers_for_portal_user", return_value=scoped_customers),
+				patch.object(
+					client_portal.frappe, "get_roles", return_value=[client_portal.CLIENT_PORTAL_ROLE]
+				),
+				count_queries() as counter,
+			):
+				snapshot = client_portal.get_snapshot(limit=client_portal.MAX_LIMIT)
+			self.assertEqual(len(snapshot["available_customers"]), customer_count)
+			self.assertEqual({row["customer"] for row in snapshot["stock"]}, set(scoped_customers))
+			counts[customer_count] = counter["queries"]
+
+		self.assertBounded(counts, "get_snapshot")
+
+	def assertBounded(self, counts: dict[int, int], label: str) -> None:
+		baseline = counts[min(counts)]
+		for size, count in counts.items():
+			self.assertLessEqual(
+				abs(count - baseline),
+				QUERY_COUNT_TOLERANCE,
+				f"{label}: {count} queries for {size} vs {baseline} for {min(counts)} ({counts})",
+			)
+
+	def _assert_controller_queries_are_bounded(
+		self, doctype: str, batch_nos: list[str], target_warehouse: str | None = None, **values
+	) -> None:
+		validate_counts = {}
+		submit_counts = {}
+		for row_count in ROW_COUNTS:
+			rows = [
+				{
+					"batch_no": batch_no,
+					"warehouse": self.warehouse,
+					"target_warehouse": target_warehouse,
+					"qty": 1,
+				}
+				for batch_no in batch_nos[:row_count]
+			]
+			doc = make_document(self._dataset, doctype, rows, customer=self.customer_a, **values)
+
+			with count_queries() as counter:
+				doc.run_method("validate")
+			validate_counts[row_count] = counter["queries"]
+
+			doc.insert()
+			with self._stub_erpnext_postings(), count_queries() as counter:
+				doc.run_method("on_submit")
+			submit_counts[row_count] = counter["queries"]
+
+		self.assertBounded(validate_counts, f"{doctype} validate")
+		self.assertBounded(submit_counts, f"{doctype} on_submit")
+
+	def _stub_erpnext_postings(self):
+		"""Stand in for the Stock Entry/Sales Invoice/Journal Entry this app posts on submit.
+
+		ERPNext writes ledger rows per item when those are submitted; that cost is not this
+		app's to bound, so only the Cold Storage side of on_submit is counted.
+		"""
+		posted = MagicMock()
+		posted.name = "CS-QUERY-COUNT-STUB"
+		return patch.object(frappe, "new_doc", return_value=posted)
+
+	@property
+	def _dataset(self) -> frappe._dict:
+		return frappe._dict(
+			company=self.company, item_code=self.item_code, item_group="Products", uom=self.uom
+		)
+
+	def _make_batches(self, count: int, *, with_stock: bool, customers: list[str] | None = None) -> list[str]:
+		self.item_code = make_item(
+			item_code=f"CS-QC-ITEM-{frappe.generate_hash(length=8)}",
+			properties={
+				"is_stock_item": 1,
+				"has_batch_no": 1,
+				"stock_uom": self.uom,
+				"item_group": "Products",
+			},
+		).name
+
+		batch_nos = []
+		for index in range(count):
+			batch = frappe.new_doc("Batch")
+			batch.batch_id = f"CS-QC-BATCH-{frappe.generate_hash(length=10)}"
+			batch.item = self.item_code
+			batch.custom_customer = customers[index % len(customers)] if customers else self.customer_a
+			batch.insert()
+			batch_nos.append(batch.name)
+
+		if with_stock:
+			create_stock_entry_for_cold_storage(
+				company=self.company,
+				posting_date=None,
+				purpose="Material Receipt",
+				items=[
+					{
+						"item_code": self.item_code,
+						"qty": 10,
+						"uom": self.uom,
+						"batch_no": batch_no,
+						"t_warehouse": self.warehouse,
+					}
+					for batch_no in batch_nos
+				],
+				reference_doctype="Batch",
+				reference_name=batch_nos[0],
+			)
+		return batch_nos
@@ -0,0 +1,74 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage import receivable_snapshots
+from cold_storage.cold_storage.report.cold_storage_receivables_aging_waterfall import (
+	cold_storage_receivables_aging_waterfall as waterfall,
+)
+
+MODULE = "cold_storage.cold_storage.receivable_snapshots"
+
+
+class TestReceivableSnapshots(TestCase):
+	def test_balance_is_snapshot_plus_entries_after_month_end(self):
+		snapshot = [["CUST-A", "2026-09-15", 100.0], ["CUST-B", "2026-09-20", 40.0]]
+		delta = [frappe._dict(customer="CUST-A", due_date="2026-09-15", balance=-30.0)]
+		with (
+			patch(f"{MODULE}.get_ar_snapshot", return_value=snapshot) as get_snapshot,
+			patch(f"{MODULE}._get_balance_rows", return_value=delta) as get_rows,
+		):
+			balances = receivable_snapshots.get_receivable_balances("Default Co", "CUST-A", "2026-10-18")
+
+		get_snapshot.assert_called_once_with("Default Co", datetime.date(2026, 9, 30))
+		self.assertEqual(
+			get_rows.call_args.args[2:], (datetime.date(2026, 10, 1), datetime.date(2026, 10, 18))
+		)
+		self.assertEqual(balances, {("CUST-A", datetime.date(2026, 9, 15)): 70.0})
+
+	def test_snapshot_is_computed_once_and_then_served_from_cache(self):
+		store = {}
+		rows = [frappe._dict(customer="CUST-A", due_date=datetime.date(2026, 9, 15), balance=100)]
+		with (
+			patch(f"{MODULE}.frappe.cache.hget", side_effect=lambda name, key: store.get(key)),
+			patch(
+				f"{MODULE}.frappe.cache.hset",
+				side_effect=lambda name, key, value: store.__setitem__(key, value),
+			),
+			patch(f"{MODULE}._get_balance_rows", return_value=rows) as get_rows,
+		):
+			first = receivable_snapshots.get_ar_snapshot("Default Co", "2026-09-30")
+			second = receivable_snapshots.get_ar_snapshot("Default Co", "2026-09-30")
+
+		get_rows.assert_called_once()
+		self.assertEqual(first, second)
+		self.assertEqual(first, [["CUST-A", "2026-09-15", 100.0]])
+
+	def test_new_ledger_entry_drops_only_snapshots_it_falls_into(self):
+		fields = [b"Default Co|2026-08-31", b"Default Co|2026-09-30", b"Other Co|2026-09-30", b"|2026-09-30"]
+		entry = frappe._dict(company="Default Co", posting_date="2026-09-10")
+		with (
+			patch(f"{MODULE}.frappe.cache.hkeys", return_value=fields),
+			patch(f"{MODULE}.frappe.cache.hdel") as hdel,
+		):
+			receivable_snapshots.invalidate_ar_snapshots(entry)
+
+		self.assertEqual(
+			[call.args[1] for call in hdel.call_args_list], ["Default Co|2026-09-30", "|2026-09-30"]
+		)
+
+	def test_sql_buckets_match_python_buckets(self):
+		bucket_sql = waterfall.get_bucket_sql("%(to_date)s", "ledger.due_date")
+
+		for key, max_age_days in waterfall.BUCKET_MAX_AGE_DAYS[:-1]:
+			self.assertIn(f"<= {max_age_days} then '{key}'", bucket_sql)
+			self.assertEqual(
+				waterfall.get_bucket_key("2026-10-18", frappe.utils.add_days("2026-10-18", -max_age_days)),
+				key,
+			)
+		self.assertTrue(bucket_sql.endswith("else '180+' end"))
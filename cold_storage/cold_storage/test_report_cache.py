@@ -0,0 +1,68 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import frappe
+
+from cold_storage.cold_storage import report_cache
+
+MODULE = "cold_storage.cold_storage.report_cache"
+
+
+class TestReportCache(TestCase):
+	def test_filters_normalize_regardless_of_order_and_empty_values(self):
+		self.assertEqual(
+			report_cache.normalize_filters({"company": "Default Co", "customer": "", "warehouse": None}),
+			report_cache.normalize_filters('{"company": "Default Co"}'),
+		)
+		self.assertNotEqual(
+			report_cache.normalize_filters({"company": "Default Co"}),
+			report_cache.normalize_filters({"company": "Other Co"}),
+		)
+
+	def test_cache_key_changes_with_movement_epoch(self):
+		with (
+			patch(f"{MODULE}.get_user_scope_key", return_value="scope"),
+			patch(f"{MODULE}.get_movement_epoch", side_effect=[4, 5]),
+		):
+			before = report_cache.get_report_cache_key(
+				"cold_storage_customer_register", {"as_on_date": "2026-10-18"}
+			)
+			after = report_cache.get_report_cache_key(
+				"cold_storage_customer_register", {"as_on_date": "2026-10-18"}
+			)
+
+		self.assertNotEqual(before, after)
+		self.assertIn(":cold_storage_customer_register:4:", before)
+
+	def test_cached_report_serves_repeat_runs_from_cache(self):
+		store = {}
+		execute = Mock(return_value=(["col"], [{"qty": 1}], None, None, []))
+		execute.__module__ = "cold_storage.cold_storage.report.demo.demo"
+		execute.__name__ = "execute"
+		cached_execute = report_cache.cached_report(execute)
+
+		with (
+			patch(f"{MODULE}.get_report_cache_key", return_value="key"),
+			patch(f"{MODULE}.frappe.cache.get_value", side_effect=store.get),
+			patch(
+				f"{MODULE}.frappe.cache.set_value",
+				side_effect=lambda key, value, expires_in_sec=None: store.__setitem__(key, value),
+			),
+		):
+			first = cached_execute({"company": "Default Co"})
+			second = cached_execute({"company": "Default Co"})
+
+		execute.assert_called_once()
+		self.assertEqual(first, second)
+
+	def test_epoch_bump_waits_for_commit_and_is_queued_once(self):
+		frappe.flags.cold_storage_movement_epoch_queued = False
+		with patch(f"{MODULE}.frappe.db") as db:
+			report_cache.bump_movement_epoch()
+			report_cache.bump_movement_epoch()
+
+		db.after_commit.add.assert_called_once_with(report_cache._increment_movement_epoch)
+		frappe.flags.cold_storage_movement_epoch_queued = False
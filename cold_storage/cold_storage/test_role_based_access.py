@@ -0,0 +1,80 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage import install
+from cold_storage.setup import role_based_access
+from cold_storage.setup.role_based_access import PERMISSION_FIELDS, get_permission_changes
+
+
+def _perm_row(name: str, role: str, **values):
+	return frappe._dict(
+		name=name,
+		role=role,
+		permlevel=values.pop("permlevel", 0),
+		**{fieldname: values.get(fieldname, 0) for fieldname in PERMISSION_FIELDS},
+	)
+
+
+class TestRoleBasedAccessSync(TestCase):
+	def test_matching_permissions_produce_no_changes(self):
+		existing = [_perm_row("P1", "Stock User", read=1, select=1)]
+
+		changes = get_permission_changes(existing, [{"role": "Stock User", "read": 1, "select": 1}])
+
+		self.assertEqual(changes, ([], {}, []))
+
+	def test_only_differing_fields_are_updated(self):
+		existing = [
+			_perm_row("P1", "Stock User", read=1),
+			_perm_row("P2", "Stock User", read=1),
+			_perm_row("P3", "Old Role", read=1),
+		]
+		desired = [
+			{"role": "Stock User", "read": 1, "write": 1},
+			{"role": "Stock Manager", "read": 1},
+		]
+
+		to_insert, to_update, to_delete = get_permission_changes(existing, desired)
+
+		self.assertEqual(to_update, {"P1": {"write": 1}})
+		self.assertEqual(to_delete, ["P2", "P3"])
+		self.assertEqual([row["role"] for row in to_insert], ["Stock Manager"])
+
+	def test_sync_clears_only_changed_doctypes(self):
+		with (
+			patch.object(role_based_access, "_ensure_roles", return_value=False),
+			patch.object(role_based_access, "_ensure_role_profiles"),
+			patch.object(
+				role_based_access, "_sync_doctype_permissions", return_value={"Charge Configuration"}
+			),
+			patch.object(role_based_access, "_ensure_activity_log_permissions", return_value=False),
+			patch.object(role_based_access, "_sync_report_roles"),
+			patch.object(role_based_access.frappe, "clear_cache") as clear_cache,
+		):
+			role_based_access.sync_role_based_access()
+
+		clear_cache.assert_called_once_with(doctype="Charge Configuration")
+
+	def test_migrate_skips_setup_when_fingerprint_is_unchanged(self):
+		with (
+			patch.object(install, "_ensure_default_uom_setting"),
+			patch.object(install, "get_setup_fingerprint", return_value="abc"),
+			patch.object(install.frappe.db, "get_global", return_value="abc"),
+			patch.object(install, "sync_setup") as sync_setup,
+		):
+			install.after_migrate()
+
+		sync_setup.assert_not_called()
+
+	def test_fingerprint_changes_with_setup_sources(self):
+		first = install.get_setup_fingerprint()
+		with patch.object(install, "SETUP_FINGERPRINT_SOURCES", ("install.py",)):
+			second = install.get_setup_fingerprint()
+
+		self.assertEqual(first, install.get_setup_fingerprint())
+		self.assertNotEqual(first, second)
@@ -0,0 +1,169 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage import stock_statements
+
+MODULE = "cold_storage.cold_storage.stock_statements"
+
+
+class TestStockStatements(TestCase):
+	def test_build_stock_statements_merges_stock_and_outstanding_in_one_pass(self):
+		stock = {
+			"CUST-A": [
+				frappe._dict(item_code="APL", item_name="Apple", stock_uom="Crate", batch_count=2, qty=40),
+				frappe._dict(item_code="ONI", item_name="Onion", stock_uom="Bag", batch_count=1, qty=5.5),
+			],
+		}
+		outstanding = {"CUST-A": 100.0, "CUST-B": 250.0}
+		details = {
+			"CUST-A": {"customer_name": "Alpha Farms", "email": "a@example.com"},
+			"CUST-B": {"customer_name": "Beta Traders", "email": ""},
+		}
+
+		with (
+			patch(f"{MODULE}.get_item_stock_by_customer", return_value=stock) as get_stock,
+			patch(f"{MODULE}.get_outstanding_by_customer", return_value=outstanding) as get_outstanding,
+			patch(f"{MODULE}._get_customer_details", return_value=details) as get_details,
+			patch(f"{MODULE}.fmt_money", side_effect=lambda value, currency=None: f"{value:.2f}"),
+		):
+			statements = stock_statements.build_stock_statements(as_on="2026-10-18")
+
+		get_stock.assert_called_once_with(company=None)
+		get_outstanding.assert_called_once_with(company=None)
+		get_details.assert_called_once_with(["CUST-A", "CUST-B"])
+		self.assertEqual([row["customer"] for row in statements], ["CUST-A", "CUST-B"])
+		self.assertEqual(statements[0]["total_qty"], 45.5)
+		self.assertEqual(statements[0]["outstanding"], "100.00")
+		self.assertEqual(statements[1]["items"], [])
+		self.assertEqual(statements[1]["outstanding"], "250.00")
+
+	def test_build_stock_statements_only_totals_the_requested_company(self):
+		stock = {
+			"Alpha Co": {"CUST-A": [frappe._dict(item_code="APL", item_name="Apple", qty=40)]},
+			"Beta Co": {"CUST-A": [frappe._dict(item_code="APL", item_name="Apple", qty=900)]},
+		}
+		outstanding = {"Alpha Co": {"CUST-A": 100.0}, "Beta Co": {"CUST-A": 5000.0}}
+		currency_by_company = {"Alpha Co": "INR", "Beta Co": "USD"}
+
+		with (
+			patch(
+				f"{MODULE}.get_item_stock_by_customer",
+				side_effect=lambda company=None: stock[company],
+			) as get_stock,
+			patch(
+				f"{MODULE}.get_outstanding_by_customer",
+				side_effect=lambda company=None: outstanding[company],
+			) as get_outstanding,
+			patch(
+				f"{MODULE}._get_customer_details",
+				return_value={"CUST-A": {"customer_name": "Alpha Farms", "email": ""}},
+			),
+			patch(
+				f"{MODULE}.frappe.get_cached_value",
+				side_effect=lambda doctype, name, field: currency_by_company[name],
+			),
+			patch(
+				f"{MODULE}.fmt_money",
+				side_effect=lambda value, currency=None: f"{currency} {value:.2f}",
+			),
+		):
+			statements = stock_statements.build_stock_statements(company="Alpha Co", as_on="2026-10-18")
+
+		get_stock.assert_called_once_with(company="Alpha Co")
+		get_outstanding.assert_called_once_with(company="Alpha Co")
+		self.assertEqual(len(statements), 1)
+		self.assertEqual(statements[0]["company"], "Alpha Co")
+		self.assertEqual(statements[0]["total_qty"], 40)
+		self.assertEqual(statements[0]["outstanding"], "INR 100.00")
+
+	def test_build_stock_statements_skips_disabled_customers(self):
+		with (
+			patch(f"{MODULE}.get_item_stock_by_customer", return_value={}),
+			patch(f"{MODULE}.get_outstanding_by_customer", return_value={"CUST-X": 10.0}),
+			patch(f"{MODULE}._get_customer_details", return_value={}),
+		):
+			self.assertEqual(stock_statements.build_stock_statements(as_on="2026-10-18"), [])
+
+	def test_send_daily_stock_statements_enqueues_fixed_size_batches(self):
+		settings = SimpleNamespace(
+			get=lambda key: {
+				"send_daily_stock_statements": 1,
+				"stock_statement_channels": "WhatsApp and Email",
+				"company": "Default Co",
+			}.get(key)
+		)
+		statements = [
+			{"customer": f"CUST-{index}"} for index in range(stock_statements.STATEMENT_BATCH_SIZE + 1)
+		]
+
+		with (
+			patch(f"{MODULE}.frappe.get_cached_doc", return_value=settings),
+			patch(f"{MODULE}.build_stock_statements", return_value=statements),
+			patch(f"{MODULE}.frappe.enqueue") as enqueue,
+		):
+			queued = stock_statements.send_daily_stock_statements()
+
+		self.assertEqual(queued, len(statements))
+		self.assertEqual(enqueue.call_count, 2)
+		self.assertEqual(
+			len(enqueue.call_args_list[0].kwargs["statements"]), stock_statements.STATEMENT_BATCH_SIZE
+		)
+		self.assertEqual(enqueue.call_args_list[1].kwargs["channels"], ["WhatsApp", "Email"])
+
+	def test_send_daily_stock_statements_is_noop_when_disabled(self):
+		settings = SimpleNamespace(get=lambda key: 0 if key == "send_daily_stock_statements" else None)
+
+		with (
+			patch(f"{MODULE}.frappe.get_cached_doc", return_value=settings),
+			patch(f"{MODULE}.build_stock_statements") as build,
+			patch(f"{MODULE}.frappe.enqueue") as enqueue,
+		):
+			self.assertEqual(stock_statements.send_daily_stock_statements(), 0)
+
+		build.assert_not_called()
+		enqueue.assert_not_called()
+
+	def test_send_stock_statement_batch_uses_one_whatsapp_call_per_batch(self):
+		statements = [
+			{
+				"customer": "CUST-A",
+				"customer_name": "Alpha Farms",
+				"email": "a@example.com",
+				"as_on": "18-10-2026",
+				"items": [{"item_name": "Apple", "qty": 40, "stock_uom": "Crate"}],
+				"total_qty": 40,
+				"outstanding": "100.00",
+			},
+			{
+				"customer": "CUST-B",
+				"customer_name": "Beta Traders",
+				"email": "",
+				"as_on": "18-10-2026",
+				"items": [],
+				"total_qty": 0,
+				"outstanding": "250.00",
+			},
+		]
+
+		with (
+			patch(f"{MODULE}.send_customer_template_messages") as send_whatsapp,
+			patch(f"{MODULE}.get_url", return_value="https://example.com/cs-portal"),
+			patch(f"{MODULE}.frappe.sendmail") as sendmail,
+		):
+			stock_statements.send_stock_statement_batch(statements, ["WhatsApp", "Email"])
+
+		send_whatsapp.assert_called_once()
+		template_key, contexts = send_whatsapp.call_args.args
+		self.assertEqual(template_key, "Stock Statement")
+		self.assertEqual(contexts["CUST-A"]["item_summary"], "Apple: 40 Crate")
+		self.assertEqual(contexts["CUST-A"]["customer_name"], "Alpha Farms")
+		self.assertEqual(contexts["CUST-B"]["outstanding"], "250.00")
+		self.assertNotIn("\n", contexts["CUST-B"]["item_summary"])
+		sendmail.assert_called_once()
+		self.assertEqual(sendmail.call_args.kwargs["recipients"], ["a@example.com"])
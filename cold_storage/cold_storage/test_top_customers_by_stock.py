@@ -0,0 +1,58 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from cold_storage.cold_storage.dashboard_chart_source.top_customers_by_stock import (
+	top_customers_by_stock as top_customers,
+)
+
+MODULE = "cold_storage.cold_storage.dashboard_chart_source.top_customers_by_stock.top_customers_by_stock"
+
+
+class TestTopCustomersByStock(TestCase):
+	def test_cached_rows_skip_the_aggregate_query(self):
+		cached = [{"customer": "CUST-1", "qty": 10.0}]
+		with (
+			patch(f"{MODULE}.frappe.has_permission", return_value=True),
+			patch(f"{MODULE}.get_movement_epoch", return_value=7),
+			patch(f"{MODULE}.frappe.cache.get_value", return_value=cached) as get_value,
+			patch(f"{MODULE}.frappe.db.sql") as sql,
+		):
+			rows = top_customers.get_top_customers(company="Cold Co")
+
+		self.assertEqual(rows, cached)
+		self.assertEqual(
+			get_value.call_args.args[0], f"{top_customers.TOP_CUSTOMERS_CACHE_KEY_PREFIX}:7:Cold Co:8"
+		)
+		sql.assert_not_called()
+
+	def test_cache_miss_reads_daily_movements_and_stores_the_ranking(self):
+		with (
+			patch(f"{MODULE}.frappe.has_permission", return_value=True),
+			patch(f"{MODULE}.get_movement_epoch", return_value=1),
+			patch(f"{MODULE}.frappe.cache.get_value", return_value=None),
+			patch(f"{MODULE}.frappe.cache.set_value") as set_value,
+			patch(
+				f"{MODULE}.frappe.db.sql",
+				return_value=[frappe._dict(customer="CUST-1", qty=12.34567)],
+			) as sql,
+		):
+			rows = top_customers.get_top_customers(limit=500)
+
+		self.assertEqual(rows, [{"customer": "CUST-1", "qty": 12.346}])
+		self.assertIn("`tabCold Storage Daily Movement`", sql.call_args.args[0])
+		self.assertEqual(sql.call_args.args[1]["limit"], top_customers.MAX_LIMIT)
+		self.assertEqual(set_value.call_args.args[1], rows)
+
+	def test_chart_source_returns_labels_and_dataset(self):
+		rows = [{"customer": "CUST-1", "qty": 5.0}, {"customer": "CUST-2", "qty": 2.0}]
+		with patch(f"{MODULE}.get_top_customers", return_value=rows) as get_top:
+			chart = top_customers.get(filters='{"company": "Cold Co"}')
+
+		get_top.assert_called_once_with(company="Cold Co")
+		self.assertEqual(chart["labels"], ["CUST-1", "CUST-2"])
+		self.assertEqual(chart["datasets"][0]["values"], [5.0, 2.0])
@@ -2,7 +2,9 @@
 # For license information, please see license.txt
 
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+
+import frappe
 
 from cold_storage.cold_storage.utils import (
 	get_batch_balance,
@@ -17,6 +19,14 @@ from cold_storage.cold_storage.utils import (
 )
 
 
+def _balance(batch_no: str, warehouse: str, qty: float, item_code: str = "ITEM-001"):
+	return frappe._dict(batch_no=batch_no, item_code=item_code, warehouse=warehouse, qty=qty)
+
+
+def _provider(*rows):
+	return Mock(get_balances=Mock(return_value=list(rows)))
+
+
 class TestUtils(TestCase):
 	def test_get_batch_balance_returns_zero_without_batch_or_warehouse(self):
 		self.assertEqual(get_batch_balance(""), 0.0)
@@ -24,7 +34,7 @@ class TestUtils(TestCase):
 
 	def test_get_batch_balance_uses_erpnext_batch_qty(self):
 		with patch(
-			"cold_storage.cold_storage.utils.get_batch_qty",
+			"erpnext.stock.doctype.batch.batch.get_batch_qty",
 			return_value=5.5,
 		):
 			self.assertEqual(
@@ -33,7 +43,7 @@ class TestUtils(TestCase):
 
 	def test_get_batch_balance_ignores_item_code_and_uses_batch_warehouse(self):
 		with patch(
-			"cold_storage.cold_storage.utils.get_batch_qty",
+			"erpnext.stock.doctype.batch.batch.get_batch_qty",
 			return_value=4,
 		):
 			self.assertEqual(get_batch_balance("BATCH-0001", warehouse="Main - CO"), 4.0)
@@ -69,19 +79,18 @@ class TestUtils(TestCase):
 			self.assertEqual(stock_ledger_calls, [])
 
 	def test_search_batches_filters_by_customer_warehouse_item(self):
-		def sql_side_effect(query, *args, **kwargs):
-			if "tabStock Ledger Entry" in query:
-				return [("BATCH-0001",)]
-			if "tabDocType" in query:
-				params = args[0] if args else {}
-				doctype_name = params.get("param1") if isinstance(params, dict) else "Batch"
-				return [(doctype_name,)]
-			return []
-
-		with patch(
-			"cold_storage.cold_storage.utils.frappe.db.sql",
-			side_effect=sql_side_effect,
-		) as db_sql:
+		provider = _provider(
+			_balance("BATCH-0001", "Main - CO", 4),
+			_balance("BATCH-0002", "Main - CO", 3),
+			_balance("BATCH-0002", "Main - CO", -3),
+		)
+		with (
+			patch("cold_storage.cold_storage.utils.get_balance_provider", return_value=provider),
+			patch(
+				"cold_storage.cold_storage.utils.frappe.db.sql",
+				return_value=[("BATCH-0001",)],
+			) as db_sql,
+		):
 			rows = search_batches_for_customer_warehouse(
 				doctype="Batch",
 				txt="BATCH",
@@ -92,15 +101,12 @@ class TestUtils(TestCase):
 			)
 
 		self.assertEqual(rows, [("BATCH-0001",)])
-		_, kwargs = db_sql.call_args
-		self.assertEqual(kwargs, {})
+		provider.get_balances.assert_called_once_with(
+			customer="CUST-0001", warehouse="Main - CO", item_code="ITEM-001"
+		)
 		query, params = db_sql.call_args.args
-		self.assertIn("b.custom_customer = %(customer)s", query)
-		self.assertIn("sle.warehouse = %(warehouse)s", query)
-		self.assertIn("and b.item = %(item)s", query)
-		self.assertEqual(params["customer"], "CUST-0001")
-		self.assertEqual(params["warehouse"], "Main - CO")
-		self.assertEqual(params["item"], "ITEM-001")
+		self.assertIn("b.name in %(batch_nos)s", query)
+		self.assertEqual(params["batch_nos"], ("BATCH-0001",))
 		self.assertEqual(params["start"], 5)
 		self.assertEqual(params["page_len"], 10)
 
@@ -121,38 +127,25 @@ class TestUtils(TestCase):
 			self.assertEqual(stock_ledger_calls, [])
 
 	def test_search_warehouses_filters_by_customer_company_item(self):
-		def sql_side_effect(query, *args, **kwargs):
-			if "tabStock Ledger Entry" in query:
-				return [("Stores - CO",)]
-			if "tabDocType" in query:
-				params = args[0] if args else {}
-				doctype_name = params.get("param1") if isinstance(params, dict) else "Warehouse"
-				return [(doctype_name,)]
-			return []
-
-		with patch(
-			"cold_storage.cold_storage.utils.frappe.db.sql",
-			side_effect=sql_side_effect,
-		) as db_sql:
+		provider = _provider(
+			_balance("BATCH-0001", "Stores - CO", 2),
+			_balance("BATCH-0002", "Stores - CO", 1),
+			_balance("BATCH-0003", "Main - CO", 5),
+		)
+		with patch("cold_storage.cold_storage.utils.get_balance_provider", return_value=provider):
 			rows = search_warehouses_for_customer(
 				doctype="Warehouse",
-				txt="Stores",
+				txt="stores",
 				searchfield="name",
-				start=2,
+				start=0,
 				page_len=15,
 				filters={"customer": "CUST-0001", "company": "Default Co", "item": "ITEM-001"},
 			)
 
 		self.assertEqual(rows, [("Stores - CO",)])
-		query, params = db_sql.call_args.args
-		self.assertIn("b.custom_customer = %(customer)s", query)
-		self.assertIn("w.company = %(company)s", query)
-		self.assertIn("and sle.item_code = %(item)s", query)
-		self.assertEqual(params["customer"], "CUST-0001")
-		self.assertEqual(params["company"], "Default Co")
-		self.assertEqual(params["item"], "ITEM-001")
-		self.assertEqual(params["start"], 2)
-		self.assertEqual(params["page_len"], 15)
+		provider.get_balances.assert_called_once_with(
+			customer="CUST-0001", company="Default Co", item_code="ITEM-001"
+		)
 
 	def test_search_items_returns_empty_without_customer(self):
 		with patch("cold_storage.cold_storage.utils.frappe.db.sql") as db_sql:
@@ -171,19 +164,14 @@ class TestUtils(TestCase):
 			self.assertEqual(stock_ledger_calls, [])
 
 	def test_search_items_filters_by_customer_company_and_warehouse(self):
-		def sql_side_effect(query, *args, **kwargs):
-			if "tabStock Ledger Entry" in query:
-				return [("ITEM-001", "Sample Item")]
-			if "tabDocType" in query:
-				params = args[0] if args else {}
-				doctype_name = params.get("param1") if isinstance(params, dict) else "Item"
-				return [(doctype_name,)]
-			return []
-
-		with patch(
-			"cold_storage.cold_storage.utils.frappe.db.sql",
-			side_effect=sql_side_effect,
-		) as db_sql:
+		provider = _provider(_balance("BATCH-0001", "Stores - CO", 2, item_code="ITEM-001"))
+		with (
+			patch("cold_storage.cold_storage.utils.get_balance_provider", return_value=provider),
+			patch(
+				"cold_storage.cold_storage.utils.frappe.db.sql",
+				return_value=[("ITEM-001", "Sample Item")],
+			) as db_sql,
+		):
 			rows = search_items_for_customer_stock(
 				doctype="Item",
 				txt="ITEM",
@@ -194,13 +182,12 @@ class TestUtils(TestCase):
 			)
 
 		self.assertEqual(rows, [("ITEM-001", "Sample Item")])
+		provider.get_balances.assert_called_once_with(
+			customer="CUST-0001", company="Default Co", warehouse="Stores - CO"
+		)
 		query, params = db_sql.call_args.args
-		self.assertIn("b.custom_customer = %(customer)s", query)
-		self.assertIn("w.company = %(company)s", query)
-		self.assertIn("sle.warehouse = %(warehouse)s", query)
-		self.assertEqual(params["customer"], "CUST-0001")
-		self.assertEqual(params["company"], "Default Co")
-		self.assertEqual(params["warehouse"], "Stores - CO")
+		self.assertIn("i.name in %(items)s", query)
+		self.assertEqual(params["items"], ("ITEM-001",))
 		self.assertEqual(params["start"], 3)
 		self.assertEqual(params["page_len"], 12)
 
@@ -226,23 +213,19 @@ class TestUtils(TestCase):
 			self.assertEqual(stock_ledger_calls, [])
 
 	def test_search_warehouses_for_batch_filters_by_batch_company_customer_item(self):
+		provider = _provider(
+			_balance("BATCH-0001", "Stores - CO", 0.0001), _balance("BATCH-0001", "Spare - CO", 5)
+		)
 		with (
 			patch(
 				"cold_storage.cold_storage.utils.frappe.db.get_value",
 				return_value={"custom_customer": "CUST-0001", "item": "ITEM-001"},
 			),
-			patch(
-				"cold_storage.cold_storage.utils.frappe.db.sql",
-				return_value=[("Stores - CO",), ("Spare - CO",)],
-			) as db_sql,
-			patch(
-				"cold_storage.cold_storage.utils.get_batch_qty",
-				side_effect=[0, 5],
-			) as mocked_get_batch_qty,
+			patch("cold_storage.cold_storage.utils.get_balance_provider", return_value=provider),
 		):
 			rows = search_warehouses_for_batch(
 				doctype="Warehouse",
-				txt="Stores",
+				txt="",
 				searchfield="name",
 				start=0,
 				page_len=10,
@@ -255,12 +238,7 @@ class TestUtils(TestCase):
 			)
 
 		self.assertEqual(rows, [("Spare - CO",)])
-		query, params = db_sql.call_args.args
-		self.assertIn("from `tabWarehouse` w", query)
-		self.assertIn("w.company = %(company)s", query)
-		self.assertEqual(params["company"], "Default Co")
-		self.assertEqual(params["scan_limit"], 100)
-		self.assertEqual(mocked_get_batch_qty.call_count, 2)
+		provider.get_balances.assert_called_once_with(company="Default Co", batch_nos=["BATCH-0001"])
 
 	def test_search_warehouses_for_batch_returns_empty_on_customer_or_item_mismatch(self):
 		with (
@@ -269,7 +247,7 @@ class TestUtils(TestCase):
 				return_value={"custom_customer": "CUST-OTHER", "item": "ITEM-OTHER"},
 			),
 			patch("cold_storage.cold_storage.utils.frappe.db.sql") as db_sql,
-			patch("cold_storage.cold_storage.utils.get_batch_qty") as mocked_get_batch_qty,
+			patch("cold_storage.cold_storage.utils.get_balance_provider") as get_balance_provider,
 		):
 			rows = search_warehouses_for_batch(
 				doctype="Warehouse",
@@ -287,7 +265,7 @@ class TestUtils(TestCase):
 
 		self.assertEqual(rows, [])
 		db_sql.assert_not_called()
-		mocked_get_batch_qty.assert_not_called()
+		get_balance_provider.assert_not_called()
 
 	def test_get_document_qr_code_payload_returns_empty_when_document_is_missing(self):
 		self.assertEqual(get_document_qr_code_payload("", "CS-IN-00001"), "")
@@ -1,13 +1,16 @@
 # Copyright (c) 2026, Umaish Solutions and contributors
 # For license information, please see license.txt
 
+import json
 from types import SimpleNamespace
 from unittest import TestCase
 from unittest.mock import patch
+from urllib.request import urlopen
 
 import frappe
 
 from cold_storage.cold_storage.integrations import whatsapp
+from cold_storage.cold_storage.integrations.meta_cloud_api_stub import MetaCloudAPIStub
 
 
 class _FakeDoc(SimpleNamespace):
@@ -55,6 +58,72 @@ class TestWhatsAppIntegration(TestCase):
 		self.assertEqual(kwargs["json"]["type"], "text")
 		self.assertEqual(response["messages"][0]["id"], "wamid.test.1")
 
+	def test_send_text_message_uses_configured_base_url(self):
+		settings = {
+			"api_base_url": "http://127.0.0.1:8787/",
+			"api_version": "v22.0",
+			"phone_number_id": "1234567890",
+			"access_token": "token-123",
+		}
+
+		with patch(
+			"cold_storage.cold_storage.integrations.whatsapp.make_post_request",
+			return_value={"messages": [{"id": "wamid.test.2"}]},
+		) as make_post_request:
+			whatsapp._send_text_message(settings=settings, to_number="15551234567", message="Hi")
+
+		self.assertEqual(
+			make_post_request.call_args.kwargs["url"],
+			"http://127.0.0.1:8787/v22.0/1234567890/messages",
+		)
+
+	def test_send_text_message_round_trips_through_local_stub(self):
+		with MetaCloudAPIStub(access_token="token-123") as stub:
+			settings = {
+				"api_base_url": stub.base_url,
+				"api_version": "v22.0",
+				"phone_number_id": "1234567890",
+				"access_token": "token-123",
+			}
+			response = whatsapp._send_text_message(settings=settings, to_number="15551234567", message="Hi")
+			stats = stub.get_stats()
+
+		self.assertTrue(whatsapp._extract_message_id(response).startswith("wamid.stub."))
+		self.assertEqual(stats["accepted"], 1)
+
+	def test_local_stub_serves_request_counters_over_http(self):
+		with MetaCloudAPIStub() as stub:
+			settings = {
+				"api_base_url": stub.base_url,
+				"api_version": "v22.0",
+				"phone_number_id": "1234567890",
+				"access_token": "token-123",
+			}
+			whatsapp._send_text_message(settings=settings, to_number="15551234567", message="Hi")
+			with urlopen(f"{stub.base_url}/stats", timeout=5) as response:
+				remote_stats = json.loads(response.read())
+
+		self.assertEqual(remote_stats["requests"], 1)
+		self.assertEqual(remote_stats["accepted"], 1)
+
+	def test_local_stub_answers_rate_limited_requests_with_429(self):
+		with MetaCloudAPIStub(rate_limit_ratio=1.0) as stub:
+			settings = {
+				"api_base_url": stub.base_url,
+				"api_version": "v22.0",
+				"phone_number_id": "1234567890",
+				"access_token": "token-123",
+			}
+			with (
+				patch("cold_storage.cold_storage.integrations.whatsapp.frappe.log_error"),
+				patch("frappe.integrations.utils.frappe.log_error"),
+				self.assertRaises(Exception) as raised,
+			):
+				whatsapp._send_text_message(settings=settings, to_number="15551234567", message="Hi")
+
+		self.assertEqual(raised.exception.response.status_code, 429)
+		self.assertEqual(stub.get_stats()["rate_limited"], 1)
+
 	def test_send_document_notification_enforces_company_scope(self):
 		settings = {
 			"enabled": 1,
@@ -135,6 +204,140 @@ class TestWhatsAppIntegration(TestCase):
 		self.assertTrue(params[2])
 		self.assertIn("Qty", params[3])
 
+	def test_send_customer_template_messages_sends_approved_template_per_customer(self):
+		settings = {
+			"enabled": 1,
+			"company": "Default Co",
+			"api_version": "v22.0",
+			"phone_number_id": "1234567890",
+			"access_token": "token-123",
+			"default_country_code": "",
+			"template_language": "en_US",
+			"stock_statement_template_name": "cs_daily_statement",
+			"stock_statement_template_body_params": '["{{ customer_name }}", "{{ item_summary }}"]',
+		}
+		contexts = {
+			"CUST-A": {"customer_name": "Alpha Farms", "item_summary": "Apple: 40 Crate"},
+			"CUST-B": {"customer_name": "Beta Traders", "item_summary": "No stock in storage"},
+		}
+
+		with (
+			patch.object(whatsapp, "get_whatsapp_settings", return_value=settings),
+			patch.object(
+				whatsapp, "_get_customer_mobiles", return_value={"CUST-A": "15551234567"}
+			) as get_mobiles,
+			patch.object(
+				whatsapp, "make_post_request", return_value={"messages": [{"id": "wamid.statement.1"}]}
+			) as make_post_request,
+		):
+			results = whatsapp.send_customer_template_messages("Stock Statement", contexts)
+
+		get_mobiles.assert_called_once_with(["CUST-A", "CUST-B"])
+		self.assertEqual(results, {"CUST-A": "wamid.statement.1", "CUST-B": ""})
+		payload = make_post_request.call_args.kwargs["json"]
+		self.assertEqual(payload["type"], "template")
+		self.assertEqual(payload["template"]["name"], "cs_daily_statement")
+		self.assertEqual(payload["template"]["language"], {"code": "en_US"})
+		self.assertEqual(
+			[param["text"] for param in payload["template"]["components"][0]["parameters"]],
+			["Alpha Farms", "Apple: 40 Crate"],
+		)
+
+	def test_send_customer_template_messages_skips_when_template_is_not_configured(self):
+		settings = {
+			"enabled": 1,
+			"phone_number_id": "1234567890",
+			"access_token": "token-123",
+			"api_version": "v22.0",
+			"stock_statement_template_name": "",
+		}
+
+		with (
+			patch.object(whatsapp, "get_whatsapp_settings", return_value=settings),
+			patch.object(whatsapp.frappe, "log_error") as log_error,
+			patch.object(whatsapp, "make_post_request") as make_post_request,
+		):
+			results = whatsapp.send_customer_template_messages("Stock Statement", {"CUST-A": {}})
+
+		self.assertEqual(results, {})
+		log_error.assert_called_once()
+		make_post_request.assert_not_called()
+
+	def test_compiled_templates_are_reused_within_settings_revision(self):
+		doc = _FakeDoc(
+			doctype="Cold Storage Outward",
+			name="CS-OUT-0004",
+			company="Default Co",
+			customer="CUST-0003",
+			posting_date="2026-02-19",
+			total_qty=3,
+		)
+		settings = {
+			"outward_template_body_params": '["{{ voucher_no }}", "{{ customer }}"]',
+			"outward_text_template": "Outward {{ voucher_no }}",
+			"revision": "2026-02-19 10:00:00.000000",
+		}
+		whatsapp.clear_compiled_template_cache()
+
+		with patch(
+			"cold_storage.cold_storage.integrations.whatsapp._parse_template_param_entries",
+			wraps=whatsapp._parse_template_param_entries,
+		) as parse_entries:
+			first = whatsapp._build_template_parameters(doc, "Cold Storage Outward", settings)
+			second = whatsapp._build_template_parameters(doc, "Cold Storage Outward", settings)
+			message = whatsapp._build_document_message(doc, "Cold Storage Outward", settings)
+
+		self.assertEqual(first, ["CS-OUT-0004", "CUST-0003"])
+		self.assertEqual(second, first)
+		self.assertEqual(message, "Outward CS-OUT-0004")
+		self.assertEqual(parse_entries.call_count, 1)
+
+	def test_compiled_templates_are_rebuilt_when_settings_revision_changes(self):
+		doc = _FakeDoc(
+			doctype="Cold Storage Inward",
+			name="CS-IN-0005",
+			company="Default Co",
+			customer="CUST-0004",
+			posting_date="2026-02-19",
+			total_qty=12,
+		)
+		whatsapp.clear_compiled_template_cache()
+
+		before = whatsapp._build_document_message(
+			doc,
+			"Cold Storage Inward",
+			{"inward_text_template": "Old {{ voucher_no }}", "revision": "rev-1"},
+		)
+		after = whatsapp._build_document_message(
+			doc,
+			"Cold Storage Inward",
+			{"inward_text_template": "New {{ voucher_no }}", "revision": "rev-2"},
+		)
+
+		self.assertEqual(before, "Old CS-IN-0005")
+		self.assertEqual(after, "New CS-IN-0005")
+
+	def test_compiled_templates_are_not_shared_between_sites_with_the_same_revision(self):
+		doc = _FakeDoc(
+			doctype="Cold Storage Inward",
+			name="CS-IN-0006",
+			company="Default Co",
+			customer="CUST-0005",
+			posting_date="2026-02-19",
+			total_qty=4,
+		)
+		revision = "2026-02-19 10:00:00.000000"
+
+		messages = {}
+		for site, template in (("site-a.local", "A {{ voucher_no }}"), ("site-b.local", "B {{ voucher_no }}")):
+			with patch.object(whatsapp.frappe.local, "site", site, create=True):
+				whatsapp.clear_compiled_template_cache()
+				messages[site] = whatsapp._build_document_message(
+					doc, "Cold Storage Inward", {"inward_text_template": template, "revision": revision}
+				)
+
+		self.assertEqual(messages, {"site-a.local": "A CS-IN-0006", "site-b.local": "B CS-IN-0006"})
+
 	def test_get_whatsapp_setup_status_reports_missing_required_fields(self):
 		settings = {
 			"enabled": 1,
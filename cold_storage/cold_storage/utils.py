@@ -5,10 +5,11 @@ from base64 import b64encode
 from io import BytesIO
 
 import frappe
-from erpnext.stock.doctype.batch.batch import get_batch_qty
 from frappe import _
 from frappe.utils import cint, flt, nowdate
 
+from cold_storage.cold_storage.batch_balances import get_balance_provider, sum_balances_by
+
 
 @frappe.whitelist()
 def get_batch_balance(
@@ -20,9 +21,45 @@ def get_batch_balance(
 	if not batch_no or not warehouse:
 		return 0.0
 
-	# Use ERPNext stock API so v17 serial/batch bundle paths are respected.
-	qty = get_batch_qty(batch_no=batch_no, warehouse=warehouse)
-	return flt(qty)
+	# Strict provider: ERPNext stock API, so v17 serial/batch bundle paths are respected.
+	return get_balance_provider(strict=True).get_balance(batch_no, warehouse)
+
+
+def get_batch_balances(keys) -> dict[tuple[str, str, str | None], float]:
+	"""Strict balances for ``(batch_no, warehouse, item_code)`` keys.
+
+	One provider call per item and warehouse instead of one per batch; keys without an item
+	fall back to ``get_batch_balance``.
+	"""
+	provider = get_balance_provider(strict=True)
+	location_balances: dict[tuple[str, str], dict[str, float]] = {}
+	balances = {}
+	for key in keys:
+		batch_no, warehouse, item_code = key
+		if not batch_no or not warehouse:
+			balances[key] = 0.0
+		elif not item_code:
+			balances[key] = provider.get_balance(batch_no, warehouse)
+		else:
+			if (item_code, warehouse) not in location_balances:
+				location_balances[(item_code, warehouse)] = provider.get_warehouse_balances(
+					item_code, warehouse
+				)
+			balances[key] = flt(location_balances[(item_code, warehouse)].get(batch_no))
+	return balances
+
+
+def get_batch_details(batch_nos) -> dict[str, frappe._dict]:
+	"""Return ``{batch: {item, custom_customer}}`` for the given batches in one query."""
+	batch_nos = sorted({batch_no for batch_no in batch_nos if batch_no})
+	if not batch_nos:
+		return {}
+	return {
+		batch.name: batch
+		for batch in frappe.get_all(
+			"Batch", filters={"name": ["in", batch_nos]}, fields=["name", "item", "custom_customer"]
+		)
+	}
 
 
 @frappe.whitelist()
@@ -46,38 +83,29 @@ def search_batches_for_customer_warehouse(
 	if not customer or not warehouse:
 		return []
 
-	params = {
-		"customer": customer,
-		"warehouse": warehouse,
-		"txt": f"%{txt or ''}%",
-		"start": int(start or 0),
-		"page_len": int(page_len or 20),
-	}
-
-	item_condition = ""
-	if item:
-		item_condition = " and b.item = %(item)s"
-		params["item"] = item
+	balances = get_balance_provider().get_balances(customer=customer, warehouse=warehouse, item_code=item)
+	batch_nos = _filter_positive_keys(balances, "batch_no")
+	if not batch_nos:
+		return []
 
 	return frappe.db.sql(
-		f"""
+		"""
 		select b.name
 		from `tabBatch` b
-		inner join `tabStock Ledger Entry` sle on sle.batch_no = b.name
-		where b.custom_customer = %(customer)s
-			and sle.warehouse = %(warehouse)s
-			and ifnull(sle.is_cancelled, 0) = 0
+		where b.name in %(batch_nos)s
 			and (
 				b.name like %(txt)s
 				or ifnull(b.batch_id, '') like %(txt)s
 			)
-			{item_condition}
-		group by b.name
-		having sum(sle.actual_qty) > 0
 		order by b.name
 		limit %(start)s, %(page_len)s
 		""",
-		params,
+		{
+			"batch_nos": tuple(batch_nos),
+			"txt": f"%{txt or ''}%",
+			"start": int(start or 0),
+			"page_len": int(page_len or 20),
+		},
 	)
 
 
@@ -102,37 +130,13 @@ def search_warehouses_for_customer(
 	if not customer:
 		return []
 
-	params = {
-		"customer": customer,
-		"company": company or "",
-		"txt": f"%{txt or ''}%",
-		"start": int(start or 0),
-		"page_len": int(page_len or 20),
-	}
-
-	item_condition = ""
-	if item:
-		item_condition = " and sle.item_code = %(item)s"
-		params["item"] = item
-
-	return frappe.db.sql(
-		f"""
-		select sle.warehouse
-		from `tabStock Ledger Entry` sle
-		inner join `tabBatch` b on b.name = sle.batch_no
-		inner join `tabWarehouse` w on w.name = sle.warehouse
-		where b.custom_customer = %(customer)s
-			and ifnull(sle.is_cancelled, 0) = 0
-			and sle.warehouse like %(txt)s
-			and (%(company)s = '' or w.company = %(company)s)
-			{item_condition}
-		group by sle.warehouse
-		having sum(sle.actual_qty) > 0
-		order by sle.warehouse
-		limit %(start)s, %(page_len)s
-		""",
-		params,
-	)
+	balances = get_balance_provider().get_balances(customer=customer, company=company, item_code=item)
+	start = int(start or 0)
+	page_len = int(page_len or 20)
+	return [
+		(warehouse,)
+		for warehouse in _filter_positive_keys(balances, "warehouse", txt)[start : start + page_len]
+	]
 
 
 @frappe.whitelist()
@@ -168,28 +172,24 @@ def search_items_for_customer_stock(
 		"page_len": page_len,
 	}
 
-	stock_rows = frappe.db.sql(
-		"""
-		select sle.item_code, i.item_name
-		from `tabStock Ledger Entry` sle
-		inner join `tabBatch` b on b.name = sle.batch_no
-		inner join `tabWarehouse` w on w.name = sle.warehouse
-		inner join `tabItem` i on i.name = sle.item_code
-		where b.custom_customer = %(customer)s
-			and ifnull(sle.is_cancelled, 0) = 0
-			and (%(company)s = '' or w.company = %(company)s)
-			and (%(warehouse)s = '' or sle.warehouse = %(warehouse)s)
-			and (
-				sle.item_code like %(txt)s
-				or ifnull(i.item_name, '') like %(txt)s
-			)
-		group by sle.item_code, i.item_name
-		having sum(sle.actual_qty) > 0
-		order by sle.item_code
-		limit %(start)s, %(page_len)s
-		""",
-		params,
-	)
+	balances = get_balance_provider().get_balances(customer=customer, company=company, warehouse=warehouse)
+	stock_items = _filter_positive_keys(balances, "item_code")
+	stock_rows = []
+	if stock_items:
+		stock_rows = frappe.db.sql(
+			"""
+			select i.name, i.item_name
+			from `tabItem` i
+			where i.name in %(items)s
+				and (
+					i.name like %(txt)s
+					or ifnull(i.item_name, '') like %(txt)s
+				)
+			order by i.name
+			limit %(start)s, %(page_len)s
+			""",
+			{**params, "items": tuple(stock_items)},
+		)
 	if stock_rows:
 		return stock_rows
 
@@ -407,34 +407,20 @@ def search_warehouses_for_batch(
 
 	start = int(start or 0)
 	page_len = int(page_len or 20)
-	scan_limit = max((start + page_len) * 5, 100)
+	balances = get_balance_provider().get_balances(company=company, batch_nos=[batch_no])
+	return [
+		(warehouse,)
+		for warehouse in _filter_positive_keys(balances, "warehouse", txt)[start : start + page_len]
+	]
 
-	params = {
-		"company": company or "",
-		"txt": f"%{txt or ''}%",
-		"scan_limit": scan_limit,
-	}
 
-	candidate_warehouses = frappe.db.sql(
-		"""
-		select w.name
-		from `tabWarehouse` w
-		where w.name like %(txt)s
-			and (%(company)s = '' or w.company = %(company)s)
-		order by w.name
-		limit %(scan_limit)s
-		""",
-		params,
+def _filter_positive_keys(balances: list[dict], key: str, txt: str | None = None) -> list[str]:
+	"""Sorted ``key`` values whose total balance is positive, optionally containing ``txt``."""
+	needle = (txt or "").strip().lower()
+	return sorted(
+		value for value, qty in sum_balances_by(balances, key).items() if qty > 0 and needle in value.lower()
 	)
 
-	matching_warehouses = []
-	for (warehouse,) in candidate_warehouses:
-		qty = flt(get_batch_qty(batch_no=batch_no, warehouse=warehouse))
-		if qty > 0:
-			matching_warehouses.append((warehouse,))
-
-	return matching_warehouses[start : start + page_len]
-
 
 def create_stock_entry_for_cold_storage(
 	*,
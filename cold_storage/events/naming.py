@@ -4,15 +4,26 @@
 from __future__ import annotations
 
 import frappe
-from frappe.model.naming import make_autoname
+from frappe.model.naming import parse_naming_series
 from frappe.utils import cstr
 
 from cold_storage.cold_storage.naming import (
 	get_company_abbreviation,
 	get_series_for_company,
 	is_cold_storage_prefixed_voucher,
+	release_series_numbers,
+	reserve_series_numbers,
+	settle_series_numbers,
 )
 
+GL_ENTRY_VOUCHER_TYPES = frozenset({"Stock Entry", "Sales Invoice", "Journal Entry"})
+GL_ENTRY_SERIES_DIGITS = 5
+# Series numbers reserved at a time for one voucher's GL rows; the unused tail is released on submit/cancel.
+GL_ENTRY_SERIES_BLOCK = 16
+# Reservations live for one transaction. Vouchers release their unused numbers on submit/cancel;
+# GL Entries posted outside those hooks (reposts, reverse entries of other doctypes) are settled
+# before commit, so they leave no gaps either.
+
 
 def autoname_cold_storage_gl_entry(doc, method: str | None = None) -> None:
 	"""Apply company-prefixed GL Entry names only for cold-storage generated vouchers."""
@@ -22,7 +33,7 @@ def autoname_cold_storage_gl_entry(doc, method: str | None = None) -> None:
 		return
 
 	voucher_type = cstr(doc.get("voucher_type")).strip()
-	if voucher_type not in {"Stock Entry", "Sales Invoice", "Journal Entry"}:
+	if voucher_type not in GL_ENTRY_VOUCHER_TYPES:
 		return
 
 	company = cstr(doc.get("company")).strip()
@@ -33,7 +44,54 @@ def autoname_cold_storage_gl_entry(doc, method: str | None = None) -> None:
 	if not is_cold_storage_prefixed_voucher(voucher_no, company):
 		return
 
-	doc.name = make_autoname(f"{get_series_for_company('gl_entry', company)}.#####", doc=doc)
+	doc.name = _next_gl_entry_name(company, voucher_type, voucher_no)
+
+
+def release_gl_entry_series(doc, method: str | None = None) -> None:
+	"""Voucher on_submit/on_cancel hook: return GL Entry numbers reserved but not used."""
+	del method
+
+	allocations = frappe.flags.cold_storage_gl_entry_series or {}
+	allocation = allocations.pop((cstr(doc.get("company")), doc.doctype, doc.name), None)
+	if allocation:
+		release_series_numbers(allocation["key"], allocation["end"], allocation["next"] - 1)
+
+
+def _next_gl_entry_name(company: str, voucher_type: str, voucher_no: str) -> str:
+	"""Take the next number from this voucher's reserved block, reserving a new block when empty."""
+	allocations = frappe.flags.cold_storage_gl_entry_series
+	if allocations is None:
+		allocations = frappe.flags.cold_storage_gl_entry_series = {}
+
+	key = parse_naming_series(get_series_for_company("gl_entry", company))
+	allocation = allocations.get((company, voucher_type, voucher_no))
+	if not allocation or allocation["key"] != key or allocation["next"] > allocation["end"]:
+		# Start past every block handed out in this transaction, even if a savepoint
+		# rollback took the series back below them.
+		handed_out = max((other["end"] for other in allocations.values() if other["key"] == key), default=0)
+		first = reserve_series_numbers(key, GL_ENTRY_SERIES_BLOCK, after=handed_out)
+		allocation = {"key": key, "next": first, "end": first + GL_ENTRY_SERIES_BLOCK - 1}
+		allocations[(company, voucher_type, voucher_no)] = allocation
+		# Commit and rollback both reset these callbacks, so register them with every block.
+		frappe.db.before_commit.add(_settle_gl_entry_series)
+		frappe.db.after_rollback.add(_clear_gl_entry_series)
+
+	number = allocation["next"]
+	allocation["next"] += 1
+	return f"{key}{number:0{GL_ENTRY_SERIES_DIGITS}d}"
+
+
+def _settle_gl_entry_series() -> None:
+	"""before_commit: settle the reservations no voucher hook released, then forget them."""
+	allocations = frappe.flags.cold_storage_gl_entry_series or {}
+	frappe.flags.cold_storage_gl_entry_series = None
+	for allocation in allocations.values():
+		settle_series_numbers(allocation["key"], allocation["end"], allocation["next"] - 1)
+
+
+def _clear_gl_entry_series() -> None:
+	"""after_rollback: reservations made in a rolled-back transaction are not reserved any more."""
+	frappe.flags.cold_storage_gl_entry_series = None
 
 
 CHILD_DOCTYPE_TOKEN = {
@@ -42,6 +100,9 @@ CHILD_DOCTYPE_TOKEN = {
 	"Cold Storage Transfer Item": "CS-TRI",
 	"Charge Configuration": "CS-CHG",
 }
+CHILD_PARENT_DOCTYPES = frozenset(
+	{"Cold Storage Inward", "Cold Storage Outward", "Cold Storage Transfer", "Cold Storage Settings"}
+)
 
 
 def autoname_cold_storage_child_doctype(doc, method: str | None = None) -> None:
@@ -64,14 +125,32 @@ def autoname_cold_storage_child_doctype(doc, method: str | None = None) -> None:
 
 
 def _resolve_company_for_child_doc(doc) -> str:
-	"""Resolve company from parent document context for child rows."""
+	"""Resolve company from parent document context for child rows.
+
+	Rows inserted with their parent carry it as ``parent_doc``; otherwise the parent's company
+	is read once per request and memoized in ``frappe.flags``.
+	"""
 	parenttype = cstr(doc.get("parenttype")).strip()
 	parent = cstr(doc.get("parent")).strip()
-
-	if parenttype in {"Cold Storage Inward", "Cold Storage Outward", "Cold Storage Transfer"} and parent:
-		return cstr(frappe.db.get_value(parenttype, parent, "company") or "").strip()
-
-	if parenttype == "Cold Storage Settings":
-		return cstr(frappe.db.get_single_value("Cold Storage Settings", "company") or "").strip()
-
-	return ""
+	if parenttype not in CHILD_PARENT_DOCTYPES:
+		return ""
+
+	parent_doc = getattr(doc, "parent_doc", None)
+	if parent_doc is not None and parent_doc.doctype == parenttype:
+		company = cstr(parent_doc.get("company")).strip()
+		if company:
+			return company
+
+	if parenttype != "Cold Storage Settings" and not parent:
+		return ""
+
+	memo = frappe.flags.cold_storage_child_parent_company
+	if memo is None:
+		memo = frappe.flags.cold_storage_child_parent_company = {}
+	key = (parenttype, parent)
+	if key not in memo:
+		if parenttype == "Cold Storage Settings":
+			memo[key] = cstr(frappe.db.get_single_value("Cold Storage Settings", "company") or "").strip()
+		else:
+			memo[key] = cstr(frappe.db.get_value(parenttype, parent, "company") or "").strip()
+	return memo[key]
@@ -34,6 +34,9 @@ require_type_annotated_api_methods = True
 after_install = "cold_storage.install.after_install"
 after_migrate = "cold_storage.install.after_migrate"
 
+# Adds X-CS-Timing in developer mode when cold_storage_instrumentation is enabled.
+after_request = ["cold_storage.cold_storage.instrumentation.add_timing_header"]
+
 fixtures = [
 	{"dt": "Role", "filters": [["role_name", "like", "Cold Storage %"]]},
 	{"dt": "Role Profile", "filters": [["role_profile", "like", "Cold Storage %"]]},
@@ -97,16 +100,84 @@ custom_fields = {
 }
 
 # ── Document Events ─────────────────────────────────────────────
+_MOVEMENT_EPOCH_HOOK = "cold_storage.cold_storage.report_cache.bump_movement_epoch"
+_COMPLIANCE_EVENT_HOOK = (
+	"cold_storage.cold_storage.doctype.cold_storage_compliance_event."
+	"cold_storage_compliance_event.record_compliance_event"
+)
+_GL_ENTRY_SERIES_HOOK = "cold_storage.events.naming.release_gl_entry_series"
+
 doc_events = {
 	"Batch": {
 		"validate": "cold_storage.events.batch.validate_batch_customer",
 	},
 	"Customer": {
-		"on_update": "cold_storage.setup.client_portal_user_permissions.sync_customer_user_permissions_for_customer",
+		"on_update": [
+			"cold_storage.setup.client_portal_user_permissions.sync_customer_user_permissions_for_customer",
+			"cold_storage.setup.client_portal_user_permissions.clear_portal_customer_cache_for_customer",
+		],
+		"after_rename": "cold_storage.setup.client_portal_user_permissions.clear_portal_customer_cache_for_customer",
+		"on_trash": "cold_storage.setup.client_portal_user_permissions.clear_portal_customer_cache_for_customer",
+	},
+	"Contact": {
+		"on_update": "cold_storage.setup.client_portal_user_permissions.clear_portal_customer_cache_for_contact",
+		"on_trash": "cold_storage.setup.client_portal_user_permissions.clear_portal_customer_cache_for_contact",
+	},
+	"User": {
+		"on_update": "cold_storage.setup.client_portal_user_permissions.clear_portal_customer_cache_for_user",
+		"on_trash": "cold_storage.setup.client_portal_user_permissions.clear_portal_customer_cache_for_user",
 	},
 	"GL Entry": {
 		"autoname": "cold_storage.events.naming.autoname_cold_storage_gl_entry",
 	},
+	"Stock Entry": {
+		"on_submit": _GL_ENTRY_SERIES_HOOK,
+		"on_cancel": _GL_ENTRY_SERIES_HOOK,
+	},
+	"Sales Invoice": {
+		"on_submit": _GL_ENTRY_SERIES_HOOK,
+		"on_cancel": _GL_ENTRY_SERIES_HOOK,
+	},
+	"Journal Entry": {
+		"on_submit": _GL_ENTRY_SERIES_HOOK,
+		"on_cancel": _GL_ENTRY_SERIES_HOOK,
+	},
+	"Cold Storage Inward": {
+		"after_insert": _COMPLIANCE_EVENT_HOOK,
+		"on_update": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_submit": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_cancel": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_update_after_submit": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_trash": _MOVEMENT_EPOCH_HOOK,
+	},
+	"Cold Storage Outward": {
+		"after_insert": _COMPLIANCE_EVENT_HOOK,
+		"on_update": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_submit": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_cancel": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_update_after_submit": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_trash": _MOVEMENT_EPOCH_HOOK,
+	},
+	"Cold Storage Transfer": {
+		"after_insert": _COMPLIANCE_EVENT_HOOK,
+		"on_update": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_submit": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_cancel": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_update_after_submit": [_MOVEMENT_EPOCH_HOOK, _COMPLIANCE_EVENT_HOOK],
+		"on_trash": _MOVEMENT_EPOCH_HOOK,
+	},
+	"Prepared Report": {
+		"after_insert": "cold_storage.cold_storage.prepared_reports.record_prepared_report_epoch",
+		"on_update": "cold_storage.cold_storage.prepared_reports.notify_prepared_report_ready",
+		"on_trash": "cold_storage.cold_storage.prepared_reports.clear_prepared_report_epoch",
+	},
+	"Payment Ledger Entry": {
+		"on_submit": "cold_storage.cold_storage.receivable_snapshots.invalidate_ar_snapshots",
+	},
+	# Stock moved outside Cold Storage documents still changes occupancy and register reports.
+	"Stock Ledger Entry": {
+		"on_submit": _MOVEMENT_EPOCH_HOOK,
+	},
 	"Cold Storage Inward Item": {
 		"autoname": "cold_storage.events.naming.autoname_cold_storage_child_doctype",
 	},
@@ -120,3 +191,13 @@ doc_events = {
 		"autoname": "cold_storage.events.naming.autoname_cold_storage_child_doctype",
 	},
 }
+
+# ── Scheduled Tasks ─────────────────────────────────────────────
+scheduler_events = {
+	"daily": [
+		"cold_storage.cold_storage.stock_statements.send_daily_stock_statements",
+	],
+	"monthly": [
+		"cold_storage.cold_storage.receivable_snapshots.warm_ar_snapshots",
+	],
+}
@@ -1,6 +1,9 @@
 # Copyright (c) 2026, Umaish Solutions and contributors
 # For license information, please see license.txt
 
+import glob
+import hashlib
+import os
 from json import JSONDecodeError, loads
 
 import frappe
@@ -94,6 +97,18 @@ REMOVED_PEOPLE_OPS_DOCTYPES = (
 LETTER_HEAD_NAME = "Cold Storage Branded Letter Head"
 LETTER_HEAD_HEADER_TEMPLATE = "templates/letter_head/cold_storage_branded_header.html"
 LETTER_HEAD_FOOTER_TEMPLATE = "templates/letter_head/cold_storage_branded_footer.html"
+SETUP_FINGERPRINT_KEY = "cold_storage_setup_fingerprint"
+# Files (relative to the app package) the desired role, permission, workspace and chart state is read from.
+SETUP_FINGERPRINT_SOURCES = (
+	"install.py",
+	"setup/role_based_access.py",
+	"templates/letter_head/*.html",
+	"workspace_sidebar/*.json",
+	"cold_storage/workspace/*/*.json",
+	"cold_storage/dashboard_chart/*/*.json",
+	"cold_storage/number_card/*/*.json",
+	"cold_storage/report/*/*.json",
+)
 SIDEBAR_ICON_BY_LABEL = {
 	"Home": "house",
 	"Operations": "workflow",
@@ -191,6 +206,7 @@ SIDEBAR_REPORT_SECTION_ORDER = {
 	],
 	INVENTORY_MOVEMENT_SECTION_LABEL: [
 		"Cold Storage Live Batch Stock",
+		"Cold Storage Inventory Aging",
 		"Cold Storage Item Movement Summary",
 		"Cold Storage Stock Flow Sankey",
 		"Cold Storage Lot Traceability Graph",
@@ -209,6 +225,7 @@ SIDEBAR_REPORT_SECTION_ORDER = {
 		"Cold Storage Audit Trail Compliance Pack",
 		"Cold Storage Login Activity Log",
 		"Cold Storage Client Portal Access Log",
+		"Cold Storage Prepared Report Jobs",
 	],
 }
 SIDEBAR_REPORT_LABEL_BY_LINK = {
@@ -217,6 +234,7 @@ SIDEBAR_REPORT_LABEL_BY_LINK = {
 	"Cold Storage Transfer Register": "Transfer Register",
 	"Cold Storage Customer Register": "Customer Register",
 	"Cold Storage Live Batch Stock": "Live Batch Stock",
+	"Cold Storage Inventory Aging": "Inventory Aging",
 	"Cold Storage Item Movement Summary": "Item Movement",
 	"Cold Storage Stock Flow Sankey": "Stock Flow",
 	"Cold Storage Lot Traceability Graph": "Lot Traceability Graph",
@@ -231,6 +249,7 @@ SIDEBAR_REPORT_LABEL_BY_LINK = {
 	"Cold Storage Audit Trail Compliance Pack": "Audit & Compliance",
 	"Cold Storage Login Activity Log": "Login Activity Log",
 	"Cold Storage Client Portal Access Log": "Portal Access Log",
+	"Cold Storage Prepared Report Jobs": "Report Jobs",
 }
 
 
@@ -273,7 +292,7 @@ def _ensure_dashboard_chart_types() -> None:
 
 
 def _ensure_top_customers_chart_source() -> None:
-	"""Ensure Top Customers chart is based on available stock (Customer Register)."""
+	"""Ensure Top Customers chart reads the cached top-customers-by-stock source, not the report."""
 	if not frappe.db.exists("Dashboard Chart", "Top Customers"):
 		return
 
@@ -281,9 +300,11 @@ def _ensure_top_customers_chart_source() -> None:
 		"Dashboard Chart",
 		"Top Customers",
 		{
-			"report_name": "Cold Storage Customer Register",
+			"chart_type": "Custom",
+			"source": "Top Customers By Stock",
+			"report_name": None,
 			"type": "Bar",
-			"use_report_chart": 1,
+			"use_report_chart": 0,
 		},
 		update_modified=False,
 	)
@@ -299,7 +320,7 @@ def _ensure_website_view_tracking_enabled() -> None:
 		return
 
 	frappe.db.set_single_value("Website Settings", "enable_view_tracking", 1)
-	frappe.clear_cache()
+	frappe.clear_document_cache("Website Settings", "Website Settings")
 
 
 def _ensure_client_portal_views_chart() -> None:
@@ -1061,6 +1082,7 @@ def _enforce_report_section_placement(items: list) -> list:
 
 	return non_report_items[:setup_index] + report_block + non_report_items[setup_index:]
 
+
 def _ensure_sidebar_link_under_section(
 	items: list, *, section_label: str, link_type: str, link_to: str, label: str
 ) -> list:
@@ -1316,24 +1338,18 @@ def _ensure_cold_storage_letter_head() -> None:
 
 def after_install() -> None:
 	_ensure_default_uom_setting(create_uom_if_missing=True)
-	_ensure_cold_storage_letter_head()
-	_ensure_website_view_tracking_enabled()
-	_ensure_batch_customizations()
-	_ensure_dashboard_chart_types()
-	_ensure_top_customers_chart_source()
-	_ensure_client_portal_views_chart()
-	_ensure_non_currency_dashboard_charts()
-	_ensure_login_activity_chart_roles()
-	_rename_legacy_audit_trail_report()
-	_ensure_live_batch_stock_report_roles()
-	_ensure_audit_trail_report_roles()
-	_ensure_workspace_assets()
-	_ensure_workspace_sidebar_assets()
-	_sync_role_based_access()
+	sync_setup()
 
 
 def after_migrate() -> None:
 	_ensure_default_uom_setting(create_uom_if_missing=True)
+	if frappe.db.get_global(SETUP_FINGERPRINT_KEY) == get_setup_fingerprint():
+		return
+	sync_setup()
+
+
+def sync_setup() -> None:
+	"""Apply roles, permissions, workspace and chart setup, then record the site's fingerprint."""
 	_ensure_cold_storage_letter_head()
 	_ensure_website_view_tracking_enabled()
 	_ensure_batch_customizations()
@@ -1348,6 +1364,24 @@ def after_migrate() -> None:
 	_ensure_workspace_assets()
 	_ensure_workspace_sidebar_assets()
 	_sync_role_based_access()
+	frappe.db.set_global(SETUP_FINGERPRINT_KEY, get_setup_fingerprint())
+
+
+def get_setup_fingerprint() -> str:
+	"""Hash of the installed apps and the app files the setup state is derived from.
+
+	Migrations re-import standard JSON only when it changes, so an unchanged fingerprint means
+	the state written by the last ``sync_setup`` is still current.
+	"""
+	app_path = frappe.get_app_path("cold_storage")
+	digest = hashlib.sha256()
+	digest.update(frappe.as_json([frappe.__version__, sorted(frappe.get_installed_apps())]).encode())
+	for pattern in SETUP_FINGERPRINT_SOURCES:
+		for path in sorted(glob.glob(os.path.join(app_path, pattern))):
+			digest.update(os.path.relpath(path, app_path).encode())
+			with open(path, "rb") as handle:
+				digest.update(handle.read())
+	return digest.hexdigest()
 
 
 def _sync_role_based_access() -> None:
@@ -0,0 +1,18 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+
+def execute() -> None:
+	"""Populate the daily movement fact table from already-submitted documents."""
+	from cold_storage.cold_storage.doctype.cold_storage_daily_movement.cold_storage_daily_movement import (
+		rebuild_daily_movements,
+	)
+
+	if not frappe.db.table_exists("Cold Storage Daily Movement"):
+		return
+
+	rebuild_daily_movements()
@@ -0,0 +1,11 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+
+def execute() -> None:
+	"""Add composite posting_date indexes to the Inward/Outward/Transfer tables."""
+	from cold_storage.setup.database_indexes import sync_database_indexes
+
+	sync_database_indexes()
@@ -0,0 +1,11 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+
+def execute() -> None:
+	"""Add batch/item/warehouse and (parent, parenttype) indexes to the movement child tables."""
+	from cold_storage.setup.database_indexes import sync_database_indexes
+
+	sync_database_indexes()
@@ -0,0 +1,16 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+
+def execute() -> None:
+	"""Seed the compliance event log from existing movement documents and their Versions."""
+	from cold_storage.cold_storage.doctype.cold_storage_compliance_event import cold_storage_compliance_event
+
+	if not frappe.db.table_exists("Cold Storage Compliance Event"):
+		return
+
+	cold_storage_compliance_event.backfill_compliance_events()
@@ -0,0 +1,3 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
@@ -0,0 +1,21 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+from __future__ import annotations
+
+import frappe
+
+
+def execute() -> None:
+	"""Populate the portal's per-customer daily totals and batch ranking from existing data."""
+	from cold_storage.cold_storage.doctype.cold_storage_batch_ranking.cold_storage_batch_ranking import (
+		rebuild_batch_ranking,
+	)
+	from cold_storage.cold_storage.doctype.cold_storage_customer_daily_movement.cold_storage_customer_daily_movement import (
+		rebuild_customer_daily_movements,
+	)
+
+	if frappe.db.table_exists("Cold Storage Customer Daily Movement"):
+		rebuild_customer_daily_movements()
+	if frappe.db.table_exists("Cold Storage Batch Ranking"):
+		rebuild_batch_ranking()
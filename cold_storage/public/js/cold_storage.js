@@ -2,7 +2,8 @@
 	const PATCH_MARKER = "__cs_top_customers_horizontal_patch__";
 	const STYLE_ID = "cs-top-customers-horizontal-style";
 	const CHART_NAME = "Top Customers";
-	const REPORT_NAME = "Cold Storage Customer Register";
+	const TOP_CUSTOMERS_METHOD =
+		"cold_storage.cold_storage.dashboard_chart_source.top_customers_by_stock.top_customers_by_stock.get_top_customers";
 	const LEGACY_AUDIT_REPORT_NAME = "Cold Storage Audit Trail & Compliance Pack";
 	const AUDIT_REPORT_NAME = "Cold Storage Audit Trail Compliance Pack";
 	const LEGACY_AUDIT_REPORT_ROUTE = `query-report/${LEGACY_AUDIT_REPORT_NAME}`;
@@ -280,14 +281,14 @@
 
 		hydrateInProgress = true;
 		try {
-			const result = await frappe.xcall("frappe.desk.query_report.run", {
-				report_name: REPORT_NAME,
-				filters: {},
-				ignore_prepared_report: 1,
+			const rows = await frappe.xcall(TOP_CUSTOMERS_METHOD, {
+				company: frappe.defaults.get_user_default("Company"),
 			});
-			const labels = result?.chart?.data?.labels || [];
-			const values = result?.chart?.data?.datasets?.[0]?.values || [];
-			renderHorizontalBars(body, labels, values);
+			renderHorizontalBars(
+				body,
+				(rows || []).map((row) => row.customer),
+				(rows || []).map((row) => row.qty)
+			);
 		} catch (error) {
 			console.warn("Cold Storage Top Customers hydrate failed.", error);
 		} finally {
@@ -9,6 +9,9 @@ import frappe
 from frappe.utils import cint
 
 CLIENT_PORTAL_ROLE = "Cold Storage Client Portal User"
+# Redis hash of user -> sorted customer names, and the full customer list for global scope.
+PORTAL_CUSTOMERS_CACHE_KEY = "cold_storage:portal_customers"
+ALL_CUSTOMERS_CACHE_KEY = "cold_storage:portal_all_customers"
 
 
 def sync_customer_user_permissions_for_client_portal_users() -> None:
@@ -19,11 +22,61 @@ def sync_customer_user_permissions_for_client_portal_users() -> None:
 
 
 def get_customers_for_portal_user(user: str | None = None) -> list[str]:
-	"""Return sorted customer list mapped to a portal user."""
+	"""Return sorted customer list mapped to a portal user (cached per user)."""
 	user_id = user or frappe.session.user
 	if not user_id:
 		return []
-	return sorted(_get_customers_for_user(user_id))
+	customers = frappe.cache.hget(
+		PORTAL_CUSTOMERS_CACHE_KEY,
+		user_id,
+		generator=lambda: sorted(_get_customers_for_user(user_id)),
+	)
+	return list(customers or [])
+
+
+def get_all_customer_names() -> list[str]:
+	"""Return every Customer name for global portal scope, cached until a Customer changes."""
+	customers = frappe.cache.get_value(
+		ALL_CUSTOMERS_CACHE_KEY,
+		generator=lambda: frappe.get_all("Customer", pluck="name", order_by="name asc"),
+	)
+	return list(customers or [])
+
+
+def clear_portal_customer_cache(user: str | None = None) -> None:
+	"""Drop cached portal customer scope for one user, or for everyone."""
+	if user:
+		frappe.cache.hdel(PORTAL_CUSTOMERS_CACHE_KEY, user)
+		return
+	frappe.cache.delete_key(PORTAL_CUSTOMERS_CACHE_KEY)
+
+
+def clear_portal_customer_cache_for_customer(doc, method: str | None = None) -> None:
+	"""Customer changes can move portal users and emails, so reset every cached scope."""
+	clear_portal_customer_cache()
+	frappe.cache.delete_value(ALL_CUSTOMERS_CACHE_KEY)
+
+
+def clear_portal_customer_cache_for_contact(doc, method: str | None = None) -> None:
+	"""Reset cached scope for users whose email is (or was) on this Contact."""
+	emails = {row.email_id for row in (doc.get("email_ids") or []) if getattr(row, "email_id", None)}
+	previous = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+	if previous:
+		emails.update(
+			row.email_id for row in (previous.get("email_ids") or []) if getattr(row, "email_id", None)
+		)
+	if doc.get("email_id"):
+		emails.add(doc.email_id)
+
+	for email in emails:
+		clear_portal_customer_cache(email)
+
+
+def clear_portal_customer_cache_for_user(doc, method: str | None = None) -> None:
+	"""Role or status changes on a User re-resolve that user's portal scope."""
+	user = getattr(doc, "name", None)
+	if user:
+		clear_portal_customer_cache(user)
 
 
 def sync_customer_user_permissions_for_customer(doc, method: str | None = None) -> None:
@@ -0,0 +1,75 @@
+# Copyright (c) 2026, Umaish Solutions and contributors
+# For license information, please see license.txt
+
+"""Secondary indexes used by the reports and client portal queries, applied on migrate."""
+
+from __future__ import annotations
+
+from typing import Final
+
+import frappe
+
+MOVEMENT_DOCTYPES: Final[tuple[str, ...]] = (
+	"Cold Storage Inward",
+	"Cold Storage Outward",
+	"Cold Storage Transfer",
+)
+
+# Company-wide reports filter (docstatus, company, posting_date range);
+# customer-scoped portal queries filter (customer, docstatus, posting_date range).
+INDEX_PLAN: Final[dict[str, tuple[tuple[str, ...], ...]]] = {
+	doctype: (
+		("docstatus", "company", "posting_date"),
+		("customer", "docstatus", "posting_date"),
+	)
+	for doctype in MOVEMENT_DOCTYPES
+}
+INDEX_PLAN["Cold Storage Daily Movement"] = (
+	("company", "posting_date"),
+	("customer", "posting_date"),
+	("item", "posting_date"),
+)
+# The portal trend chart reads a customer's last N days; top batches read the largest qty per scope.
+INDEX_PLAN["Cold Storage Customer Daily Movement"] = (("customer", "posting_date"),)
+INDEX_PLAN["Cold Storage Batch Ranking"] = (
+	("customer", "qty"),
+	("qty",),
+)
+# Lot traceability and the audit pack look child rows up by batch/item/warehouse;
+# (parent, parenttype) serves the parent joins that also pin parenttype.
+INDEX_PLAN["Cold Storage Inward Item"] = (
+	("batch_no",),
+	("item",),
+	("warehouse",),
+	("parent", "parenttype"),
+)
+INDEX_PLAN["Cold Storage Outward Item"] = INDEX_PLAN["Cold Storage Inward Item"]
+INDEX_PLAN["Cold Storage Transfer Item"] = (
+	("batch_no",),
+	("item",),
+	("source_warehouse",),
+	("target_warehouse",),
+	("parent", "parenttype"),
+)
+# The audit pack reads events per document in time order; time-window scans use event_timestamp.
+INDEX_PLAN["Cold Storage Compliance Event"] = (
+	("reference_doctype", "reference_name", "event_timestamp"),
+	("event_timestamp",),
+)
+
+
+def get_index_name(fields: tuple[str, ...]) -> str:
+	return "_".join(fields) + "_index"
+
+
+def add_indexes_for_doctype(doctype: str) -> None:
+	"""Create the planned indexes for one DocType; existing indexes are left alone."""
+	for fields in INDEX_PLAN.get(doctype, ()):
+		frappe.db.add_index(doctype, list(fields), index_name=get_index_name(fields))
+
+
+def sync_database_indexes() -> None:
+	"""Create every planned index that is missing."""
+	for doctype in INDEX_PLAN:
+		if frappe.db.table_exists(doctype):
+			add_indexes_for_doctype(doctype)
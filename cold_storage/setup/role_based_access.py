@@ -6,7 +6,6 @@ from __future__ import annotations
 from typing import Final
 
 import frappe
-from frappe.permissions import reset_perms
 from frappe.utils import cint
 
 PERMISSION_FIELDS: Final[tuple[str, ...]] = (
@@ -443,6 +442,13 @@ REPORT_ROLES: Final[dict[str, list[str]]] = {
 		"Cold Storage Warehouse Manager",
 		"Cold Storage Inventory Controller",
 	],
+	"Cold Storage Inventory Aging": [
+		"System Manager",
+		"Cold Storage Admin",
+		"Cold Storage Warehouse Manager",
+		"Cold Storage Inventory Controller",
+		"Cold Storage Billing Executive",
+	],
 	"Cold Storage Warehouse Occupancy Timeline": [
 		"System Manager",
 		"Cold Storage Admin",
@@ -463,6 +469,10 @@ REPORT_ROLES: Final[dict[str, list[str]]] = {
 		"Cold Storage Inventory Controller",
 		"Cold Storage Billing Executive",
 	],
+	"Cold Storage Prepared Report Jobs": [
+		"System Manager",
+		"Cold Storage Admin",
+	],
 	"Cold Storage Login Activity Log": [
 		"System Manager",
 		"Cold Storage Admin",
@@ -489,16 +499,25 @@ REPORT_ROLES: Final[dict[str, list[str]]] = {
 
 
 def sync_role_based_access() -> None:
-	"""Synchronize roles, role profiles, doctype permissions and report access."""
-	_ensure_roles()
+	"""Synchronize roles, role profiles, doctype permissions and report access.
+
+	Only rows that differ from the definitions above are written, and only the caches of
+	doctypes whose permissions changed are cleared.
+	"""
+	if _ensure_roles():
+		frappe.clear_cache(doctype="Role")
 	_ensure_role_profiles()
-	_sync_doctype_permissions()
-	_ensure_activity_log_permissions()
+	changed_doctypes = _sync_doctype_permissions()
+	if _ensure_activity_log_permissions():
+		changed_doctypes.add("Activity Log")
 	_sync_report_roles()
-	frappe.clear_cache()
+
+	for doctype in sorted(changed_doctypes):
+		frappe.clear_cache(doctype=doctype)
 
 
-def _ensure_roles() -> None:
+def _ensure_roles() -> bool:
+	changed = False
 	for role_name, config in ROLE_DEFINITIONS.items():
 		desk_access = cint(config.get("desk_access", 1))
 
@@ -513,6 +532,7 @@ def _ensure_roles() -> None:
 				updated = True
 			if updated:
 				role.save(ignore_permissions=True)
+				changed = True
 			continue
 
 		role = frappe.new_doc("Role")
@@ -520,6 +540,9 @@ def _ensure_roles() -> None:
 		role.desk_access = desk_access
 		role.disabled = 0
 		role.insert(ignore_permissions=True)
+		changed = True
+
+	return changed
 
 
 def _ensure_role_profiles() -> None:
@@ -545,35 +568,96 @@ def _ensure_role_profiles() -> None:
 			profile.save(ignore_permissions=True)
 
 
-def _sync_doctype_permissions() -> None:
+def _sync_doctype_permissions() -> set[str]:
+	"""Bring Custom DocPerm rows in line with ``DOCTYPE_PERMISSIONS``; return the doctypes changed."""
 	from frappe.core.doctype.doctype.doctype import validate_permissions_for_doctype
 
+	doctypes = set(
+		frappe.get_all("DocType", filters={"name": ["in", list(DOCTYPE_PERMISSIONS)]}, pluck="name")
+	)
+	existing_by_doctype: dict[str, list[dict]] = {}
+	for row in frappe.get_all(
+		"Custom DocPerm",
+		filters={"parent": ["in", list(doctypes) or [""]]},
+		fields=["name", "parent", "role", "permlevel", *PERMISSION_FIELDS],
+		order_by="creation asc",
+	):
+		existing_by_doctype.setdefault(row.parent, []).append(row)
+
+	changed_doctypes = set()
 	for doctype, permission_rows in DOCTYPE_PERMISSIONS.items():
-		if not frappe.db.exists("DocType", doctype):
+		if doctype not in doctypes:
 			continue
 
-		reset_perms(doctype)
+		to_insert, to_update, to_delete = get_permission_changes(
+			existing_by_doctype.get(doctype, []), permission_rows
+		)
+		if not (to_insert or to_update or to_delete):
+			continue
 
-		for permission in permission_rows:
+		for name in to_delete:
+			frappe.db.delete("Custom DocPerm", {"name": name})
+		for name, values in to_update.items():
+			frappe.db.set_value("Custom DocPerm", name, values)
+		for values in to_insert:
 			custom_perm = frappe.new_doc("Custom DocPerm")
 			custom_perm.parent = doctype
 			custom_perm.parenttype = "DocType"
 			custom_perm.parentfield = "permissions"
-			custom_perm.role = permission["role"]
-			custom_perm.permlevel = cint(permission.get("permlevel", 0))
-			for fieldname in PERMISSION_FIELDS:
-				custom_perm.set(fieldname, cint(permission.get(fieldname, 0)))
+			custom_perm.update(values)
 			custom_perm.insert(ignore_permissions=True)
 
 		validate_permissions_for_doctype(doctype)
-		frappe.clear_cache(doctype=doctype)
+		changed_doctypes.add(doctype)
+
+	return changed_doctypes
+
+
+def get_permission_changes(
+	existing_rows: list[dict], permission_rows: list[dict[str, int | str]]
+) -> tuple[list[dict], dict[str, dict], list[str]]:
+	"""Diff existing Custom DocPerm rows against the desired ones.
+
+	Rows are matched on ``(role, permlevel)``. Returns ``(rows to insert, {name: changed values},
+	names to delete)``; duplicates and rows for roles no longer defined are deleted.
+	"""
+	desired = {}
+	for permission in permission_rows:
+		values = {
+			"role": permission["role"],
+			"permlevel": cint(permission.get("permlevel", 0)),
+			**{fieldname: cint(permission.get(fieldname, 0)) for fieldname in PERMISSION_FIELDS},
+		}
+		desired[(values["role"], values["permlevel"])] = values
+
+	to_update = {}
+	to_delete = []
+	matched = set()
+	for row in existing_rows:
+		key = (row.get("role"), cint(row.get("permlevel")))
+		values = desired.get(key)
+		if values is None or key in matched:
+			to_delete.append(row.get("name"))
+			continue
+
+		matched.add(key)
+		changed = {
+			fieldname: values[fieldname]
+			for fieldname in PERMISSION_FIELDS
+			if cint(row.get(fieldname)) != values[fieldname]
+		}
+		if changed:
+			to_update[row.get("name")] = changed
+
+	to_insert = [values for key, values in desired.items() if key not in matched]
+	return to_insert, to_update, to_delete
 
 
-def _ensure_activity_log_permissions() -> None:
+def _ensure_activity_log_permissions() -> bool:
 	from frappe.core.doctype.doctype.doctype import validate_permissions_for_doctype
 
 	if not frappe.db.exists("DocType", "Activity Log"):
-		return
+		return False
 
 	updated = False
 	for role in ACTIVITY_LOG_ACCESS_ROLES:
@@ -589,7 +673,10 @@ def _ensure_activity_log_permissions() -> None:
 		permission_values = {"select": 1, "read": 1, "report": 1}
 
 		if existing_name:
-			current = frappe.db.get_value("Custom DocPerm", existing_name, list(permission_values), as_dict=True) or {}
+			current = (
+				frappe.db.get_value("Custom DocPerm", existing_name, list(permission_values), as_dict=True)
+				or {}
+			)
 			if all(cint(current.get(field)) == value for field, value in permission_values.items()):
 				continue
 			for field, value in permission_values.items():
@@ -610,7 +697,7 @@ def _ensure_activity_log_permissions() -> None:
 
 	if updated:
 		validate_permissions_for_doctype("Activity Log")
-		frappe.clear_cache(doctype="Activity Log")
+	return updated
 
 
 def _sync_report_roles() -> None: